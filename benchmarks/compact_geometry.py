@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring,invalid-name,too-few-public-methods
+"""
+Compares the slotted, immutable Point and Region against the original
+dict-backed classes, both in memory per instance and construction throughput
+"""
+
+from __future__ import print_function
+
+from sys import getsizeof
+from timeit import repeat
+
+from wotw_xlib.utils import Point, Region
+
+NUMBER = 100000
+REPEAT = 5
+
+
+class LegacyPoint(object):
+    """The original Point, kept verbatim for comparison"""
+
+    def __init__(self, x, y):
+        self.x = self.parse_coordinate(x)
+        self.y = self.parse_coordinate(y)
+
+    @staticmethod
+    def parse_coordinate(raw_coordinate):
+        return (
+            raw_coordinate.value
+            if hasattr(raw_coordinate, 'value')
+            else raw_coordinate
+        )
+
+    def is_above_and_left_of(self, unknown_point):
+        return (
+            self.x <= unknown_point.x
+            and
+            self.y <= unknown_point.y
+        )
+
+
+class LegacyRegion(object):
+    """The original Region, kept verbatim for comparison"""
+
+    def __init__(self, top_left, width=0, height=0):
+        self.top_left = top_left
+        self.bottom_right = LegacyPoint(
+            self.top_left.x + LegacyPoint.parse_coordinate(width),
+            self.top_left.y + LegacyPoint.parse_coordinate(height)
+        )
+
+    def contains(self, unknown_point):
+        return (
+            self.top_left.is_above_and_left_of(unknown_point)
+            and
+            unknown_point.is_above_and_left_of(self.bottom_right)
+        )
+
+
+def deep_size(instance):
+    """Sums the instance, its __dict__ if any, and any nested Points"""
+    size = getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += getsizeof(instance.__dict__)
+    for name in ['top_left', 'bottom_right']:
+        if hasattr(instance, name):
+            size += deep_size(getattr(instance, name))
+    return size
+
+
+SETUP = """
+from ctypes import c_int, c_uint
+from wotw_xlib.utils import Point, Region
+from __main__ import LegacyPoint, LegacyRegion
+cx, cy, cw, ch = c_int(1), c_int(2), c_uint(3), c_uint(4)
+old_region = LegacyRegion(LegacyPoint(0, 0), 10, 10)
+old_point = LegacyPoint(5, 5)
+region = Region(Point(0, 0), 10, 10)
+point = Point(5, 5)
+"""
+
+
+def best_rate(statement):
+    """Reports the best of several runs in operations per second"""
+    return NUMBER / min(repeat(statement, SETUP, number=NUMBER, repeat=REPEAT))
+
+
+CASES = [
+    ['Point(ints)', 'LegacyPoint(1, 2)', 'Point(1, 2)'],
+    ['Point(ctypes)', 'LegacyPoint(cx, cy)', 'Point(cx, cy)'],
+    ['Point.from_ctypes', 'LegacyPoint(cx, cy)', 'Point.from_ctypes(cx, cy)'],
+    [
+        'Region(ints)',
+        'LegacyRegion(LegacyPoint(1, 2), 3, 4)',
+        'Region(Point(1, 2), 3, 4)'
+    ],
+    [
+        'Region.from_ctypes',
+        'LegacyRegion(LegacyPoint(cx, cy), cw, ch)',
+        'Region.from_ctypes(cx, cy, cw, ch)'
+    ],
+    ['Region.contains', 'old_region.contains(old_point)', 'region.contains(point)'],
+]
+
+
+def cli():
+    print("{: >20} {: >12} {: >12}".format('bytes', 'legacy', 'compact'))
+    print("{: >20} {: >12} {: >12}".format(
+        'Point', deep_size(LegacyPoint(1, 2)), deep_size(Point(1, 2))
+    ))
+    print("{: >20} {: >12} {: >12}".format(
+        'Region',
+        deep_size(LegacyRegion(LegacyPoint(1, 2), 3, 4)),
+        deep_size(Region(Point(1, 2), 3, 4))
+    ))
+    print()
+    print("{: >20} {: >12} {: >12}".format('ops/sec', 'legacy', 'compact'))
+    for name, legacy, compact in CASES:
+        print("{: >20} {: >12.0f} {: >12.0f}".format(
+            name,
+            best_rate(legacy),
+            best_rate(compact)
+        ))
+
+if '__main__' == __name__:
+    cli()
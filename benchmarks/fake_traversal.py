@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Times the traversal algorithms against a ~100k window FakeBackend model, so
+the numbers reflect algorithmic cost without any socket latency
+"""
+
+from __future__ import print_function
+
+from timeit import default_timer
+
+from wotw_xlib.backends import FakeBackend
+from wotw_xlib.common import PointerWindow
+from wotw_xlib.utils import RegionIndex
+from wotw_xlib.xlib import Window
+
+WIDTH = 46
+DEPTH = 3
+RUNS = 20
+
+
+def time_runs(method_to_time, *args):
+    start = default_timer()
+    for _ in range(RUNS):
+        result = method_to_time(*args)
+    return [(default_timer() - start) / RUNS, result]
+
+
+def scan_query_tree(root_window):
+    """The XQueryTree scan, checking every child at every level"""
+    pointer_location = root_window.get_mouse_position()[1]
+    discovered_window = root_window
+    for snapshot in root_window.snapshot_children():
+        if snapshot.might_be_under_pointer(pointer_location):
+            discovered_window = PointerWindow(
+                root_window.display,
+                Window(snapshot.window),
+                backend=root_window.backend
+            )
+    if discovered_window.window.value != root_window.window.value:
+        return scan_query_tree(discovered_window)
+    return root_window
+
+
+def index_top_level(root_window):
+    index = RegionIndex()
+    for stacking, snapshot in enumerate(root_window.snapshot_children()):
+        index.insert(snapshot.window, snapshot.region, stacking)
+    return index
+
+
+def cli():
+    backend = FakeBackend()
+    start = default_timer()
+    target = backend.populate(WIDTH, DEPTH)
+    print("{: >16}: {: >10.1f} ms for {} windows".format(
+        'populate', (default_timer() - start) * 1000, len(backend.windows)
+    ))
+    origin = backend.origin_of(target)
+    backend.warp_pointer(origin[0] + 1, origin[1] + 1)
+    root_window = PointerWindow(backend=backend)
+    location = root_window.get_mouse_position()[0]
+    index = index_top_level(root_window)
+    for label, method_to_time, args in [
+            ['pointer walk', root_window.find_window_under_pointer, []],
+            ['query tree scan', scan_query_tree, [root_window]],
+            ['index build', index_top_level, [root_window]],
+            ['index query', index.find_topmost, [location]]
+    ]:
+        elapsed, _ = time_runs(method_to_time, *args)
+        print("{: >16}: {: >10.4f} ms".format(label, elapsed * 1000))
+
+if '__main__' == __name__:
+    cli()
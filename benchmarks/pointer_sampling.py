@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Compares calls per second of the allocating get_mouse_position and get_region
+against the scratch-backed sample_mouse_position and sample_region
+"""
+
+from __future__ import print_function
+
+from array import array
+from timeit import default_timer
+
+from wotw_xlib.common import NeedsDisplay, PointerWindow
+
+CALLS = 20000
+
+
+def calls_per_second(method_to_time, *args):
+    start = default_timer()
+    for _ in range(CALLS):
+        method_to_time(*args)
+    return CALLS / (default_timer() - start)
+
+
+def report(label, before, after):
+    print("{: >16}: {: >10.0f} -> {: >10.0f} calls/s ({:.2f}x)".format(
+        label, before, after, after / before
+    ))
+
+
+def cli():
+    with NeedsDisplay() as main_display:
+        root_window = PointerWindow(main_display.display)
+        out = array('l', [0] * 4)
+        report(
+            'mouse position',
+            calls_per_second(root_window.get_mouse_position),
+            calls_per_second(root_window.sample_mouse_position, out)
+        )
+        report(
+            'region',
+            calls_per_second(root_window.get_region),
+            calls_per_second(root_window.sample_region, out)
+        )
+
+if '__main__' == __name__:
+    cli()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Times RegionSet construction, algebra, area, and point containment on sets
+built from thousands of overlapping rectangles
+"""
+
+from __future__ import print_function
+
+from random import Random
+from timeit import default_timer
+
+from wotw_xlib.utils import Point, Region, RegionSet
+
+SIZES = [1000, 5000]
+RUNS = 5
+POINTS = 10000
+SCREEN = (3840, 2160)
+
+
+def random_regions(generator, count):
+    return [
+        Region.from_values(
+            generator.randint(0, SCREEN[0]),
+            generator.randint(0, SCREEN[1]),
+            generator.randint(8, 120),
+            generator.randint(8, 90)
+        )
+        for _ in range(count)
+    ]
+
+
+def time_runs(method_to_time, *args):
+    start = default_timer()
+    for _ in range(RUNS):
+        result = method_to_time(*args)
+    return [(default_timer() - start) / RUNS, result]
+
+
+def contains_all(region_set, points):
+    return sum(1 for point in points if region_set.contains(point))
+
+
+def cli():
+    generator = Random(47)
+    points = [
+        Point(generator.randint(0, SCREEN[0]), generator.randint(0, SCREEN[1]))
+        for _ in range(POINTS)
+    ]
+    for size in SIZES:
+        elapsed, first = time_runs(RegionSet, random_regions(generator, size))
+        second = RegionSet(random_regions(generator, size))
+        print("{} rectangles -> {} bands, {} banded rectangles".format(
+            size, len(first.bands), len(first)
+        ))
+        print("{: >16}: {: >10.2f} ms".format('construct', elapsed * 1000))
+        for label, method_to_time, args in [
+                ['union', first.union, [second]],
+                ['intersection', first.intersection, [second]],
+                ['subtraction', first.subtract, [second]],
+                ['area', lambda: first.area, []]
+        ]:
+            elapsed, _ = time_runs(method_to_time, *args)
+            print("{: >16}: {: >10.2f} ms".format(label, elapsed * 1000))
+        elapsed, _ = time_runs(contains_all, first, points)
+        print("{: >16}: {: >10.2f} us/point".format(
+            'contains', elapsed * 1000000 / POINTS
+        ))
+
+if '__main__' == __name__:
+    cli()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Reports frames per second capturing the window under the pointer and a fixed
+root region through MIT-SHM
+"""
+
+from __future__ import print_function
+
+from timeit import default_timer
+
+from wotw_xlib.common import EwmhClients, ShmCapture
+from wotw_xlib.utils import Point, Region
+
+FRAMES = 200
+
+
+def frames_per_second(capture, target):
+    # The first frame pays for the segment
+    capture.capture(target)
+    start = default_timer()
+    for _ in range(FRAMES):
+        capture.capture(target)
+    return FRAMES / (default_timer() - start)
+
+
+def cli():
+    with ShmCapture() as capture:
+        window = EwmhClients(capture.display).find_window_under_pointer()
+        for label, target in [
+                ['pointer window', window],
+                ['640x480 region', Region(Point(0, 0), 640, 480)]
+        ]:
+            print("{: >16}: {: >10.1f} frames/s".format(
+                label, frames_per_second(capture, target)
+            ))
+
+if '__main__' == __name__:
+    cli()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Times the hot paths against synthetic window trees on a private Xvfb server
+and saves percentiles as JSON, optionally flagging regressions against an
+earlier run
+"""
+
+from __future__ import print_function
+
+from argparse import ArgumentParser
+from json import dump, load
+from platform import python_version
+from sys import exit as sys_exit
+from time import time as time_now
+from timeit import default_timer
+
+from wotw_xlib.common import NeedsDisplay, PointerWindow, WindowTreeCache
+from wotw_xlib.xlib import Window
+
+from window_tree import TREE_SIZES, WindowTree
+from xvfb import Xvfb
+
+PERCENTILES = [50, 90, 99]
+
+
+def percentile(ordered_samples, rank):
+    """Nearest-rank percentile of an already sorted list"""
+    index = int(round(rank / 100.0 * (len(ordered_samples) - 1)))
+    return ordered_samples[index]
+
+
+def summarize(samples):
+    """Reduces raw timings to milliseconds"""
+    ordered = sorted(sample * 1000 for sample in samples)
+    summary = {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'mean': sum(ordered) / len(ordered)
+    }
+    for rank in PERCENTILES:
+        summary['p%d' % rank] = percentile(ordered, rank)
+    return summary
+
+
+def measure(method_to_time, warmup, repeat):
+    """Discards the warmup runs, then times each run on its own"""
+    for _ in range(warmup):
+        method_to_time()
+    samples = []
+    for _ in range(repeat):
+        start = default_timer()
+        method_to_time()
+        samples.append(default_timer() - start)
+    return summarize(samples)
+
+
+def consume_query_tree(window):
+    with window.get_query_tree() as children:
+        return len(children)
+
+
+def build_hot_paths(display, tree):
+    """Pairs each hot path with a zero-argument callable"""
+    root = PointerWindow(display)
+    target = PointerWindow(display, Window(tree.target))
+    location = root.get_mouse_position()[0]
+    cache = WindowTreeCache(display)
+    cache.load()
+    return [
+        ['get_query_tree', lambda: consume_query_tree(root)],
+        ['get_region', target.get_region],
+        [
+            'might_be_under_pointer',
+            lambda: PointerWindow(
+                display,
+                Window(tree.target)
+            ).might_be_under_pointer(location)
+        ],
+        ['snapshot_children', root.snapshot_children],
+        ['find_window_under_pointer', root.find_window_under_pointer],
+        ['cached_find_window_under_pointer', cache.find_window_under_pointer]
+    ]
+
+
+def run_size(display, size_name, arguments):
+    tree = WindowTree.from_size(
+        display,
+        size_name,
+        arguments.overlap,
+        not arguments.no_reparent
+    ).build()
+    try:
+        results = {'windows': tree.count}
+        for name, hot_path in build_hot_paths(display, tree):
+            results[name] = measure(hot_path, arguments.warmup, arguments.repeat)
+        return results
+    finally:
+        tree.destroy()
+
+
+def run_suite(display_name, arguments):
+    results = {}
+    with NeedsDisplay(display_name) as main_display:
+        for size_name in arguments.sizes:
+            results[size_name] = run_size(
+                main_display.display,
+                size_name,
+                arguments
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lists every p50 that slowed down by more than the tolerance"""
+    regressions = []
+    for size_name, paths in results.items():
+        for name, summary in paths.items():
+            previous = baseline.get(size_name, {}).get(name)
+            if not isinstance(summary, dict) or not previous:
+                continue
+            ratio = summary['p50'] / previous['p50'] if previous['p50'] else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append([size_name, name, ratio])
+    return regressions
+
+
+def report(results):
+    for size_name in sorted(results):
+        print("{} ({} windows)".format(size_name, results[size_name]['windows']))
+        for name, summary in sorted(results[size_name].items()):
+            if isinstance(summary, dict):
+                print("{: >34}: {: >9.4f} p50 {: >9.4f} p99 ms".format(
+                    name, summary['p50'], summary['p99']
+                ))
+
+
+def parse_arguments():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        choices=sorted(TREE_SIZES),
+        default=['10', '1k']
+    )
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--overlap', type=float, default=0.5)
+    parser.add_argument('--no-reparent', action='store_true')
+    parser.add_argument(
+        '--display',
+        help='use an existing display instead of starting Xvfb'
+    )
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='earlier output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    return parser.parse_args()
+
+
+def cli():
+    arguments = parse_arguments()
+    if arguments.display:
+        results = run_suite(arguments.display.encode('ascii'), arguments)
+    else:
+        with Xvfb() as server:
+            results = run_suite(server.display_name, arguments)
+    report(results)
+    with open(arguments.output, 'w') as output_file:
+        dump(
+            {
+                'created': time_now(),
+                'python': python_version(),
+                'arguments': vars(arguments),
+                'results': results
+            },
+            output_file,
+            indent=2,
+            sort_keys=True
+        )
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            baseline = load(baseline_file)['results']
+        regressions = compare(results, baseline, arguments.tolerance)
+        for size_name, name, ratio in regressions:
+            print("regression: {} {} is {:.2f}x slower".format(
+                size_name, name, ratio
+            ))
+        if regressions:
+            sys_exit(1)
+
+if '__main__' == __name__:
+    cli()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Times the top to bottom visibility sweep against checking every window
+against every window above it, on FakeBackend desktops of growing size
+"""
+
+from __future__ import print_function
+
+from random import Random
+from timeit import default_timer
+
+from wotw_xlib.backends import FakeBackend
+from wotw_xlib.common import PointerWindow, WindowVisibility
+from wotw_xlib.utils import RegionSet
+
+SIZES = [100, 500, 2000]
+
+
+def build_desktop(count):
+    generator = Random(47)
+    backend = FakeBackend(3840, 2160)
+    for _ in range(count):
+        backend.create_window(
+            x=generator.randint(0, 3600),
+            y=generator.randint(0, 2000),
+            width=generator.randint(80, 1200),
+            height=generator.randint(60, 800)
+        )
+    return PointerWindow(backend=backend)
+
+
+def pairwise(snapshots):
+    hidden = 0
+    for index, snapshot in enumerate(snapshots):
+        visible = RegionSet([snapshot.region])
+        for above in snapshots[index + 1:]:
+            if above.region.overlaps(snapshot.region):
+                visible = visible - RegionSet([above.region])
+        hidden += not visible
+    return hidden
+
+
+def sweep(root_window, snapshots):
+    return sum(
+        result.is_hidden
+        for result in WindowVisibility.sweep(
+            snapshots,
+            RegionSet([root_window.region])
+        )
+    )
+
+
+def timed(method_to_time, *args):
+    start = default_timer()
+    result = method_to_time(*args)
+    return [(default_timer() - start) * 1000, result]
+
+
+def cli():
+    for size in SIZES:
+        root_window = build_desktop(size)
+        snapshots = root_window.snapshot_children()
+        sweep_ms, hidden = timed(sweep, root_window, snapshots)
+        print("{: >6} windows, {: >6} hidden: sweep {: >10.1f} ms".format(
+            size, hidden, sweep_ms
+        ), end='')
+        if size <= 500:
+            pairwise_ms, _ = timed(pairwise, snapshots)
+            print(", pairwise {: >10.1f} ms".format(pairwise_ms))
+        else:
+            print()
+
+if '__main__' == __name__:
+    cli()
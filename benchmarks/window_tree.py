@@ -0,0 +1,120 @@
+# pylint: disable=missing-docstring
+"""
+Builds synthetic window trees of a given width, depth, and overlap, so every
+benchmark run sees the same shape
+"""
+
+from __future__ import print_function
+
+from wotw_xlib.xlib import (
+    XCreateSimpleWindow,
+    XDefaultScreen,
+    XDestroyWindow,
+    XMapSubwindows,
+    XReparentWindow,
+    XRootWindow,
+    XSync,
+    XWarpPointer
+)
+
+# name: (children per window, levels)
+TREE_SIZES = {
+    '10': (10, 1),
+    '1k': (10, 3),
+    '10k': (21, 3)
+}
+
+
+class WindowTree(object):
+    """
+    This class creates width children under every window, depth levels deep.
+    Children are half their parent's size and overlap their previous sibling
+    by the given fraction. With reparent set, every child is created on the
+    root and reparented into place, the way a window manager frames clients.
+    """
+
+    MINIMUM_SIZE = 4
+
+    def __init__(self, display, width, depth, overlap=0.5, reparent=True):
+        """Ctor only records the shape"""
+        self.display = display
+        self.width = width
+        self.depth = depth
+        self.overlap = overlap
+        self.reparent = reparent
+        self.root = XRootWindow(display, XDefaultScreen(display))
+        self.top_level = []
+        self.count = 0
+        # The topmost leaf, in root coordinates
+        self.target = None
+        self.target_center = None
+
+    @classmethod
+    def from_size(cls, display, size_name, overlap=0.5, reparent=True):
+        """Builds one of the TREE_SIZES presets"""
+        width, depth = TREE_SIZES[size_name]
+        return cls(display, width, depth, overlap, reparent)
+
+    def child_layout(self, parent_size):
+        """Places width children, overlapping along a diagonal"""
+        child_size = max(self.MINIMUM_SIZE, parent_size // 2)
+        step = max(1, int(child_size * (1 - self.overlap)))
+        room = max(1, parent_size - child_size)
+        return child_size, [
+            ((index * step) % room, (index * step * 3) % room)
+            for index in range(self.width)
+        ]
+
+    def build(self, screen_size=1024):
+        """Creates and maps the whole tree, then parks the pointer on it"""
+        pending = [(self.root, screen_size, 0, 0, 0)]
+        while pending:
+            parent, parent_size, level, left, top = pending.pop(0)
+            if level == self.depth:
+                continue
+            child_size, positions = self.child_layout(parent_size)
+            for x, y in positions:
+                window = XCreateSimpleWindow(
+                    self.display,
+                    self.root if self.reparent else parent,
+                    x,
+                    y,
+                    child_size,
+                    child_size,
+                    0,
+                    0,
+                    0
+                )
+                if self.reparent and parent != self.root:
+                    XReparentWindow(self.display, window, parent, x, y)
+                if parent == self.root:
+                    self.top_level.append(window)
+                self.count += 1
+                pending.append((window, child_size, level + 1, left + x, top + y))
+                self.target = window
+                self.target_center = (
+                    left + x + child_size // 2,
+                    top + y + child_size // 2
+                )
+            XMapSubwindows(self.display, parent)
+        XWarpPointer(
+            self.display,
+            0,
+            self.root,
+            0,
+            0,
+            0,
+            0,
+            self.target_center[0],
+            self.target_center[1]
+        )
+        XSync(self.display, False)
+        return self
+
+    def destroy(self):
+        """Tears everything down again"""
+        for window in self.top_level:
+            XDestroyWindow(self.display, window)
+        XSync(self.display, False)
+        self.top_level = []
+        self.count = 0
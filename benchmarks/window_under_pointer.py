@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# pylint: disable=missing-docstring
+"""
+Compares the original XQueryTree scan for the window under the pointer against
+PointerWindow.find_window_under_pointer
+"""
+
+from __future__ import print_function
+
+from timeit import default_timer
+
+from wotw_xlib.xlib import Window
+from wotw_xlib.common import NeedsDisplay, PointerWindow
+
+RUNS = 50
+
+
+def scan_query_tree(display, root_window):
+    """The original lookup from examples/get-window-under-cursor"""
+    with root_window.get_query_tree() as children:
+        child_windows = list(children)
+    if child_windows:
+        discovered_window = root_window
+        pointer_location = root_window.get_mouse_position()[1]
+        for child in child_windows:
+            window = PointerWindow(display, Window(child))
+            if window.might_be_under_pointer(pointer_location):
+                discovered_window = window
+        if discovered_window.window != root_window.window:
+            return scan_query_tree(display, discovered_window)
+    return root_window
+
+
+def walk_pointer_children(display, root_window):
+    # pylint: disable=unused-argument
+    return root_window.find_window_under_pointer()
+
+
+def time_runs(method_to_time, *args):
+    start = default_timer()
+    for _ in range(RUNS):
+        result = method_to_time(*args)
+    return [(default_timer() - start) / RUNS, result]
+
+
+def cli():
+    with NeedsDisplay() as main_display:
+        root_window = PointerWindow(main_display.display)
+        scan_time, scan_result = time_runs(
+            scan_query_tree,
+            main_display.display,
+            root_window
+        )
+        walk_time, walk_result = time_runs(
+            walk_pointer_children,
+            main_display.display,
+            root_window
+        )
+    print("{: >14}: {: >10.4f} ms -> {}".format(
+        'query tree', scan_time * 1000, scan_result.window.value
+    ))
+    print("{: >14}: {: >10.4f} ms -> {}".format(
+        'pointer walk', walk_time * 1000, walk_result.window.value
+    ))
+    print("{: >14}: {: >10.1f}x".format('speedup', scan_time / walk_time))
+
+if '__main__' == __name__:
+    cli()
@@ -0,0 +1,83 @@
+# pylint: disable=missing-docstring
+"""
+Starts a throwaway Xvfb server so benchmarks never depend on whatever desktop
+happens to be running
+"""
+
+from __future__ import print_function
+
+from os import devnull
+from os.path import exists
+from subprocess import Popen
+from time import sleep
+from timeit import default_timer
+
+
+class Xvfb(object):
+    """This class owns a single Xvfb process for the length of a with block"""
+
+    SOCKET_PATTERN = '/tmp/.X11-unix/X%d'
+    LOCK_PATTERN = '/tmp/.X%d-lock'
+    FIRST_DISPLAY = 99
+    STARTUP_TIMEOUT = 10.0
+
+    def __init__(self, width=1920, height=1080, depth=24):
+        """Ctor only records the screen; nothing starts until entered"""
+        self.screen = '%dx%dx%d' % (width, height, depth)
+        self.display_number = None
+        self.process = None
+        self.output = None
+
+    @property
+    def display_name(self):
+        """The name XOpenDisplay wants"""
+        return (':%d' % self.display_number).encode('ascii')
+
+    @classmethod
+    def find_free_display(cls):
+        """Skips any display number another server already claimed"""
+        display_number = cls.FIRST_DISPLAY
+        while exists(cls.LOCK_PATTERN % display_number):
+            display_number += 1
+        return display_number
+
+    def start(self):
+        """Launches the server and waits for its socket"""
+        self.display_number = self.find_free_display()
+        self.output = open(devnull, 'w')
+        self.process = Popen(
+            [
+                'Xvfb',
+                ':%d' % self.display_number,
+                '-screen', '0', self.screen,
+                '-nolisten', 'tcp'
+            ],
+            stdout=self.output,
+            stderr=self.output
+        )
+        deadline = default_timer() + self.STARTUP_TIMEOUT
+        while not exists(self.SOCKET_PATTERN % self.display_number):
+            if self.process.poll() is not None or default_timer() > deadline:
+                self.stop()
+                raise RuntimeError('Xvfb did not start')
+            sleep(0.05)
+
+    def stop(self):
+        """Shuts the server down"""
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.terminate()
+            self.process.wait()
+            self.process = None
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+
+    def __enter__(self):
+        """Starts the server"""
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Stops the server"""
+        self.stop()
@@ -0,0 +1,57 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from wotw_xlib.backends import Backend
+
+
+class BackendUnitTests(TestCase):
+
+    def test_interface_is_abstract(self):
+        self.assertRaises(TypeError, Backend)
+
+    def test_partial_backend_fails_early(self):
+        self.assertRaises(TypeError, PartialBackend)
+
+    def test_every_request_abstract(self):
+        self.assertIn('open_display', Backend.__abstractmethods__)
+        self.assertIn('get_sub_image', Backend.__abstractmethods__)
+        self.assertNotIn('snapshot_windows', Backend.__abstractmethods__)
+        self.assertNotIn('ignore_vanished_windows', Backend.__abstractmethods__)
+
+
+class PartialBackend(Backend):
+
+    def query_pointer(self, display, window):
+        return (1, 2, 3, 4, 5)
+
+    def get_geometry(self, display, window):
+        return (6, 7, 8, 9)
+
+    def query_tree(self, display, window):
+        return [10, 11]
+
+
+class SingleRequestBackend(PartialBackend):
+    pass
+
+
+# The defaults under test only need the three requests above
+SingleRequestBackend.__abstractmethods__ = frozenset()
+
+
+class DefaultsUnitTests(TestCase):
+
+    def setUp(self):
+        self.backend = SingleRequestBackend()
+
+    def test_samples_built_from_requests(self):
+        self.assertEquals(self.backend.sample_pointer(None, 1), (1, 2, 3, 4))
+        out = [0] * 4
+        self.assertIs(self.backend.sample_geometry(None, 1, out), out)
+        self.assertEquals(out, [6, 7, 8, 9])
+
+    def test_children_wrapped(self):
+        with self.backend.child_windows(None, 1) as children:
+            self.assertEquals(list(children), [10, 11])
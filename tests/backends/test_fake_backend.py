@@ -0,0 +1,366 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from wotw_xlib.backends import FakeBackend, FakeDisplay
+from wotw_xlib.common import (
+    DamageError,
+    DamageTracker,
+    DisplayPool,
+    EwmhClients,
+    MonitorLayout,
+    NeedsDisplay,
+    PointerWindow,
+    ShapeCache,
+    ShmCapture,
+    ShmError,
+    TitleCache,
+    WindowTreeCache
+)
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xext import ShapeInput
+from wotw_xlib.xlib import (
+    IsUnmapped,
+    IsUnviewable,
+    IsViewable,
+    PropertyChangeMask,
+    SubstructureNotifyMask,
+    Window
+)
+
+
+class FakeBackendTestCase(TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend(100, 100)
+        self.bottom = self.backend.create_window(None, 0, 0, 50, 50, name=u'bottom')
+        self.top = self.backend.create_window(None, 10, 10, 50, 50, name=u'top')
+        self.nested = self.backend.create_window(self.top, 5, 5, 10, 10)
+        self.display = self.backend.open_display()
+        self.addCleanup(self.backend.close_display, self.display)
+
+
+class TreeUnitTests(FakeBackendTestCase):
+
+    def test_query_tree(self):
+        self.assertEquals(
+            self.backend.query_tree(self.display, FakeBackend.ROOT),
+            [self.bottom, self.top]
+        )
+
+    def test_raise(self):
+        self.backend.raise_window(self.bottom)
+        self.assertEquals(
+            self.backend.query_tree(self.display, FakeBackend.ROOT),
+            [self.top, self.bottom]
+        )
+
+    def test_reparent(self):
+        self.backend.reparent_window(self.nested, self.bottom, 1, 2)
+        self.assertEquals(self.backend.query_tree(self.display, self.top), [])
+        self.assertEquals(self.backend.origin_of(self.nested), (1, 2))
+
+    def test_destroy_subtree(self):
+        self.backend.destroy_window(self.top)
+        self.assertNotIn(self.nested, self.backend.windows)
+        self.assertEquals(
+            self.backend.query_tree(self.display, FakeBackend.ROOT),
+            [self.bottom]
+        )
+
+    def test_populate(self):
+        backend = FakeBackend()
+        topmost = backend.populate(10, 3)
+        self.assertEquals(len(backend.windows), 1 + 10 + 100 + 1000)
+        self.assertEquals(backend.windows[topmost].children, [])
+
+
+class StateUnitTests(FakeBackendTestCase):
+
+    def test_map_state(self):
+        self.backend.set_mapped(self.top, False)
+        self.assertEquals(self.backend.map_state_of(self.top), IsUnmapped)
+        self.assertEquals(self.backend.map_state_of(self.nested), IsUnviewable)
+        self.assertEquals(self.backend.map_state_of(self.bottom), IsViewable)
+
+    def test_query_pointer(self):
+        self.backend.warp_pointer(20, 20)
+        self.assertEquals(
+            self.backend.query_pointer(self.display, FakeBackend.ROOT),
+            (20, 20, 20, 20, self.top)
+        )
+        self.assertEquals(
+            self.backend.query_pointer(self.display, self.top),
+            (20, 20, 10, 10, self.nested)
+        )
+
+    def test_unmapped_children_skipped(self):
+        self.backend.warp_pointer(20, 20)
+        self.backend.set_mapped(self.top, False)
+        self.assertEquals(
+            self.backend.query_pointer(self.display, FakeBackend.ROOT)[4],
+            self.bottom
+        )
+
+    def test_attributes(self):
+        attributes = self.backend.get_window_attributes(self.display, self.top)
+        self.assertEquals(
+            (attributes.x, attributes.y, attributes.width, attributes.height),
+            (10, 10, 50, 50)
+        )
+        self.assertEquals(attributes.map_state, IsViewable)
+
+    def test_masks_accumulate(self):
+        self.backend.select_input(self.display, self.top, SubstructureNotifyMask)
+        self.backend.select_input(self.display, self.top, PropertyChangeMask)
+        self.assertEquals(
+            self.backend.get_window_attributes(
+                self.display,
+                self.top
+            ).your_event_mask,
+            SubstructureNotifyMask | PropertyChangeMask
+        )
+        self.assertEquals(
+            self.backend.get_window_attributes(
+                self.backend.open_display(),
+                self.top
+            ).your_event_mask,
+            0
+        )
+
+
+class PointerWindowIntegrationTests(FakeBackendTestCase):
+
+    def test_display_lifecycle(self):
+        with NeedsDisplay(backend=self.backend) as has_display:
+            self.assertIsInstance(has_display.display, FakeDisplay)
+            self.assertEquals(self.backend.open_displays, 2)
+        self.assertEquals(self.backend.open_displays, 1)
+
+    def test_pooled_lifecycle(self):
+        pool = DisplayPool(backend=self.backend)
+        with PointerWindow(pool=pool, backend=self.backend) as root:
+            self.assertEquals(root.window.value, FakeBackend.ROOT)
+            leased = root.display
+        with PointerWindow(pool=pool, backend=self.backend) as root:
+            self.assertIs(root.display, leased)
+        self.assertEquals(self.backend.open_displays, 2)
+        pool.close_all()
+        self.assertEquals(self.backend.open_displays, 1)
+
+    def test_find_window_under_pointer(self):
+        self.backend.warp_pointer(20, 20)
+        root = PointerWindow(backend=self.backend)
+        self.assertEquals(root.window.value, FakeBackend.ROOT)
+        found = root.find_window_under_pointer()
+        self.assertEquals(found.window.value, self.nested)
+        self.assertIs(found.backend, self.backend)
+
+    def test_queries(self):
+        self.backend.warp_pointer(20, 20)
+        window = PointerWindow(self.display, Window(self.top), backend=self.backend)
+        self.assertEquals(str(window.get_region()), '(10,10)x(60,60)')
+        self.assertEquals(window.sample_region(), (10, 10, 50, 50))
+        self.assertEquals(window.sample_mouse_position([0] * 4), [20, 20, 10, 10])
+        self.assertEquals(window.get_names(), [b'top', b'top'])
+        self.assertTrue(window.might_be_under_pointer(window.get_mouse_position()[0]))
+        with window.get_query_tree() as children:
+            self.assertEquals(list(children), [self.nested])
+
+    def test_snapshot_children(self):
+        root = PointerWindow(self.display, backend=self.backend)
+        snapshots = root.snapshot_children()
+        self.assertEquals([snapshot.window for snapshot in snapshots], [self.bottom, self.top])
+        self.assertEquals(snapshots[1].name, b'top')
+        self.assertEquals(str(snapshots[1].region), '(10,10)x(60,60)')
+
+
+class WindowTreeCacheIntegrationTests(FakeBackendTestCase):
+
+    def setUp(self):
+        super(WindowTreeCacheIntegrationTests, self).setUp()
+        self.cache = WindowTreeCache(self.display, backend=self.backend)
+        self.cache.load()
+
+    def find(self, x, y):
+        self.cache.process_events()
+        return self.cache.find_window_under(Point(x, y)).window
+
+    def test_loaded(self):
+        self.assertEquals(
+            self.cache.windows[FakeBackend.ROOT].children,
+            [self.bottom, self.top]
+        )
+        self.assertEquals(self.find(20, 20), self.nested)
+        self.assertEquals(self.find(5, 5), self.bottom)
+        self.assertEquals(self.find(90, 90), FakeBackend.ROOT)
+
+    def test_created_on_top(self):
+        created = self.backend.create_window(None, 0, 0, 30, 30)
+        self.assertEquals(self.find(20, 20), created)
+
+    def test_nested_creation_watched(self):
+        created = self.backend.create_window(self.nested, 0, 0, 5, 5)
+        self.assertEquals(self.find(16, 16), created)
+        grandchild = self.backend.create_window(created, 0, 0, 2, 2)
+        self.assertEquals(self.find(16, 16), grandchild)
+
+    def test_unmapped_and_destroyed(self):
+        self.backend.set_mapped(self.top, False)
+        self.assertEquals(self.find(20, 20), self.bottom)
+        self.backend.set_mapped(self.top)
+        self.assertEquals(self.find(20, 20), self.nested)
+        self.backend.destroy_window(self.top)
+        self.assertEquals(self.find(20, 20), self.bottom)
+        self.assertNotIn(self.nested, self.cache.windows)
+
+    def test_restacked_and_moved(self):
+        self.backend.raise_window(self.bottom)
+        self.assertEquals(self.find(20, 20), self.bottom)
+        self.backend.configure_window(self.bottom, 70, 70, 10, 10)
+        self.assertEquals(self.find(20, 20), self.nested)
+        self.assertEquals(self.find(75, 75), self.bottom)
+
+    def test_reparented(self):
+        self.backend.reparent_window(self.nested, self.bottom, 1, 2)
+        self.assertEquals(self.find(3, 4), self.nested)
+        self.assertEquals(self.cache.windows[self.top].children, [])
+
+    def walk(self, x, y):
+        self.backend.warp_pointer(x, y)
+        return PointerWindow(
+            self.display,
+            backend=self.backend
+        ).find_window_under_pointer().window.value
+
+    def test_borders(self):
+        framed = self.backend.create_window(None, 70, 70, 10, 10, border_width=3)
+        self.cache.process_events()
+        inner = self.backend.create_window(framed, 0, 0, 2, 2)
+        for x, expected in [(71, framed), (73, inner), (86, framed), (87, FakeBackend.ROOT)]:
+            self.assertEquals(self.find(x, x), expected)
+            self.assertEquals(self.walk(x, x), expected)
+        loaded = WindowTreeCache(self.display, backend=self.backend)
+        loaded.load()
+        self.assertEquals(loaded.windows[framed].region, self.cache.windows[framed].region)
+        self.assertEquals(loaded.windows[framed].border_width, 3)
+        self.assertEquals(
+            self.backend.snapshot_relative(self.display, [inner], FakeBackend.ROOT)[0].region,
+            Region.from_values(73, 73, 2, 2)
+        )
+
+    def test_matches_the_tree_walk(self):
+        self.backend.warp_pointer(20, 20)
+        self.assertEquals(
+            self.cache.find_window_under_pointer().window,
+            PointerWindow(self.display, backend=self.backend)
+            .find_window_under_pointer().window.value
+        )
+
+    def test_shapes_respected(self):
+        self.cache.shapes = ShapeCache(self.display, backend=self.backend)
+        self.backend.set_shape(self.top, ShapeInput, [Region.from_values(0, 0, 5, 5)])
+        self.assertEquals(self.find(30, 30), self.bottom)
+        self.assertEquals(self.find(12, 12), self.top)
+        self.backend.set_shape(self.top, ShapeInput, [Region.from_values(0, 0, 50, 50)])
+        self.cache.shapes.process_events()
+        self.assertEquals(self.find(30, 30), self.top)
+
+    def test_covering_shape_rechecked_after_resize(self):
+        self.cache.shapes = ShapeCache(self.display, backend=self.backend)
+        self.backend.set_shape(self.top, ShapeInput, [Region.from_values(0, 0, 50, 50)])
+        self.assertEquals(self.find(30, 30), self.top)
+        self.backend.configure_window(self.top, 10, 10, 80, 80)
+        self.assertEquals(self.find(75, 75), FakeBackend.ROOT)
+
+    def test_destroyed_shapes_forgotten(self):
+        shapes = ShapeCache(self.display, backend=self.backend)
+        shapes.get_shape(self.top, Region.from_values(10, 10, 50, 50))
+        self.backend.destroy_window(self.top)
+        shapes.process_events()
+        self.assertEquals(shapes.shapes, {})
+
+
+class CacheIntegrationTests(FakeBackendTestCase):
+
+    def test_titles(self):
+        self.backend.set_property(
+            self.top,
+            '_NET_WM_NAME',
+            'UTF8_STRING',
+            u'caf\xe9'.encode('utf-8')
+        )
+        titles = TitleCache(self.display, backend=self.backend)
+        self.assertEquals(titles.get_title(self.top).name, u'caf\xe9')
+        self.backend.set_property(self.top, 'WM_CLASS', 'STRING', b'xterm\0XTerm\0')
+        self.assertEquals(titles.get_title(self.top).wm_class, (u'xterm', u'XTerm'))
+        self.assertEquals(titles.get_title(self.bottom).name, None)
+
+    def test_monitors(self):
+        layout = MonitorLayout(self.display, backend=self.backend)
+        self.assertEquals(layout.monitor_at(Point(10, 10)).name, 'default')
+        self.backend.set_monitors([
+            ('left', Region.from_values(0, 0, 50, 100), True),
+            ('right', Region.from_values(50, 0, 50, 100), False)
+        ])
+        self.assertEquals(layout.monitor_at(Point(60, 10)).name, 'right')
+        self.assertEquals(layout.get_primary().name, 'left')
+
+    def set_window_list(self, window, name, windows):
+        self.backend.set_property(window, name, 'WINDOW', windows)
+
+    def test_ewmh_clients(self):
+        self.set_window_list(
+            FakeBackend.ROOT,
+            '_NET_CLIENT_LIST_STACKING',
+            [self.top, self.bottom]
+        )
+        clients = EwmhClients(self.display, backend=self.backend)
+        self.assertIsNone(clients.get_client_stacking())
+        check = self.backend.create_window(None, 0, 0, 1, 1)
+        self.set_window_list(FakeBackend.ROOT, '_NET_SUPPORTING_WM_CHECK', [check])
+        self.set_window_list(check, '_NET_SUPPORTING_WM_CHECK', [check])
+        self.backend.warp_pointer(20, 20)
+        self.assertEquals(clients.get_client_stacking(), [self.top, self.bottom])
+        self.assertEquals(clients.find_window_under_pointer().window.value, self.bottom)
+        menu = self.backend.create_window(None, 15, 15, 10, 10, override_redirect=True)
+        self.backend.set_mapped(menu, True)
+        self.assertEquals(clients.find_window_under_pointer().window.value, menu)
+        self.backend.destroy_window(check)
+        self.assertIsNone(clients.get_client_stacking())
+
+    def test_shm_capture(self):
+        self.backend.windows[self.top].pixel = 0x01020304
+        capture = ShmCapture(self.display, backend=self.backend)
+        window = PointerWindow(self.display, Window(self.top), backend=self.backend)
+        pixels = capture.capture_segment(window).as_memoryview()
+        self.assertEquals(len(pixels), 50 * 50 * 4)
+        self.assertEquals(bytearray(pixels[:4]), bytearray(b'\x04\x03\x02\x01'))
+
+    def test_shm_capture_clipped(self):
+        capture = ShmCapture(self.display, backend=self.backend)
+        window = PointerWindow(self.display, Window(self.top), backend=self.backend)
+        self.backend.configure_window(self.top, 70, -20, 50, 50)
+        segment = capture.capture_segment(window)
+        self.assertEquals((segment.width, segment.height), (30, 30))
+        self.backend.configure_window(self.top, 100, 0, 50, 50)
+        self.assertRaises(ShmError, capture.capture_segment, window)
+
+    def test_damage(self):
+        window = PointerWindow(self.display, Window(self.top), backend=self.backend)
+        tracker = DamageTracker(window)
+        self.assertEquals(tracker.refresh(), [Region.from_values(0, 0, 50, 50)])
+        self.assertEquals(tracker.refresh(), [])
+        self.backend.windows[self.top].pixel = 0xffffffff
+        self.backend.damage_window(self.top, Region.from_values(1, 0, 1, 1))
+        self.assertEquals(tracker.refresh(), [Region.from_values(1, 0, 1, 1)])
+        frame = tracker.segment.as_memoryview()
+        self.assertEquals(bytearray(frame[:8]), bytearray(b'\0' * 4 + b'\xff' * 4))
+        self.backend.set_mapped(self.top, False)
+        self.assertRaises(DamageError, tracker.refresh)
+        self.backend.set_mapped(self.top)
+        self.assertEquals(tracker.refresh(), [Region.from_values(0, 0, 50, 50)])
+        self.backend.destroy_window(self.top)
+        tracker.process_events()
+        self.assertTrue(tracker.destroyed)
@@ -0,0 +1,548 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import addressof, c_uint, cast, create_string_buffer, pointer, POINTER
+from threading import Thread
+from unittest import TestCase
+
+from mock import call, MagicMock, patch
+
+from wotw_xlib.backends import XLIB_BACKEND, XlibBackend
+from wotw_xlib.common import ChildWindows, NeedsDisplay
+from wotw_xlib.utils import Region
+from wotw_xlib.xlib import (
+    AllPlanes,
+    BadValue,
+    BadWindow,
+    PropertyChangeMask,
+    SubstructureNotifyMask,
+    Visual,
+    Window,
+    XA_WINDOW,
+    XErrorEvent,
+    XRectangle,
+    XWindowAttributes,
+    ZPixmap
+)
+from wotw_xlib.xext import ShapeInput, XFixesRegionNone, XRRMonitorInfo
+
+
+class XlibBackendTestCase(TestCase):
+    DISPLAY = 'a display'
+    WINDOW = 47
+
+    def setUp(self):
+        self.backend = XlibBackend()
+        for flag in ['threads_initialized', 'display_opened']:
+            flag_patcher = patch.object(XlibBackend, flag, False)
+            flag_patcher.start()
+            self.addCleanup(flag_patcher.stop)
+
+
+class DefaultUnitTests(XlibBackendTestCase):
+
+    def test_default_backend(self):
+        self.assertIs(NeedsDisplay.backend, XLIB_BACKEND)
+        self.assertIsInstance(XLIB_BACKEND, XlibBackend)
+
+
+class InitThreadsUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XInitThreads')
+    def test_called_once(self, mock_init):
+        self.backend.init_threads()
+        XlibBackend().init_threads()
+        mock_init.assert_called_once_with()
+        self.assertTrue(XlibBackend.threads_initialized)
+
+    @patch('wotw_xlib.backends.xlib_backend.XInitThreads')
+    def test_too_late(self, mock_init):
+        XlibBackend.display_opened = True
+        self.assertRaises(RuntimeError, self.backend.init_threads)
+        mock_init.assert_not_called()
+
+
+class DisplayUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XOpenDisplay')
+    def test_open(self, mock_open):
+        self.assertIs(self.backend.open_display(':1'), mock_open.return_value)
+        mock_open.assert_called_once_with(':1')
+        self.assertTrue(XlibBackend.display_opened)
+
+    @patch('wotw_xlib.backends.xlib_backend.XInitThreads')
+    @patch('wotw_xlib.backends.xlib_backend.XOpenDisplay')
+    def test_open_threaded(self, mock_open, mock_init):
+        backend = XlibBackend(threaded=True)
+        backend.open_display(':1')
+        backend.open_display(':1')
+        mock_init.assert_called_once_with()
+        self.assertEquals(mock_open.call_count, 2)
+
+    @patch('wotw_xlib.common.EventDispatcher.forget')
+    @patch('wotw_xlib.common.AtomRegistry.forget')
+    @patch('wotw_xlib.backends.xlib_backend.XCloseDisplay')
+    def test_close_forgets_atoms(self, mock_close, mock_forget, mock_events):
+        self.backend.close_display(self.DISPLAY)
+        mock_close.assert_called_once_with(self.DISPLAY)
+        mock_forget.assert_called_once_with(self.DISPLAY)
+        mock_events.assert_called_once_with(self.DISPLAY)
+
+    @patch('wotw_xlib.backends.xlib_backend.XDefaultScreen', return_value=2)
+    @patch('wotw_xlib.backends.xlib_backend.XRootWindow', return_value=1)
+    def test_root_discovery(self, mock_root, mock_screen):
+        mock_manager = MagicMock()
+        mock_manager.attach_mock(mock_root, 'XRootWindow')
+        mock_manager.attach_mock(mock_screen, 'XDefaultScreen')
+        self.assertEquals(self.backend.root_window(self.DISPLAY), 1)
+        mock_manager.assert_has_calls([
+            call.XDefaultScreen(self.DISPLAY),
+            call.XRootWindow(self.DISPLAY, 2)
+        ])
+
+
+class QueryPointerUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XQueryPointer')
+    def test_values_unwrapped(self, mock_query):
+
+        def fill(display, window, root, child, root_x, root_y, win_x, win_y, mask):
+            child._obj.value = 74
+            root_x._obj.value = 1
+            root_y._obj.value = 2
+            win_x._obj.value = 3
+            win_y._obj.value = 4
+        mock_query.side_effect = fill
+        self.assertEquals(
+            self.backend.query_pointer(self.DISPLAY, self.WINDOW),
+            (1, 2, 3, 4, 74)
+        )
+        self.assertEquals(mock_query.call_args[0][1], self.WINDOW)
+
+
+class GetGeometryUnitTests(XlibBackendTestCase):
+
+    PADDING = 10
+
+    @patch(
+        'wotw_xlib.backends.xlib_backend.c_uint',
+        return_value=c_uint(PADDING)
+    )
+    @patch('wotw_xlib.backends.xlib_backend.XGetGeometry')
+    def test_return_values(self, mock_get, mock_cuint):
+        self.assertEquals(
+            self.backend.get_geometry(self.DISPLAY, self.WINDOW),
+            (0, 0, self.PADDING, self.PADDING)
+        )
+        mock_get.assert_called_once()
+
+
+class GetWindowAttributesUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XGetWindowAttributes')
+    def test_return_attributes(self, mock_get):
+        result = self.backend.get_window_attributes(self.DISPLAY, self.WINDOW)
+        self.assertIsInstance(result, XWindowAttributes)
+        mock_get.assert_called_once()
+
+
+class SelectInputUnitTests(XlibBackendTestCase):
+
+    @patch(
+        'wotw_xlib.backends.XlibBackend.get_window_attributes',
+        return_value=XWindowAttributes(your_event_mask=PropertyChangeMask)
+    )
+    @patch('wotw_xlib.backends.xlib_backend.XSelectInput')
+    def test_existing_mask_kept(self, mock_select, mock_get):
+        self.backend.select_input(
+            self.DISPLAY,
+            self.WINDOW,
+            SubstructureNotifyMask
+        )
+        mock_get.assert_called_once_with(self.DISPLAY, self.WINDOW)
+        mock_select.assert_called_once_with(
+            self.DISPLAY,
+            self.WINDOW,
+            PropertyChangeMask | SubstructureNotifyMask
+        )
+
+
+class GetNamesUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XFree')
+    @patch('wotw_xlib.backends.xlib_backend.XGetWMIconName')
+    @patch('wotw_xlib.backends.xlib_backend.XFetchName')
+    def test_names_freed(self, mock_fetch, mock_get, mock_free):
+        name = create_string_buffer(b'name')
+        icon_name = create_string_buffer(b'icon')
+
+        def fetch_name(display, window, name_pointer):
+            name_pointer._obj.value = addressof(name)
+
+        def get_icon_name(display, window, props):
+            props._obj.value = addressof(icon_name)
+        mock_fetch.side_effect = fetch_name
+        mock_get.side_effect = get_icon_name
+        result = self.backend.get_names(self.DISPLAY, self.WINDOW)
+        self.assertEquals(result, [b'name', b'icon'])
+        self.assertEquals(
+            sorted([entry[0][0] for entry in mock_free.call_args_list]),
+            sorted([addressof(name), addressof(icon_name)])
+        )
+
+    @patch('wotw_xlib.backends.xlib_backend.XFree')
+    @patch('wotw_xlib.backends.xlib_backend.XGetWMIconName')
+    @patch('wotw_xlib.backends.xlib_backend.XFetchName')
+    def test_missing_names_not_freed(self, mock_fetch, mock_get, mock_free):
+        self.assertEquals(
+            self.backend.get_names(self.DISPLAY, self.WINDOW),
+            [None, None]
+        )
+        self.assertEquals(mock_free.call_count, 0)
+
+
+@patch('wotw_xlib.common.child_windows.XFree')
+@patch('wotw_xlib.backends.xlib_backend.XQueryTree')
+class QueryTreeUnitTests(XlibBackendTestCase):
+
+    NUMBER_CHILDREN = 10
+
+    def fill_children(self, mock_query):
+        buffer_to_return = (Window * self.NUMBER_CHILDREN)(
+            *range(0, self.NUMBER_CHILDREN)
+        )
+
+        def fill(display, window, root, parent, children, count):
+            pointer_type = type(children._obj)
+            children._obj.contents = cast(buffer_to_return, pointer_type).contents
+            count._obj.value = self.NUMBER_CHILDREN
+        mock_query.side_effect = fill
+        return buffer_to_return
+
+    def test_buffer_wrapped(self, mock_query, mock_free):
+        buffer_to_return = self.fill_children(mock_query)
+        with self.backend.child_windows(self.DISPLAY, self.WINDOW) as children:
+            self.assertIsInstance(children, ChildWindows)
+            self.assertEquals(list(children), list(buffer_to_return))
+        mock_free.assert_called_once()
+
+    def test_children_copied(self, mock_query, mock_free):
+        self.fill_children(mock_query)
+        self.assertEquals(
+            self.backend.query_tree(self.DISPLAY, self.WINDOW),
+            list(range(0, self.NUMBER_CHILDREN))
+        )
+        mock_free.assert_called_once()
+
+
+class SampleUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.common.QueryScratch')
+    def test_scratch_reused(self, mock_scratch):
+        self.assertIs(self.backend.get_scratch(), self.backend.get_scratch())
+        mock_scratch.assert_called_once_with()
+
+    @patch('wotw_xlib.common.QueryScratch', side_effect=MagicMock)
+    def test_scratch_per_thread(self, mock_scratch):
+        scratches = [self.backend.get_scratch()]
+        worker = Thread(
+            target=lambda: scratches.append(self.backend.get_scratch())
+        )
+        worker.start()
+        worker.join()
+        self.assertIsNot(scratches[0], scratches[1])
+
+    @patch('wotw_xlib.backends.XlibBackend.get_scratch')
+    def test_pointer(self, mock_scratch):
+        out = [0] * 4
+        self.backend.sample_pointer(self.DISPLAY, self.WINDOW, out)
+        mock_scratch.return_value.query_pointer.assert_called_once_with(
+            self.DISPLAY,
+            self.WINDOW,
+            out
+        )
+
+    @patch('wotw_xlib.backends.XlibBackend.get_scratch')
+    def test_geometry(self, mock_scratch):
+        self.backend.sample_geometry(self.DISPLAY, self.WINDOW)
+        mock_scratch.return_value.query_geometry.assert_called_once_with(
+            self.DISPLAY,
+            self.WINDOW,
+            None
+        )
+
+
+class SnapshotWindowsUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.common.WindowSnapshot.collect', return_value=['snapshots'])
+    def test_batched(self, mock_collect):
+        self.assertEquals(
+            self.backend.snapshot_windows(self.DISPLAY, [74, 147]),
+            ['snapshots']
+        )
+        mock_collect.assert_called_once_with(self.DISPLAY, [74, 147])
+
+
+class HandleErrorUnitTests(XlibBackendTestCase):
+
+    def test_vanished_windows_ignored(self):
+        error = XErrorEvent()
+        error.error_code = BadWindow
+        previous = MagicMock()
+        with patch.object(XlibBackend, 'previous_error_handler', previous):
+            result = XlibBackend.handle_error(None, MagicMock(contents=error))
+        self.assertEquals(result, 0)
+        self.assertEquals(previous.call_count, 0)
+
+    def test_other_errors_passed_along(self):
+        error = XErrorEvent()
+        error.error_code = BadValue
+        previous = MagicMock(return_value=1)
+        wrapped = MagicMock(contents=error)
+        with patch.object(XlibBackend, 'previous_error_handler', previous):
+            XlibBackend.handle_error('display', wrapped)
+        previous.assert_called_once_with('display', wrapped)
+
+    @patch.object(XlibBackend, 'error_handler_users', 0)
+    @patch.object(XlibBackend, 'error_handler', None)
+    @patch.object(XlibBackend, 'previous_error_handler', None)
+    @patch('wotw_xlib.backends.xlib_backend.XSetErrorHandler')
+    def test_installed_once(self, mock_set):
+        self.backend.ignore_vanished_windows()
+        XlibBackend().ignore_vanished_windows()
+        mock_set.assert_called_once_with(XlibBackend.error_handler)
+        self.assertIs(XlibBackend.previous_error_handler, mock_set.return_value)
+
+    @patch.object(XlibBackend, 'error_handler_users', 0)
+    @patch.object(XlibBackend, 'error_handler', None)
+    @patch.object(XlibBackend, 'previous_error_handler', None)
+    @patch('wotw_xlib.backends.xlib_backend.XSync')
+    @patch('wotw_xlib.backends.xlib_backend.XSetErrorHandler')
+    def test_restored_after_last_user(self, mock_set, mock_sync):
+        self.backend.ignore_vanished_windows()
+        self.backend.ignore_vanished_windows()
+        previous = mock_set.return_value
+        self.backend.stop_ignoring_vanished_windows(self.DISPLAY)
+        self.assertEquals(mock_set.call_count, 1)
+        self.assertIsNotNone(XlibBackend.error_handler)
+        self.backend.stop_ignoring_vanished_windows(self.DISPLAY)
+        mock_set.assert_called_with(previous)
+        self.assertEquals(mock_sync.call_args_list, [call(self.DISPLAY, False)] * 2)
+        self.assertIsNone(XlibBackend.error_handler)
+        self.assertIsNone(XlibBackend.previous_error_handler)
+
+    @patch.object(XlibBackend, 'error_handler_users', 0)
+    @patch('wotw_xlib.backends.xlib_backend.XSync')
+    @patch('wotw_xlib.backends.xlib_backend.XSetErrorHandler')
+    def test_unpaired_stop_ignored(self, mock_set, mock_sync):
+        self.backend.stop_ignoring_vanished_windows(self.DISPLAY)
+        mock_set.assert_not_called()
+        mock_sync.assert_not_called()
+
+
+@patch('wotw_xlib.backends.xlib_backend.XFree')
+@patch('wotw_xlib.backends.xlib_backend.XGetWindowProperty')
+class GetWindowListUnitTests(XlibBackendTestCase):
+
+    def fill_property(self, items, actual_type=XA_WINDOW):
+        self.items = (Window * len(items))(*items)
+
+        def get_property(display, window, atom, offset, length, delete,
+                         requested, type_return, format_return, items_return,
+                         after_return, value_return):
+            type_return._obj.value = actual_type
+            format_return._obj.value = 32
+            items_return._obj.value = len(items)
+            value_return._obj.value = addressof(self.items) if items else None
+            return 0
+        return get_property
+
+    def test_windows_copied(self, mock_get, mock_free):
+        mock_get.side_effect = self.fill_property([10, 20, 30])
+        self.assertEquals(
+            self.backend.get_window_list(self.DISPLAY, self.WINDOW, 300, 8),
+            [10, 20, 30]
+        )
+        self.assertEquals(mock_get.call_args[0][1:7], (self.WINDOW, 300, 0, 8, False, XA_WINDOW))
+        mock_free.assert_called_once_with(addressof(self.items))
+
+    def test_missing_property(self, mock_get, mock_free):
+        mock_get.side_effect = self.fill_property([], 0)
+        self.assertIsNone(
+            self.backend.get_window_list(self.DISPLAY, self.WINDOW, 300, 8)
+        )
+        self.assertEquals(mock_free.call_count, 0)
+
+    def test_empty_property(self, mock_get, mock_free):
+        mock_get.side_effect = self.fill_property([])
+        self.assertEquals(
+            self.backend.get_window_list(self.DISPLAY, self.WINDOW, 300, 8),
+            []
+        )
+
+
+class QueryExtensionUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.xext.XDamageQueryExtension')
+    def test_event_base(self, mock_query):
+
+        def query(display, event_base, error_base):
+            event_base._obj.value = 91
+            return 1
+        mock_query.side_effect = query
+        self.assertEquals(self.backend.query_extension(self.DISPLAY, 'DAMAGE'), 91)
+
+    @patch('wotw_xlib.xext.XRRQueryExtension', return_value=0)
+    def test_missing(self, mock_query):
+        self.assertIsNone(self.backend.query_extension(self.DISPLAY, 'RANDR'))
+
+    @patch('wotw_xlib.xext.XShmQueryExtension', return_value=1)
+    def test_shm(self, mock_query):
+        self.assertEquals(self.backend.query_extension(self.DISPLAY, 'MIT-SHM'), 0)
+        mock_query.return_value = 0
+        self.assertIsNone(self.backend.query_extension(self.DISPLAY, 'MIT-SHM'))
+
+
+@patch('wotw_xlib.backends.xlib_backend.XFree')
+@patch('wotw_xlib.xext.XShapeGetRectangles')
+class GetShapeRectanglesUnitTests(XlibBackendTestCase):
+
+    def test_copied_and_freed(self, mock_get, mock_free):
+        rectangles = (XRectangle * 2)(XRectangle(0, 0, 20, 20), XRectangle(5, 5, 1, 1))
+
+        def get_rectangles(display, window, kind, count, ordering):
+            count._obj.value = 2
+            return cast(rectangles, POINTER(XRectangle))
+        mock_get.side_effect = get_rectangles
+        self.assertEquals(
+            self.backend.get_shape_rectangles(self.DISPLAY, self.WINDOW, ShapeInput),
+            [Region.from_values(0, 0, 20, 20), Region.from_values(5, 5, 1, 1)]
+        )
+        self.assertEquals(mock_get.call_args[0][:3], (self.DISPLAY, self.WINDOW, ShapeInput))
+        mock_free.assert_called_once()
+
+    def test_empty_shape(self, mock_get, mock_free):
+        mock_get.return_value = POINTER(XRectangle)()
+        self.assertEquals(
+            self.backend.get_shape_rectangles(self.DISPLAY, self.WINDOW, ShapeInput),
+            []
+        )
+        mock_free.assert_not_called()
+
+
+@patch('wotw_xlib.xext.XRRFreeMonitors')
+@patch('wotw_xlib.xext.XRRGetMonitors')
+class GetMonitorsUnitTests(XlibBackendTestCase):
+
+    def test_copied_and_freed(self, mock_get, mock_free):
+        infos = (XRRMonitorInfo * 1)(
+            XRRMonitorInfo(name=300, x=1920, y=0, width=1280, height=1024, primary=1)
+        )
+
+        def get_monitors(display, window, get_active, count):
+            count._obj.value = 1
+            return infos
+        mock_get.side_effect = get_monitors
+        self.assertEquals(
+            self.backend.get_monitors(self.DISPLAY, self.WINDOW),
+            [(300, Region.from_values(1920, 0, 1280, 1024), True)]
+        )
+        mock_free.assert_called_once_with(infos)
+
+    def test_nothing_to_free(self, mock_get, mock_free):
+        mock_get.return_value = None
+        self.assertEquals(self.backend.get_monitors(self.DISPLAY, self.WINDOW), [])
+        mock_free.assert_not_called()
+
+
+@patch('wotw_xlib.backends.xlib_backend.XFree')
+@patch('wotw_xlib.xext.XFixesDestroyRegion')
+@patch('wotw_xlib.xext.XFixesFetchRegion')
+@patch('wotw_xlib.xext.XDamageSubtract')
+@patch('wotw_xlib.xext.XFixesCreateRegion', return_value=501)
+class CollectDamageUnitTests(XlibBackendTestCase):
+    DAMAGE = 500
+
+    def test_drained_into_regions(self, mock_create, mock_subtract, mock_fetch,
+                                  mock_destroy, mock_free):
+        rectangles = (XRectangle * 2)(XRectangle(0, 0, 10, 10), XRectangle(20, 20, 5, 5))
+
+        def fetch_region(display, region, count):
+            count._obj.value = 2
+            return cast(rectangles, POINTER(XRectangle))
+        mock_fetch.side_effect = fetch_region
+        self.assertEquals(
+            self.backend.collect_damage(self.DISPLAY, self.DAMAGE),
+            [Region.from_values(0, 0, 10, 10), Region.from_values(20, 20, 5, 5)]
+        )
+        mock_subtract.assert_called_once_with(
+            self.DISPLAY,
+            self.DAMAGE,
+            XFixesRegionNone,
+            501
+        )
+        mock_free.assert_called_once()
+        mock_destroy.assert_called_once_with(self.DISPLAY, 501)
+
+    def test_empty(self, mock_create, mock_subtract, mock_fetch, mock_destroy,
+                   mock_free):
+        mock_fetch.return_value = None
+        self.assertEquals(self.backend.collect_damage(self.DISPLAY, self.DAMAGE), [])
+        mock_free.assert_not_called()
+        mock_destroy.assert_called_once_with(self.DISPLAY, 501)
+
+
+class GetSubImageUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XGetSubImage')
+    def test_lands_in_place(self, mock_get):
+        image = MagicMock()
+        self.backend.get_sub_image(
+            self.DISPLAY,
+            self.WINDOW,
+            Region.from_values(10, 20, 5, 5),
+            image
+        )
+        mock_get.assert_called_once_with(
+            self.DISPLAY,
+            self.WINDOW,
+            10,
+            20,
+            5,
+            5,
+            AllPlanes,
+            ZPixmap,
+            image.image,
+            10,
+            20
+        )
+
+
+class TranslateCoordinatesUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XTranslateCoordinates')
+    def test_origin_translated(self, mock_translate):
+
+        def translate(display, window, destination, x, y, dest_x, dest_y, child):
+            dest_x._obj.value = 100
+            dest_y._obj.value = 200
+        mock_translate.side_effect = translate
+        self.assertEquals(
+            self.backend.translate_coordinates(self.DISPLAY, self.WINDOW, 1),
+            (100, 200)
+        )
+        self.assertEquals(mock_translate.call_args[0][:5], (self.DISPLAY, self.WINDOW, 1, 0, 0))
+
+
+class VisualIdUnitTests(XlibBackendTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XVisualIDFromVisual')
+    def test_read_off_the_visual(self, mock_visual_id):
+        visual = pointer(Visual())
+        self.assertIs(self.backend.visual_id(visual), mock_visual_id.return_value)
+        mock_visual_id.assert_called_once_with(visual)
+
+    @patch('wotw_xlib.backends.xlib_backend.XVisualIDFromVisual')
+    def test_null_visual(self, mock_visual_id):
+        self.assertIsNone(self.backend.visual_id(POINTER(Visual)()))
+        mock_visual_id.assert_not_called()
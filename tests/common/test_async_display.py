@@ -0,0 +1,249 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import addressof
+from unittest import skipIf, TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EventDispatcher, NeedsDisplay
+from wotw_xlib.xcb import GenericError, GetGeometryReply, QueryPointerReply
+from wotw_xlib.xlib import BadWindow, MapNotify, XEvent
+
+try:
+    import asyncio
+    from wotw_xlib.common import AsyncDisplay
+    from wotw_xlib.common.async_display import EventStream, XRequestError
+except ImportError:
+    asyncio = None
+
+
+@skipIf(asyncio is None, 'asyncio needs Python 3')
+class AsyncDisplayTestCase(TestCase):
+    ROOT_WINDOW = 1
+    FILE_DESCRIPTOR = 47
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.loop.add_reader = MagicMock()
+        self.loop.remove_reader = MagicMock()
+        patchers = [
+            patch.object(NeedsDisplay, 'open_display'),
+            patch('wotw_xlib.common.async_display.XGetXCBConnection'),
+            patch('wotw_xlib.common.async_display.XDefaultScreen'),
+            patch(
+                'wotw_xlib.common.async_display.XRootWindow',
+                return_value=self.ROOT_WINDOW
+            ),
+            patch(
+                'wotw_xlib.common.async_display.XConnectionNumber',
+                return_value=self.FILE_DESCRIPTOR
+            ),
+            patch('wotw_xlib.common.async_display.xcb_flush'),
+            patch('wotw_xlib.backends.xlib_backend.XPending', return_value=0),
+            patch('wotw_xlib.common.async_display.free'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.display = AsyncDisplay(loop=self.loop)
+        self.addCleanup(EventDispatcher.forget, self.display.display)
+        self.replies = {}
+
+    def poll_for_reply(self, connection, sequence, reply, error):
+        if sequence not in self.replies:
+            return 0
+        reply._obj.value = addressof(self.replies[sequence])
+        return 1
+
+    def run(self, result=None):
+        with patch(
+            'wotw_xlib.common.async_display.xcb_poll_for_reply',
+            side_effect=self.poll_for_reply
+        ):
+            super(AsyncDisplayTestCase, self).run(result)
+
+
+class ConstructorUnitTests(AsyncDisplayTestCase):
+
+    def test_reader_registered(self):
+        self.loop.add_reader.assert_called_once_with(
+            self.FILE_DESCRIPTOR,
+            self.display.on_readable
+        )
+        self.assertEquals(self.display.root_window, self.ROOT_WINDOW)
+
+    def test_handler_registered(self):
+        self.assertEquals(self.display.events.handlers, [self.display.handle_event])
+
+    def test_new_loop_outside_of_one(self):
+        loop = AsyncDisplay.find_loop()
+        self.addCleanup(loop.close)
+        self.assertIsInstance(loop, asyncio.AbstractEventLoop)
+        self.assertIsNot(loop, self.loop)
+
+    def test_running_loop_used(self):
+        found = []
+        self.loop.call_soon(lambda: found.append(AsyncDisplay.find_loop()))
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self.assertEquals(found, [self.loop])
+
+
+class QueryPointerUnitTests(AsyncDisplayTestCase):
+
+    @patch('wotw_xlib.common.async_display.xcb_query_pointer')
+    def test_reply_parsed(self, mock_query):
+        mock_query.return_value = MagicMock(sequence=7)
+        future = self.display.query_pointer()
+        mock_query.assert_called_once_with(self.display.connection, self.ROOT_WINDOW)
+        self.assertFalse(future.done())
+        reply = QueryPointerReply()
+        reply.root_x, reply.root_y, reply.child = 3, 4, 9
+        self.replies[7] = reply
+        self.display.on_readable()
+        root, _, child = future.result()
+        self.assertEquals(str(root), '(3,4)')
+        self.assertEquals(child, 9)
+        self.assertEquals(self.display.pending_replies, {})
+
+
+class GetRegionUnitTests(AsyncDisplayTestCase):
+
+    @patch('wotw_xlib.common.async_display.xcb_get_geometry')
+    def test_reply_parsed(self, mock_get):
+        mock_get.return_value = MagicMock(sequence=8)
+        future = self.display.get_region(5)
+        reply = GetGeometryReply()
+        reply.x, reply.y, reply.width, reply.height = 1, 2, 3, 4
+        self.replies[8] = reply
+        self.display.collect_replies()
+        self.assertEquals(str(future.result()), '(1,2)x(4,6)')
+
+
+class CollectRepliesUnitTests(AsyncDisplayTestCase):
+
+    def test_unanswered_requests_wait(self):
+        future = self.display.send(MagicMock(sequence=3), lambda address: None)
+        self.display.collect_replies()
+        self.assertFalse(future.done())
+        self.assertIn(3, self.display.pending_replies)
+
+    def test_errors_raised(self):
+        future = self.display.send(MagicMock(sequence=3), lambda address: None)
+        error = GenericError()
+        error.error_code = BadWindow
+
+        def poll_error(connection, sequence, reply, error_pointer):
+            error_pointer._obj.contents = error
+            return 1
+        with patch(
+            'wotw_xlib.common.async_display.xcb_poll_for_reply',
+            side_effect=poll_error
+        ):
+            self.display.collect_replies()
+        with self.assertRaises(XRequestError) as context:
+            future.result()
+        self.assertEquals(context.exception.error_code, BadWindow)
+        self.assertEquals(context.exception.sequence, 3)
+
+
+class OnReadableUnitTests(AsyncDisplayTestCase):
+
+    def test_reply_read_while_draining(self):
+        future = self.display.send(MagicMock(sequence=3), lambda address: 'parsed')
+
+        def drain_events():
+            self.replies[3] = GetGeometryReply()
+        with patch.object(self.display, 'process_events', side_effect=drain_events):
+            self.display.on_readable()
+        self.assertEquals(future.result(), 'parsed')
+        self.assertEquals(self.display.pending_replies, {})
+
+    def test_reply_collected_after_send(self):
+        future = self.display.send(MagicMock(sequence=3), lambda address: 'parsed')
+        self.replies[3] = GetGeometryReply()
+        self.assertEquals(self.loop.run_until_complete(future), 'parsed')
+
+
+class FindWindowUnderPointerUnitTests(AsyncDisplayTestCase):
+
+    def test_descends_through_children(self):
+        children = {self.ROOT_WINDOW: 10, 10: 20, 20: 0}
+
+        def query_pointer(window=None):
+            future = self.loop.create_future()
+            future.set_result([None, None, children[window]])
+            return future
+        self.display.query_pointer = query_pointer
+        future = self.display.find_window_under_pointer()
+        self.assertEquals(self.loop.run_until_complete(future), 20)
+
+
+class EventsUnitTests(AsyncDisplayTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XNextEvent')
+    @patch('wotw_xlib.backends.xlib_backend.XPending', side_effect=[1, 0])
+    def test_events_streamed(self, mock_pending, mock_next):
+        stream = self.display.open_event_stream()
+        other = MagicMock()
+        self.display.events.register(other)
+        self.display.events.event.type = MapNotify
+        self.display.on_readable()
+        event = self.loop.run_until_complete(stream.__anext__())
+        self.assertIsInstance(event, XEvent)
+        self.assertEquals(event.type, MapNotify)
+        self.assertIsNot(event, self.display.events.event)
+        other.assert_called_once_with(self.display.events.event)
+
+    @patch('wotw_xlib.common.async_display.XFlush')
+    def test_close_ends_streams(self, mock_flush):
+        stream = self.display.open_event_stream()
+        pending = self.display.send(MagicMock(sequence=1), lambda address: None)
+        self.display.close_display()
+        self.assertTrue(pending.cancelled())
+        self.assertEquals(EventDispatcher.for_display(self.display.display).handlers, [])
+        with self.assertRaises(StopAsyncIteration):
+            self.loop.run_until_complete(stream.__anext__())
+
+
+@skipIf(asyncio is None, 'asyncio needs Python 3')
+class EventStreamUnitTests(TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_waiter_woken(self):
+        stream = EventStream(self.loop)
+        future = stream.__anext__()
+        self.assertFalse(future.done())
+        stream.push('event')
+        self.assertEquals(future.result(), 'event')
+
+    def test_oldest_dropped_past_the_bound(self):
+        stream = EventStream(self.loop, 2)
+        for event in ['first', 'second', 'third']:
+            stream.push(event)
+        self.assertEquals(list(stream.buffered), ['second', 'third'])
+        self.assertEquals(stream.dropped, 1)
+
+    def test_async_for(self):
+        stream = EventStream(self.loop)
+        for event in ['first', 'second']:
+            stream.push(event)
+        stream.close()
+        collected = []
+
+        def consume():
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    collected.append(
+                        self.loop.run_until_complete(iterator.__anext__())
+                    )
+                except StopAsyncIteration:
+                    return
+        consume()
+        self.assertEquals(collected, ['first', 'second'])
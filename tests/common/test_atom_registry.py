@@ -0,0 +1,108 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import addressof, create_string_buffer, POINTER
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import AtomRegistry
+from wotw_xlib.xlib import AtomNone, Display
+
+
+class AtomRegistryTestCase(TestCase):
+    KNOWN_ATOMS = ['WM_NAME', '_NET_WM_NAME']
+    ATOMS = {
+        b'WM_NAME': 39,
+        b'_NET_WM_NAME': 300,
+        b'_NET_WM_STATE': 301,
+        b'UTF8_STRING': 302
+    }
+
+    def setUp(self):
+        self.display = MagicMock()
+        self.registry = AtomRegistry(self.display, self.KNOWN_ATOMS)
+        intern_patcher = patch(
+            'wotw_xlib.backends.xlib_backend.XInternAtoms',
+            side_effect=self.fake_intern
+        )
+        self.mock_intern = intern_patcher.start()
+        self.addCleanup(intern_patcher.stop)
+
+    def fake_intern(self, display, names, count, only_if_exists, atoms):
+        for index in range(count):
+            atoms[index] = self.ATOMS.get(names[index], AtomNone)
+        return 1
+
+
+class InternUnitTests(AtomRegistryTestCase):
+
+    def test_known_atoms_batched(self):
+        self.assertEquals(self.registry['WM_NAME'], 39)
+        self.assertEquals(self.registry['_NET_WM_NAME'], 300)
+        self.mock_intern.assert_called_once()
+        self.assertEquals(self.mock_intern.call_args[0][2], 2)
+
+    def test_unknown_atoms_join_batch(self):
+        self.registry.request('_NET_WM_STATE')
+        self.assertEquals(
+            self.registry.intern('UTF8_STRING', 'WM_NAME'),
+            [302, 39]
+        )
+        self.mock_intern.assert_called_once()
+        self.assertIn('_NET_WM_STATE', self.registry)
+
+    def test_resolved_atoms_skip_server(self):
+        self.registry['WM_NAME']
+        self.registry['WM_NAME']
+        self.registry.intern(*self.KNOWN_ATOMS)
+        self.mock_intern.assert_called_once()
+
+    def test_missing_atom(self):
+        self.assertEquals(self.registry['NOPE'], AtomNone)
+        self.assertNotIn('NOPE', self.registry)
+
+    def test_names_memoized(self):
+        self.registry['WM_NAME']
+        self.assertEquals(self.registry.get_name(39), 'WM_NAME')
+
+
+class GetNamesUnitTests(AtomRegistryTestCase):
+
+    @patch('wotw_xlib.backends.xlib_backend.XFree')
+    @patch('wotw_xlib.backends.xlib_backend.XGetAtomNames')
+    def test_unknown_atoms_fetched_once(self, mock_get, mock_free):
+        raw_names = [create_string_buffer(b'FIRST'), create_string_buffer(b'SECOND')]
+
+        def fill_names(display, atoms, count, names_return):
+            for index in range(count):
+                names_return[index] = addressof(raw_names[index])
+            return 1
+        mock_get.side_effect = fill_names
+        self.assertEquals(
+            self.registry.get_names(401, 400, AtomNone),
+            ['SECOND', 'FIRST', None]
+        )
+        self.assertEquals(self.registry.get_names(400, 401), ['FIRST', 'SECOND'])
+        mock_get.assert_called_once()
+        self.assertEquals(mock_free.call_count, 2)
+        self.assertEquals(self.registry['FIRST'], 400)
+
+
+class ForDisplayUnitTests(TestCase):
+
+    def tearDown(self):
+        AtomRegistry.registries.clear()
+
+    def test_shared_per_display(self):
+        display = POINTER(Display)()
+        self.assertIs(
+            AtomRegistry.for_display(display),
+            AtomRegistry.for_display(POINTER(Display)())
+        )
+
+    def test_forget(self):
+        display = MagicMock()
+        registry = AtomRegistry.for_display(display)
+        AtomRegistry.forget(display)
+        self.assertIsNot(AtomRegistry.for_display(display), registry)
@@ -0,0 +1,155 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from json import load
+from os import close, remove
+from sys import modules
+from tempfile import mkstemp
+from types import ModuleType
+from unittest import TestCase
+
+import wotw_xlib.backends.xlib_backend as xlib_backend
+import wotw_xlib.xlib as xlib
+from wotw_xlib.common import BindingStats, NeedsDisplay
+from wotw_xlib.common.binding_stats import BindingRecord
+from wotw_xlib.xext import functions as xext_functions
+from wotw_xlib.xlib import functions
+
+
+class FakeWindow(NeedsDisplay):
+
+    def __init__(self, binding):
+        super(FakeWindow, self).__init__(None)
+        self.binding = binding
+
+    def open_display(self, display_to_open):
+        return None
+
+    def get_region(self):
+        return self.binding(1, 2)
+
+
+class BindingStatsTestCase(TestCase):
+
+    def setUp(self):
+        self.stats = BindingStats()
+        self.addCleanup(self.stats.disable)
+
+
+class BindingRecordUnitTests(TestCase):
+
+    def test_histogram_buckets(self):
+        record = BindingRecord('XSync', True)
+        record.record(0.0000005, 'a')
+        record.record(0.000003, 'a')
+        record.record(0.0000035, 'b')
+        result = record.as_dict()
+        self.assertEquals(result['calls'], 3)
+        self.assertEquals(result['histogram_us'], {1: 1, 4: 2})
+        self.assertEquals(result['callers'], {'a': 2, 'b': 1})
+
+
+class EnableUnitTests(BindingStatsTestCase):
+
+    def test_bindings_swapped_everywhere(self):
+        original = xlib_backend.XQueryPointer
+        self.stats.enable()
+        self.assertIsNot(xlib_backend.XQueryPointer, original)
+        self.assertIs(xlib_backend.XQueryPointer.binding, original)
+        self.assertIs(
+            functions.XQueryPointer,
+            xlib_backend.XQueryPointer
+        )
+
+    def test_disabled_bindings_untouched(self):
+        original = xlib_backend.XQueryPointer
+        self.stats.enable()
+        self.stats.disable()
+        self.assertIs(xlib_backend.XQueryPointer, original)
+        self.assertIs(functions.XQueryPointer, original)
+        self.assertFalse(self.stats.enabled)
+
+    def test_context_manager(self):
+        original = functions.XSync
+        with self.stats:
+            self.assertTrue(self.stats.enabled)
+        self.assertIs(functions.XSync, original)
+
+    def test_extensions_swapped(self):
+        original = xext_functions.XShapeGetRectangles
+        self.stats.enable()
+        self.assertIs(xext_functions.XShapeGetRectangles.binding, original)
+        self.stats.disable()
+        self.assertIs(xext_functions.XShapeGetRectangles, original)
+
+    def test_resolved_while_enabled(self):
+        original = functions.XSync
+        vars(xlib).pop('XSync', None)
+        self.stats.enable()
+        self.assertIs(xlib.XSync.binding, original)
+        self.stats.disable()
+        self.assertIs(xlib.XSync, original)
+
+    def test_imported_while_enabled(self):
+        original = functions.XSync
+        late = ModuleType('wotw_xlib.late')
+        modules[late.__name__] = late
+        self.addCleanup(modules.pop, late.__name__)
+        self.stats.enable()
+        late.XSync = functions.XSync
+        self.assertIsNot(late.XSync, original)
+        self.stats.disable()
+        self.assertIs(late.XSync, original)
+
+    def test_enable_twice(self):
+        original = functions.XSync
+        self.stats.enable()
+        self.stats.enable()
+        self.stats.disable()
+        self.assertIs(functions.XSync, original)
+
+
+class RecordUnitTests(BindingStatsTestCase):
+
+    def setUp(self):
+        super(RecordUnitTests, self).setUp()
+        self.calls = []
+        self.wrapped = self.stats.wrap(
+            'XGetGeometry',
+            lambda *args: self.calls.append(args) or 47
+        )
+
+    def test_passes_through(self):
+        self.assertEquals(self.wrapped(1, 2), 47)
+        self.assertEquals(self.calls, [(1, 2)])
+
+    def test_caller_recorded(self):
+        FakeWindow(self.wrapped).get_region()
+        self.wrapped()
+        result = self.stats.stats()['XGetGeometry']
+        self.assertEquals(result['calls'], 2)
+        self.assertTrue(result['round_trip'])
+        self.assertEquals(
+            result['callers'],
+            {'FakeWindow.get_region': 1, 'unattributed': 1}
+        )
+        self.assertEquals(
+            self.stats.round_trips_by_caller(),
+            {'FakeWindow.get_region': 1, 'unattributed': 1}
+        )
+
+    def test_reset(self):
+        self.wrapped()
+        self.stats.reset()
+        self.assertEquals(self.stats.stats(), {})
+
+    def test_export(self):
+        self.wrapped()
+        handle, path = mkstemp()
+        close(handle)
+        self.addCleanup(remove, path)
+        self.stats.export(path)
+        with open(path) as exported:
+            result = load(exported)
+        self.assertEquals(result['bindings']['XGetGeometry']['calls'], 1)
+        self.assertEquals(result['round_trips_by_caller'], {'unattributed': 1})
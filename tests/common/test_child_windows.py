@@ -0,0 +1,84 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import cast, POINTER
+from unittest import skipIf, TestCase
+
+from mock import patch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from wotw_xlib.common import ChildWindows
+from wotw_xlib.xlib import Window
+
+
+class ChildWindowsTestCase(TestCase):
+    CHILDREN = [7, 8, 9]
+
+    def setUp(self):
+        self.buffer = (Window * len(self.CHILDREN))(*self.CHILDREN)
+        free_patcher = patch('wotw_xlib.common.child_windows.XFree')
+        self.mock_free = free_patcher.start()
+        self.addCleanup(free_patcher.stop)
+        self.children = ChildWindows(
+            cast(self.buffer, POINTER(Window)),
+            len(self.CHILDREN)
+        )
+        # Release before XFree is unpatched; the buffer belongs to Python
+        self.addCleanup(self.children.free)
+
+
+class ConstructorUnitTests(ChildWindowsTestCase):
+
+    def test_null_pointer(self):
+        children = ChildWindows(POINTER(Window)(), 4)
+        self.assertEquals(len(children), 0)
+        self.assertEquals(list(children), [])
+
+    def test_no_copy(self):
+        self.buffer[1] = 47
+        self.assertEquals(self.children[1], 47)
+
+
+class AccessUnitTests(ChildWindowsTestCase):
+
+    def test_iteration(self):
+        self.assertEquals(list(self.children), self.CHILDREN)
+        self.assertEquals(len(self.children), len(self.CHILDREN))
+
+    def test_memoryview(self):
+        view = self.children.as_memoryview()
+        self.assertEquals(view.tobytes(), bytes(bytearray(self.buffer)))
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        self.assertEquals(self.children.as_numpy().tolist(), self.CHILDREN)
+
+    @patch('wotw_xlib.common.child_windows.numpy', None)
+    def test_numpy_missing(self):
+        self.assertRaises(ImportError, self.children.as_numpy)
+
+
+class FreeUnitTests(ChildWindowsTestCase):
+
+    def test_context_frees(self):
+        with self.children as children:
+            self.assertEquals(list(children), self.CHILDREN)
+        self.mock_free.assert_called_once()
+        self.assertEquals(len(self.children), 0)
+
+    def test_free_once(self):
+        self.children.free()
+        self.children.free()
+        self.mock_free.assert_called_once()
+
+
+class FromSequenceUnitTests(ChildWindowsTestCase):
+
+    def test_never_freed(self):
+        with ChildWindows.from_sequence(self.CHILDREN) as children:
+            self.assertEquals(list(children), self.CHILDREN)
+        self.assertEquals(self.mock_free.call_count, 0)
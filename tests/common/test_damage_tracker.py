@@ -0,0 +1,335 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import pointer
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import DamageError, DamageTracker, EventDispatcher
+from wotw_xlib.utils import Region
+from wotw_xlib.xlib import (
+    ConfigureNotify,
+    DestroyNotify,
+    Display,
+    IsUnmapped,
+    IsViewable,
+    MapNotify,
+    StructureNotifyMask,
+    UnmapNotify,
+    Window,
+    XEvent,
+    XWindowAttributes
+)
+
+
+class DamageTrackerTestCase(TestCase):
+    EVENT_BASE = 91
+    DAMAGE = 500
+
+    def setUp(self):
+        self.window = MagicMock()
+        self.window.display = Display()
+        self.window.window = Window(47)
+        self.window.window_attributes = XWindowAttributes(
+            width=100,
+            height=50,
+            depth=24,
+            map_state=IsViewable
+        )
+        self.available = True
+        self.rectangles = []
+        self.pending = []
+        self.backend = self.window.backend
+        self.backend.query_extension.side_effect = self.query_extension
+        self.backend.create_damage.return_value = self.DAMAGE
+        self.backend.collect_damage.side_effect = self.collect_damage
+        self.backend.create_image.side_effect = self.build_segment
+        self.backend.pending_events.side_effect = lambda display: len(self.pending)
+        self.backend.next_event.side_effect = self.next_event
+        self.addCleanup(EventDispatcher.forget, self.window.display)
+        self.tracker = DamageTracker(self.window)
+
+    def query_extension(self, display, name):
+        return self.EVENT_BASE if self.available else None
+
+    def collect_damage(self, display, damage):
+        return [Region.from_values(*rectangle) for rectangle in self.rectangles]
+
+    def next_event(self, display, event):
+        pointer(event)[0] = self.pending.pop(0)
+
+    def build_event(self, event_type, window=47):
+        event = XEvent()
+        event.type = event_type
+        member = {
+            ConfigureNotify: 'xconfigure',
+            DestroyNotify: 'xdestroywindow',
+            MapNotify: 'xmap',
+            UnmapNotify: 'xunmap'
+        }.get(event_type, 'xany')
+        getattr(event, member).window = window
+        return event
+
+    @staticmethod
+    def build_segment(display, width, height, depth, visual):
+        segment = MagicMock()
+        segment.width = width
+        segment.height = height
+        segment.depth = depth
+        return segment
+
+
+class StartUnitTests(DamageTrackerTestCase):
+
+    def test_creates_everything_once(self):
+        self.tracker.start()
+        self.tracker.start()
+        self.backend.create_damage.assert_called_once_with(
+            self.window.display,
+            47
+        )
+        self.window.backend.select_input.assert_called_once_with(
+            self.window.display,
+            47,
+            StructureNotifyMask
+        )
+        self.assertEquals(self.tracker.damage_event, self.EVENT_BASE)
+
+    def test_missing_extension(self):
+        self.available = False
+        self.assertRaises(DamageError, self.tracker.start)
+
+
+class StopUnitTests(DamageTrackerTestCase):
+
+    def test_destroys_everything(self):
+        self.tracker.refresh()
+        segment = self.tracker.segment
+        self.tracker.stop()
+        self.tracker.stop()
+        self.backend.destroy_damage.assert_called_once_with(
+            self.window.display,
+            self.DAMAGE
+        )
+        segment.release.assert_called_once_with()
+        self.assertTrue(self.tracker.needs_full_grab)
+        self.assertEquals(self.tracker.events.handlers, [])
+
+    @patch('wotw_xlib.common.NeedsDisplay.close_display')
+    def test_close_display(self, mock_close):
+        self.tracker.refresh()
+        self.tracker.close_display()
+        self.backend.destroy_damage.assert_called_once()
+        mock_close.assert_called_once_with()
+
+
+class EventUnitTests(DamageTrackerTestCase):
+
+    def test_events_shared(self):
+        self.tracker.start()
+        self.tracker.dirty = False
+        other = MagicMock()
+        self.tracker.events.register(other)
+        self.pending = [self.build_event(self.EVENT_BASE)]
+        self.tracker.process_events()
+        self.assertTrue(self.tracker.dirty)
+        other.assert_called_once()
+        self.assertEquals(self.pending, [])
+
+    def test_other_windows_ignored(self):
+        self.tracker.start()
+        self.tracker.dirty = False
+        self.pending = [
+            self.build_event(event_type, 48)
+            for event_type in [self.EVENT_BASE, ConfigureNotify, DestroyNotify]
+        ]
+        self.tracker.process_events()
+        self.assertFalse(self.tracker.dirty)
+        self.window.invalidate.assert_not_called()
+        self.assertFalse(self.tracker.destroyed)
+
+    def test_damage_marks_dirty(self):
+        self.tracker.start()
+        self.tracker.dirty = False
+        self.tracker.handle_event(self.build_event(self.EVENT_BASE))
+        self.assertTrue(self.tracker.dirty)
+
+    def test_configure_invalidates_the_window(self):
+        self.tracker.start()
+        self.tracker.handle_event(self.build_event(ConfigureNotify))
+        self.window.invalidate.assert_called_once_with(
+            'window_attributes',
+            'region'
+        )
+
+    def test_destroy_drops_the_damage(self):
+        self.tracker.start()
+        self.tracker.handle_event(self.build_event(DestroyNotify))
+        self.tracker.stop()
+        self.backend.destroy_damage.assert_not_called()
+
+    def test_refresh_fails_once_destroyed(self):
+        self.tracker.refresh()
+        self.tracker.handle_event(self.build_event(DestroyNotify))
+        self.assertRaises(DamageError, self.tracker.refresh)
+        self.assertEquals(self.backend.create_damage.call_count, 1)
+
+    def test_destroy_noticed_during_refresh(self):
+        self.tracker.refresh()
+        self.pending = [self.build_event(DestroyNotify)]
+        collected = self.backend.collect_damage.call_count
+        self.assertRaises(DamageError, self.tracker.refresh)
+        self.assertEquals(self.backend.collect_damage.call_count, collected)
+
+
+class CollectDamageUnitTests(DamageTrackerTestCase):
+
+    def test_drains_into_regions(self):
+        self.tracker.start()
+        self.rectangles = [(0, 0, 10, 10), (20, 20, 5, 5)]
+        self.assertEquals(
+            self.tracker.collect_damage(),
+            [Region.from_values(0, 0, 10, 10), Region.from_values(20, 20, 5, 5)]
+        )
+        self.backend.collect_damage.assert_called_once_with(
+            self.window.display,
+            self.DAMAGE
+        )
+        self.assertFalse(self.tracker.dirty)
+
+    def test_skipped_when_clean(self):
+        self.tracker.dirty = False
+        self.assertEquals(self.tracker.collect_damage(), [])
+        self.backend.collect_damage.assert_not_called()
+
+    def test_empty(self):
+        self.tracker.start()
+        self.assertEquals(self.tracker.collect_damage(), [])
+
+
+class CoalesceUnitTests(DamageTrackerTestCase):
+
+    def test_neighbouring_bands_merge(self):
+        self.assertEquals(
+            DamageTracker.coalesce([
+                Region.from_values(0, 2, 10, 2),
+                Region.from_values(0, 0, 10, 2),
+                Region.from_values(1, 4, 9, 2)
+            ]),
+            [Region.from_values(0, 0, 10, 6)]
+        )
+
+    def test_distant_regions_stay_apart(self):
+        regions = [
+            Region.from_values(0, 0, 5, 5),
+            Region.from_values(90, 40, 5, 5)
+        ]
+        self.assertEquals(DamageTracker.coalesce(regions), regions)
+
+    def test_too_many_boxes(self):
+        self.assertIsNone(DamageTracker.coalesce([
+            Region.from_values(index * 20, 0, 1, 1)
+            for index in range(DamageTracker.MAX_BOXES + 1)
+        ]))
+        self.assertEquals(
+            len(DamageTracker.coalesce([
+                Region.from_values(index * 20, 0, 1, 1)
+                for index in range(DamageTracker.MAX_BOXES)
+            ])),
+            DamageTracker.MAX_BOXES
+        )
+
+
+class RefreshUnitTests(DamageTrackerTestCase):
+
+    def test_first_refresh_grabs_everything(self):
+        self.assertEquals(
+            self.tracker.refresh(),
+            [Region.from_values(0, 0, 100, 50)]
+        )
+        self.tracker.segment.capture.assert_called_once_with(47)
+        self.backend.get_sub_image.assert_not_called()
+
+    def test_only_damage_is_grabbed(self):
+        self.tracker.refresh()
+        self.tracker.dirty = True
+        self.rectangles = [(10, 20, 5, 5), (90, 40, 20, 20)]
+        self.assertEquals(
+            self.tracker.refresh(),
+            [Region.from_values(10, 20, 5, 5), Region.from_values(90, 40, 10, 10)]
+        )
+        self.tracker.segment.capture.assert_called_once()
+        self.backend.get_sub_image.assert_any_call(
+            self.window.display,
+            47,
+            Region.from_values(10, 20, 5, 5),
+            self.tracker.segment
+        )
+
+    def test_scattered_damage_grabs_everything(self):
+        self.tracker.refresh()
+        self.tracker.dirty = True
+        self.rectangles = [
+            (index * 12, (index % 2) * 40, 2, 2)
+            for index in range(DamageTracker.MAX_BOXES + 1)
+        ]
+        self.assertEquals(self.tracker.refresh(), [Region.from_values(0, 0, 100, 50)])
+        self.assertEquals(self.tracker.segment.capture.call_count, 2)
+        self.backend.get_sub_image.assert_not_called()
+
+    def test_most_of_the_window_grabs_everything(self):
+        self.tracker.refresh()
+        self.tracker.dirty = True
+        self.rectangles = [(0, 0, 100, 30)]
+        self.assertEquals(self.tracker.refresh(), [Region.from_values(0, 0, 100, 50)])
+        self.backend.get_sub_image.assert_not_called()
+
+    def test_unviewable_window(self):
+        self.tracker.refresh()
+        self.window.window_attributes.map_state = IsUnmapped
+        self.assertRaises(DamageError, self.tracker.refresh)
+
+    def test_unmap_invalidates_and_map_starts_over(self):
+        self.tracker.refresh()
+        self.tracker.handle_event(self.build_event(UnmapNotify))
+        self.window.invalidate.assert_called_once_with('window_attributes', 'region')
+        self.tracker.handle_event(self.build_event(MapNotify))
+        self.assertTrue(self.tracker.needs_full_grab)
+        self.tracker.handle_event(self.build_event(MapNotify, 48))
+        self.assertEquals(self.window.invalidate.call_count, 2)
+
+    def test_clean_refresh_grabs_nothing(self):
+        self.tracker.refresh()
+        self.assertEquals(self.tracker.refresh(), [])
+        self.backend.collect_damage.assert_called_once()
+
+    def test_resize_grabs_everything(self):
+        self.tracker.refresh()
+        first = self.tracker.segment
+        self.window.window_attributes = XWindowAttributes(
+            width=200,
+            height=50,
+            depth=24,
+            map_state=IsViewable
+        )
+        self.assertEquals(
+            self.tracker.refresh(),
+            [Region.from_values(0, 0, 200, 50)]
+        )
+        first.release.assert_called_once_with()
+        self.assertIsNot(self.tracker.segment, first)
+
+
+class FrameUnitTests(DamageTrackerTestCase):
+
+    def test_nothing_before_refresh(self):
+        self.assertIsNone(self.tracker.frame)
+
+    @patch('wotw_xlib.common.damage_tracker.numpy', new=None)
+    def test_memoryview(self):
+        self.tracker.refresh()
+        self.assertIs(
+            self.tracker.frame,
+            self.tracker.segment.as_memoryview.return_value
+        )
@@ -0,0 +1,130 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import c_char_p
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.backends import XLIB_BACKEND
+from wotw_xlib.common import DisplayPool
+
+
+class DisplayPoolTestCase(TestCase):
+    DISPLAY_NAME = ':47.0'
+    IDLE_TIMEOUT = 10
+    MAX_IDLE = 2
+
+    def setUp(self):
+        backend = MagicMock()
+        backend.open_display.side_effect = lambda name: MagicMock(name=str(name))
+        self.pool = DisplayPool(self.IDLE_TIMEOUT, self.MAX_IDLE, backend)
+        self.mock_open = backend.open_display
+        self.mock_close = backend.close_display
+
+
+class ConstructorUnitTests(DisplayPoolTestCase):
+
+    def test_libx11_by_default(self):
+        self.assertIs(DisplayPool().backend, XLIB_BACKEND)
+
+
+class ParseDisplayNameUnitTests(DisplayPoolTestCase):
+
+    def test_unwraps_ctypes(self):
+        self.assertEquals(
+            DisplayPool.parse_display_name(c_char_p(self.DISPLAY_NAME)),
+            self.DISPLAY_NAME
+        )
+
+    def test_passes_everything_else(self):
+        self.assertIsNone(DisplayPool.parse_display_name(None))
+        self.assertEquals(
+            DisplayPool.parse_display_name(self.DISPLAY_NAME),
+            self.DISPLAY_NAME
+        )
+
+
+class LeaseUnitTests(DisplayPoolTestCase):
+
+    def test_connection_shared(self):
+        first = self.pool.lease(self.DISPLAY_NAME)
+        second = self.pool.lease(c_char_p(self.DISPLAY_NAME))
+        self.assertIs(first, second)
+        self.mock_open.assert_called_once_with(self.DISPLAY_NAME)
+        self.assertEquals(self.pool.connections[self.DISPLAY_NAME].references, 2)
+
+    def test_names_kept_apart(self):
+        self.pool.lease(self.DISPLAY_NAME)
+        self.pool.lease(None)
+        self.assertEquals(len(self.pool), 2)
+
+    def test_failures_not_pooled(self):
+        self.mock_open.side_effect = None
+        self.mock_open.return_value = None
+        self.assertIsNone(self.pool.lease(self.DISPLAY_NAME))
+        self.assertEquals(len(self.pool), 0)
+
+
+class ReleaseUnitTests(DisplayPoolTestCase):
+
+    def test_idles_after_last_release(self):
+        first = self.pool.lease(self.DISPLAY_NAME)
+        self.pool.lease(self.DISPLAY_NAME)
+        self.pool.release(first)
+        self.assertIsNone(self.pool.connections[self.DISPLAY_NAME].released_at)
+        self.pool.release(first)
+        self.assertIsNotNone(self.pool.connections[self.DISPLAY_NAME].released_at)
+        self.assertEquals(self.mock_close.call_count, 0)
+
+    def test_idle_connection_reused(self):
+        first = self.pool.lease(self.DISPLAY_NAME)
+        self.pool.release(first)
+        self.assertIs(self.pool.lease(self.DISPLAY_NAME), first)
+        self.mock_open.assert_called_once_with(self.DISPLAY_NAME)
+
+    def test_unknown_display_ignored(self):
+        self.pool.release(MagicMock())
+        self.assertEquals(self.mock_close.call_count, 0)
+
+
+class PruneUnitTests(DisplayPoolTestCase):
+
+    @patch('wotw_xlib.common.display_pool.time_now', return_value=100)
+    def test_timeout(self, mock_now):
+        display = self.pool.lease(self.DISPLAY_NAME)
+        self.pool.release(display)
+        self.pool.prune(100 + self.IDLE_TIMEOUT + 1)
+        self.mock_close.assert_called_once_with(display)
+        self.assertEquals(len(self.pool), 0)
+
+    @patch('wotw_xlib.common.display_pool.time_now')
+    def test_max_idle(self, mock_now):
+        names = [':1', ':2', ':3']
+        displays = [self.pool.lease(name) for name in names]
+        for index, display in enumerate(displays):
+            mock_now.return_value = index
+            self.pool.release(display)
+        self.mock_close.assert_called_once_with(displays[0])
+        self.assertEquals(sorted(self.pool.connections.keys()), names[1:])
+
+    def test_max_idle_ignores_leased(self):
+        for name in [':1', ':2', ':3']:
+            self.pool.lease(name)
+        self.assertEquals(self.mock_close.call_count, 0)
+        self.assertEquals(len(self.pool), 3)
+
+    def test_leased_never_closed(self):
+        self.pool.lease(self.DISPLAY_NAME)
+        self.pool.prune(10 ** 10)
+        self.assertEquals(self.mock_close.call_count, 0)
+
+
+class CloseAllUnitTests(DisplayPoolTestCase):
+
+    def test_everything_closed(self):
+        self.pool.lease(self.DISPLAY_NAME)
+        self.pool.lease(None)
+        self.pool.close_all()
+        self.assertEquals(self.mock_close.call_count, 2)
+        self.assertEquals(len(self.pool), 0)
@@ -0,0 +1,98 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EventDispatcher, NeedsDisplay
+from wotw_xlib.xlib import Display
+
+
+class EventDispatcherTestCase(TestCase):
+
+    def setUp(self):
+        self.display = Display()
+        self.pending = []
+        for name, replacement in [
+                ['XPending', MagicMock(side_effect=lambda display: len(self.pending))],
+                ['XNextEvent', MagicMock(side_effect=self.next_event)]
+        ]:
+            patcher = patch(
+                'wotw_xlib.backends.xlib_backend.' + name,
+                new=replacement
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(EventDispatcher.forget, self.display)
+        self.dispatcher = EventDispatcher.for_display(self.display)
+
+    def next_event(self, display, event):
+        event._obj.type = self.pending.pop(0)
+
+
+class ForDisplayUnitTests(EventDispatcherTestCase):
+
+    def test_shared_per_display(self):
+        self.assertIs(EventDispatcher.for_display(self.display), self.dispatcher)
+        other = Display()
+        self.addCleanup(EventDispatcher.forget, other)
+        self.assertIsNot(EventDispatcher.for_display(other), self.dispatcher)
+
+    def test_forget(self):
+        EventDispatcher.forget(self.display)
+        self.assertIsNot(EventDispatcher.for_display(self.display), self.dispatcher)
+
+    def test_forget_unknown(self):
+        EventDispatcher.forget(Display())
+
+    def test_needs_display_property(self):
+        self.assertIs(NeedsDisplay(self.display).events, self.dispatcher)
+
+
+class RegisterUnitTests(EventDispatcherTestCase):
+
+    def test_repeats_ignored(self):
+        handler = MagicMock()
+        self.dispatcher.register(handler)
+        self.dispatcher.register(handler)
+        self.assertEquals(self.dispatcher.handlers, [handler])
+
+    def test_unregister(self):
+        handler = MagicMock()
+        self.dispatcher.register(handler)
+        self.dispatcher.unregister(handler)
+        self.dispatcher.unregister(handler)
+        self.assertEquals(self.dispatcher.handlers, [])
+
+
+class DispatchUnitTests(EventDispatcherTestCase):
+
+    def test_every_handler_sees_every_event(self):
+        seen = {'first': [], 'second': []}
+        self.dispatcher.register(lambda event: seen['first'].append(event.type))
+        self.dispatcher.register(lambda event: seen['second'].append(event.type))
+        self.pending = [64, 65]
+        self.dispatcher.dispatch()
+        self.assertEquals(seen, {'first': [64, 65], 'second': [64, 65]})
+        self.assertEquals(self.pending, [])
+
+    def test_handler_may_unregister(self):
+        handlers = []
+
+        def once(event):
+            self.dispatcher.unregister(once)
+            handlers.append(event.type)
+        other = MagicMock()
+        self.dispatcher.register(once)
+        self.dispatcher.register(other)
+        self.pending = [64, 65]
+        self.dispatcher.dispatch()
+        self.assertEquals(handlers, [64])
+        self.assertEquals(other.call_count, 2)
+
+    def test_nothing_queued(self):
+        handler = MagicMock()
+        self.dispatcher.register(handler)
+        self.dispatcher.dispatch()
+        handler.assert_not_called()
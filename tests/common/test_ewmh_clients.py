@@ -0,0 +1,246 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EwmhClients
+from wotw_xlib.utils import Point
+from wotw_xlib.xlib import (
+    Display,
+    IsUnviewable,
+    IsViewable,
+    Window
+)
+
+
+class EwmhClientsTestCase(TestCase):
+    ROOT = 1
+    CHECK = 50
+    STACKING = [10, 20, 30]
+
+    def setUp(self):
+        self.clients = EwmhClients(Display(), Window(self.ROOT))
+        atoms_patcher = patch(
+            'wotw_xlib.common.EwmhClients.atoms',
+            new={
+                '_NET_CLIENT_LIST_STACKING': 300,
+                '_NET_ACTIVE_WINDOW': 301,
+                '_NET_SUPPORTING_WM_CHECK': 302
+            }
+        )
+        atoms_patcher.start()
+        self.addCleanup(atoms_patcher.stop)
+
+    @staticmethod
+    def snapshot(window, covers, map_state=IsViewable):
+        snapshot = MagicMock(window=window)
+        snapshot.might_be_under_pointer.return_value = (
+            covers and map_state == IsViewable
+        )
+        return snapshot
+
+
+class GetWindowPropertyUnitTests(EwmhClientsTestCase):
+
+    def setUp(self):
+        super(GetWindowPropertyUnitTests, self).setUp()
+        self.clients.backend = MagicMock()
+        self.properties = {
+            (self.ROOT, 302): [self.CHECK],
+            (self.CHECK, 302): [self.CHECK],
+            (self.ROOT, 300): self.STACKING
+        }
+        self.mock_get = self.clients.backend.get_window_list
+        self.mock_get.side_effect = (
+            lambda display, window, atom, length: self.properties.get((window, atom))
+        )
+
+    def test_stacking(self):
+        self.assertEquals(self.clients.get_client_stacking(), self.STACKING)
+        self.mock_get.assert_called_with(
+            self.clients.display,
+            self.ROOT,
+            300,
+            self.clients.LIST_LENGTH
+        )
+
+    def test_missing_property(self):
+        del self.properties[(self.ROOT, 300)]
+        self.assertIsNone(self.clients.get_client_stacking())
+
+    def test_active_window(self):
+        self.properties[(self.ROOT, 301)] = [20]
+        self.assertEquals(self.clients.get_active_window(), 20)
+        self.assertEquals(self.mock_get.call_args[0][2:], (301, 1))
+
+    def test_no_active_window(self):
+        self.properties[(self.ROOT, 301)] = []
+        self.assertIsNone(self.clients.get_active_window())
+
+
+class WmCheckUnitTests(GetWindowPropertyUnitTests):
+
+    def test_validated(self):
+        self.assertEquals(self.clients.get_wm_check(), self.CHECK)
+        self.assertEquals(
+            [call[0][1:] for call in self.mock_get.call_args_list],
+            [(self.ROOT, 302, 1), (self.CHECK, 302, 1)]
+        )
+        self.clients.backend.ignore_vanished_windows.assert_called_with()
+
+    def test_remembered(self):
+        self.clients.get_wm_check()
+        self.mock_get.reset_mock()
+        self.assertEquals(self.clients.get_wm_check(), self.CHECK)
+        self.assertEquals(
+            [call[0][1:] for call in self.mock_get.call_args_list],
+            [(self.CHECK, 302, 1)]
+        )
+
+    def test_replaced_wm(self):
+        self.clients.get_wm_check()
+        del self.properties[(self.CHECK, 302)]
+        self.properties[(self.ROOT, 302)] = [60]
+        self.properties[(60, 302)] = [60]
+        self.assertEquals(self.clients.get_wm_check(), 60)
+
+    def test_stale_check_window(self):
+        del self.properties[(self.CHECK, 302)]
+        self.assertIsNone(self.clients.get_wm_check())
+        self.assertIsNone(self.clients.get_client_stacking())
+
+    def test_mismatched_check_window(self):
+        self.properties[(self.CHECK, 302)] = [60]
+        self.assertIsNone(self.clients.get_wm_check())
+
+    def test_no_wm(self):
+        del self.properties[(self.ROOT, 302)]
+        self.assertIsNone(self.clients.get_wm_check())
+
+
+class SnapshotClientsUnitTests(EwmhClientsTestCase):
+
+    def test_regions_relative_to_root(self):
+        self.clients.backend = MagicMock()
+        self.assertIs(
+            self.clients.snapshot_clients([10, 20]),
+            self.clients.backend.snapshot_relative.return_value
+        )
+        self.clients.backend.snapshot_relative.assert_called_once_with(
+            self.clients.display,
+            [10, 20],
+            self.ROOT
+        )
+
+
+class FindClientUnderUnitTests(EwmhClientsTestCase):
+
+    @patch('wotw_xlib.common.EwmhClients.snapshot_clients')
+    def test_topmost_wins(self, mock_snapshot):
+        mock_snapshot.return_value = [
+            self.snapshot(10, True),
+            self.snapshot(20, True),
+            self.snapshot(30, True, IsUnviewable)
+        ]
+        self.assertEquals(
+            self.clients.find_client_under(Point(5, 5), self.STACKING),
+            20
+        )
+
+    @patch('wotw_xlib.common.EwmhClients.snapshot_clients')
+    def test_nothing_under(self, mock_snapshot):
+        mock_snapshot.return_value = [self.snapshot(10, False)]
+        self.assertIsNone(
+            self.clients.find_client_under(Point(5, 5), self.STACKING)
+        )
+
+    @patch('wotw_xlib.common.EwmhClients.snapshot_clients')
+    def test_shapes_consulted(self, mock_snapshot):
+        mock_snapshot.return_value = [
+            self.snapshot(10, True),
+            self.snapshot(20, True)
+        ]
+        self.clients.shapes = MagicMock()
+        self.clients.shapes.might_be_under_pointer.side_effect = (
+            lambda snapshot, location: snapshot.window != 20
+        )
+        self.assertEquals(
+            self.clients.find_client_under(Point(5, 5), self.STACKING),
+            10
+        )
+        self.clients.shapes.process_events.assert_called_once_with()
+
+
+@patch('wotw_xlib.common.EwmhClients.snapshot_children')
+class FindOverrideRedirectUnderUnitTests(EwmhClientsTestCase):
+
+    def test_override_redirect_on_top(self, mock_children):
+        menu = self.snapshot(40, True)
+        menu.override_redirect = True
+        mock_children.return_value = [self.snapshot(10, True), menu]
+        self.assertEquals(self.clients.find_override_redirect_under(Point(5, 5)), 40)
+
+    def test_frame_on_top(self, mock_children):
+        menu = self.snapshot(40, True)
+        menu.override_redirect = True
+        frame = self.snapshot(10, True)
+        frame.override_redirect = False
+        mock_children.return_value = [menu, frame]
+        self.assertIsNone(self.clients.find_override_redirect_under(Point(5, 5)))
+
+    def test_nothing_under(self, mock_children):
+        mock_children.return_value = [self.snapshot(10, False)]
+        self.assertIsNone(self.clients.find_override_redirect_under(Point(5, 5)))
+
+
+@patch('wotw_xlib.common.PointerWindow.find_window_under_pointer')
+@patch('wotw_xlib.common.EwmhClients.get_mouse_position')
+@patch('wotw_xlib.common.EwmhClients.find_client_under')
+@patch('wotw_xlib.common.EwmhClients.find_override_redirect_under')
+@patch('wotw_xlib.common.EwmhClients.get_client_stacking')
+class FindWindowUnderPointerUnitTests(EwmhClientsTestCase):
+
+    def test_stacking_used(self, mock_stacking, mock_override, mock_find, mock_mouse,
+                           mock_walk):
+        mock_stacking.return_value = self.STACKING
+        mock_mouse.return_value = [Point(1, 2), Point(3, 4)]
+        mock_override.return_value = None
+        mock_find.return_value = 20
+        result = self.clients.find_window_under_pointer()
+        self.assertEquals(result.window.value, 20)
+        mock_override.assert_called_once_with(Point(1, 2))
+        mock_find.assert_called_once_with(Point(1, 2), self.STACKING)
+        self.assertEquals(mock_walk.call_count, 0)
+
+    def test_override_redirect_first(self, mock_stacking, mock_override, mock_find,
+                                     mock_mouse, mock_walk):
+        mock_stacking.return_value = self.STACKING
+        mock_mouse.return_value = [Point(1, 2), Point(3, 4)]
+        mock_override.return_value = 40
+        result = self.clients.find_window_under_pointer()
+        self.assertEquals(result.window.value, 40)
+        self.assertEquals(mock_find.call_count, 0)
+        self.assertEquals(mock_walk.call_count, 0)
+
+    def test_falls_back_without_wm(self, mock_stacking, mock_override, mock_find,
+                                   mock_mouse, mock_walk):
+        mock_stacking.return_value = None
+        self.assertEquals(
+            self.clients.find_window_under_pointer(),
+            mock_walk.return_value
+        )
+        self.assertEquals(mock_override.call_count, 0)
+        self.assertEquals(mock_find.call_count, 0)
+
+    def test_falls_back_over_desktop(self, mock_stacking, mock_override, mock_find,
+                                     mock_mouse, mock_walk):
+        mock_stacking.return_value = self.STACKING
+        mock_mouse.return_value = [Point(1, 2), Point(3, 4)]
+        mock_override.return_value = None
+        mock_find.return_value = None
+        self.assertEquals(
+            self.clients.find_window_under_pointer(),
+            mock_walk.return_value
+        )
@@ -0,0 +1,52 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from importlib import import_module
+from os.path import abspath, dirname
+from subprocess import check_output
+from sys import executable, version_info
+from unittest import TestCase
+
+import wotw_xlib
+import wotw_xlib.common
+from wotw_xlib.common import EXPORTS
+
+
+class ResolveUnitTests(TestCase):
+
+    def test_every_export_resolves(self):
+        for name, module_name in EXPORTS.items():
+            if 'AsyncDisplay' == name and version_info[0] < 3:
+                continue
+            module = import_module('wotw_xlib.common.' + module_name)
+            self.assertIs(getattr(wotw_xlib.common, name), getattr(module, name))
+
+    def test_modules_resolve(self):
+        self.assertIs(
+            getattr(wotw_xlib.common, 'window_snapshot'),
+            import_module('wotw_xlib.common.window_snapshot')
+        )
+
+    def test_unknown_names_missing(self):
+        self.assertFalse(hasattr(wotw_xlib.common, 'NotAnExport'))
+
+
+class LazinessUnitTests(TestCase):
+
+    def test_extensions_not_imported(self):
+        loaded = check_output([
+            executable,
+            '-c',
+            'import sys, wotw_xlib; wotw_xlib.PointerWindow; '
+            'print(" ".join(sorted(sys.modules)))'
+        ], cwd=dirname(dirname(abspath(wotw_xlib.__file__)))).decode('utf-8').split()
+        self.assertIn('wotw_xlib.common.pointer_window', loaded)
+        for module_name in [
+                'damage_tracker',
+                'monitor_layout',
+                'shape_cache',
+                'shm_capture',
+                'shm_segment'
+        ]:
+            self.assertNotIn('wotw_xlib.common.' + module_name, loaded)
+        self.assertNotIn('wotw_xlib.xext.functions', loaded)
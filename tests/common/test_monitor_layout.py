@@ -0,0 +1,157 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EventDispatcher, MonitorLayout, RandrError
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import Display, XEvent
+
+
+class MonitorLayoutTestCase(TestCase):
+    ROOT = 1
+    EVENT_BASE = 89
+    # Listed out of order on purpose
+    MONITORS = [
+        (301, 1920, 0, 1280, 1024, 0),
+        (300, 0, 0, 1920, 1080, 1),
+        (302, 0, 1080, 1920, 1080, 0)
+    ]
+    NAMES = {300: 'DP-1', 301: 'HDMI-1', 302: 'DP-2'}
+
+    def setUp(self):
+        self.available = True
+        self.monitors = list(self.MONITORS)
+        self.pending = []
+        registry = MagicMock()
+        registry.get_names.side_effect = lambda *atoms: [
+            self.NAMES[atom] for atom in atoms
+        ]
+        atoms_patcher = patch('wotw_xlib.common.MonitorLayout.atoms', new=registry)
+        atoms_patcher.start()
+        self.addCleanup(atoms_patcher.stop)
+        self.layout = MonitorLayout(Display())
+        self.addCleanup(EventDispatcher.forget, self.layout.display)
+        self.backend = self.layout.backend = MagicMock()
+        self.backend.root_window.return_value = self.ROOT
+        self.backend.query_extension.side_effect = self.query_extension
+        self.backend.get_monitors.side_effect = self.get_monitors
+        self.backend.pending_events.side_effect = lambda display: len(self.pending)
+        self.backend.next_event.side_effect = self.next_event
+
+    def query_extension(self, display, name):
+        return self.EVENT_BASE if self.available else None
+
+    def get_monitors(self, display, window):
+        return [
+            (name, Region.from_values(x, y, width, height), bool(primary))
+            for name, x, y, width, height, primary in self.monitors
+        ]
+
+    def next_event(self, display, event):
+        event.type = self.pending.pop(0)
+
+    def names(self, monitors):
+        return [monitor.name for monitor in monitors]
+
+
+class LoadUnitTests(MonitorLayoutTestCase):
+
+    def test_lazy(self):
+        self.backend.get_monitors.assert_not_called()
+
+    def test_single_request(self):
+        self.layout.get_monitors()
+        self.layout.get_monitors()
+        self.backend.get_monitors.assert_called_once_with(
+            self.layout.display,
+            self.ROOT
+        )
+
+    def test_left_to_right(self):
+        monitors = self.layout.get_monitors()
+        self.assertEquals(self.names(monitors), ['DP-1', 'DP-2', 'HDMI-1'])
+        self.assertEquals(monitors[0].region, Region.from_values(0, 0, 1920, 1080))
+
+    def test_watches_screen_changes(self):
+        self.layout.get_monitors()
+        self.backend.select_screen_changes.assert_called_once_with(
+            self.layout.display,
+            self.ROOT
+        )
+
+    def test_no_monitors(self):
+        self.monitors = []
+        self.assertEquals(self.layout.get_monitors(), [])
+        self.assertIsNone(self.layout.get_primary())
+
+    def test_missing_extension(self):
+        self.available = False
+        self.assertRaises(RandrError, self.layout.get_monitors)
+
+
+class PrimaryUnitTests(MonitorLayoutTestCase):
+
+    def test_marked(self):
+        self.assertEquals(self.layout.get_primary().name, 'DP-1')
+
+    def test_unmarked(self):
+        self.monitors = [monitor[:5] + (0,) for monitor in self.MONITORS]
+        self.assertEquals(self.layout.get_primary().name, 'DP-1')
+
+
+class LookupUnitTests(MonitorLayoutTestCase):
+
+    def test_monitor_at(self):
+        self.assertEquals(self.layout.monitor_at(Point(100, 100)).name, 'DP-1')
+        self.assertEquals(self.layout.monitor_at(Point(2000, 100)).name, 'HDMI-1')
+        self.assertEquals(self.layout.monitor_at(Point(100, 1500)).name, 'DP-2')
+
+    def test_shared_edge_goes_right(self):
+        self.assertEquals(self.layout.monitor_at(Point(1920, 100)).name, 'HDMI-1')
+
+    def test_dead_space(self):
+        self.assertIsNone(self.layout.monitor_at(Point(2000, 1500)))
+
+    def test_monitors_for(self):
+        self.assertEquals(
+            self.names(
+                self.layout.monitors_for(Region.from_values(1800, 1000, 200, 200))
+            ),
+            ['DP-1', 'DP-2', 'HDMI-1']
+        )
+        self.assertEquals(
+            self.names(
+                self.layout.monitors_for(Region.from_values(10, 10, 20, 20))
+            ),
+            ['DP-1']
+        )
+
+
+class RefreshUnitTests(MonitorLayoutTestCase):
+
+    def test_screen_change_reloads(self):
+        self.layout.get_monitors()
+        self.monitors = self.MONITORS[1:]
+        self.pending = [self.EVENT_BASE]
+        self.assertEquals(
+            self.names(self.layout.get_monitors()),
+            ['DP-1', 'DP-2']
+        )
+        self.backend.update_configuration.assert_called_once()
+        self.assertIsNone(self.layout.monitor_at(Point(2000, 100)))
+
+    def test_other_events_ignored(self):
+        self.layout.get_monitors()
+        self.pending = [self.EVENT_BASE + 1]
+        self.layout.get_monitors()
+        self.backend.get_monitors.assert_called_once()
+
+    def test_handle_event(self):
+        self.layout.get_monitors()
+        event = XEvent()
+        event.type = self.EVENT_BASE
+        self.layout.handle_event(event)
+        self.assertTrue(self.layout.stale)
@@ -4,10 +4,10 @@ from __future__ import print_function
 from ctypes import c_char_p
 from unittest import TestCase
 
-from mock import patch
+from mock import MagicMock, patch
 
 
-from wotw_xlib.common import NeedsDisplay
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay
 from wotw_xlib.xlib import Display
 
 
@@ -25,6 +25,7 @@ class NeedsDisplayTestCase(TestCase):
         open_display_patcher = patch.object(NeedsDisplay, 'open_display')
         open_display_patcher.start()
         self.has_display = NeedsDisplay(self.DEFAULT_DISPLAY)
+        self.backend = self.has_display.backend = MagicMock()
         open_display_patcher.stop()
         self.addCleanup(self.wipe_needs_display)
 
@@ -71,9 +72,9 @@ class ParseUnknownDisplayUnitTests(NeedsDisplayTestCase):
     def test_with_words(self, mock_open):
         for unknown in [self.DISPLAY_INDEX, c_char_p(self.DISPLAY_INDEX)]:
             result = self.has_display.parse_unknown_display(unknown)
-            mock_open.assert_called_once_with(unknown)
-            self.assertEquals(result, self.PARSED_DISPLAY)
-            mock_open.reset_mock()
+            self.assertEquals(mock_open.call_count, 0)
+            self.assertIsNone(result)
+            self.assertIs(self.has_display.display_name, unknown)
 
     @patch(
         'wotw_xlib.common.NeedsDisplay.open_display',
@@ -82,52 +83,126 @@ class ParseUnknownDisplayUnitTests(NeedsDisplayTestCase):
     def test_with_wrong_indices(self, mock_open):
         for unknown in self.WRONG_INDICES:
             result = self.has_display.parse_unknown_display(unknown)
-            mock_open.assert_called_once_with(None)
-            self.assertEquals(result, self.PARSED_DISPLAY)
-            mock_open.reset_mock()
+            self.assertEquals(mock_open.call_count, 0)
+            self.assertIsNone(result)
+            self.assertIsNone(self.has_display.display_name)
+
+
+class DisplayUnitTests(NeedsDisplayTestCase):
+
+    def test_opened_on_first_use(self):
+        self.has_display.display_name = ':47.0'
+        self.backend.open_display.return_value = self.PARSED_DISPLAY
+        self.assertEquals(self.has_display.display, self.PARSED_DISPLAY)
+        self.assertEquals(self.has_display.display, self.PARSED_DISPLAY)
+        self.backend.open_display.assert_called_once_with(':47.0')
+        self.assertTrue(self.has_display.opened_display)
+        self.assertFalse(self.has_display.leased_display)
+
+    def test_passed_in_display_kept(self):
+        display = Display()
+        has_display = NeedsDisplay(display, backend=self.backend)
+        self.assertIs(has_display.display, display)
+        self.assertEquals(self.backend.open_display.call_count, 0)
+        self.assertFalse(has_display.opened_display)
+
+    def test_shared_pool_by_default(self):
+        self.assertIs(NeedsDisplay().pool, DISPLAY_POOL)
 
 
 class OpenDisplayUnitTests(NeedsDisplayTestCase):
 
     DISPLAY_TO_OPEN = ':47.0'
 
-    @patch(
-        'wotw_xlib.needs_display.XOpenDisplay',
-        return_value=NeedsDisplayTestCase.PARSED_DISPLAY
-    )
-    def test_flag_is_set(self, mock_open):
+    def test_flag_is_set(self):
         self.has_display.open_display(self.DISPLAY_TO_OPEN)
         self.assertTrue(self.has_display.opened_display)
 
-    @patch(
-        'wotw_xlib.needs_display.XOpenDisplay',
-        return_value=NeedsDisplayTestCase.PARSED_DISPLAY
-    )
-    def test_parse_is_called(self, mock_open):
+    def test_backend_opens(self):
+        self.backend.open_display.return_value = self.PARSED_DISPLAY
+        self.assertEquals(
+            self.has_display.open_display(self.DISPLAY_TO_OPEN),
+            self.PARSED_DISPLAY
+        )
+        self.backend.open_display.assert_called_once_with(self.DISPLAY_TO_OPEN)
+
+    def test_pool_untouched(self):
+        self.has_display.pool = MagicMock(backend=self.backend)
         self.has_display.open_display(self.DISPLAY_TO_OPEN)
-        mock_open.assert_called_once_with(self.DISPLAY_TO_OPEN)
+        self.assertEquals(self.has_display.pool.lease.call_count, 0)
+        self.assertFalse(self.has_display.leased_display)
 
 
 class CloseDisplayUnitTests(NeedsDisplayTestCase):
 
-    @patch(
-        'wotw_xlib.needs_display.XCloseDisplay',
-        return_value=NeedsDisplayTestCase.PARSED_DISPLAY
-    )
-    def test_nothing_happens_without_flag(self, mock_close):
+    def test_nothing_happens_without_flag(self):
         self.has_display.opened_display = False
         self.has_display.close_display()
-        self.assertEquals(mock_close.call_count, 0)
+        self.assertEquals(self.backend.close_display.call_count, 0)
 
-    @patch(
-        'wotw_xlib.needs_display.XCloseDisplay',
-        return_value=NeedsDisplayTestCase.PARSED_DISPLAY
-    )
-    def test_close_is_called_with_flag(self, mock_close):
+    def test_close_is_called_with_flag(self):
         self.has_display.opened_display = True
         self.has_display.display = self.PARSED_DISPLAY
         self.has_display.close_display()
-        mock_close.assert_called_once_with(self.PARSED_DISPLAY)
+        self.backend.close_display.assert_called_once_with(self.PARSED_DISPLAY)
+        self.assertFalse(self.has_display.opened_display)
+
+    def test_pool_released_with_flag(self):
+        self.has_display.opened_display = True
+        self.has_display.leased_display = True
+        self.has_display.display = self.PARSED_DISPLAY
+        self.has_display.pool = MagicMock(backend=self.backend)
+        self.has_display.close_display()
+        self.has_display.close_display()
+        self.has_display.pool.release.assert_called_once_with(self.PARSED_DISPLAY)
+        self.assertEquals(self.backend.close_display.call_count, 0)
+        self.assertFalse(self.has_display.leased_display)
+
+    def test_reopened_after_close(self):
+        self.has_display.opened_display = True
+        self.has_display.display = self.PARSED_DISPLAY
+        self.has_display.close_display()
+        reopened = self.has_display.display
+        self.backend.open_display.assert_called_once_with(None)
+        self.assertIs(reopened, self.backend.open_display.return_value)
+        self.assertIs(self.has_display.current_display, reopened)
+
+
+class IgnoreVanishedWindowsUnitTests(NeedsDisplayTestCase):
+
+    def test_asked_once(self):
+        self.has_display.ignore_vanished_windows()
+        self.has_display.ignore_vanished_windows()
+        self.backend.ignore_vanished_windows.assert_called_once_with()
+
+    def test_stopped_on_close(self):
+        self.has_display.display = self.PARSED_DISPLAY
+        self.has_display.ignore_vanished_windows()
+        self.has_display.close_display()
+        self.has_display.close_display()
+        self.backend.stop_ignoring_vanished_windows.assert_called_once_with(
+            self.PARSED_DISPLAY
+        )
+        self.assertFalse(self.has_display.ignoring_vanished_windows)
+
+    def test_nothing_to_stop(self):
+        self.has_display.close_display()
+        self.assertEquals(self.backend.stop_ignoring_vanished_windows.call_count, 0)
+
+
+class AtomsUnitTests(NeedsDisplayTestCase):
+
+    @patch('wotw_xlib.common.needs_display.AtomRegistry.for_display')
+    def test_registry_attached_to_display(self, mock_for_display):
+        self.has_display.display = self.PARSED_DISPLAY
+        self.assertEquals(
+            self.has_display.atoms,
+            mock_for_display.return_value
+        )
+        mock_for_display.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.has_display.backend
+        )
 
 
 class EnterUnitTests(NeedsDisplayTestCase):
@@ -136,6 +211,39 @@ class EnterUnitTests(NeedsDisplayTestCase):
         result = self.has_display.__enter__()
         self.assertEquals(self.has_display, result)
 
+    def test_pool_leased(self):
+        self.has_display.display_name = ':47.0'
+        self.has_display.pool = MagicMock(backend=self.backend)
+        self.has_display.__enter__()
+        self.has_display.pool.lease.assert_called_once_with(':47.0')
+        self.assertIs(
+            self.has_display.display,
+            self.has_display.pool.lease.return_value
+        )
+        self.assertEquals(self.backend.open_display.call_count, 0)
+        self.assertTrue(self.has_display.opened_display)
+        self.assertTrue(self.has_display.leased_display)
+
+    def test_pool_on_another_backend_skipped(self):
+        self.has_display.pool = MagicMock()
+        self.has_display.__enter__()
+        self.assertEquals(self.has_display.pool.lease.call_count, 0)
+        self.assertEquals(self.backend.open_display.call_count, 0)
+
+    def test_open_display_not_leased(self):
+        self.has_display.display = self.PARSED_DISPLAY
+        self.has_display.pool = MagicMock(backend=self.backend)
+        self.has_display.__enter__()
+        self.assertEquals(self.has_display.pool.lease.call_count, 0)
+
+    def test_round_trip(self):
+        self.has_display.pool = MagicMock(backend=self.backend)
+        with self.has_display as has_display:
+            display = has_display.display
+        self.has_display.pool.release.assert_called_once_with(display)
+        self.assertEquals(self.backend.close_display.call_count, 0)
+        self.assertFalse(self.has_display.opened_display)
+
 
 class ExitUnitTests(NeedsDisplayTestCase):
 
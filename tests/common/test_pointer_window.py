@@ -1,31 +1,19 @@
 # pylint: disable=missing-docstring,unused-argument,invalid-name
 from __future__ import print_function
 
-from ctypes import c_uint, POINTER
 from unittest import TestCase
 
-from mock import call, MagicMock, patch
+from mock import MagicMock, patch
 
-from wotw_xlib.utils import Point
-from wotw_xlib.common import PointerWindow
-# pylint:disable=unused-import
+from wotw_xlib.utils import Point, Region, RegionSet
+from wotw_xlib.common import DISPLAY_POOL, PointerWindow
 from wotw_xlib.xlib import (
-    Coordinate,
+    Display,
     IsUnviewable,
     IsViewable,
     Window,
-    XDefaultScreen,
-    XFetchName,
-    XGetGeometry,
-    XGetWMIconName,
-    XGetWindowAttributes,
-    XQueryPointer,
-    XQueryTree,
-    XRootWindow,
-    XTextProperty,
     XWindowAttributes
 )
-# pylint:enable=unused-import
 
 
 class PointerWindowTestCase(TestCase):
@@ -57,7 +45,8 @@ class PointerWindowTestCase(TestCase):
             self.DEFAULT_DISPLAY,
             self.DEFAULT_WINDOW_ID
         )
-        self.pointer_window.display = self.DEFAULT_DISPLAY
+        self.pointer_window.display = self.PARSED_DISPLAY
+        self.backend = self.pointer_window.backend = MagicMock()
         parse_window_id_patcher.stop()
         get_region_patcher.stop()
         super_patcher.stop()
@@ -69,16 +58,86 @@ class ConstructorUnitTests(PointerWindowTestCase):
     def test_super_called(self):
         self.mock_super.assert_called_once()
 
-    def test_window_parsed(self):
-        self.mock_parse_window_id.assert_called_once_with(
-            self.DEFAULT_WINDOW_ID
-        )
+    @patch('wotw_xlib.common.NeedsDisplay.__init__', return_value=None)
+    def test_pool_forwarded(self, mock_init):
+        PointerWindow(self.DEFAULT_DISPLAY)
+        mock_init.assert_called_once_with(self.DEFAULT_DISPLAY, DISPLAY_POOL, None)
+
+    def test_window_is_lazy(self):
+        self.assertEquals(self.mock_parse_window_id.call_count, 0)
+
+    @patch.object(PointerWindow, 'parse_window_id')
+    def test_window_parsed_once(self, mock_parse):
+        self.assertIs(self.pointer_window.window, mock_parse.return_value)
+        self.assertIs(self.pointer_window.window, mock_parse.return_value)
+        mock_parse.assert_called_once_with(self.DEFAULT_WINDOW_ID)
+
+    def test_region_is_lazy(self):
+        self.assertEquals(self.mock_get_region.call_count, 0)
+
+    def test_cache_is_empty(self):
+        self.assertEquals(self.pointer_window.cache, {})
+        self.assertIsNone(self.pointer_window.ttl)
 
-    def test_region_created(self):
-        self.mock_get_region.assert_called_once_with()
 
-    def test_window_attributes_are_empty(self):
-        self.assertIsNone(self.pointer_window.window_attributes)
+class CachedPropertiesUnitTests(PointerWindowTestCase):
+    ATTRIBUTES = XWindowAttributes(x=1, y=2, width=3, height=4)
+
+    @patch('wotw_xlib.common.PointerWindow.get_region', return_value='region')
+    def test_region_loaded_once(self, mock_get):
+        self.assertEquals(self.pointer_window.region, 'region')
+        self.assertEquals(self.pointer_window.region, 'region')
+        mock_get.assert_called_once_with()
+
+    @patch('wotw_xlib.common.PointerWindow.get_region')
+    @patch(
+        'wotw_xlib.common.PointerWindow.get_window_attributes',
+        return_value=ATTRIBUTES
+    )
+    def test_attributes_fill_region(self, mock_attributes, mock_region):
+        self.assertIs(self.pointer_window.window_attributes, self.ATTRIBUTES)
+        self.assertEquals(str(self.pointer_window.region), '(1,2)x(4,6)')
+        self.assertEquals(mock_region.call_count, 0)
+
+    @patch('wotw_xlib.common.PointerWindow.get_region')
+    @patch(
+        'wotw_xlib.common.PointerWindow.get_window_attributes',
+        return_value=ATTRIBUTES
+    )
+    def test_region_from_cached_attributes(self, mock_attributes, mock_region):
+        self.pointer_window.window_attributes = self.ATTRIBUTES
+        self.pointer_window.invalidate('region')
+        self.assertEquals(str(self.pointer_window.region), '(1,2)x(4,6)')
+        self.assertEquals(mock_attributes.call_count, 0)
+        self.assertEquals(mock_region.call_count, 0)
+
+    @patch('wotw_xlib.common.PointerWindow.get_names', return_value=['a', 'b'])
+    def test_invalidate_everything(self, mock_names):
+        self.pointer_window.names
+        self.pointer_window.invalidate()
+        self.pointer_window.names
+        self.assertEquals(mock_names.call_count, 2)
+
+    @patch('wotw_xlib.common.pointer_window.time_now')
+    @patch('wotw_xlib.common.PointerWindow.get_names', return_value=['a', 'b'])
+    def test_ttl(self, mock_names, mock_time):
+        self.pointer_window.ttl = 5
+        mock_time.return_value = 100
+        self.pointer_window.names
+        mock_time.return_value = 105
+        self.pointer_window.names
+        self.assertEquals(mock_names.call_count, 1)
+        mock_time.return_value = 106
+        self.pointer_window.names
+        self.assertEquals(mock_names.call_count, 2)
+
+    @patch('wotw_xlib.common.PointerWindow.get_query_tree')
+    def test_children_copied(self, mock_tree):
+        mock_tree.return_value = MagicMock()
+        mock_tree.return_value.__enter__.return_value = [5, 6]
+        self.assertEquals(self.pointer_window.children, (5, 6))
+        self.assertEquals(self.pointer_window.children, (5, 6))
+        mock_tree.return_value.__exit__.assert_called_once()
 
 
 class ParseWindowIdUnitTests(PointerWindowTestCase):
@@ -106,138 +165,177 @@ class ParseWindowIdUnitTests(PointerWindowTestCase):
 
 class DiscoverRootWindowUnitTests(PointerWindowTestCase):
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XDefaultScreen',
-        return_value=PointerWindowTestCase.DEFAULT_SCREEN
-    )
-    @patch(
-        'wotw_xlib.common.pointer_window.XRootWindow',
-        return_value=MagicMock()
-    )
-    def test_root_discovery(self, mock_root, mock_screen):
-        mock_manager = MagicMock()
-        mock_manager.attach_mock(mock_root, 'XRootWindow')
-        mock_manager.attach_mock(mock_screen, 'XDefaultScreen')
-        self.pointer_window.display = self.DEFAULT_DISPLAY
-        self.pointer_window.discover_root_window()
-        mock_manager.assert_has_calls([
-            call.XDefaultScreen(self.DEFAULT_DISPLAY),
-            call.XRootWindow(self.DEFAULT_DISPLAY, self.DEFAULT_SCREEN)
-        ])
+    def test_root_discovery(self):
+        self.backend.root_window.return_value = 1
+        result = self.pointer_window.discover_root_window()
+        self.assertEquals(result.value, 1)
+        self.backend.root_window.assert_called_once_with(self.PARSED_DISPLAY)
 
 
 class GetMousePositionUnitTests(PointerWindowTestCase):
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XQueryPointer',
-        return_value=MagicMock()
-    )
-    def test_function_call(self, mock_query):
-        self.pointer_window.get_mouse_position()
-        mock_query.assert_called_once()
-
-    @patch(
-        'wotw_xlib.common.pointer_window.XQueryPointer',
-        return_value=MagicMock()
-    )
-    def test_return_points(self, mock_query):
-        empty = Point(0, 0)
+    def test_return_points(self):
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        self.backend.query_pointer.return_value = (1, 2, 3, 4, 0)
         root, win = self.pointer_window.get_mouse_position()
-        self.assertEquals(empty.x, root.x)
-        self.assertEquals(empty.y, root.y)
-        self.assertEquals(empty.x, win.x)
-        self.assertEquals(empty.y, win.y)
+        self.assertEquals((root.x, root.y, win.x, win.y), (1, 2, 3, 4))
+        self.backend.query_pointer.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
 
 
-class GetRegionUnitTests(PointerWindowTestCase):
+class SampleUnitTests(PointerWindowTestCase):
 
-    PADDING = 10
-    TOP_LEFT = Point(0, 0)
-    BOTTOM_RIGHT = Point(PADDING, PADDING)
+    def test_mouse_position(self):
+        out = [0] * 4
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        self.pointer_window.sample_mouse_position(out)
+        self.backend.sample_pointer.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID,
+            out
+        )
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XGetGeometry',
-        return_value=MagicMock()
-    )
-    def test_function_call(self, mock_get):
-        self.pointer_window.get_region()
-        mock_get.assert_called_once()
+    def test_region(self):
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        self.pointer_window.sample_region()
+        self.backend.sample_geometry.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID,
+            None
+        )
 
-    @patch(
-        'wotw_xlib.common.pointer_window.c_uint',
-        return_value=c_uint(PADDING)
-    )
-    @patch(
-        'wotw_xlib.common.pointer_window.XGetGeometry',
-        return_value=MagicMock()
-    )
-    def test_return_region(self, mock_get, mock_cuint):
+
+class GetPointerChildUnitTests(PointerWindowTestCase):
+
+    CHILD_WINDOW = 74
+
+    def setUp(self):
+        super(GetPointerChildUnitTests, self).setUp()
+        self.backend.query_pointer.return_value = (0, 0, 0, 0, self.CHILD_WINDOW)
+
+    def test_defaults_to_own_window(self):
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        self.assertEquals(self.pointer_window.get_pointer_child(), self.CHILD_WINDOW)
+        self.backend.query_pointer.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
+
+    def test_uses_provided_window(self):
+        self.pointer_window.get_pointer_child(Window(self.CHILD_WINDOW))
+        self.backend.query_pointer.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.CHILD_WINDOW
+        )
+
+
+class FindWindowUnderPointerUnitTests(PointerWindowTestCase):
+
+    CHILDREN = [74, 147, 0]
+
+    @patch('wotw_xlib.common.pointer_window.PointerWindow.get_region')
+    @patch('wotw_xlib.common.PointerWindow.get_pointer_child')
+    def test_walks_to_deepest_child(self, mock_child, mock_region):
+        mock_child.side_effect = self.CHILDREN
+        self.pointer_window.display = Display()
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        result = self.pointer_window.find_window_under_pointer()
+        self.assertEquals(mock_child.call_count, len(self.CHILDREN))
+        self.assertEquals(result.window.value, self.CHILDREN[-2])
+
+    @patch('wotw_xlib.common.pointer_window.PointerWindow.get_region')
+    @patch('wotw_xlib.common.PointerWindow.get_pointer_child')
+    def test_returns_self_without_children(self, mock_child, mock_region):
+        mock_child.return_value = 0
+        self.pointer_window.display = Display()
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        result = self.pointer_window.find_window_under_pointer()
+        mock_child.assert_called_once()
+        self.assertEquals(result.window.value, self.DEFAULT_WINDOW_ID)
+
+
+class GetRegionUnitTests(PointerWindowTestCase):
+
+    def test_return_region(self):
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
+        self.backend.get_geometry.return_value = (1, 2, 3, 4)
         region = self.pointer_window.get_region()
-        self.assertEquals(region.top_left.x, self.TOP_LEFT.x)
-        self.assertEquals(region.top_left.y, self.TOP_LEFT.y)
-        self.assertEquals(region.bottom_right.x, self.BOTTOM_RIGHT.x)
-        self.assertEquals(region.bottom_right.y, self.BOTTOM_RIGHT.y)
+        self.assertEquals(str(region), '(1,2)x(4,6)')
+        self.backend.get_geometry.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
 
 
-class GetWindowAttributesUnitTests(PointerWindowTestCase):
+class DelegationUnitTests(PointerWindowTestCase):
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XGetWindowAttributes',
-        return_value=MagicMock()
-    )
-    def test_function_call(self, mock_get):
-        self.pointer_window.get_window_attributes()
-        mock_get.assert_called_once()
+    def setUp(self):
+        super(DelegationUnitTests, self).setUp()
+        self.pointer_window.window = Window(self.DEFAULT_WINDOW_ID)
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XGetWindowAttributes',
-        return_value=MagicMock()
-    )
-    def test_return_points(self, mock_get):
-        result = self.pointer_window.get_window_attributes()
-        self.assertIsInstance(result, XWindowAttributes)
+    def test_window_attributes(self):
+        self.assertIs(
+            self.pointer_window.get_window_attributes(),
+            self.backend.get_window_attributes.return_value
+        )
+        self.backend.get_window_attributes.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
 
+    def test_names(self):
+        self.assertIs(
+            self.pointer_window.get_names(),
+            self.backend.get_names.return_value
+        )
+        self.backend.get_names.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
 
-class GetNamesUnitTests(PointerWindowTestCase):
+    def test_query_tree(self):
+        self.assertIs(
+            self.pointer_window.get_query_tree(),
+            self.backend.child_windows.return_value
+        )
+        self.backend.child_windows.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.DEFAULT_WINDOW_ID
+        )
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XGetWMIconName',
-        return_value=MagicMock()
-    )
-    @patch(
-        'wotw_xlib.common.pointer_window.XFetchName',
-        return_value=MagicMock()
-    )
-    def test_function_call(self, mock_fetch, mock_get):
-        self.pointer_window.get_names()
-        mock_fetch.assert_called_once()
-        mock_get.assert_called_once()
 
+class SnapshotChildrenUnitTests(PointerWindowTestCase):
 
-class GetQueryTreeUnitTests(PointerWindowTestCase):
+    CHILDREN = [74, 147]
 
-    NUMBER_CHILDREN = 10
+    @patch('wotw_xlib.common.PointerWindow.get_query_tree')
+    def test_children_batched(self, mock_tree):
+        mock_tree.return_value = MagicMock()
+        mock_tree.return_value.__enter__.return_value = self.CHILDREN
+        self.backend.snapshot_windows.return_value = ['snapshots']
+        result = self.pointer_window.snapshot_children()
+        self.backend.snapshot_windows.assert_called_once_with(
+            self.PARSED_DISPLAY,
+            self.CHILDREN
+        )
+        self.assertEquals(result, ['snapshots'])
+        mock_tree.return_value.__exit__.assert_called_once()
 
-    @patch(
-        'wotw_xlib.common.pointer_window.XQueryTree',
-        return_value=MagicMock()
-    )
-    def test_function_call(self, mock_query):
-        self.pointer_window.get_query_tree()
-        mock_query.assert_called_once()
 
-    @patch(
-        'wotw_xlib.common.pointer_window.c_uint',
-        return_value=c_uint(NUMBER_CHILDREN)
-    )
-    @patch(
-        'wotw_xlib.common.pointer_window.XQueryTree',
-        return_value=MagicMock()
-    )
-    def test_return_points(self, mock_query, mock_cuint):
-        pointers, total_count = self.pointer_window.get_query_tree()
-        self.assertEquals(total_count, self.NUMBER_CHILDREN)
-        self.assertIsInstance(pointers, POINTER(Window))
+class ChildrenVisibilityUnitTests(PointerWindowTestCase):
+
+    @patch('wotw_xlib.common.pointer_window.WindowVisibility.sweep')
+    @patch('wotw_xlib.common.PointerWindow.snapshot_children')
+    def test_clipped_to_own_box(self, mock_snapshot, mock_sweep):
+        self.pointer_window.region = Region.from_values(50, 60, 100, 80)
+        result = self.pointer_window.get_children_visibility()
+        mock_sweep.assert_called_once_with(
+            mock_snapshot.return_value,
+            RegionSet([Region.from_values(0, 0, 100, 80)])
+        )
+        self.assertIs(result, mock_sweep.return_value)
 
 
 class ContainsPointerUnitTests(PointerWindowTestCase):
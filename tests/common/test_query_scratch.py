@@ -0,0 +1,88 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from array import array
+from unittest import TestCase
+
+from mock import patch
+
+from wotw_xlib.common import QueryScratch
+
+
+class QueryScratchTestCase(TestCase):
+    DEFAULT_DISPLAY = 'display'
+    DEFAULT_WINDOW = 47
+
+    def setUp(self):
+        self.scratch = QueryScratch()
+
+    @staticmethod
+    def fill_pointer(display, window, root, child, root_x, root_y, win_x,
+                     win_y, mask):
+        root_x._obj.value = 1
+        root_y._obj.value = 2
+        win_x._obj.value = 3
+        win_y._obj.value = 4
+
+    @staticmethod
+    def fill_geometry(display, window, root, win_x, win_y, width, height,
+                      border_width, depth):
+        win_x._obj.value = 5
+        win_y._obj.value = 6
+        width._obj.value = 7
+        height._obj.value = 8
+
+
+class QueryPointerUnitTests(QueryScratchTestCase):
+
+    @patch('wotw_xlib.common.query_scratch.XQueryPointer')
+    def test_tuple(self, mock_query):
+        mock_query.side_effect = self.fill_pointer
+        result = self.scratch.query_pointer(
+            self.DEFAULT_DISPLAY,
+            self.DEFAULT_WINDOW
+        )
+        self.assertEquals(result, (1, 2, 3, 4))
+
+    @patch('wotw_xlib.common.query_scratch.XQueryPointer')
+    def test_out_buffer(self, mock_query):
+        mock_query.side_effect = self.fill_pointer
+        out = array('l', [0] * 4)
+        result = self.scratch.query_pointer(
+            self.DEFAULT_DISPLAY,
+            self.DEFAULT_WINDOW,
+            out
+        )
+        self.assertIs(result, out)
+        self.assertEquals(list(out), [1, 2, 3, 4])
+
+    @patch('wotw_xlib.common.query_scratch.XQueryPointer')
+    def test_handles_reused(self, mock_query):
+        self.scratch.query_pointer(self.DEFAULT_DISPLAY, self.DEFAULT_WINDOW)
+        self.scratch.query_pointer(self.DEFAULT_DISPLAY, self.DEFAULT_WINDOW)
+        first, second = mock_query.call_args_list
+        for old, new in zip(first[0][2:], second[0][2:]):
+            self.assertIs(old, new)
+
+
+class QueryGeometryUnitTests(QueryScratchTestCase):
+
+    @patch('wotw_xlib.common.query_scratch.XGetGeometry')
+    def test_tuple(self, mock_geometry):
+        mock_geometry.side_effect = self.fill_geometry
+        result = self.scratch.query_geometry(
+            self.DEFAULT_DISPLAY,
+            self.DEFAULT_WINDOW
+        )
+        self.assertEquals(result, (5, 6, 7, 8))
+
+    @patch('wotw_xlib.common.query_scratch.XGetGeometry')
+    def test_out_buffer(self, mock_geometry):
+        mock_geometry.side_effect = self.fill_geometry
+        out = [0] * 4
+        self.scratch.query_geometry(
+            self.DEFAULT_DISPLAY,
+            self.DEFAULT_WINDOW,
+            out
+        )
+        self.assertEquals(out, [5, 6, 7, 8])
@@ -0,0 +1,229 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EventDispatcher, ShapeCache, WindowSnapshot
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import (
+    DestroyNotify,
+    Display,
+    IsUnmapped,
+    IsViewable,
+    StructureNotifyMask,
+    XEvent
+)
+from wotw_xlib.xext import ShapeBounding, ShapeInput
+
+
+class ShapeCacheTestCase(TestCase):
+    WINDOW = 10
+    EVENT_BASE = 64
+    BOX = Region.from_values(100, 100, 40, 20)
+    # Input only in the left half
+    SHAPES = {
+        ShapeBounding: [(0, 0, 40, 20)],
+        ShapeInput: [(0, 0, 20, 20)]
+    }
+
+    def setUp(self):
+        self.available = True
+        self.shapes = dict(self.SHAPES)
+        self.pending = []
+        self.cache = ShapeCache(Display())
+        self.addCleanup(EventDispatcher.forget, self.cache.display)
+        self.backend = self.cache.backend = MagicMock()
+        self.backend.query_extension.side_effect = self.query_extension
+        self.backend.get_shape_rectangles.side_effect = self.get_rectangles
+        self.backend.pending_events.side_effect = lambda display: len(self.pending)
+        self.backend.next_event.side_effect = self.next_event
+
+    def query_extension(self, display, name):
+        return self.EVENT_BASE if self.available else None
+
+    def get_rectangles(self, display, window, kind):
+        return [Region.from_values(*value) for value in self.shapes[kind]]
+
+    def next_event(self, display, event):
+        event.type, event.xany.window = self.pending.pop(0)
+
+    def shape_event(self, window=WINDOW):
+        self.pending.append((self.EVENT_BASE, window))
+
+
+class LoadShapeUnitTests(ShapeCacheTestCase):
+
+    def test_bounding_and_input_intersected(self):
+        shape = self.cache.get_shape(self.WINDOW, self.BOX)
+        self.assertEquals(list(shape), [Region.from_values(0, 0, 20, 20)])
+        self.assertEquals(
+            [call[0][2] for call in self.backend.get_shape_rectangles.call_args_list],
+            [ShapeBounding, ShapeInput]
+        )
+        self.backend.select_shape_input.assert_called_once_with(
+            self.cache.display,
+            self.WINDOW
+        )
+        self.backend.select_input.assert_called_once_with(
+            self.cache.display,
+            self.WINDOW,
+            StructureNotifyMask
+        )
+
+    def test_full_box_unshaped(self):
+        self.shapes[ShapeInput] = [(0, 0, 40, 20)]
+        self.assertIs(
+            self.cache.get_shape(self.WINDOW, self.BOX),
+            ShapeCache.UNSHAPED
+        )
+
+    def test_unshaped_rechecked_after_resize(self):
+        self.shapes[ShapeInput] = [(0, 0, 40, 20)]
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        self.cache.get_shape(self.WINDOW, Region.from_values(0, 0, 40, 20))
+        self.assertEquals(self.backend.get_shape_rectangles.call_count, 2)
+        shape = self.cache.get_shape(self.WINDOW, Region.from_values(100, 100, 80, 20))
+        self.assertEquals(list(shape), [Region.from_values(0, 0, 40, 20)])
+        self.assertEquals(self.backend.get_shape_rectangles.call_count, 4)
+
+    def test_empty_input_kept(self):
+        self.shapes[ShapeInput] = []
+        shape = self.cache.get_shape(self.WINDOW, self.BOX)
+        self.assertIsNot(shape, ShapeCache.UNSHAPED)
+        self.assertFalse(shape)
+
+    def test_without_extension(self):
+        self.available = False
+        self.assertIs(
+            self.cache.get_shape(self.WINDOW, self.BOX),
+            ShapeCache.UNSHAPED
+        )
+        self.cache.get_shape(self.WINDOW + 1, self.BOX)
+        self.assertEquals(self.backend.query_extension.call_count, 1)
+        self.backend.get_shape_rectangles.assert_not_called()
+
+    def test_cached(self):
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        self.assertEquals(self.backend.get_shape_rectangles.call_count, 2)
+
+
+class AcceptsUnitTests(ShapeCacheTestCase):
+
+    def test_inside_shape(self):
+        self.assertTrue(
+            self.cache.accepts(self.WINDOW, self.BOX, Point(110, 110))
+        )
+
+    def test_outside_shape(self):
+        self.assertFalse(
+            self.cache.accepts(self.WINDOW, self.BOX, Point(130, 110))
+        )
+
+    def test_shape_starts_inside_the_border(self):
+        bordered = WindowSnapshot.bordered(100, 100, 40, 20, 2)
+        self.assertTrue(
+            self.cache.accepts(self.WINDOW, bordered, Point(121, 110), 2)
+        )
+        self.assertFalse(
+            self.cache.accepts(self.WINDOW, bordered, Point(123, 110), 2)
+        )
+
+    def test_border_in_the_box(self):
+        self.shapes = {
+            ShapeBounding: [(-2, -2, 44, 24)],
+            ShapeInput: [(-2, -2, 44, 24)]
+        }
+        bordered = WindowSnapshot.bordered(100, 100, 40, 20, 2)
+        self.assertIs(
+            self.cache.get_shape(self.WINDOW, bordered, 2),
+            ShapeCache.UNSHAPED
+        )
+
+    def test_unshaped(self):
+        self.shapes[ShapeInput] = [(0, 0, 40, 20)]
+        self.assertTrue(
+            self.cache.accepts(self.WINDOW, self.BOX, Point(130, 110))
+        )
+
+    def test_box_checked_first(self):
+        snapshot = WindowSnapshot(self.WINDOW, self.BOX, IsViewable)
+        self.assertFalse(
+            self.cache.might_be_under_pointer(snapshot, Point(10, 10))
+        )
+        self.backend.get_shape_rectangles.assert_not_called()
+        self.assertTrue(
+            self.cache.might_be_under_pointer(snapshot, Point(110, 110))
+        )
+        self.assertFalse(
+            self.cache.might_be_under_pointer(snapshot, Point(130, 110))
+        )
+
+    def test_unmapped_skipped(self):
+        snapshot = WindowSnapshot(self.WINDOW, self.BOX, IsUnmapped)
+        self.assertFalse(
+            self.cache.might_be_under_pointer(snapshot, Point(110, 110))
+        )
+        self.backend.get_shape_rectangles.assert_not_called()
+
+
+class EventUnitTests(ShapeCacheTestCase):
+
+    def test_shape_notify_forgets(self):
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        self.cache.get_shape(self.WINDOW + 1, self.BOX)
+        self.shape_event()
+        self.cache.process_events()
+        self.assertNotIn(self.WINDOW, self.cache.shapes)
+        self.assertIn(self.WINDOW + 1, self.cache.shapes)
+        self.assertEquals(self.pending, [])
+
+    def test_destroy_notify_forgets(self):
+        self.shapes[ShapeInput] = [(0, 0, 40, 20)]
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        event = XEvent()
+        event.type = DestroyNotify
+        event.xany.window = self.WINDOW - 1
+        event.xdestroywindow.window = self.WINDOW
+        self.cache.handle_event(event)
+        self.assertEquals(self.cache.shapes, {})
+        self.assertEquals(self.cache.covered, {})
+
+    def test_shared_with_other_watchers(self):
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        other = MagicMock()
+        self.cache.events.register(other)
+        self.shape_event()
+        self.cache.process_events()
+        self.assertNotIn(self.WINDOW, self.cache.shapes)
+        other.assert_called_once()
+
+    def test_reloads_after_notify(self):
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        self.shapes[ShapeInput] = [(0, 0, 40, 20)]
+        self.shape_event()
+        self.cache.process_events()
+        self.assertIs(
+            self.cache.get_shape(self.WINDOW, self.BOX),
+            ShapeCache.UNSHAPED
+        )
+
+    def test_other_events_ignored(self):
+        self.cache.get_shape(self.WINDOW, self.BOX)
+        event = XEvent()
+        event.type = self.EVENT_BASE + 1
+        event.xany.window = self.WINDOW
+        self.cache.handle_event(event)
+        self.assertIn(self.WINDOW, self.cache.shapes)
+
+    def test_ignored_before_query(self):
+        event = XEvent()
+        event.type = self.EVENT_BASE
+        self.cache.handle_event(event)
+        self.backend.query_extension.assert_not_called()
+
+    def test_forget_unknown(self):
+        self.cache.forget(self.WINDOW)
+        self.assertEquals(self.cache.shapes, {})
@@ -0,0 +1,220 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import addressof, cast, c_int, pointer, POINTER
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import PointerWindow, ShmCapture, ShmError
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import (
+    Display,
+    IsUnmapped,
+    IsViewable,
+    Visual,
+    Window,
+    XWindowAttributes
+)
+
+
+class ShmCaptureTestCase(TestCase):
+    ROOT = 1
+    VISUAL_ID = 33
+
+    def setUp(self):
+        self.visual = pointer(Visual())
+        self.capture = ShmCapture(Display())
+        self.backend = self.capture.backend = MagicMock()
+        self.backend.query_extension.return_value = 0
+        self.backend.root_window.return_value = self.ROOT
+        self.backend.screen_format.return_value = (24, self.visual)
+        self.backend.create_image.side_effect = self.build_segment
+        self.backend.get_geometry.return_value = (0, 0, 100, 100)
+        self.backend.translate_coordinates.return_value = (10, 10)
+        self.backend.visual_id.return_value = self.VISUAL_ID
+
+    @staticmethod
+    def build_segment(display, width, height, depth, visual):
+        segment = MagicMock()
+        segment.capture.return_value = segment
+        segment.size = (width, height, depth)
+        return segment
+
+
+class ResolveTargetUnitTests(ShmCaptureTestCase):
+
+    def test_region_comes_off_the_root(self):
+        self.assertEquals(
+            self.capture.resolve_target(Region(Point(10, 20), 30, 40)),
+            (self.ROOT, 10, 20, 30, 40, 24, self.visual)
+        )
+        self.backend.get_geometry.assert_called_once_with(
+            self.capture.display,
+            self.ROOT
+        )
+
+    def test_region_clipped_to_the_root(self):
+        self.assertEquals(
+            self.capture.resolve_target(Region(Point(90, -10), 30, 40)),
+            (self.ROOT, 90, 0, 10, 30, 24, self.visual)
+        )
+
+    def test_region_off_the_screen(self):
+        self.assertRaises(
+            ShmError,
+            self.capture.resolve_target,
+            Region(Point(200, 200), 30, 40)
+        )
+
+    def build_window(self, map_state=IsViewable):
+        window_attributes = XWindowAttributes(
+            width=30,
+            height=40,
+            depth=32,
+            map_state=map_state
+        )
+        window = MagicMock(spec=PointerWindow)
+        window.window = Window(47)
+        window.window_attributes = window_attributes
+        return window
+
+    def test_window_uses_its_own_visual(self):
+        visual = Visual()
+        window = self.build_window()
+        window.window_attributes.visual = cast(pointer(visual), POINTER(c_int))
+        resolved = self.capture.resolve_target(window)
+        self.assertEquals(resolved[:6], (47, 0, 0, 30, 40, 32))
+        self.assertEquals(addressof(resolved[6].contents), addressof(visual))
+        self.backend.translate_coordinates.assert_called_once_with(
+            self.capture.display,
+            47,
+            self.ROOT
+        )
+
+    def test_window_clipped_to_the_root(self):
+        self.backend.translate_coordinates.return_value = (80, -10)
+        self.assertEquals(
+            self.capture.resolve_target(self.build_window())[:6],
+            (47, 0, 10, 20, 30, 32)
+        )
+
+    def test_window_off_the_screen(self):
+        self.backend.translate_coordinates.return_value = (200, 200)
+        self.assertRaises(
+            ShmError,
+            self.capture.resolve_target,
+            self.build_window()
+        )
+
+    def test_window_attributes_refreshed(self):
+        window = self.build_window()
+        self.capture.resolve_target(window)
+        window.invalidate.assert_called_once_with('window_attributes', 'region')
+
+    def test_unmapped_window(self):
+        self.assertRaises(
+            ShmError,
+            self.capture.resolve_target,
+            self.build_window(IsUnmapped)
+        )
+
+
+class SegmentUnitTests(ShmCaptureTestCase):
+
+    def test_reused_by_size(self):
+        first = self.capture.get_segment(30, 40, 24, self.visual)
+        self.assertIs(self.capture.get_segment(30, 40, 24, self.visual), first)
+        self.backend.create_image.assert_called_once_with(
+            self.capture.display,
+            30,
+            40,
+            24,
+            self.visual
+        )
+
+    def test_new_visual_gets_a_segment(self):
+        self.backend.visual_id.side_effect = lambda visual: addressof(visual.contents)
+        first = self.capture.get_segment(30, 40, 24, self.visual)
+        self.assertIsNot(
+            self.capture.get_segment(30, 40, 24, pointer(Visual())),
+            first
+        )
+        self.assertEquals(self.backend.create_image.call_count, 2)
+
+    def test_new_size_gets_a_segment(self):
+        first = self.capture.get_segment(30, 40, 24, self.visual)
+        self.assertIsNot(self.capture.get_segment(40, 30, 24, self.visual), first)
+
+    def test_oldest_is_released(self):
+        self.capture.max_segments = 2
+        oldest = self.capture.get_segment(1, 1, 24, self.visual)
+        self.capture.get_segment(2, 2, 24, self.visual)
+        self.capture.get_segment(3, 3, 24, self.visual)
+        oldest.release.assert_called_once_with()
+        self.assertEquals(
+            list(self.capture.segments),
+            [(2, 2, 24, self.VISUAL_ID), (3, 3, 24, self.VISUAL_ID)]
+        )
+
+    def test_extension_checked_once(self):
+        self.capture.get_segment(1, 1, 24, self.visual)
+        self.capture.get_segment(2, 2, 24, self.visual)
+        self.backend.query_extension.assert_called_once_with(
+            self.capture.display,
+            'MIT-SHM'
+        )
+
+    def test_missing_extension(self):
+        self.backend.query_extension.return_value = None
+        self.assertRaises(
+            ShmError,
+            self.capture.get_segment,
+            1,
+            1,
+            24,
+            self.visual
+        )
+
+
+class CaptureUnitTests(ShmCaptureTestCase):
+
+    def test_fills_the_segment(self):
+        segment = self.capture.capture_segment(Region(Point(10, 20), 30, 40))
+        segment.capture.assert_called_once_with(self.ROOT, 10, 20)
+
+    @patch('wotw_xlib.common.shm_capture.numpy', new=MagicMock())
+    def test_prefers_numpy(self):
+        segment = self.capture.capture_segment(Region(Point(0, 0), 1, 1))
+        self.assertIs(
+            self.capture.capture(Region(Point(0, 0), 1, 1)),
+            segment.as_numpy.return_value
+        )
+
+    @patch('wotw_xlib.common.shm_capture.numpy', new=None)
+    def test_falls_back_to_memoryview(self):
+        segment = self.capture.capture_segment(Region(Point(0, 0), 1, 1))
+        self.assertIs(
+            self.capture.capture(Region(Point(0, 0), 1, 1)),
+            segment.as_memoryview.return_value
+        )
+
+
+class ReleaseUnitTests(ShmCaptureTestCase):
+
+    def test_releases_everything(self):
+        segments = [
+            self.capture.get_segment(size, size, 24, self.visual)
+            for size in [1, 2]
+        ]
+        self.capture.release()
+        for segment in segments:
+            segment.release.assert_called_once_with()
+        self.assertEquals(len(self.capture.segments), 0)
+
+    @patch('wotw_xlib.common.NeedsDisplay.close_display')
+    def test_close_display(self, mock_close):
+        segment = self.capture.get_segment(1, 1, 24, self.visual)
+        self.capture.close_display()
+        segment.release.assert_called_once_with()
+        mock_close.assert_called_once_with()
@@ -0,0 +1,233 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import addressof, c_ubyte, pointer
+from unittest import skipIf, TestCase
+
+from mock import MagicMock, patch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from wotw_xlib.common import ShmError, ShmSegment
+from wotw_xlib.xlib import AllPlanes, Display, Visual, Window, XImage, ZPixmap
+from wotw_xlib.xext import IPC_CREAT, IPC_PRIVATE, IPC_RMID, SHM_FAILED
+
+
+class ShmSegmentTestCase(TestCase):
+    WIDTH = 3
+    HEIGHT = 2
+    # One pixel of padding per row
+    BYTES_PER_LINE = 16
+    SHMID = 5
+
+    def setUp(self):
+        self.display = Display()
+        self.image = XImage(
+            width=self.WIDTH,
+            height=self.HEIGHT,
+            bytes_per_line=self.BYTES_PER_LINE,
+            bits_per_pixel=32
+        )
+        self.buffer = (c_ubyte * (self.BYTES_PER_LINE * self.HEIGHT))(
+            *range(self.BYTES_PER_LINE * self.HEIGHT)
+        )
+        self.mocks = {}
+        for name, return_value in [
+                ['XShmCreateImage', pointer(self.image)],
+                ['shmget', self.SHMID],
+                ['shmat', addressof(self.buffer)],
+                ['shmctl', 0],
+                ['shmdt', 0],
+                ['XShmAttach', 1],
+                ['XShmDetach', 1],
+                ['XShmGetImage', 1],
+                ['XSync', 0],
+                ['XDestroyImage', 1]
+        ]:
+            patcher = patch(
+                'wotw_xlib.common.shm_segment.' + name,
+                MagicMock(return_value=return_value)
+            )
+            self.mocks[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def build_segment(self):
+        segment = ShmSegment(
+            self.display,
+            self.WIDTH,
+            self.HEIGHT,
+            24,
+            pointer(Visual())
+        )
+        self.addCleanup(segment.release)
+        return segment
+
+
+class ConstructorUnitTests(ShmSegmentTestCase):
+
+    def test_creates_a_zpixmap(self):
+        self.build_segment()
+        args = self.mocks['XShmCreateImage'].call_args[0]
+        self.assertEquals(args[2:5], (24, ZPixmap, None))
+        self.assertEquals(args[6:], (self.WIDTH, self.HEIGHT))
+
+    def test_sizes_the_segment_with_padding(self):
+        self.build_segment()
+        self.mocks['shmget'].assert_called_once_with(
+            IPC_PRIVATE,
+            self.BYTES_PER_LINE * self.HEIGHT,
+            IPC_CREAT | ShmSegment.PERMISSIONS
+        )
+
+    def test_points_the_image_at_the_segment(self):
+        segment = self.build_segment()
+        self.assertEquals(self.image.data, addressof(self.buffer))
+        self.assertEquals(segment.info.shmaddr, addressof(self.buffer))
+        self.assertEquals(segment.info.shmid, self.SHMID)
+
+    def test_removes_after_attaching(self):
+        segment = self.build_segment()
+        self.assertTrue(segment.attached)
+        self.mocks['XSync'].assert_called_once_with(self.display, 0)
+        self.mocks['shmctl'].assert_called_once_with(self.SHMID, IPC_RMID, None)
+
+
+class FailureUnitTests(ShmSegmentTestCase):
+
+    def assert_cleaned_up(self):
+        self.assertRaises(ShmError, self.build_segment)
+        self.mocks['XShmDetach'].assert_not_called()
+
+    def test_create_image(self):
+        self.mocks['XShmCreateImage'].return_value = None
+        self.assert_cleaned_up()
+        self.mocks['shmget'].assert_not_called()
+
+    def test_shmget(self):
+        self.mocks['shmget'].return_value = -1
+        self.assert_cleaned_up()
+        self.mocks['shmctl'].assert_not_called()
+        self.mocks['XDestroyImage'].assert_called_once()
+
+    def test_shmat(self):
+        self.mocks['shmat'].return_value = SHM_FAILED
+        self.assert_cleaned_up()
+        self.mocks['shmdt'].assert_not_called()
+        self.mocks['shmctl'].assert_called_once_with(self.SHMID, IPC_RMID, None)
+
+    def test_attach(self):
+        self.mocks['XShmAttach'].return_value = 0
+        self.assert_cleaned_up()
+        self.mocks['shmdt'].assert_called_once_with(addressof(self.buffer))
+        self.mocks['shmctl'].assert_called_once_with(self.SHMID, IPC_RMID, None)
+
+
+class CaptureUnitTests(ShmSegmentTestCase):
+
+    def test_reads_into_the_image(self):
+        segment = self.build_segment()
+        self.assertIs(segment.capture(Window(47), 10, 20), segment)
+        args = self.mocks['XShmGetImage'].call_args[0]
+        self.assertEquals(args[0], self.display)
+        self.assertEquals(args[1].value, 47)
+        self.assertEquals(addressof(args[2].contents), addressof(self.image))
+        self.assertEquals(args[3:], (10, 20, AllPlanes))
+
+    def test_failure(self):
+        segment = self.build_segment()
+        self.mocks['XShmGetImage'].return_value = 0
+        self.assertRaises(ShmError, segment.capture, Window(47))
+
+    def test_released(self):
+        segment = self.build_segment()
+        segment.release()
+        self.assertRaises(ShmError, segment.capture, Window(47))
+
+
+class ViewUnitTests(ShmSegmentTestCase):
+
+    def test_memoryview_covers_the_segment(self):
+        segment = self.build_segment()
+        view = segment.as_memoryview()
+        self.assertEquals(view.tobytes(), bytearray(self.buffer))
+        self.assertIs(segment.as_memoryview(), view)
+
+    def test_memoryview_is_shared(self):
+        segment = self.build_segment()
+        view = segment.as_memoryview()
+        self.buffer[0] = 99
+        self.assertEquals(bytearray(view.tobytes())[0], 99)
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_drops_padding(self):
+        segment = self.build_segment()
+        array = segment.as_numpy()
+        self.assertEquals(array.shape, (self.HEIGHT, self.WIDTH, 4))
+        self.assertEquals(list(array[1, 0]), [16, 17, 18, 19])
+        self.assertEquals(list(array[1, 2]), [24, 25, 26, 27])
+        self.assertIs(segment.as_numpy(), array)
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_is_shared(self):
+        segment = self.build_segment()
+        array = segment.as_numpy()
+        self.buffer[4] = 99
+        self.assertEquals(array[0, 1, 0], 99)
+
+    @patch('wotw_xlib.common.shm_segment.numpy', new=None)
+    def test_numpy_missing(self):
+        segment = self.build_segment()
+        self.assertRaises(ImportError, segment.as_numpy)
+
+
+class ReleaseUnitTests(ShmSegmentTestCase):
+
+    def test_detaches_everything(self):
+        segment = self.build_segment()
+        segment.release()
+        self.mocks['XShmDetach'].assert_called_once()
+        self.mocks['shmdt'].assert_called_once_with(addressof(self.buffer))
+        self.mocks['XDestroyImage'].assert_called_once()
+        self.assertIsNone(segment.image)
+        self.assertFalse(segment.attached)
+
+    def test_views_keep_the_mapping(self):
+        segment = self.build_segment()
+        view = segment.as_memoryview()
+        segment.release()
+        self.mocks['XShmDetach'].assert_called_once()
+        self.mocks['shmdt'].assert_not_called()
+        self.assertEquals(bytearray(view.tobytes())[1], 1)
+        del view
+        self.mocks['shmdt'].assert_called_once_with(addressof(self.buffer))
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_arrays_keep_the_mapping(self):
+        segment = self.build_segment()
+        array = segment.as_numpy()
+        segment.release()
+        self.mocks['shmdt'].assert_not_called()
+        self.assertEquals(list(array[1, 0]), [16, 17, 18, 19])
+        del array
+        self.mocks['shmdt'].assert_called_once_with(addressof(self.buffer))
+
+    def test_views_refused_once_released(self):
+        segment = self.build_segment()
+        segment.release()
+        self.assertRaises(ShmError, segment.as_memoryview)
+
+    def test_only_once(self):
+        segment = self.build_segment()
+        segment.release()
+        segment.release()
+        self.mocks['XShmDetach'].assert_called_once()
+        self.mocks['shmdt'].assert_called_once()
+        self.mocks['shmctl'].assert_called_once()
+
+    def test_context(self):
+        with self.build_segment() as segment:
+            pass
+        self.assertIsNone(segment.image)
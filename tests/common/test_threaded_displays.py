@@ -0,0 +1,80 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from threading import Thread
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.backends import XlibBackend
+from wotw_xlib.common import ThreadedDisplays
+
+
+class ThreadedDisplaysTestCase(TestCase):
+    DISPLAY_NAME = ':47.0'
+
+    def setUp(self):
+        init_patcher = patch('wotw_xlib.backends.xlib_backend.XInitThreads')
+        self.mock_init = init_patcher.start()
+        needs_display_patcher = patch(
+            'wotw_xlib.common.threaded_displays.NeedsDisplay',
+            side_effect=lambda name, pool, backend: MagicMock(display=MagicMock())
+        )
+        self.mock_needs_display = needs_display_patcher.start()
+        self.addCleanup(init_patcher.stop)
+        self.addCleanup(needs_display_patcher.stop)
+        for flag in ['threads_initialized', 'display_opened']:
+            flag_patcher = patch.object(XlibBackend, flag, False)
+            flag_patcher.start()
+            self.addCleanup(flag_patcher.stop)
+
+
+class InitThreadsUnitTests(ThreadedDisplaysTestCase):
+
+    def test_called_once(self):
+        ThreadedDisplays(self.DISPLAY_NAME)
+        ThreadedDisplays(self.DISPLAY_NAME)
+        self.mock_init.assert_called_once_with()
+
+    def test_backend_asked(self):
+        backend = MagicMock()
+        ThreadedDisplays(self.DISPLAY_NAME, backend)
+        backend.init_threads.assert_called_once_with()
+        self.mock_init.assert_not_called()
+
+    def test_too_late(self):
+        XlibBackend.display_opened = True
+        self.assertRaises(RuntimeError, ThreadedDisplays, self.DISPLAY_NAME)
+        self.mock_init.assert_not_called()
+
+
+class DisplayUnitTests(ThreadedDisplaysTestCase):
+
+    def test_reused_within_thread(self):
+        displays = ThreadedDisplays(self.DISPLAY_NAME)
+        self.assertIs(displays.display, displays.display)
+        self.mock_needs_display.assert_called_once_with(
+            self.DISPLAY_NAME,
+            pool=None,
+            backend=displays.backend
+        )
+
+    def test_separate_per_thread(self):
+        displays = ThreadedDisplays(self.DISPLAY_NAME)
+        collected = [displays.display]
+        worker = Thread(target=lambda: collected.append(displays.display))
+        worker.start()
+        worker.join()
+        self.assertIsNot(collected[0], collected[1])
+        self.assertEquals(len(displays.opened), 2)
+
+
+class CloseUnitTests(ThreadedDisplaysTestCase):
+
+    def test_everything_closed(self):
+        with ThreadedDisplays(self.DISPLAY_NAME) as displays:
+            displays.display
+            opened = list(displays.opened)
+        for needs_display in opened:
+            needs_display.close_display.assert_called_once_with()
+        self.assertEquals(displays.opened, [])
@@ -0,0 +1,73 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.backends import XlibBackend
+from wotw_xlib.common import ThreadedQuery, WindowSnapshot
+
+
+class ThreadedQueryTestCase(TestCase):
+    WORKERS = 2
+    WINDOWS = [1, 2, 3, 4, 5]
+
+    def setUp(self):
+        init_patcher = patch('wotw_xlib.backends.xlib_backend.XInitThreads')
+        init_patcher.start()
+        needs_display_patcher = patch(
+            'wotw_xlib.common.threaded_displays.NeedsDisplay',
+            side_effect=lambda name, pool, backend: MagicMock(display='display')
+        )
+        needs_display_patcher.start()
+        self.addCleanup(init_patcher.stop)
+        self.addCleanup(needs_display_patcher.stop)
+        for flag in ['threads_initialized', 'display_opened']:
+            flag_patcher = patch.object(XlibBackend, flag, False)
+            flag_patcher.start()
+            self.addCleanup(flag_patcher.stop)
+        self.query = ThreadedQuery(workers=self.WORKERS)
+        self.addCleanup(self.query.close)
+
+    @staticmethod
+    def snapshot(window):
+        return WindowSnapshot(window, None, None)
+
+
+class MapWindowsUnitTests(ThreadedQueryTestCase):
+
+    def test_every_window_mapped(self):
+        result = self.query.map_windows(
+            lambda display, window: [display, window],
+            self.WINDOWS
+        )
+        self.assertEquals(result, [['display', window] for window in self.WINDOWS])
+
+
+class SnapshotWindowsUnitTests(ThreadedQueryTestCase):
+
+    @patch('wotw_xlib.common.threaded_query.WindowSnapshot.collect')
+    def test_split_across_workers(self, mock_collect):
+        mock_collect.side_effect = lambda display, chunk: chunk
+        result = self.query.snapshot_windows(self.WINDOWS)
+        self.assertEquals(mock_collect.call_count, self.WORKERS)
+        self.assertEquals(sorted(result), self.WINDOWS)
+
+
+class WalkTreeUnitTests(ThreadedQueryTestCase):
+
+    @patch('wotw_xlib.common.threaded_query.PointerWindow')
+    def test_subtree_walked(self, mock_window):
+        tree = {0: [1, 2], 1: [3], 2: [], 3: []}
+        mock_window.side_effect = lambda display, window: MagicMock(
+            snapshot_children=lambda: [
+                self.snapshot(child)
+                for child in tree[getattr(window, 'value', 0)]
+            ]
+        )
+        result = self.query.walk_tree()
+        self.assertEquals(
+            sorted([snapshot.window for snapshot in result]),
+            [1, 2, 3]
+        )
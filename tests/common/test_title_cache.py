@@ -0,0 +1,128 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import EventDispatcher, TitleCache, WindowTitle
+from wotw_xlib.xlib import (
+    Display,
+    DestroyNotify,
+    PropertyChangeMask,
+    PropertyNotify,
+    StructureNotifyMask,
+    XEvent
+)
+
+
+class TitleCacheTestCase(TestCase):
+    WINDOW = 47
+    ATOMS = {
+        '_NET_WM_NAME': 300,
+        'WM_NAME': 39,
+        '_NET_WM_ICON_NAME': 301,
+        'WM_ICON_NAME': 37,
+        'WM_CLASS': 67,
+        'UTF8_STRING': 302
+    }
+
+    def setUp(self):
+        self.cache = TitleCache(Display())
+        self.addCleanup(EventDispatcher.forget, self.cache.display)
+        self.cache.backend = MagicMock()
+        self.cache.backend.pending_events.return_value = 0
+        self.cache.backend.get_properties.side_effect = self.fake_get_properties
+        self.mock_select = self.cache.backend.select_input
+        registry = MagicMock()
+        registry.__getitem__.side_effect = lambda name: self.ATOMS[name]
+        registry.intern.side_effect = lambda *names: [
+            self.ATOMS[name] for name in names
+        ]
+        atoms_patcher = patch('wotw_xlib.common.TitleCache.atoms', new=registry)
+        atoms_patcher.start()
+        self.addCleanup(atoms_patcher.stop)
+        self.properties = {}
+        self.requested = []
+
+    def fake_get_properties(self, display, requests, length):
+        self.requested.extend(atom for _, atom in requests)
+        return [self.properties.get(atom) for _, atom in requests]
+
+    def property_event(self, atom, window=WINDOW):
+        event = XEvent()
+        event.type = PropertyNotify
+        event.xproperty.window = window
+        event.xproperty.atom = atom
+        return event
+
+
+class GetTitlesUnitTests(TitleCacheTestCase):
+
+    def test_prefers_utf8_names(self):
+        self.properties[300] = (302, u'caf\xe9'.encode('utf-8'))
+        self.properties[39] = (31, b'fallback')
+        self.properties[37] = (31, b'caf\xe9')
+        self.properties[67] = (31, b'xterm\0XTerm\0')
+        title = self.cache.get_title(self.WINDOW)
+        self.assertIsInstance(title, WindowTitle)
+        self.assertEquals(title.name, u'caf\xe9')
+        self.assertEquals(title.icon_name, u'caf\xe9')
+        self.assertEquals(title.wm_class, (u'xterm', u'XTerm'))
+
+    def test_falls_back_to_wm_name(self):
+        self.properties[39] = (31, b'fallback')
+        self.assertEquals(self.cache.get_title(self.WINDOW).name, u'fallback')
+
+    def test_watched_once(self):
+        self.cache.get_title(self.WINDOW)
+        self.cache.get_title(self.WINDOW)
+        self.mock_select.assert_called_once_with(
+            self.cache.display,
+            self.WINDOW,
+            PropertyChangeMask | StructureNotifyMask
+        )
+
+    def test_unchanged_never_refetched(self):
+        self.cache.get_titles([self.WINDOW, 48])
+        self.assertEquals(len(self.requested), 10)
+        self.cache.get_titles([self.WINDOW, 48])
+        self.assertEquals(len(self.requested), 10)
+
+
+class EventUnitTests(TitleCacheTestCase):
+
+    def test_only_changed_field_refetched(self):
+        self.properties[39] = (31, b'before')
+        self.cache.get_title(self.WINDOW)
+        self.properties[39] = (31, b'after')
+        self.cache.handle_event(self.property_event(39))
+        del self.requested[:]
+        title = self.cache.get_title(self.WINDOW)
+        self.assertEquals(title.name, u'after')
+        self.assertEquals(
+            sorted(self.requested),
+            [39, 300]
+        )
+
+    def test_unrelated_property_ignored(self):
+        self.cache.get_title(self.WINDOW)
+        self.cache.handle_event(self.property_event(999))
+        self.assertEquals(self.cache.titles[self.WINDOW].stale, set())
+
+    def test_unknown_window_ignored(self):
+        self.cache.handle_event(self.property_event(39, 48))
+        self.assertNotIn(48, self.cache.titles)
+
+    def test_close_forgets(self):
+        self.cache.get_title(self.WINDOW)
+        self.cache.close_display()
+        self.assertEquals(self.cache.titles, {})
+
+    def test_destroy_forgets(self):
+        self.cache.get_title(self.WINDOW)
+        event = XEvent()
+        event.type = DestroyNotify
+        event.xdestroywindow.window = self.WINDOW
+        self.cache.handle_event(event)
+        self.assertNotIn(self.WINDOW, self.cache.titles)
@@ -0,0 +1,206 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import pointer
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from wotw_xlib.common import WindowSnapshot
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xcb import (
+    GetGeometryReply,
+    GetPropertyReply,
+    GetWindowAttributesReply,
+    TranslateCoordinatesReply
+)
+from wotw_xlib.xlib import IsUnviewable, IsViewable
+
+
+class WindowSnapshotTestCase(TestCase):
+    DEFAULT_WINDOW = 47
+    DEFAULT_REGION = Region(Point(0, 0), 10, 10)
+    INSIDE = Point(5, 5)
+    OUTSIDE = Point(50, 50)
+
+    def construct_snapshot(self, map_state=IsViewable):
+        return WindowSnapshot(
+            self.DEFAULT_WINDOW,
+            self.DEFAULT_REGION,
+            map_state
+        )
+
+
+class ConstructorUnitTests(WindowSnapshotTestCase):
+
+    def test_defaults(self):
+        snapshot = self.construct_snapshot()
+        self.assertEquals(snapshot.window, self.DEFAULT_WINDOW)
+        self.assertEquals(snapshot.region, self.DEFAULT_REGION)
+        self.assertFalse(snapshot.override_redirect)
+        self.assertIsNone(snapshot.name)
+        self.assertEquals(snapshot.border_width, 0)
+
+
+class BorderUnitTests(WindowSnapshotTestCase):
+
+    def test_bordered(self):
+        self.assertEquals(
+            WindowSnapshot.bordered(1, 2, 10, 20, 3),
+            Region.from_values(1, 2, 16, 26)
+        )
+
+    def test_to_inside(self):
+        snapshot = WindowSnapshot(
+            self.DEFAULT_WINDOW,
+            WindowSnapshot.bordered(10, 20, 10, 10, 2),
+            IsViewable,
+            border_width=2
+        )
+        self.assertEquals(snapshot.to_inside(Point(15, 25)), Point(3, 3))
+        self.assertTrue(snapshot.might_be_under_pointer(Point(23, 33)))
+
+
+@patch('wotw_xlib.common.window_snapshot.free')
+@patch('wotw_xlib.common.window_snapshot.XGetXCBConnection')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_property')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_window_attributes')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_geometry')
+class CollectUnitTests(WindowSnapshotTestCase):
+    WINDOWS = [47, 74]
+
+    def build_replies(self, border_width=0):
+        geometry = GetGeometryReply()
+        geometry.x, geometry.y = 1, 2
+        geometry.width, geometry.height = 3, 4
+        geometry.border_width = border_width
+        attributes = GetWindowAttributesReply()
+        attributes.map_state = IsViewable
+        return [pointer(geometry), pointer(attributes), pointer(GetPropertyReply())]
+
+    @patch.object(WindowSnapshot, 'parse_name', return_value='name')
+    @patch.object(WindowSnapshot, 'collect_reply')
+    def test_requests_sent_before_replies(self, mock_reply, mock_name, *mocks):
+        mock_geometry, mock_attributes, mock_property = mocks[:3]
+        manager = MagicMock()
+        manager.attach_mock(mock_geometry, 'geometry')
+        manager.attach_mock(mock_reply, 'reply')
+        mock_reply.side_effect = self.build_replies() * len(self.WINDOWS)
+        WindowSnapshot.collect('display', self.WINDOWS)
+        names = [entry[0] for entry in manager.mock_calls]
+        self.assertEquals(names[:len(self.WINDOWS)], ['geometry'] * len(self.WINDOWS))
+        self.assertEquals(mock_property.call_count, len(self.WINDOWS))
+        self.assertEquals(mock_attributes.call_count, len(self.WINDOWS))
+
+    @patch.object(WindowSnapshot, 'parse_name', return_value='name')
+    @patch.object(WindowSnapshot, 'collect_reply')
+    def test_snapshots_built(self, mock_reply, mock_name, *mocks):
+        mock_free = mocks[-1]
+        mock_reply.side_effect = self.build_replies()
+        result = WindowSnapshot.collect('display', self.WINDOWS[:1])
+        self.assertEquals(len(result), 1)
+        self.assertEquals(result[0].window, self.WINDOWS[0])
+        self.assertEquals(str(result[0].region), '(1,2)x(4,6)')
+        self.assertTrue(result[0].is_viewable())
+        self.assertEquals(result[0].name, 'name')
+        self.assertEquals(mock_free.call_count, 3)
+
+    @patch.object(WindowSnapshot, 'parse_name', return_value=None)
+    @patch.object(WindowSnapshot, 'collect_reply')
+    def test_border_included(self, mock_reply, mock_name, *mocks):
+        mock_reply.side_effect = self.build_replies(2)
+        result = WindowSnapshot.collect('display', self.WINDOWS[:1])
+        self.assertEquals(str(result[0].region), '(1,2)x(8,10)')
+        self.assertEquals(result[0].border_width, 2)
+
+    @patch.object(WindowSnapshot, 'parse_name', return_value=None)
+    @patch.object(WindowSnapshot, 'collect_reply')
+    def test_missing_windows_skipped(self, mock_reply, mock_name, *mocks):
+        replies = self.build_replies()
+        mock_reply.side_effect = [None, replies[1], replies[2]]
+        result = WindowSnapshot.collect('display', self.WINDOWS[:1])
+        self.assertEquals(result, [])
+
+
+@patch('wotw_xlib.common.window_snapshot.free')
+@patch('wotw_xlib.common.window_snapshot.XGetXCBConnection')
+@patch('wotw_xlib.common.window_snapshot.xcb_translate_coordinates')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_window_attributes')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_geometry')
+@patch('wotw_xlib.common.window_snapshot.xcb_translate_coordinates_reply')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_window_attributes_reply')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_geometry_reply')
+class CollectRelativeUnitTests(WindowSnapshotTestCase):
+
+    def test_regions_relative_to_destination(self, mock_geometry,
+                                             mock_attributes, mock_origin,
+                                             *args):
+        mock_geometry.side_effect = [
+            pointer(GetGeometryReply(x=0, y=0, width=50, height=50)),
+            None
+        ]
+        mock_attributes.side_effect = [
+            pointer(GetWindowAttributesReply(map_state=IsViewable)),
+            pointer(GetWindowAttributesReply(map_state=IsViewable))
+        ]
+        mock_origin.side_effect = [
+            pointer(TranslateCoordinatesReply(dst_x=100, dst_y=200)),
+            pointer(TranslateCoordinatesReply())
+        ]
+        snapshots = WindowSnapshot.collect_relative('display', [10, 20], 1)
+        self.assertEquals(len(snapshots), 1)
+        self.assertEquals(snapshots[0].window, 10)
+        self.assertEquals(str(snapshots[0].region), '(100,200)x(150,250)')
+        self.assertEquals(args[2].call_args[0][2:], (1, 0, 0))
+        self.assertEquals(args[-1].call_count, 5)
+
+    def test_border_outside_the_origin(self, mock_geometry, mock_attributes,
+                                       mock_origin, *args):
+        mock_geometry.return_value = pointer(
+            GetGeometryReply(width=50, height=50, border_width=2)
+        )
+        mock_attributes.return_value = pointer(GetWindowAttributesReply())
+        mock_origin.return_value = pointer(
+            TranslateCoordinatesReply(dst_x=100, dst_y=200)
+        )
+        snapshot = WindowSnapshot.collect_relative('display', [10], 1)[0]
+        self.assertEquals(str(snapshot.region), '(98,198)x(152,252)')
+        self.assertEquals(snapshot.border_width, 2)
+
+
+@patch('wotw_xlib.common.window_snapshot.free')
+@patch('wotw_xlib.common.window_snapshot.XGetXCBConnection')
+@patch('wotw_xlib.common.window_snapshot.xcb_get_property')
+class CollectPropertiesUnitTests(WindowSnapshotTestCase):
+
+    @patch.object(WindowSnapshot, 'parse_name', return_value=b'name')
+    @patch.object(WindowSnapshot, 'collect_reply')
+    def test_requests_sent_before_replies(self, mock_reply, mock_name,
+                                          mock_property, *mocks):
+        manager = MagicMock()
+        manager.attach_mock(mock_property, 'request')
+        manager.attach_mock(mock_reply, 'reply')
+        mock_reply.side_effect = [pointer(GetPropertyReply(type=31)), None]
+        self.assertEquals(
+            WindowSnapshot.collect_properties('display', [(47, 39), (74, 39)], 8),
+            [(31, b'name'), None]
+        )
+        names = [entry[0] for entry in manager.mock_calls]
+        self.assertEquals(names, ['request', 'request', 'reply', 'reply'])
+        self.assertEquals(mock_property.call_args[0][2:], (74, 39, 0, 0, 8))
+        self.assertEquals(mocks[-1].call_count, 1)
+
+
+class MightBeUnderPointerUnitTests(WindowSnapshotTestCase):
+
+    def test_viewable_and_inside(self):
+        snapshot = self.construct_snapshot()
+        self.assertTrue(snapshot.might_be_under_pointer(self.INSIDE))
+
+    def test_viewable_and_outside(self):
+        snapshot = self.construct_snapshot()
+        self.assertFalse(snapshot.might_be_under_pointer(self.OUTSIDE))
+
+    def test_hidden_and_inside(self):
+        snapshot = self.construct_snapshot(IsUnviewable)
+        self.assertFalse(snapshot.might_be_under_pointer(self.INSIDE))
@@ -0,0 +1,339 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import call, MagicMock, patch
+
+from wotw_xlib.common import (
+    EventDispatcher,
+    NeedsDisplay,
+    WindowSnapshot,
+    WindowTreeCache
+)
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import (
+    CirculateNotify,
+    ConfigureNotify,
+    CreateNotify,
+    DestroyNotify,
+    IsUnmapped,
+    IsViewable,
+    MapNotify,
+    PlaceOnBottom,
+    ReparentNotify,
+    SubstructureNotifyMask,
+    UnmapNotify,
+    Window,
+    XEvent
+)
+
+
+class WindowTreeCacheTestCase(TestCase):
+    ROOT = 1
+    ROOT_REGION = Region(Point(0, 0), 100, 100)
+    BOTTOM = 10
+    TOP = 20
+    NESTED = 21
+
+    def setUp(self):
+        self.construct_cache()
+
+    def wipe_cache(self):
+        del self.cache
+
+    def construct_cache(self):
+        open_display_patcher = patch.object(NeedsDisplay, 'open_display')
+        open_display_patcher.start()
+        pointer_window_patcher = patch(
+            'wotw_xlib.common.window_tree_cache.PointerWindow'
+        )
+        mock_pointer_window = pointer_window_patcher.start()
+        mock_pointer_window.return_value.window = Window(self.ROOT)
+        mock_pointer_window.return_value.region = self.ROOT_REGION
+        self.cache = WindowTreeCache()
+        self.cache.backend = MagicMock()
+        self.cache.root
+        pointer_window_patcher.stop()
+        open_display_patcher.stop()
+        self.addCleanup(self.wipe_cache)
+
+    def populate(self):
+        self.cache.add_window(self.ROOT, None, self.ROOT_REGION, IsViewable)
+        self.cache.add_window(
+            self.BOTTOM,
+            self.ROOT,
+            Region(Point(0, 0), 50, 50),
+            IsViewable
+        )
+        self.cache.add_window(
+            self.TOP,
+            self.ROOT,
+            Region(Point(25, 25), 50, 50),
+            IsViewable
+        )
+        self.cache.add_window(
+            self.NESTED,
+            self.TOP,
+            Region(Point(10, 10), 10, 10),
+            IsViewable
+        )
+
+    @staticmethod
+    def build_event(event_type, member, **fields):
+        event = XEvent()
+        event.type = event_type
+        for key, value in fields.items():
+            setattr(getattr(event, member), key, value)
+        return event
+
+
+class LoadUnitTests(WindowTreeCacheTestCase):
+
+    def test_tree_walked(self):
+        backend = self.cache.backend
+        backend.child_windows.return_value.__enter__.side_effect = [
+            [self.BOTTOM],
+            []
+        ]
+        backend.snapshot_windows.side_effect = [
+            [WindowSnapshot(self.BOTTOM, self.ROOT_REGION, IsViewable)],
+            []
+        ]
+        self.cache.load()
+        backend.ignore_vanished_windows.assert_called_once_with()
+        self.assertEquals(backend.select_input.call_args_list, [
+            call(self.cache.display, self.ROOT, SubstructureNotifyMask),
+            call(self.cache.display, self.BOTTOM, SubstructureNotifyMask)
+        ])
+        self.assertEquals(backend.snapshot_windows.call_args_list, [
+            call(self.cache.display, [self.BOTTOM]),
+            call(self.cache.display, [])
+        ])
+        self.assertEquals(self.cache.windows[self.ROOT].children, [self.BOTTOM])
+        self.assertEquals(self.cache.windows[self.BOTTOM].parent, self.ROOT)
+
+
+class CloseDisplayUnitTests(WindowTreeCacheTestCase):
+
+    def test_tree_dropped(self):
+        self.populate()
+        self.cache.close_display()
+        self.assertEquals(self.cache.windows, {})
+        self.assertIsNone(self.cache.current_root)
+
+
+class ProcessEventsUnitTests(WindowTreeCacheTestCase):
+
+    @patch('wotw_xlib.common.WindowTreeCache.handle_event')
+    def test_queue_drained(self, mock_handle):
+        self.addCleanup(EventDispatcher.forget, self.cache.display)
+        self.cache.backend.pending_events.side_effect = [2, 1, 0]
+        self.cache.events.register(self.cache.handle_event)
+        self.cache.process_events()
+        self.assertEquals(self.cache.backend.next_event.call_count, 2)
+        self.assertEquals(mock_handle.call_count, 2)
+
+
+class EventUnitTests(WindowTreeCacheTestCase):
+
+    def setUp(self):
+        super(EventUnitTests, self).setUp()
+        self.populate()
+
+    def test_create(self):
+        self.cache.handle_event(self.build_event(
+            CreateNotify,
+            'xcreatewindow',
+            parent=self.ROOT,
+            window=30,
+            x=1,
+            y=2,
+            width=3,
+            height=4
+        ))
+        self.assertEquals(self.cache.windows[self.ROOT].children[-1], 30)
+        self.assertEquals(self.cache.windows[30].map_state, IsUnmapped)
+        self.assertEquals(str(self.cache.windows[30].region), '(1,2)x(4,6)')
+        self.cache.backend.select_input.assert_called_once_with(
+            self.cache.display,
+            30,
+            SubstructureNotifyMask
+        )
+
+    def test_create_with_border(self):
+        self.cache.handle_event(self.build_event(
+            CreateNotify,
+            'xcreatewindow',
+            parent=self.ROOT,
+            window=30,
+            x=1,
+            y=2,
+            width=3,
+            height=4,
+            border_width=2
+        ))
+        self.assertEquals(str(self.cache.windows[30].region), '(1,2)x(8,10)')
+        self.assertEquals(self.cache.windows[30].border_width, 2)
+
+    def test_destroy(self):
+        self.cache.handle_event(self.build_event(
+            DestroyNotify,
+            'xdestroywindow',
+            event=self.ROOT,
+            window=self.TOP
+        ))
+        self.assertNotIn(self.TOP, self.cache.windows)
+        self.assertNotIn(self.NESTED, self.cache.windows)
+        self.assertEquals(self.cache.windows[self.ROOT].children, [self.BOTTOM])
+
+    def test_unmap_and_map(self):
+        self.cache.handle_event(self.build_event(
+            UnmapNotify,
+            'xunmap',
+            event=self.ROOT,
+            window=self.TOP
+        ))
+        self.assertEquals(self.cache.windows[self.TOP].map_state, IsUnmapped)
+        self.cache.handle_event(self.build_event(
+            MapNotify,
+            'xmap',
+            event=self.ROOT,
+            window=self.TOP
+        ))
+        self.assertEquals(self.cache.windows[self.TOP].map_state, IsViewable)
+
+    def test_reparent(self):
+        self.cache.handle_event(self.build_event(
+            ReparentNotify,
+            'xreparent',
+            event=self.TOP,
+            window=self.NESTED,
+            parent=self.BOTTOM,
+            x=5,
+            y=6
+        ))
+        self.assertEquals(self.cache.windows[self.TOP].children, [])
+        self.assertEquals(self.cache.windows[self.BOTTOM].children, [self.NESTED])
+        self.assertEquals(self.cache.windows[self.NESTED].parent, self.BOTTOM)
+        self.assertEquals(str(self.cache.windows[self.NESTED].region), '(5,6)x(15,16)')
+
+    def test_configure_restacks(self):
+        self.cache.handle_event(self.build_event(
+            ConfigureNotify,
+            'xconfigure',
+            event=self.ROOT,
+            window=self.BOTTOM,
+            x=1,
+            y=1,
+            width=10,
+            height=10,
+            above=self.TOP
+        ))
+        self.assertEquals(
+            self.cache.windows[self.ROOT].children,
+            [self.TOP, self.BOTTOM]
+        )
+        self.assertEquals(str(self.cache.windows[self.BOTTOM].region), '(1,1)x(11,11)')
+
+    def test_configure_border(self):
+        self.cache.handle_event(self.build_event(
+            ConfigureNotify,
+            'xconfigure',
+            event=self.ROOT,
+            window=self.BOTTOM,
+            x=1,
+            y=1,
+            width=10,
+            height=10,
+            border_width=3
+        ))
+        self.assertEquals(str(self.cache.windows[self.BOTTOM].region), '(1,1)x(17,17)')
+        self.assertEquals(self.cache.windows[self.BOTTOM].border_width, 3)
+
+    def test_circulate(self):
+        self.cache.handle_event(self.build_event(
+            CirculateNotify,
+            'xcirculate',
+            event=self.ROOT,
+            window=self.TOP,
+            place=PlaceOnBottom
+        ))
+        self.assertEquals(
+            self.cache.windows[self.ROOT].children,
+            [self.TOP, self.BOTTOM]
+        )
+
+
+class FindWindowUnderUnitTests(WindowTreeCacheTestCase):
+
+    def setUp(self):
+        super(FindWindowUnderUnitTests, self).setUp()
+        self.populate()
+
+    def test_topmost_sibling_wins(self):
+        result = self.cache.find_window_under(Point(30, 30))
+        self.assertEquals(result.window, self.TOP)
+
+    def test_descends_into_children(self):
+        result = self.cache.find_window_under(Point(40, 40))
+        self.assertEquals(result.window, self.NESTED)
+
+    def test_unmapped_windows_skipped(self):
+        self.cache.windows[self.TOP].map_state = IsUnmapped
+        result = self.cache.find_window_under(Point(30, 30))
+        self.assertEquals(result.window, self.BOTTOM)
+
+    def test_borders_count(self):
+        self.cache.add_window(
+            self.TOP,
+            self.ROOT,
+            WindowSnapshot.bordered(25, 25, 50, 50, 5),
+            IsViewable,
+            border_width=5
+        )
+        self.cache.add_window(
+            self.NESTED,
+            self.TOP,
+            Region(Point(10, 10), 10, 10),
+            IsViewable
+        )
+        self.assertEquals(self.cache.find_window_under(Point(78, 78)).window, self.TOP)
+        self.assertEquals(self.cache.find_window_under(Point(39, 39)).window, self.TOP)
+        self.assertEquals(self.cache.find_window_under(Point(40, 40)).window, self.NESTED)
+
+    def test_falls_back_to_root(self):
+        result = self.cache.find_window_under(Point(90, 10))
+        self.assertEquals(result.window, self.ROOT)
+
+    def test_nothing_loaded(self):
+        self.cache.windows = {}
+        self.assertIsNone(self.cache.find_window_under(Point(0, 0)))
+
+
+class ShapesUnitTests(WindowTreeCacheTestCase):
+
+    def setUp(self):
+        super(ShapesUnitTests, self).setUp()
+        self.populate()
+        self.shapes = MagicMock()
+        self.cache.shapes = self.shapes
+
+    def test_shaped_window_looked_through(self):
+        self.shapes.might_be_under_pointer.side_effect = (
+            lambda snapshot, location: snapshot.window != self.TOP
+        )
+        result = self.cache.find_window_under(Point(30, 30))
+        self.assertEquals(result.window, self.BOTTOM)
+
+    def test_unknown_events_left_to_dispatcher(self):
+        self.cache.handle_event(self.build_event(99, 'xany', window=self.TOP))
+        self.shapes.handle_event.assert_not_called()
+
+    def test_destroy_forgets_shape(self):
+        self.cache.handle_event(self.build_event(
+            DestroyNotify,
+            'xdestroywindow',
+            window=self.TOP
+        ))
+        self.shapes.forget.assert_called_once_with(self.TOP)
@@ -0,0 +1,96 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from wotw_xlib.common import WindowSnapshot, WindowVisibility
+from wotw_xlib.utils import Region, RegionSet
+from wotw_xlib.xlib import IsUnmapped, IsViewable
+
+
+class WindowVisibilityTestCase(TestCase):
+    SCREEN = RegionSet([Region.from_values(0, 0, 100, 100)])
+
+    @staticmethod
+    def snapshot(window, x, y, width, height, map_state=IsViewable):
+        return WindowSnapshot(
+            window,
+            Region.from_values(x, y, width, height),
+            map_state
+        )
+
+    def fractions(self, results):
+        return [(result.window, result.fraction) for result in results]
+
+
+class SweepUnitTests(WindowVisibilityTestCase):
+
+    def test_keeps_stacking_order(self):
+        results = WindowVisibility.sweep([
+            self.snapshot(1, 0, 0, 10, 10),
+            self.snapshot(2, 50, 50, 10, 10)
+        ])
+        self.assertEquals([result.window for result in results], [1, 2])
+
+    def test_top_covers_bottom(self):
+        results = WindowVisibility.sweep([
+            self.snapshot(1, 0, 0, 20, 10),
+            self.snapshot(2, 10, 0, 20, 10)
+        ])
+        self.assertEquals(self.fractions(results), [(1, 0.5), (2, 1.0)])
+        self.assertEquals(
+            list(results[0].visible),
+            [Region.from_values(0, 0, 10, 10)]
+        )
+
+    def test_fully_covered(self):
+        results = WindowVisibility.sweep([
+            self.snapshot(1, 10, 10, 10, 10),
+            self.snapshot(2, 0, 0, 50, 50)
+        ])
+        self.assertTrue(results[0].is_hidden)
+        self.assertFalse(results[1].is_hidden)
+
+    def test_covered_by_several(self):
+        results = WindowVisibility.sweep([
+            self.snapshot(1, 0, 0, 20, 20),
+            self.snapshot(2, 0, 0, 10, 20),
+            self.snapshot(3, 10, 0, 10, 20)
+        ])
+        self.assertTrue(results[0].is_hidden)
+
+    def test_unmapped_covers_nothing(self):
+        results = WindowVisibility.sweep([
+            self.snapshot(1, 0, 0, 20, 20),
+            self.snapshot(2, 0, 0, 20, 20, IsUnmapped)
+        ])
+        self.assertEquals(self.fractions(results), [(1, 1.0), (2, 0.0)])
+
+    def test_clipped(self):
+        results = WindowVisibility.sweep(
+            [self.snapshot(1, 90, 90, 20, 20)],
+            self.SCREEN
+        )
+        self.assertEquals(self.fractions(results), [(1, 0.25)])
+
+    def test_full_cover_short_circuits(self):
+        results = WindowVisibility.sweep(
+            [
+                self.snapshot(1, 10, 10, 10, 10),
+                self.snapshot(2, 200, 200, 10, 10),
+                self.snapshot(3, -10, -10, 200, 200)
+            ],
+            self.SCREEN
+        )
+        self.assertEquals(
+            self.fractions(results),
+            [(1, 0.0), (2, 0.0), (3, 0.25)]
+        )
+
+
+class FractionUnitTests(WindowVisibilityTestCase):
+
+    def test_empty_window(self):
+        result = WindowVisibility(self.snapshot(1, 0, 0, 0, 0), RegionSet())
+        self.assertEquals(result.fraction, 0.0)
+        self.assertTrue(result.is_hidden)
@@ -2,6 +2,7 @@
 from __future__ import print_function
 
 from ctypes import c_int
+from pickle import dumps, loads
 from unittest import TestCase
 
 from mock import patch
@@ -40,6 +41,25 @@ class ConstructorUnitTests(PointTestCase):
         )
 
 
+class FromValuesUnitTests(PointTestCase):
+
+    @patch(
+        'wotw_xlib.Point.parse_coordinate',
+        return_value=PointTestCase.DEFAULT_COORDINATE
+    )
+    def test_parse_skipped(self, mock_parse):
+        sample = Point.from_values(1, 2)
+        self.assertEquals(mock_parse.call_count, 0)
+        self.assertEquals((sample.x, sample.y), (1, 2))
+
+
+class FromCtypesUnitTests(PointTestCase):
+
+    def test_values_unwrapped(self):
+        sample = Point.from_ctypes(c_int(1), c_int(2))
+        self.assertEquals((sample.x, sample.y), (1, 2))
+
+
 class ParseCoordinatesUnitTests(PointTestCase):
 
     def test_plain_number(self):
@@ -66,6 +86,37 @@ class IsAboveAndLeftOfUnitTests(PointTestCase):
                 )
 
 
+class ImmutabilityUnitTests(PointTestCase):
+
+    def test_no_assignment(self):
+        sample = Point(self.DEFAULT_COORDINATE, self.DEFAULT_COORDINATE)
+        with self.assertRaises(AttributeError):
+            sample.x = 0
+        with self.assertRaises(AttributeError):
+            del sample.y
+        with self.assertRaises(AttributeError):
+            sample.z = 0
+
+    def test_pickle_round_trip(self):
+        sample = Point(self.DEFAULT_COORDINATE, 0)
+        self.assertEquals(loads(dumps(sample, 2)), sample)
+
+
+class EqualityUnitTests(PointTestCase):
+
+    def test_equal_points(self):
+        first = Point(self.DEFAULT_COORDINATE, 0)
+        second = Point(c_int(self.DEFAULT_COORDINATE), 0)
+        self.assertTrue(first == second)
+        self.assertFalse(first != second)
+        self.assertEquals(hash(first), hash(second))
+        self.assertEquals(len(set([first, second])), 1)
+
+    def test_different_points(self):
+        self.assertNotEquals(Point(0, 1), Point(1, 0))
+        self.assertNotEquals(Point(0, 1), (0, 1))
+
+
 class StrUnitTests(PointTestCase):
 
     def test_to_string(self):
@@ -74,3 +125,9 @@ class StrUnitTests(PointTestCase):
             sample.__str__(),
             "(%d,%d)" % (self.DEFAULT_COORDINATE, self.DEFAULT_COORDINATE)
         )
+
+
+class ReprUnitTests(PointTestCase):
+
+    def test_repr(self):
+        self.assertEquals(repr(Point(1, 2)), 'Point(1, 2)')
@@ -0,0 +1,50 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from array import array
+from unittest import TestCase
+
+from mock import patch
+
+from wotw_xlib.utils import Point, PointArray
+
+
+class PointArrayTestCase(TestCase):
+    POINTS = [Point(1, 2), Point(3, 4), Point(-5, 6)]
+
+
+class AsColumnUnitTests(PointArrayTestCase):
+
+    @patch('wotw_xlib.utils.point_array.numpy', None)
+    def test_array_fallback(self):
+        column = PointArray.as_column([1, 2, 3])
+        self.assertIsInstance(column, array)
+        self.assertEquals(list(column), [1, 2, 3])
+
+    def test_numpy_when_available(self):
+        column = PointArray.as_column([1, 2, 3])
+        self.assertEquals([int(value) for value in column], [1, 2, 3])
+
+
+class FromPointsUnitTests(PointArrayTestCase):
+
+    def test_columns_split(self):
+        points = PointArray.from_points(self.POINTS)
+        self.assertEquals(len(points), len(self.POINTS))
+        self.assertEquals([int(value) for value in points.x], [1, 3, -5])
+        self.assertEquals([int(value) for value in points.y], [2, 4, 6])
+
+    def test_point_rebuilt(self):
+        points = PointArray.from_points(self.POINTS)
+        self.assertEquals(str(points[2]), str(self.POINTS[2]))
+
+
+class ParsePointsUnitTests(PointArrayTestCase):
+
+    def test_passes_arrays_through(self):
+        points = PointArray.from_points(self.POINTS)
+        self.assertIs(PointArray.parse_points(points), points)
+
+    def test_converts_sequences(self):
+        points = PointArray.parse_points(self.POINTS)
+        self.assertIsInstance(points, PointArray)
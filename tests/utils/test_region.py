@@ -1,6 +1,8 @@
 # pylint: disable=missing-docstring,unused-argument,invalid-name
 from __future__ import print_function
 
+from ctypes import c_int, c_uint
+from pickle import dumps, loads
 from unittest import TestCase
 
 from mock import patch
@@ -33,6 +35,22 @@ class ConstructorUnitTests(RegionTestCase):
         self.assertEquals(region.top_left.y, region.bottom_right.y)
 
 
+class FromValuesUnitTests(RegionTestCase):
+
+    def test_corners(self):
+        region = Region.from_values(1, 2, 3, 4)
+        self.assertEquals(region.top_left, Point(1, 2))
+        self.assertEquals(region.bottom_right, Point(4, 6))
+        self.assertEquals((region.width, region.height), (3, 4))
+
+
+class FromCtypesUnitTests(RegionTestCase):
+
+    def test_values_unwrapped(self):
+        region = Region.from_ctypes(c_int(1), c_int(2), c_uint(3), c_uint(4))
+        self.assertEquals(region, Region.from_values(1, 2, 3, 4))
+
+
 class ContainsUnitTests(RegionTestCase):
 
     def test_contains(self):
@@ -50,6 +68,58 @@ class ContainsUnitTests(RegionTestCase):
                 )
 
 
+class OverlapUnitTests(RegionTestCase):
+
+    def test_overlaps(self):
+        region = Region.from_values(0, 0, 10, 10)
+        self.assertTrue(region.overlaps(Region.from_values(5, 5, 10, 10)))
+        self.assertTrue(region.overlaps(Region.from_values(2, 2, 2, 2)))
+        self.assertFalse(region.overlaps(Region.from_values(10, 0, 5, 5)))
+        self.assertFalse(region.overlaps(Region.from_values(20, 20, 5, 5)))
+
+    def test_intersection(self):
+        region = Region.from_values(0, 0, 10, 10)
+        self.assertEquals(
+            region.intersection(Region.from_values(5, -5, 10, 10)),
+            Region.from_values(5, 0, 5, 5)
+        )
+        self.assertIsNone(region.intersection(Region.from_values(10, 0, 5, 5)))
+
+    def test_union(self):
+        self.assertEquals(
+            Region.from_values(0, 0, 10, 10).union(Region.from_values(20, 5, 5, 20)),
+            Region.from_values(0, 0, 25, 25)
+        )
+
+
+class ImmutabilityUnitTests(RegionTestCase):
+
+    def test_no_assignment(self):
+        region = Region(self.DEFAULT_TOP_LEFT)
+        with self.assertRaises(AttributeError):
+            region.top_left = self.DEFAULT_BOTTOM_RIGHT
+        with self.assertRaises(AttributeError):
+            del region.bottom_right
+
+    def test_pickle_round_trip(self):
+        region = Region(self.DEFAULT_TOP_LEFT, 3, 4)
+        self.assertEquals(loads(dumps(region, 2)), region)
+
+
+class EqualityUnitTests(RegionTestCase):
+
+    def test_equal_regions(self):
+        first = Region(Point(1, 2), 3, 4)
+        second = Region.from_values(1, 2, 3, 4)
+        self.assertTrue(first == second)
+        self.assertFalse(first != second)
+        self.assertEquals(hash(first), hash(second))
+
+    def test_different_regions(self):
+        self.assertNotEquals(Region(Point(1, 2), 3, 4), Region(Point(1, 2), 4, 3))
+        self.assertNotEquals(Region(Point(1, 2)), Point(1, 2))
+
+
 class StrUnitTests(RegionTestCase):
 
     def test_to_string(self):
@@ -62,3 +132,12 @@ class StrUnitTests(RegionTestCase):
             region.__str__(),
             '(0,0)x(2,2)'
         )
+
+
+class ReprUnitTests(RegionTestCase):
+
+    def test_repr(self):
+        self.assertEquals(
+            repr(Region(Point(1, 2), 3, 4)),
+            'Region(Point(1, 2), 3, 4)'
+        )
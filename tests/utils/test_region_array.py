@@ -0,0 +1,67 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from mock import patch
+
+from wotw_xlib.utils import Point, PointArray, Region, RegionArray
+
+
+class RegionArrayTestCase(TestCase):
+    # Bottom to top
+    REGIONS = [
+        Region(Point(0, 0), 100, 100),
+        Region(Point(10, 10), 20, 20),
+        Region(Point(15, 15), 5, 5)
+    ]
+    POINTS = [Point(5, 5), Point(12, 12), Point(16, 16), Point(500, 500)]
+    EXPECTED_MATRIX = [
+        [True, False, False],
+        [True, True, False],
+        [True, True, True],
+        [False, False, False]
+    ]
+    EXPECTED_TOPMOST = [0, 1, 2, -1]
+
+    def build(self):
+        return RegionArray.from_regions(self.REGIONS)
+
+    def check_contains_many(self):
+        matrix = self.build().contains_many(self.POINTS)
+        self.assertEquals(
+            [[bool(cell) for cell in row] for row in matrix],
+            self.EXPECTED_MATRIX
+        )
+
+    def check_topmost_many(self):
+        topmost = self.build().topmost_many(PointArray.from_points(self.POINTS))
+        self.assertEquals([int(index) for index in topmost], self.EXPECTED_TOPMOST)
+
+
+class NumpyUnitTests(RegionArrayTestCase):
+
+    def test_contains_many(self):
+        self.check_contains_many()
+
+    def test_topmost_many(self):
+        self.check_topmost_many()
+
+
+@patch('wotw_xlib.utils.region_array.numpy', None)
+@patch('wotw_xlib.utils.point_array.numpy', None)
+class FallbackUnitTests(RegionArrayTestCase):
+
+    def test_contains_many(self):
+        self.check_contains_many()
+
+    def test_topmost_many(self):
+        self.check_topmost_many()
+
+
+class GetItemUnitTests(RegionArrayTestCase):
+
+    def test_region_rebuilt(self):
+        regions = self.build()
+        self.assertEquals(len(regions), len(self.REGIONS))
+        self.assertEquals(str(regions[1]), str(self.REGIONS[1]))
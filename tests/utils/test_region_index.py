@@ -0,0 +1,121 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from unittest import TestCase
+
+from wotw_xlib.utils import Point, Region, RegionIndex
+
+
+class RegionIndexTestCase(TestCase):
+    TILE_SIZE = 10
+    BIG = Region(Point(0, 0), 100, 100)
+    SMALL = Region(Point(5, 5), 10, 10)
+    FAR = Region(Point(-35, -35), 10, 10)
+
+    def setUp(self):
+        self.index = RegionIndex(self.TILE_SIZE)
+
+
+class TilesForUnitTests(RegionIndexTestCase):
+
+    def test_single_tile(self):
+        region = Region(Point(1, 1), 2, 2)
+        self.assertEquals(self.index.tiles_for(region), [(0, 0)])
+
+    def test_spanning_tiles(self):
+        self.assertEquals(
+            sorted(self.index.tiles_for(self.SMALL)),
+            [(0, 0), (0, 1), (1, 0), (1, 1)]
+        )
+
+    def test_negative_coordinates(self):
+        self.assertEquals(
+            self.index.tiles_for(self.FAR),
+            [(-4, -4), (-4, -3), (-3, -4), (-3, -3)]
+        )
+
+
+class InsertUnitTests(RegionIndexTestCase):
+
+    def test_default_stacking_is_on_top(self):
+        self.index.insert('big', self.BIG)
+        self.index.insert('small', self.SMALL)
+        self.assertEquals(self.index.query(Point(6, 6)), ['small', 'big'])
+
+    def test_explicit_stacking(self):
+        self.index.insert('big', self.BIG, 5)
+        self.index.insert('small', self.SMALL, 1)
+        self.assertEquals(self.index.query(Point(6, 6)), ['big', 'small'])
+        self.index.insert('next', self.SMALL)
+        self.assertEquals(self.index.entries['next'][1], 6)
+
+    def test_reinsert_replaces(self):
+        self.index.insert('small', self.SMALL)
+        self.index.insert('small', self.FAR)
+        self.assertEquals(len(self.index), 1)
+        self.assertEquals(self.index.query(Point(6, 6)), [])
+
+
+class RemoveUnitTests(RegionIndexTestCase):
+
+    def test_tiles_emptied(self):
+        self.index.insert('small', self.SMALL)
+        self.index.remove('small')
+        self.assertNotIn('small', self.index)
+        self.assertEquals(self.index.tiles, {})
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.index.remove('small')
+
+
+class UpdateUnitTests(RegionIndexTestCase):
+
+    def test_moves_region(self):
+        self.index.insert('small', self.SMALL)
+        self.index.update('small', self.FAR)
+        self.assertEquals(self.index.query(Point(6, 6)), [])
+        self.assertEquals(self.index.query(Point(-28, -28)), ['small'])
+
+    def test_restacks_only(self):
+        self.index.insert('big', self.BIG)
+        self.index.insert('small', self.SMALL)
+        self.index.update('big', stacking=10)
+        self.assertEquals(self.index.query(Point(6, 6)), ['big', 'small'])
+        self.assertEquals(self.index.entries['big'][0], self.BIG)
+
+
+class QueryUnitTests(RegionIndexTestCase):
+
+    def test_shared_tile_but_outside(self):
+        self.index.insert('small', self.SMALL)
+        self.assertEquals(self.index.query(Point(1, 1)), [])
+
+    def test_find_topmost(self):
+        self.index.insert('big', self.BIG)
+        self.index.insert('small', self.SMALL)
+        self.assertEquals(self.index.find_topmost(Point(6, 6)), 'small')
+        self.assertEquals(self.index.find_topmost(Point(50, 50)), 'big')
+        self.assertIsNone(self.index.find_topmost(Point(500, 500)))
+
+
+class QueryRegionUnitTests(RegionIndexTestCase):
+
+    def test_topmost_first(self):
+        self.index.insert('big', self.BIG)
+        self.index.insert('small', self.SMALL)
+        self.assertEquals(
+            self.index.query_region(Region(Point(0, 0), 8, 8)),
+            ['small', 'big']
+        )
+
+    def test_shared_tile_but_outside(self):
+        self.index.insert('small', self.SMALL)
+        self.assertEquals(self.index.query_region(Region(Point(0, 0), 3, 3)), [])
+
+    def test_each_key_once(self):
+        self.index.insert('big', self.BIG)
+        self.assertEquals(
+            self.index.query_region(Region(Point(0, 0), 50, 50)),
+            ['big']
+        )
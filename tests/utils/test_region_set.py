@@ -0,0 +1,216 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from pickle import dumps, loads
+from random import Random
+from unittest import TestCase
+
+from wotw_xlib.utils import Point, Region, RegionSet
+from wotw_xlib.utils.region_set import (
+    combine_spans,
+    INTERSECTION,
+    SUBTRACTION,
+    UNION
+)
+
+
+class RegionSetTestCase(TestCase):
+    LEFT = Region.from_values(0, 0, 10, 10)
+    RIGHT = Region.from_values(5, 5, 10, 10)
+
+    @staticmethod
+    def pixels(regions):
+        return set(
+            (x, y)
+            for region in regions
+            for x in range(region.top_left.x, region.bottom_right.x)
+            for y in range(region.top_left.y, region.bottom_right.y)
+        )
+
+    def assert_canonical(self, region_set):
+        previous = None
+        for top, bottom, spans in region_set.bands:
+            self.assertLess(top, bottom)
+            self.assertTrue(spans)
+            self.assertEquals(len(spans) % 2, 0)
+            self.assertEquals(list(spans), sorted(set(spans)))
+            if previous is not None:
+                self.assertLessEqual(previous[1], top)
+                if previous[1] == top:
+                    self.assertNotEqual(previous[2], spans)
+            previous = (top, bottom, spans)
+
+
+class CombineSpansUnitTests(RegionSetTestCase):
+
+    def test_union(self):
+        self.assertEquals(
+            combine_spans((0, 5, 10, 15), (3, 12), UNION),
+            (0, 15)
+        )
+
+    def test_touching_ranges_merge(self):
+        self.assertEquals(
+            combine_spans((0, 5), (5, 10), UNION),
+            (0, 10)
+        )
+
+    def test_intersection(self):
+        self.assertEquals(
+            combine_spans((0, 5, 10, 15), (3, 12), INTERSECTION),
+            (3, 5, 10, 12)
+        )
+
+    def test_subtraction(self):
+        self.assertEquals(
+            combine_spans((0, 15), (3, 5, 10, 12), SUBTRACTION),
+            (0, 3, 5, 10, 12, 15)
+        )
+
+
+class ConstructorUnitTests(RegionSetTestCase):
+
+    def test_empty(self):
+        region_set = RegionSet()
+        self.assertFalse(region_set)
+        self.assertEquals(region_set.area, 0)
+        self.assertIsNone(region_set.bounds)
+
+    def test_single_region(self):
+        region_set = RegionSet([self.LEFT])
+        self.assertEquals(region_set.bands, ((0, 10, (0, 10)),))
+        self.assertEquals(list(region_set), [self.LEFT])
+
+    def test_degenerate_regions_ignored(self):
+        self.assertFalse(RegionSet([Region.from_values(0, 0, 0, 10)]))
+
+    def test_overlapping_regions_are_banded(self):
+        region_set = RegionSet([self.LEFT, self.RIGHT])
+        self.assertEquals(
+            region_set.bands,
+            ((0, 5, (0, 10)), (5, 10, (0, 15)), (10, 15, (5, 15)))
+        )
+        self.assertEquals(region_set.area, 175)
+
+    def test_stacked_regions_coalesce(self):
+        region_set = RegionSet([
+            Region.from_values(0, 0, 10, 5),
+            Region.from_values(0, 5, 10, 5)
+        ])
+        self.assertEquals(region_set.bands, ((0, 10, (0, 10)),))
+
+
+class AlgebraUnitTests(RegionSetTestCase):
+
+    def test_union(self):
+        union = RegionSet([self.LEFT]) | RegionSet([self.RIGHT])
+        self.assertEquals(union, RegionSet([self.LEFT, self.RIGHT]))
+
+    def test_intersection(self):
+        self.assertEquals(
+            list(RegionSet([self.LEFT]) & RegionSet([self.RIGHT])),
+            [Region.from_values(5, 5, 5, 5)]
+        )
+
+    def test_subtraction(self):
+        difference = RegionSet([self.LEFT]) - RegionSet([self.RIGHT])
+        self.assertEquals(
+            list(difference),
+            [Region.from_values(0, 0, 10, 5), Region.from_values(0, 5, 5, 5)]
+        )
+        self.assertEquals(difference.area, 75)
+
+    def test_empty_operands(self):
+        full, empty = RegionSet([self.LEFT]), RegionSet()
+        self.assertEquals(full | empty, full)
+        self.assertEquals(empty | full, full)
+        self.assertEquals(full - empty, full)
+        self.assertFalse(empty - full)
+        self.assertFalse(full & empty)
+
+    def test_vertically_disjoint(self):
+        below = Region.from_values(0, 20, 10, 10)
+        self.assertEquals(
+            list(RegionSet([self.LEFT]) | RegionSet([below])),
+            [self.LEFT, below]
+        )
+        self.assertEquals(
+            list(RegionSet([below]) - RegionSet([self.LEFT])),
+            [below]
+        )
+        self.assertFalse(RegionSet([below]) & RegionSet([self.LEFT]))
+
+    def test_subtracting_everything(self):
+        self.assertFalse(RegionSet([self.RIGHT]) - RegionSet([self.LEFT, self.RIGHT]))
+
+    def test_hole(self):
+        hole = RegionSet([Region.from_values(0, 0, 30, 30)]) - RegionSet([
+            Region.from_values(10, 10, 10, 10)
+        ])
+        self.assertEquals(hole.area, 800)
+        self.assertEquals(len(hole), 4)
+        self.assertEquals(hole.bounds, Region.from_values(0, 0, 30, 30))
+
+    def test_matches_pixels(self):
+        generator = Random(47)
+        for _ in range(100):
+            first, second = [
+                [
+                    Region.from_values(
+                        generator.randint(0, 30),
+                        generator.randint(0, 30),
+                        generator.randint(1, 12),
+                        generator.randint(1, 12)
+                    )
+                    for _ in range(generator.randint(1, 6))
+                ]
+                for _ in range(2)
+            ]
+            first_set, second_set = RegionSet(first), RegionSet(second)
+            first_pixels, second_pixels = self.pixels(first), self.pixels(second)
+            for result, expected in [
+                    [first_set | second_set, first_pixels | second_pixels],
+                    [first_set & second_set, first_pixels & second_pixels],
+                    [first_set - second_set, first_pixels - second_pixels]
+            ]:
+                self.assert_canonical(result)
+                self.assertEquals(self.pixels(result), expected)
+                self.assertEquals(result.area, len(expected))
+
+
+class ContainsUnitTests(RegionSetTestCase):
+
+    def test_half_open(self):
+        region_set = RegionSet([self.LEFT, self.RIGHT])
+        for point, expected in [
+                [Point(0, 0), True],
+                [Point(9, 4), True],
+                [Point(10, 4), False],
+                [Point(14, 14), True],
+                [Point(15, 14), False],
+                [Point(2, 12), False],
+                [Point(-1, 0), False],
+                [Point(0, 15), False]
+        ]:
+            self.assertEquals(region_set.contains(point), expected, point)
+
+    def test_empty(self):
+        self.assertFalse(RegionSet().contains(Point(0, 0)))
+
+
+class ImmutabilityUnitTests(RegionSetTestCase):
+
+    def test_no_assignment(self):
+        region_set = RegionSet([self.LEFT])
+        self.assertRaises(AttributeError, setattr, region_set, 'bands', ())
+        self.assertRaises(AttributeError, delattr, region_set, 'bands')
+
+    def test_pickle_round_trip(self):
+        region_set = RegionSet([self.LEFT, self.RIGHT])
+        self.assertEquals(loads(dumps(region_set)), region_set)
+
+    def test_hashable(self):
+        self.assertEquals(
+            len(set([RegionSet([self.LEFT]), RegionSet([self.LEFT])])),
+            1
+        )
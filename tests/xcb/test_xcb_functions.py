@@ -0,0 +1,4 @@
+# pylint: disable=missing-docstring,unused-import
+import wotw_xlib.xcb.functions
+
+# Does absolutely nothing
@@ -0,0 +1,57 @@
+# pylint: disable=missing-docstring,unused-argument,invalid-name
+from __future__ import print_function
+
+from ctypes import c_int
+from unittest import TestCase
+
+from mock import patch
+
+from wotw_xlib.xlib.lazy_bindings import LazyBindings, MissingBinding
+
+
+class LazyBindingsTestCase(TestCase):
+    LIBRARIES = {
+        'lib': 'libfake.so.1'
+    }
+    BINDINGS = {
+        'fake_function': ('lib', [c_int], c_int)
+    }
+
+    def setUp(self):
+        self.namespace = {}
+        self.binder = LazyBindings(self.namespace, self.LIBRARIES, self.BINDINGS)
+        cdll_patcher = patch('wotw_xlib.xlib.lazy_bindings.CDLL')
+        self.mock_cdll = cdll_patcher.start()
+        self.addCleanup(cdll_patcher.stop)
+
+
+class LoadLibraryUnitTests(LazyBindingsTestCase):
+
+    def test_loads_once(self):
+        library = self.binder('lib')
+        self.assertIs(self.binder.load_library('lib'), library)
+        self.mock_cdll.assert_called_once_with('libfake.so.1')
+        self.assertIs(self.namespace['lib'], library)
+
+
+class BindUnitTests(LazyBindingsTestCase):
+
+    def test_declares_the_signature(self):
+        function = self.binder('fake_function')
+        self.assertIs(function, self.mock_cdll.return_value.fake_function)
+        self.assertEquals(function.argtypes, [c_int])
+        self.assertEquals(function.restype, c_int)
+        self.assertIs(self.namespace['fake_function'], function)
+
+    def test_unknown_name(self):
+        self.assertRaises(AttributeError, self.binder, 'not_a_function')
+
+    def test_missing_library(self):
+        self.mock_cdll.side_effect = OSError('not found')
+        function = self.binder('fake_function')
+        self.assertIsInstance(function, MissingBinding)
+        self.assertRaises(OSError, function, 1)
+
+    def test_bind_all(self):
+        bound = self.binder.bind_all()
+        self.assertEquals(sorted(bound), ['fake_function', 'lib'])
@@ -1,6 +1,24 @@
-# pylint: disable=wildcard-import
-"""Placeholder"""
+"""
+Placeholder. Nothing below is imported until it's read, so Point and Region
+work on hosts without X and the C libraries only load when they're needed.
+"""
 
-from .utils import *
-from .xlib import *
-from .common import *
+from importlib import import_module
+
+from wotw_xlib.lazy_module import LazyModule
+
+# Searched in order; utils goes first since it never touches ctypes
+SUBPACKAGES = ['utils', 'xlib', 'common']
+
+
+def resolve(name):
+    """Finds the subpackage, or the first subpackage that exports the name"""
+    if name in SUBPACKAGES:
+        return import_module('wotw_xlib.' + name)
+    for subpackage in SUBPACKAGES:
+        module = import_module('wotw_xlib.' + subpackage)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(name)
+
+LazyModule.install(__name__, resolve)
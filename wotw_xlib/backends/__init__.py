@@ -0,0 +1,5 @@
+"""Placeholder"""
+
+from .backend import Backend
+from .xlib_backend import XLIB_BACKEND, XlibBackend
+from .fake_backend import FakeBackend, FakeDisplay, FakeWindow
@@ -0,0 +1,267 @@
+"""This file provides Backend, the interface PointerWindow can query through"""
+
+from abc import ABCMeta, abstractmethod
+
+from wotw_xlib import common
+
+
+class Backend(ABCMeta('AbstractBackend', (object,), {})):
+    """
+    This class lists everything NeedsDisplay and PointerWindow ask of a
+    server; they never talk to libX11 themselves. XlibBackend is the default.
+    Windows are plain numbers. Every request is abstract, so a backend that
+    misses one fails when it's constructed. The batch and sampling helpers
+    are built out of the single requests, so a backend only has to override
+    them when it can do better.
+    """
+
+    @abstractmethod
+    def open_display(self, display_name=None):
+        """Connects and returns the display handle"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close_display(self, display):
+        """Disconnects"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def root_window(self, display):
+        """Gets the root window of the default screen"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_pointer(self, display, window):
+        """Returns (root_x, root_y, win_x, win_y, child)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_geometry(self, display, window):
+        """Returns (x, y, width, height), relative to the parent"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_window_attributes(self, display, window):
+        """Returns an XWindowAttributes"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_names(self, display, window):
+        """Returns [name, icon_name]"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_tree(self, display, window):
+        """Returns the children, bottom to top"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_input(self, display, window, event_mask):
+        """Adds to the events this client selected on the window"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def pending_events(self, display):
+        """Counts the events already queued, without blocking"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def next_event(self, display, event):
+        """Copies the next queued event into an XEvent"""
+        raise NotImplementedError
+
+    def init_threads(self):
+        """
+        Connections are about to be used from more than one thread. Backends
+        whose client library needs process-wide setup for that do it here.
+        """
+
+    def ignore_vanished_windows(self):
+        """
+        Windows can disappear between an event and a request about them.
+        Backends that treat that as fatal stop doing so; nothing else has to.
+        Every call is paired with a stop_ignoring_vanished_windows.
+        """
+
+    def stop_ignoring_vanished_windows(self, display):
+        """
+        Undoes one ignore_vanished_windows. Errors about the display's earlier
+        requests may still be on their way, so they're settled first.
+        """
+
+    @abstractmethod
+    def intern_atoms(self, display, names):
+        """Returns an atom per name, AtomNone for names the server lacks"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_atom_names(self, display, atoms):
+        """Returns a name per atom, None for atoms the server lacks"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_window_list(self, display, window, atom, length):
+        """Returns a window list property, or None if it isn't set"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_property(self, display, window, atom, length):
+        """Returns a property as (type, bytes), or None if it isn't set"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def translate_coordinates(self, display, window, destination):
+        """Returns the window's origin in the destination's coordinates"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def screen_format(self, display):
+        """Returns (depth, visual) for the default screen"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def visual_id(self, visual):
+        """Returns the visual's ID, or None without a visual"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_extension(self, display, name):
+        """
+        Returns the extension's first event type, or None when the server
+        doesn't have it
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_shape_input(self, display, window):
+        """Asks for ShapeNotify on the window"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_shape_rectangles(self, display, window, kind):
+        """Returns one of the window's shapes as Regions, relative to it"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_screen_changes(self, display, window):
+        """Asks for RRScreenChangeNotify on the root"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_monitors(self, display, window):
+        """Returns (name atom, Region, primary) for every monitor"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_configuration(self, event):
+        """Lets the client library see a screen change"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_damage(self, display, drawable):
+        """Starts accumulating damage on the drawable"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def destroy_damage(self, display, damage):
+        """Stops accumulating damage"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def collect_damage(self, display, damage):
+        """Returns the accumulated damage as Regions and starts over"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_image(self, display, width, height, depth, visual):
+        """
+        Returns an image to capture into; it has width, height, depth,
+        capture(drawable, x, y), as_memoryview(), as_numpy(), and release()
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_sub_image(self, display, drawable, region, image):
+        """Copies the drawable's pixels in region into the same spot in image"""
+        raise NotImplementedError
+
+    @staticmethod
+    def fill(values, out=None):
+        """Returns the values, or copies them into out"""
+        if out is None:
+            return tuple(values)
+        for index, value in enumerate(values):
+            out[index] = value
+        return out
+
+    def sample_pointer(self, display, window, out=None):
+        """Returns or fills (root_x, root_y, win_x, win_y)"""
+        return self.fill(self.query_pointer(display, window)[:4], out)
+
+    def sample_geometry(self, display, window, out=None):
+        """Returns or fills (x, y, width, height)"""
+        return self.fill(self.get_geometry(display, window), out)
+
+    def child_windows(self, display, window):
+        """Wraps the children in a ChildWindows"""
+        return common.ChildWindows.from_sequence(self.query_tree(display, window))
+
+    def snapshot_windows(self, display, windows):
+        """Builds a WindowSnapshot per window out of the other requests"""
+        snapshots = []
+        for window in windows:
+            attributes = self.get_window_attributes(display, window)
+            snapshots.append(
+                common.WindowSnapshot(
+                    window,
+                    common.WindowSnapshot.bordered(
+                        attributes.x,
+                        attributes.y,
+                        attributes.width,
+                        attributes.height,
+                        attributes.border_width
+                    ),
+                    attributes.map_state,
+                    bool(attributes.override_redirect),
+                    self.get_names(display, window)[0],
+                    attributes.border_width
+                )
+            )
+        return snapshots
+
+    def get_properties(self, display, requests, length):
+        """Runs get_property for every (window, atom) pair, in order"""
+        return [
+            self.get_property(display, window, atom, length)
+            for window, atom in requests
+        ]
+
+    def snapshot_relative(self, display, windows, destination):
+        """
+        Builds a WindowSnapshot per window whose region is in the
+        destination's coordinates; translating moves the inside origin
+        """
+        snapshots = []
+        for window in windows:
+            attributes = self.get_window_attributes(display, window)
+            origin_x, origin_y = self.translate_coordinates(
+                display,
+                window,
+                destination
+            )
+            snapshots.append(
+                common.WindowSnapshot(
+                    window,
+                    common.WindowSnapshot.bordered(
+                        origin_x - attributes.border_width,
+                        origin_y - attributes.border_width,
+                        attributes.width,
+                        attributes.height,
+                        attributes.border_width
+                    ),
+                    attributes.map_state,
+                    bool(attributes.override_redirect),
+                    border_width=attributes.border_width
+                )
+            )
+        return snapshots
@@ -0,0 +1,636 @@
+"""This file provides FakeBackend, an in-memory X server model"""
+
+from ctypes import pointer
+from struct import pack
+
+from wotw_xlib import common
+from wotw_xlib.backends.backend import Backend
+from wotw_xlib.utils import Region
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.xlib import (
+    AtomNone,
+    ConfigureNotify,
+    CreateNotify,
+    DestroyNotify,
+    Display,
+    IsUnmapped,
+    IsUnviewable,
+    IsViewable,
+    MapNotify,
+    PropertyChangeMask,
+    PropertyNotify,
+    ReparentNotify,
+    StructureNotifyMask,
+    SubstructureNotifyMask,
+    UnmapNotify,
+    XA_WINDOW,
+    XEvent,
+    XWindowAttributes
+)
+from wotw_xlib.xext import RRScreenChangeNotify, ShapeNotify, XDamageNotify
+
+
+class FakeDisplay(Display):
+    """Display handles the fake hands out; each connection gets its own"""
+    # pylint: disable=too-few-public-methods
+
+
+def window_id(window):
+    """Windows can come in as ctypes values or plain numbers"""
+    return getattr(window, 'value', window)
+
+
+class FakeWindow(object):
+    """This class holds the server-side state of a single window"""
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            window,
+            parent,
+            x,
+            y,
+            width,
+            height,
+            mapped=True,
+            override_redirect=False,
+            name=None,
+            pixel=0,
+            border_width=0
+    ):
+        """Ctor assigns everything and starts with no children"""
+        # pylint: disable=too-many-arguments
+        self.window = window
+        self.parent = parent
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.border_width = border_width
+        self.mapped = mapped
+        self.override_redirect = override_redirect
+        self.name = name
+        self.icon_name = name
+        # Every pixel of the window is this 32-bit value
+        self.pixel = pixel
+        # Bottom to top, just like XQueryTree
+        self.children = []
+        # Selected events, by the id of the display that selected them
+        self.event_masks = {}
+        # Ids of the displays that asked for ShapeNotify
+        self.shape_watchers = set()
+        # Atom to (type atom, value); window lists are lists, the rest bytes
+        self.properties = {}
+        # Shape kind to Regions; missing kinds cover the whole window
+        self.shapes = {}
+
+    def contains(self, x, y):
+        """
+        Checks a point in parent coordinates against the window and its
+        border; the edges are inclusive
+        """
+        outer = 2 * self.border_width
+        return (
+            self.x <= x <= self.x + self.width + outer
+            and
+            self.y <= y <= self.y + self.height + outer
+        )
+
+
+class FakeImage(object):
+    """
+    This class stands in for an MIT-SHM segment. Pixels are 4 bytes with no
+    row padding, and each one is copied from the window that was grabbed.
+    Reading anything off the screen raises ValueError, where the server
+    would send a BadMatch.
+    """
+
+    PIXEL_SIZE = 4
+
+    def __init__(self, backend, width, height, depth):
+        """Ctor starts out black"""
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.buffer = bytearray(width * height * self.PIXEL_SIZE)
+
+    def check_on_screen(self, drawable, region):
+        """Raises unless the drawable's region is all on the root"""
+        origin_x, origin_y = self.backend.origin_of(window_id(drawable))
+        root = self.backend.windows[self.backend.ROOT]
+        if (
+                origin_x + region.top_left.x < 0
+                or
+                origin_y + region.top_left.y < 0
+                or
+                origin_x + region.bottom_right.x > root.width
+                or
+                origin_y + region.bottom_right.y > root.height
+        ):
+            raise ValueError('BadMatch: the read goes past the screen')
+
+    def paint(self, drawable, region):
+        """Fills the region with the drawable's pixel"""
+        value = pack('<I', self.backend.windows[window_id(drawable)].pixel)
+        for row in range(region.top_left.y, region.bottom_right.y):
+            start = (row * self.width + region.top_left.x) * self.PIXEL_SIZE
+            self.buffer[start:start + region.width * self.PIXEL_SIZE] = (
+                value * region.width
+            )
+
+    def capture(self, drawable, x=0, y=0):
+        """Grabs the whole image's worth, starting at x, y"""
+        self.check_on_screen(
+            drawable,
+            Region.from_values(x, y, self.width, self.height)
+        )
+        self.paint(drawable, Region.from_values(0, 0, self.width, self.height))
+        return self
+
+    def as_memoryview(self):
+        """Exposes the pixels as flat bytes"""
+        return memoryview(self.buffer)
+
+    def as_numpy(self):
+        """Exposes the pixels as a (height, width, 4) array"""
+        return numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(
+            self.height,
+            self.width,
+            self.PIXEL_SIZE
+        )
+
+    def release(self):
+        """Nothing is shared, so there's nothing to detach"""
+
+
+class FakeBackend(Backend):
+    """
+    This class models a single screen: a window tree with geometry, map state,
+    stacking, names, properties, shapes, monitors, damage, and the pointer.
+    Changes made through it are queued as events for every display that
+    selected them, the way the server would. Nothing touches a socket, so
+    traversals and indexes can be timed on huge trees without any server
+    latency.
+    """
+    # pylint: disable=too-many-public-methods
+
+    ROOT = 1
+
+    DEPTH = 24
+
+    # First event of each extension; remove one to pretend it's missing
+    EXTENSIONS = {
+        'DAMAGE': 91,
+        'MIT-SHM': 0,
+        'RANDR': 89,
+        'SHAPE': 64
+    }
+
+    # Interned atoms start past the predefined ones
+    FIRST_ATOM = 1000
+
+    def __init__(self, width=1920, height=1080):
+        """Ctor starts with a bare, mapped root and the pointer at the origin"""
+        self.windows = {
+            self.ROOT: FakeWindow(self.ROOT, None, 0, 0, width, height)
+        }
+        self.next_window = self.ROOT + 1
+        self.pointer = (0, 0)
+        self.open_displays = 0
+        self.extensions = dict(self.EXTENSIONS)
+        # Queued events, by the id of the display they're for
+        self.queues = {}
+        self.atoms = {'WINDOW': XA_WINDOW}
+        self.atom_names = {XA_WINDOW: 'WINDOW'}
+        self.monitors = [('default', Region.from_values(0, 0, width, height), True)]
+        self.screen_watchers = set()
+        # Damage handle to [display id, window, Regions]
+        self.damages = {}
+        self.next_damage = 1
+
+    def open_display(self, display_name=None):
+        """Hands out a fresh handle"""
+        self.open_displays += 1
+        display = FakeDisplay()
+        self.queues[id(display)] = []
+        return display
+
+    def close_display(self, display):
+        """Forgets a handle and everything attached to it"""
+        common.AtomRegistry.forget(display)
+        common.EventDispatcher.forget(display)
+        self.queues.pop(id(display), None)
+        self.open_displays -= 1
+
+    def root_window(self, display):
+        """There's only ever one screen"""
+        return self.ROOT
+
+    def post(self, display_key, event_type, reported_on, member=None, **fields):
+        """Queues an event reported on a window for one display"""
+        event = XEvent()
+        event.type = event_type
+        event.xany.window = reported_on
+        for key, value in fields.items():
+            setattr(getattr(event, member), key, value)
+        self.queues.setdefault(display_key, []).append(event)
+
+    def notify(self, changed, event_type, member, extra_parents=(), **fields):
+        """
+        Reports a change to a window through StructureNotify on it and
+        SubstructureNotify on its parent, plus any parent it just left
+        """
+        targets = [(changed, StructureNotifyMask)]
+        parents = [self.windows[changed].parent] + list(extra_parents)
+        targets.extend([
+            (parent, SubstructureNotifyMask)
+            for parent in parents
+            if parent is not None
+        ])
+        for target, mask in targets:
+            for display_key, event_mask in self.windows[target].event_masks.items():
+                if event_mask & mask:
+                    self.post(display_key, event_type, target, member, **fields)
+
+    def create_window(self, parent=None, x=0, y=0, width=1, height=1, **kwargs):
+        """Adds a window on top of its siblings and returns its ID"""
+        parent = self.ROOT if parent is None else parent
+        window = self.next_window
+        self.next_window += 1
+        self.windows[window] = FakeWindow(window, parent, x, y, width, height, **kwargs)
+        self.windows[parent].children.append(window)
+        self.notify(
+            window,
+            CreateNotify,
+            'xcreatewindow',
+            parent=parent,
+            window=window,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            border_width=self.windows[window].border_width,
+            override_redirect=int(self.windows[window].override_redirect)
+        )
+        if self.windows[window].mapped:
+            self.notify(window, MapNotify, 'xmap', window=window)
+        return window
+
+    def destroy_window(self, window):
+        """Drops a window and everything under it, reporting the children first"""
+        cached = self.windows[window]
+        for child in list(cached.children):
+            self.destroy_window(child)
+        self.notify(window, DestroyNotify, 'xdestroywindow', window=window)
+        self.windows[cached.parent].children.remove(window)
+        del self.windows[window]
+
+    def reparent_window(self, window, parent, x, y):
+        """Moves a window on top of a new parent's children"""
+        cached = self.windows[window]
+        previous_parent = cached.parent
+        self.windows[cached.parent].children.remove(window)
+        cached.parent = parent
+        cached.x = x
+        cached.y = y
+        self.windows[parent].children.append(window)
+        self.notify(
+            window,
+            ReparentNotify,
+            'xreparent',
+            extra_parents=[previous_parent],
+            window=window,
+            parent=parent,
+            x=x,
+            y=y,
+            override_redirect=int(cached.override_redirect)
+        )
+
+    def notify_configure(self, window):
+        """Reports the window's geometry and the sibling it's stacked on"""
+        cached = self.windows[window]
+        siblings = self.windows[cached.parent].children
+        position = siblings.index(window)
+        self.notify(
+            window,
+            ConfigureNotify,
+            'xconfigure',
+            window=window,
+            x=cached.x,
+            y=cached.y,
+            width=cached.width,
+            height=cached.height,
+            border_width=cached.border_width,
+            above=siblings[position - 1] if position else 0
+        )
+
+    def raise_window(self, window):
+        """Moves a window to the top of its siblings"""
+        siblings = self.windows[self.windows[window].parent].children
+        siblings.remove(window)
+        siblings.append(window)
+        self.notify_configure(window)
+
+    def configure_window(self, window, x, y, width, height):
+        """Moves and resizes a window"""
+        cached = self.windows[window]
+        cached.x = x
+        cached.y = y
+        cached.width = width
+        cached.height = height
+        self.notify_configure(window)
+
+    def set_mapped(self, window, mapped=True):
+        """Maps or unmaps a window"""
+        self.windows[window].mapped = mapped
+        if mapped:
+            self.notify(window, MapNotify, 'xmap', window=window)
+        else:
+            self.notify(window, UnmapNotify, 'xunmap', window=window)
+
+    def warp_pointer(self, x, y):
+        """Moves the pointer, in root coordinates"""
+        self.pointer = (x, y)
+
+    def intern(self, name):
+        """Interns a single name on the server side"""
+        if name not in self.atoms:
+            atom = self.FIRST_ATOM + len(self.atoms)
+            self.atoms[name] = atom
+            self.atom_names[atom] = name
+        return self.atoms[name]
+
+    def set_property(self, window, name, type_name, value):
+        """
+        Sets a property; window lists are lists of IDs, anything else bytes.
+        Reported to PropertyChangeMask on the window.
+        """
+        atom = self.intern(name)
+        self.windows[window].properties[atom] = (self.intern(type_name), value)
+        for display_key, event_mask in self.windows[window].event_masks.items():
+            if event_mask & PropertyChangeMask:
+                self.post(
+                    display_key,
+                    PropertyNotify,
+                    window,
+                    'xproperty',
+                    window=window,
+                    atom=atom
+                )
+
+    def set_shape(self, window, kind, regions):
+        """Replaces one of the window's shapes and reports ShapeNotify"""
+        self.windows[window].shapes[kind] = list(regions)
+        if 'SHAPE' not in self.extensions:
+            return
+        for display_key in self.windows[window].shape_watchers:
+            self.post(display_key, self.extensions['SHAPE'] + ShapeNotify, window)
+
+    def set_monitors(self, monitors):
+        """
+        Replaces the (name, Region, primary) monitors and reports
+        RRScreenChangeNotify
+        """
+        self.monitors = list(monitors)
+        if 'RANDR' not in self.extensions:
+            return
+        for display_key in self.screen_watchers:
+            self.post(
+                display_key,
+                self.extensions['RANDR'] + RRScreenChangeNotify,
+                self.ROOT
+            )
+
+    def damage_window(self, window, region):
+        """
+        Adds a window-relative Region to every damage on the window. Like
+        XDamageReportNonEmpty, only the first since the last drain is reported.
+        """
+        for display_key, drawable, regions in self.damages.values():
+            if drawable != window:
+                continue
+            if not regions:
+                self.post(
+                    display_key,
+                    self.extensions['DAMAGE'] + XDamageNotify,
+                    window
+                )
+            regions.append(region)
+
+    def populate(self, width, depth, overlap=0.5, parent=None):
+        """
+        Builds width children under every window, depth levels deep. Each
+        child is half its parent's size and overlaps its previous sibling by
+        the given fraction. Returns the topmost leaf.
+        """
+        pending = [(self.ROOT if parent is None else parent, 0)]
+        topmost = None
+        while pending:
+            parent, level = pending.pop(0)
+            cached = self.windows[parent]
+            child_size = max(4, min(cached.width, cached.height) // 2)
+            step = max(1, int(child_size * (1 - overlap)))
+            room = max(1, min(cached.width, cached.height) - child_size)
+            for index in range(width):
+                topmost = self.create_window(
+                    parent,
+                    (index * step) % room,
+                    (index * step * 3) % room,
+                    child_size,
+                    child_size
+                )
+                if level + 1 < depth:
+                    pending.append((topmost, level + 1))
+        return topmost
+
+    def origin_of(self, window):
+        """Sums the offsets, borders included, up to the root"""
+        x, y = 0, 0
+        while window != self.ROOT:
+            cached = self.windows[window]
+            x += cached.x + cached.border_width
+            y += cached.y + cached.border_width
+            window = cached.parent
+        return x, y
+
+    def map_state_of(self, window):
+        """Unviewable means mapped under an unmapped ancestor"""
+        cached = self.windows[window]
+        if not cached.mapped:
+            return IsUnmapped
+        while cached.parent is not None:
+            cached = self.windows[cached.parent]
+            if not cached.mapped:
+                return IsUnviewable
+        return IsViewable
+
+    def query_pointer(self, display, window):
+        """Reports the topmost viewable child under the pointer, like X does"""
+        origin_x, origin_y = self.origin_of(window)
+        win_x = self.pointer[0] - origin_x
+        win_y = self.pointer[1] - origin_y
+        child = 0
+        for candidate in reversed(self.windows[window].children):
+            cached = self.windows[candidate]
+            if cached.mapped and cached.contains(win_x, win_y):
+                child = candidate
+                break
+        return self.pointer[0], self.pointer[1], win_x, win_y, child
+
+    def get_geometry(self, display, window):
+        """Reports the geometry relative to the parent"""
+        cached = self.windows[window_id(window)]
+        return cached.x, cached.y, cached.width, cached.height
+
+    def get_window_attributes(self, display, window):
+        """Fills in the attributes PointerWindow actually reads"""
+        window = window_id(window)
+        cached = self.windows[window]
+        return XWindowAttributes(
+            x=cached.x,
+            y=cached.y,
+            width=cached.width,
+            height=cached.height,
+            border_width=cached.border_width,
+            depth=self.DEPTH,
+            map_state=self.map_state_of(window),
+            override_redirect=int(cached.override_redirect),
+            your_event_mask=cached.event_masks.get(id(display), 0)
+        )
+
+    def get_names(self, display, window):
+        """Reports the names as bytes, like XFetchName"""
+        cached = self.windows[window]
+        return [
+            None if cached.name is None else cached.name.encode('utf-8'),
+            None if cached.icon_name is None else cached.icon_name.encode('utf-8')
+        ]
+
+    def query_tree(self, display, window):
+        """Copies the children, bottom to top"""
+        return list(self.windows[window].children)
+
+    def select_input(self, display, window, event_mask):
+        """Records the mask; matching changes are queued from then on"""
+        event_masks = self.windows[window].event_masks
+        event_masks[id(display)] = event_masks.get(id(display), 0) | event_mask
+
+    def pending_events(self, display):
+        """Counts the display's queue"""
+        return len(self.queues.get(id(display), []))
+
+    def next_event(self, display, event):
+        """Copies the oldest queued event out"""
+        pointer(event)[0] = self.queues[id(display)].pop(0)
+
+    def snapshot_windows(self, display, windows):
+        """Skips vanished windows, like the XCB batch"""
+        return super(FakeBackend, self).snapshot_windows(
+            display,
+            [window for window in windows if window in self.windows]
+        )
+
+    def snapshot_relative(self, display, windows, destination):
+        """Skips vanished windows, like the XCB batch"""
+        return super(FakeBackend, self).snapshot_relative(
+            display,
+            [window for window in windows if window in self.windows],
+            destination
+        )
+
+    def intern_atoms(self, display, names):
+        """Interns everything, since nothing asks only_if_exists"""
+        return [self.intern(name) for name in names]
+
+    def get_atom_names(self, display, atoms):
+        """Looks the atoms up"""
+        return [self.atom_names.get(atom) for atom in atoms]
+
+    def get_window_list(self, display, window, atom, length):
+        """Reports anything that isn't a window list as empty"""
+        cached = self.windows.get(window)
+        entry = None if cached is None else cached.properties.get(atom)
+        if entry is None:
+            return None
+        if XA_WINDOW != entry[0]:
+            return []
+        return list(entry[1])[:length]
+
+    def get_property(self, display, window, atom, length):
+        """Length is in 32-bit units, like GetProperty"""
+        cached = self.windows.get(window)
+        if cached is None:
+            return None
+        property_type, value = cached.properties.get(atom, (AtomNone, b''))
+        return property_type, value[:length * 4]
+
+    def translate_coordinates(self, display, window, destination):
+        """Subtracts the origins"""
+        origin_x, origin_y = self.origin_of(window)
+        destination_x, destination_y = self.origin_of(destination)
+        return origin_x - destination_x, origin_y - destination_y
+
+    def screen_format(self, display):
+        """Visuals don't mean anything here"""
+        return self.DEPTH, None
+
+    def visual_id(self, visual):
+        """Every fake visual is the same one"""
+        return None
+
+    def query_extension(self, display, name):
+        """Reports whatever's left in extensions"""
+        return self.extensions.get(name)
+
+    def select_shape_input(self, display, window):
+        """Records the watcher"""
+        self.windows[window].shape_watchers.add(id(display))
+
+    def get_shape_rectangles(self, display, window, kind):
+        """Unset shapes cover the whole window, just like X"""
+        cached = self.windows[window]
+        return list(cached.shapes.get(
+            kind,
+            [Region.from_values(0, 0, cached.width, cached.height)]
+        ))
+
+    def select_screen_changes(self, display, window):
+        """Records the watcher"""
+        self.screen_watchers.add(id(display))
+
+    def get_monitors(self, display, window):
+        """Interns the monitor names"""
+        return [
+            (self.intern(name), region, primary)
+            for name, region, primary in self.monitors
+        ]
+
+    def update_configuration(self, event):
+        """There's no client-side copy to update"""
+
+    def create_damage(self, display, drawable):
+        """Hands out a handle"""
+        damage = self.next_damage
+        self.next_damage += 1
+        self.damages[damage] = [id(display), window_id(drawable), []]
+        return damage
+
+    def destroy_damage(self, display, damage):
+        """Forgets the handle"""
+        self.damages.pop(damage, None)
+
+    def collect_damage(self, display, damage):
+        """Hands the regions over and starts over"""
+        regions = self.damages[damage][2]
+        self.damages[damage][2] = []
+        return regions
+
+    def create_image(self, display, width, height, depth, visual):
+        """Images live in plain memory"""
+        return FakeImage(self, width, height, depth)
+
+    def get_sub_image(self, display, drawable, region, image):
+        """Paints just the region"""
+        image.check_on_screen(drawable, region)
+        image.paint(drawable, region)
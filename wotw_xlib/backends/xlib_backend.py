@@ -0,0 +1,504 @@
+"""This file provides XlibBackend, the Backend that talks to a real server"""
+
+from ctypes import (
+    byref,
+    cast,
+    c_char_p,
+    c_int,
+    c_uint,
+    c_ulong,
+    c_void_p,
+    POINTER,
+    string_at
+)
+from threading import local, Lock
+
+from wotw_xlib import common, xext
+from wotw_xlib.backends.backend import Backend
+from wotw_xlib.utils import Region
+from wotw_xlib.xlib import (
+    AllPlanes,
+    Atom,
+    AtomNone,
+    BadDrawable,
+    BadWindow,
+    Coordinate,
+    Success,
+    Window,
+    XA_WINDOW,
+    XCloseDisplay,
+    XDefaultDepth,
+    XDefaultScreen,
+    XDefaultVisual,
+    XErrorHandler,
+    XFetchName,
+    XFree,
+    XGetAtomNames,
+    XGetGeometry,
+    XGetSubImage,
+    XGetWindowProperty,
+    XGetWMIconName,
+    XGetWindowAttributes,
+    XInitThreads,
+    XInternAtoms,
+    XNextEvent,
+    XOpenDisplay,
+    XPending,
+    XQueryPointer,
+    XQueryTree,
+    XRootWindow,
+    XSelectInput,
+    XSetErrorHandler,
+    XTextProperty,
+    XSync,
+    XTranslateCoordinates,
+    XVisualIDFromVisual,
+    XWindowAttributes,
+    ZPixmap
+)
+from wotw_xlib.xext import (
+    RRScreenChangeNotifyMask,
+    ShapeNotifyMask,
+    XDamageReportNonEmpty,
+    XFixesRegionNone
+)
+
+
+class XlibBackend(Backend):
+    """
+    This class sends every request through libX11, except snapshots, which
+    go out as one pipelined XCB batch. Sampling reuses a QueryScratch per
+    thread, so one instance can be shared by the whole process. Xlib only
+    supports threads when XInitThreads runs before the first XOpenDisplay,
+    so a threaded instance calls it before opening anything, and asking for
+    threads after a display was opened raises.
+    """
+
+    VANISHED_WINDOW_ERRORS = [BadWindow, BadDrawable]
+
+    # The error handler is process-wide, so it's shared by every instance
+    previous_error_handler = None
+    error_handler = None
+    error_handler_users = 0
+    error_handler_lock = Lock()
+
+    # Extensions that report their event base, by name
+    EXTENSION_QUERIES = {
+        'DAMAGE': 'XDamageQueryExtension',
+        'RANDR': 'XRRQueryExtension',
+        'SHAPE': 'XShapeQueryExtension'
+    }
+
+    # XInitThreads is process-wide, and so is every XOpenDisplay before it
+    threads_initialized = False
+    display_opened = False
+    threads_lock = Lock()
+
+    def __init__(self, threaded=False):
+        """Ctor allocates nothing until a thread samples"""
+        self.local = local()
+        self.threaded = threaded
+
+    def open_display(self, display_name=None):
+        """Connects with XOpenDisplay, turning on Xlib's locking first if threaded"""
+        if self.threaded:
+            self.init_threads()
+        with self.threads_lock:
+            XlibBackend.display_opened = True
+        return XOpenDisplay(display_name)
+
+    def init_threads(self):
+        """
+        Calls XInitThreads exactly once per process. Once a display has been
+        opened without it, it's too late, and this raises RuntimeError.
+        """
+        with self.threads_lock:
+            if XlibBackend.threads_initialized:
+                return
+            if XlibBackend.display_opened:
+                raise RuntimeError(
+                    'XInitThreads has to run before the first XOpenDisplay'
+                )
+            XInitThreads()
+            XlibBackend.threads_initialized = True
+
+    def close_display(self, display):
+        """Forgets the display's atoms and dispatcher before closing it"""
+        common.AtomRegistry.forget(display)
+        common.EventDispatcher.forget(display)
+        XCloseDisplay(display)
+
+    def root_window(self, display):
+        """Gets the root window of the default screen"""
+        return XRootWindow(display, XDefaultScreen(display))
+
+    def query_pointer(self, display, window):
+        """Returns (root_x, root_y, win_x, win_y, child) from one request"""
+        (root_x, root_y) = (Coordinate(), Coordinate())
+        (win_x, win_y) = (Coordinate(), Coordinate())
+        child = Window()
+        XQueryPointer(
+            display,
+            window,
+            Window(),
+            byref(child),
+            byref(root_x),
+            byref(root_y),
+            byref(win_x),
+            byref(win_y),
+            c_ulong()
+        )
+        return (
+            root_x.value,
+            root_y.value,
+            win_x.value,
+            win_y.value,
+            child.value
+        )
+
+    def get_geometry(self, display, window):
+        """Returns (x, y, width, height), relative to the parent"""
+        (win_x, win_y) = (Coordinate(), Coordinate())
+        (width, height) = (c_uint(), c_uint())
+        XGetGeometry(
+            display,
+            window,
+            Window(),
+            byref(win_x),
+            byref(win_y),
+            byref(width),
+            byref(height),
+            c_uint(),
+            c_uint()
+        )
+        return (win_x.value, win_y.value, width.value, height.value)
+
+    def get_window_attributes(self, display, window):
+        """Collects the window attributes"""
+        win_attributes = XWindowAttributes()
+        XGetWindowAttributes(display, window, byref(win_attributes))
+        return win_attributes
+
+    def get_names(self, display, window):
+        """Collects the WM Name and WM Icon Name, freeing Xlib's copies"""
+        name = c_char_p()
+        XFetchName(display, window, byref(name))
+        props = XTextProperty()
+        XGetWMIconName(display, window, byref(props))
+        names = [name.value, props.value]
+        for address in [
+                cast(name, c_void_p).value,
+                c_void_p.from_buffer(props, XTextProperty.value.offset).value
+        ]:
+            if address:
+                XFree(address)
+        return names
+
+    def query_tree(self, display, window):
+        """Copies the children out so the Xlib buffer can be freed"""
+        with self.child_windows(display, window) as children:
+            return list(children)
+
+    def select_input(self, display, window, event_mask):
+        """
+        XSelectInput replaces the whole mask this client has on the window,
+        so the mask already there is read back first and kept
+        """
+        XSelectInput(
+            display,
+            window,
+            self.get_window_attributes(display, window).your_event_mask
+            | event_mask
+        )
+
+    def pending_events(self, display):
+        """XPending flushes, but never blocks"""
+        return XPending(display)
+
+    def next_event(self, display, event):
+        """Takes the next event off the queue"""
+        XNextEvent(display, byref(event))
+
+    def ignore_vanished_windows(self):
+        """
+        The default handler treats any error as fatal, so only errors about
+        vanished windows are swallowed; the rest go to the old handler. The
+        handler stays installed until every caller has stopped ignoring them.
+        """
+        cls = type(self)
+        with cls.error_handler_lock:
+            cls.error_handler_users += 1
+            if cls.error_handler is None:
+                cls.error_handler = XErrorHandler(cls.handle_error)
+                cls.previous_error_handler = XSetErrorHandler(cls.error_handler)
+
+    def stop_ignoring_vanished_windows(self, display):
+        """Syncs while still ignoring, then puts the old handler back after the last user"""
+        cls = type(self)
+        with cls.error_handler_lock:
+            if cls.error_handler_users == 0:
+                return
+            if display:
+                XSync(display, False)
+            cls.error_handler_users -= 1
+            if cls.error_handler_users == 0:
+                XSetErrorHandler(cls.previous_error_handler)
+                cls.error_handler = None
+                cls.previous_error_handler = None
+
+    @classmethod
+    def handle_error(cls, display, error):
+        """Ignores vanished windows and passes everything else along"""
+        if error.contents.error_code in cls.VANISHED_WINDOW_ERRORS:
+            return 0
+        return cls.previous_error_handler(display, error)
+
+    def intern_atoms(self, display, names):
+        """Interns every name with one XInternAtoms"""
+        atoms = (Atom * len(names))()
+        XInternAtoms(
+            display,
+            (c_char_p * len(names))(*[
+                common.atom_registry.encode_name(name) for name in names
+            ]),
+            len(names),
+            False,
+            atoms
+        )
+        return list(atoms)
+
+    def get_atom_names(self, display, atoms):
+        """Resolves every atom with one XGetAtomNames, freeing Xlib's copies"""
+        names = [None] * len(atoms)
+        raw_names = (c_void_p * len(atoms))()
+        if XGetAtomNames(display, (Atom * len(atoms))(*atoms), len(atoms), raw_names):
+            for index, address in enumerate(raw_names):
+                if address:
+                    names[index] = common.atom_registry.decode_name(
+                        string_at(address)
+                    )
+                    XFree(address)
+        return names
+
+    def get_window_list(self, display, window, atom, length):
+        """Reads a format 32 XA_WINDOW property with one XGetWindowProperty"""
+        actual_type = Atom()
+        actual_format = c_int()
+        number_of_items = c_ulong()
+        bytes_after = c_ulong()
+        value = c_void_p()
+        status = XGetWindowProperty(
+            display,
+            window,
+            atom,
+            0,
+            length,
+            False,
+            XA_WINDOW,
+            byref(actual_type),
+            byref(actual_format),
+            byref(number_of_items),
+            byref(bytes_after),
+            byref(value)
+        )
+        try:
+            if Success != status or AtomNone == actual_type.value:
+                return None
+            if 32 != actual_format.value or not value:
+                return []
+            # Format 32 properties come back as C longs
+            return cast(value, POINTER(Window))[0:number_of_items.value]
+        finally:
+            if value:
+                XFree(value.value)
+
+    def get_property(self, display, window, atom, length):
+        """A batch of one"""
+        return self.get_properties(display, [(window, atom)], length)[0]
+
+    def get_properties(self, display, requests, length):
+        """Sends the whole batch before waiting on a single reply"""
+        return common.WindowSnapshot.collect_properties(display, requests, length)
+
+    def translate_coordinates(self, display, window, destination):
+        """Translates the window's own origin"""
+        (dest_x, dest_y) = (c_int(), c_int())
+        XTranslateCoordinates(
+            display,
+            window,
+            destination,
+            0,
+            0,
+            byref(dest_x),
+            byref(dest_y),
+            byref(Window())
+        )
+        return (dest_x.value, dest_y.value)
+
+    def snapshot_relative(self, display, windows, destination):
+        """Sends the whole batch before waiting on a single reply"""
+        return common.WindowSnapshot.collect_relative(display, windows, destination)
+
+    def screen_format(self, display):
+        """Reads the default screen's depth and visual"""
+        screen = XDefaultScreen(display)
+        return XDefaultDepth(display, screen), XDefaultVisual(display, screen)
+
+    def visual_id(self, visual):
+        """Reads it client-side; NULL pointers are falsy"""
+        return XVisualIDFromVisual(visual) if visual else None
+
+    def query_extension(self, display, name):
+        """MIT-SHM doesn't report its event base, so it comes back as 0"""
+        if 'MIT-SHM' == name:
+            return 0 if xext.XShmQueryExtension(display) else None
+        event_base, error_base = c_int(), c_int()
+        query = getattr(xext, self.EXTENSION_QUERIES[name])
+        if not query(display, byref(event_base), byref(error_base)):
+            return None
+        return event_base.value
+
+    def select_shape_input(self, display, window):
+        """Asks for ShapeNotify"""
+        xext.XShapeSelectInput(display, window, ShapeNotifyMask)
+
+    def get_shape_rectangles(self, display, window, kind):
+        """Copies the rectangles out so Xlib's buffer can be freed"""
+        count, ordering = c_int(), c_int()
+        rectangles = xext.XShapeGetRectangles(
+            display,
+            window,
+            kind,
+            byref(count),
+            byref(ordering)
+        )
+        if not rectangles:
+            return []
+        try:
+            return [
+                Region.from_values(
+                    rectangle.x,
+                    rectangle.y,
+                    rectangle.width,
+                    rectangle.height
+                )
+                for rectangle in rectangles[:count.value]
+            ]
+        finally:
+            XFree(rectangles)
+
+    def select_screen_changes(self, display, window):
+        """Asks for RRScreenChangeNotify"""
+        xext.XRRSelectInput(display, window, RRScreenChangeNotifyMask)
+
+    def get_monitors(self, display, window):
+        """Copies the active monitors out of one XRRGetMonitors"""
+        count = c_int()
+        infos = xext.XRRGetMonitors(display, window, 1, byref(count))
+        try:
+            return [
+                (
+                    info.name,
+                    Region.from_values(info.x, info.y, info.width, info.height),
+                    bool(info.primary)
+                )
+                for info in (infos[:count.value] if infos else [])
+            ]
+        finally:
+            if infos:
+                xext.XRRFreeMonitors(infos)
+
+    def update_configuration(self, event):
+        """Xlib keeps its own copy of the screen size"""
+        xext.XRRUpdateConfiguration(byref(event))
+
+    def create_damage(self, display, drawable):
+        """NonEmpty only reports once between drains; the rectangles come later"""
+        return xext.XDamageCreate(display, drawable, XDamageReportNonEmpty)
+
+    def destroy_damage(self, display, damage):
+        """Frees the damage object"""
+        xext.XDamageDestroy(display, damage)
+
+    def collect_damage(self, display, damage):
+        """
+        Moves the damage into a scratch region and reads it back, which is a
+        single round trip
+        """
+        parts = xext.XFixesCreateRegion(display, None, 0)
+        try:
+            xext.XDamageSubtract(display, damage, XFixesRegionNone, parts)
+            count = c_int()
+            rectangles = xext.XFixesFetchRegion(display, parts, byref(count))
+            if not rectangles:
+                return []
+            try:
+                return [
+                    Region.from_values(
+                        rectangle.x,
+                        rectangle.y,
+                        rectangle.width,
+                        rectangle.height
+                    )
+                    for rectangle in rectangles[:count.value]
+                ]
+            finally:
+                XFree(rectangles)
+        finally:
+            xext.XFixesDestroyRegion(display, parts)
+
+    def create_image(self, display, width, height, depth, visual):
+        """Images live in MIT-SHM segments"""
+        return common.ShmSegment(display, width, height, depth, visual)
+
+    def get_sub_image(self, display, drawable, region, image):
+        """XGetSubImage into the segment's XImage"""
+        XGetSubImage(
+            display,
+            drawable,
+            region.top_left.x,
+            region.top_left.y,
+            region.width,
+            region.height,
+            AllPlanes,
+            ZPixmap,
+            image.image,
+            region.top_left.x,
+            region.top_left.y
+        )
+
+    def get_scratch(self):
+        """Lazily allocates this thread's out-parameters"""
+        scratch = getattr(self.local, 'scratch', None)
+        if scratch is None:
+            scratch = self.local.scratch = common.QueryScratch()
+        return scratch
+
+    def sample_pointer(self, display, window, out=None):
+        """Reuses the scratch out-parameters instead of allocating"""
+        return self.get_scratch().query_pointer(display, window, out)
+
+    def sample_geometry(self, display, window, out=None):
+        """Reuses the scratch out-parameters instead of allocating"""
+        return self.get_scratch().query_geometry(display, window, out)
+
+    def child_windows(self, display, window):
+        """Hands out Xlib's buffer itself; it's freed with the ChildWindows"""
+        child_pointers = POINTER(Window)()
+        number_of_children = c_uint()
+        XQueryTree(
+            display,
+            window,
+            Window(),
+            Window(),
+            byref(child_pointers),
+            byref(number_of_children)
+        )
+        return common.ChildWindows(child_pointers, number_of_children.value)
+
+    def snapshot_windows(self, display, windows):
+        """Sends the whole batch before waiting on a single reply"""
+        return common.WindowSnapshot.collect(display, windows)
+
+
+XLIB_BACKEND = XlibBackend()
@@ -1,4 +1,54 @@
-"""Placeholder"""
+"""
+Placeholder. Each module is only imported once one of its names is read, so
+the extensions behind SHM, damage, RandR, and shapes never load their
+libraries unless they're used.
+"""
 
-from .needs_display import NeedsDisplay
-from .pointer_window import PointerWindow
+from importlib import import_module
+
+from wotw_xlib.lazy_module import LazyModule
+
+# Maps every exported name to the module that defines it
+EXPORTS = {
+    'AtomRegistry': 'atom_registry',
+    'DISPLAY_POOL': 'display_pool',
+    'DisplayPool': 'display_pool',
+    'EventDispatcher': 'event_dispatcher',
+    'NeedsDisplay': 'needs_display',
+    'BINDING_STATS': 'binding_stats',
+    'BindingStats': 'binding_stats',
+    'ChildWindows': 'child_windows',
+    'QueryScratch': 'query_scratch',
+    'WindowSnapshot': 'window_snapshot',
+    'WindowVisibility': 'window_visibility',
+    'PointerWindow': 'pointer_window',
+    'ShapeCache': 'shape_cache',
+    'EwmhClients': 'ewmh_clients',
+    'WindowTreeCache': 'window_tree_cache',
+    'TitleCache': 'title_cache',
+    'WindowTitle': 'title_cache',
+    'ShmError': 'shm_segment',
+    'ShmSegment': 'shm_segment',
+    'ShmCapture': 'shm_capture',
+    'DamageError': 'damage_tracker',
+    'DamageTracker': 'damage_tracker',
+    'Monitor': 'monitor_layout',
+    'MonitorLayout': 'monitor_layout',
+    'RandrError': 'monitor_layout',
+    'ThreadedDisplays': 'threaded_displays',
+    'ThreadedQuery': 'threaded_query',
+    # asyncio is Python 3 only, so this raises ImportError on Python 2
+    'AsyncDisplay': 'async_display'
+}
+
+
+def resolve(name):
+    """Imports the module behind an exported name, or a module by name"""
+    if name in EXPORTS:
+        module = import_module('wotw_xlib.common.' + EXPORTS[name])
+        return getattr(module, name)
+    if name in set(EXPORTS.values()):
+        return import_module('wotw_xlib.common.' + name)
+    raise AttributeError(name)
+
+LazyModule.install(__name__, resolve)
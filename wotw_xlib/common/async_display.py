@@ -0,0 +1,296 @@
+"""
+This file provides AsyncDisplay, which runs a Display on an asyncio loop. It
+needs Python 3; wotw_xlib.common skips it everywhere else.
+"""
+
+import asyncio
+from collections import deque
+from ctypes import byref, cast, c_void_p, POINTER, sizeof, string_at
+
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import (
+    XConnectionNumber,
+    XDefaultScreen,
+    XEvent,
+    XFlush,
+    XRootWindow
+)
+from wotw_xlib.xcb import (
+    free,
+    GenericError,
+    GetGeometryReply,
+    GetWindowAttributesReply,
+    QueryPointerReply,
+    QueryTreeReply,
+    XGetXCBConnection,
+    xcb_flush,
+    xcb_get_geometry,
+    xcb_get_window_attributes,
+    xcb_poll_for_reply,
+    xcb_query_pointer,
+    xcb_query_tree,
+    xcb_query_tree_children,
+    xcb_query_tree_children_length
+)
+from wotw_xlib.common import NeedsDisplay
+
+
+class XRequestError(RuntimeError):
+    """This is raised from an awaited request the server rejected"""
+
+    def __init__(self, error_code, sequence):
+        """Ctor keeps the raw error details"""
+        super(XRequestError, self).__init__(
+            "X error %d on request %d" % (error_code, sequence)
+        )
+        self.error_code = error_code
+        self.sequence = sequence
+
+
+class EventStream(object):
+    """
+    This class is the async iterator AsyncDisplay.open_event_stream hands
+    out. A consumer that falls behind loses its oldest events once
+    max_buffered are waiting; dropped counts them.
+    """
+
+    # Plenty for a burst, without letting an idle stream grow forever
+    MAX_BUFFERED = 1024
+
+    def __init__(self, loop, max_buffered=MAX_BUFFERED):
+        """Ctor starts with nothing buffered"""
+        self.loop = loop
+        self.buffered = deque(maxlen=max_buffered)
+        self.dropped = 0
+        self.waiter = None
+        self.closed = False
+
+    def push(self, event):
+        """Wakes a waiting consumer or buffers the event"""
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(event)
+            self.waiter = None
+            return
+        if len(self.buffered) == self.buffered.maxlen:
+            self.dropped += 1
+        self.buffered.append(event)
+
+    def close(self):
+        """Ends iteration once the buffer drains"""
+        self.closed = True
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_exception(StopAsyncIteration())
+            self.waiter = None
+
+    def __aiter__(self):
+        """Streams are their own iterators"""
+        return self
+
+    def __anext__(self):
+        """Returns a future for the next event"""
+        future = self.loop.create_future()
+        if self.buffered:
+            future.set_result(self.buffered.popleft())
+        elif self.closed:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self.waiter = future
+        return future
+
+
+class AsyncDisplay(NeedsDisplay):
+    """
+    This class registers the Display socket with an asyncio loop. Events are
+    dispatched whenever it's readable, and queries are sent as XCB requests
+    whose replies are collected without blocking, so any number of callers
+    can have requests in flight on one connection and one thread. Event
+    streams share the display's EventDispatcher with every other watcher.
+    """
+
+    def __init__(self, display=None, loop=None):
+        """
+        Ctor wires the connection into the loop, which defaults to the
+        running one or else a new one. The loop owns the socket, so this
+        never leases a pooled connection.
+        """
+        super(AsyncDisplay, self).__init__(display, pool=None)
+        self.loop = self.find_loop() if loop is None else loop
+        self.connection = XGetXCBConnection(self.display)
+        self.root_window = XRootWindow(self.display, XDefaultScreen(self.display))
+        self.pending_replies = {}
+        self.streams = []
+        self.events.register(self.handle_event)
+        self.file_descriptor = XConnectionNumber(self.display)
+        self.loop.add_reader(self.file_descriptor, self.on_readable)
+
+    @staticmethod
+    def find_loop():
+        """Attaches to the running loop, or starts a new one outside of one"""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.new_event_loop()
+
+    def on_readable(self):
+        """
+        Reading events off the socket can buffer replies too, and those
+        won't make it readable again. Replies are collected after every
+        dispatch until a pass doesn't resolve any more.
+        """
+        self.collect_replies()
+        self.process_events()
+        while self.pending_replies:
+            waiting = len(self.pending_replies)
+            self.collect_replies()
+            if len(self.pending_replies) == waiting:
+                break
+            self.process_events()
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """Copies the event to every open stream; the dispatcher reuses its own"""
+        if not self.streams:
+            return
+        event = XEvent.from_buffer_copy(event)
+        for stream in self.streams:
+            stream.push(event)
+
+    def open_event_stream(self, max_buffered=EventStream.MAX_BUFFERED):
+        """Opens a new async iterator over X events"""
+        stream = EventStream(self.loop, max_buffered)
+        self.streams.append(stream)
+        return stream
+
+    def send(self, cookie, parse_reply):
+        """
+        Tracks a request and returns a future for its parsed reply. Any
+        synchronous call on this display might have read the reply already,
+        and then the socket never wakes the loop for it, so replies are
+        collected once more on the next pass.
+        """
+        future = self.loop.create_future()
+        self.pending_replies[cookie.sequence] = [future, parse_reply]
+        xcb_flush(self.connection)
+        self.loop.call_soon(self.collect_replies)
+        return future
+
+    def collect_replies(self):
+        """Resolves every request whose reply or error has arrived"""
+        for sequence, (future, parse_reply) in list(self.pending_replies.items()):
+            reply = c_void_p()
+            error = POINTER(GenericError)()
+            if not xcb_poll_for_reply(self.connection, sequence, byref(reply), byref(error)):
+                continue
+            del self.pending_replies[sequence]
+            if error:
+                future.set_exception(
+                    XRequestError(error.contents.error_code, sequence)
+                )
+                free(error)
+            elif reply:
+                future.set_result(parse_reply(reply.value))
+                free(reply)
+            else:
+                future.set_result(None)
+
+    @staticmethod
+    def copy_reply(reply_type, address):
+        """Copies a fixed-size reply out of XCB's buffer"""
+        return reply_type.from_buffer_copy(string_at(address, sizeof(reply_type)))
+
+    def query_pointer(self, window=None):
+        """Awaits [root location, window location, child]"""
+        def parse_reply(address):
+            """Builds the same shape get_mouse_position returns, plus the child"""
+            reply = self.copy_reply(QueryPointerReply, address)
+            return [
+                Point.from_values(reply.root_x, reply.root_y),
+                Point.from_values(reply.win_x, reply.win_y),
+                reply.child
+            ]
+        return self.send(
+            xcb_query_pointer(self.connection, self.parse_window(window)),
+            parse_reply
+        )
+
+    def get_region(self, window=None):
+        """Awaits the window's Region"""
+        def parse_reply(address):
+            """Builds the same Region get_region returns"""
+            reply = self.copy_reply(GetGeometryReply, address)
+            return Region.from_values(reply.x, reply.y, reply.width, reply.height)
+        return self.send(
+            xcb_get_geometry(self.connection, self.parse_window(window)),
+            parse_reply
+        )
+
+    def get_window_attributes(self, window=None):
+        """Awaits a copy of the window's attributes"""
+        return self.send(
+            xcb_get_window_attributes(self.connection, self.parse_window(window)),
+            lambda address: self.copy_reply(GetWindowAttributesReply, address)
+        )
+
+    def get_query_tree(self, window=None):
+        """Awaits the window's children, bottom to top"""
+        def parse_reply(address):
+            """Copies the trailing child list"""
+            reply = cast(address, POINTER(QueryTreeReply))
+            children = xcb_query_tree_children(reply)
+            return [
+                children[index]
+                for index in range(0, xcb_query_tree_children_length(reply))
+            ]
+        return self.send(
+            xcb_query_tree(self.connection, self.parse_window(window)),
+            parse_reply
+        )
+
+    def find_window_under_pointer(self, window=None):
+        """
+        Awaits the deepest window under the pointer, descending through the
+        child each XQueryPointer reply names
+        """
+        result = self.loop.create_future()
+
+        def descend(future, current):
+            """Either steps into the child or settles on the current window"""
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+                return
+            child = future.result()[2]
+            if not child:
+                result.set_result(current)
+                return
+            self.query_pointer(child).add_done_callback(
+                lambda next_future: descend(next_future, child)
+            )
+
+        start = self.parse_window(window)
+        self.query_pointer(start).add_done_callback(
+            lambda future: descend(future, start)
+        )
+        return result
+
+    def parse_window(self, window=None):
+        """Unwraps ctypes windows and defaults to the root"""
+        if window is None:
+            return self.root_window
+        return getattr(window, 'value', window)
+
+    def close_display(self):
+        """Detaches from the loop and fails anything still in flight"""
+        self.loop.remove_reader(self.file_descriptor)
+        self.events.unregister(self.handle_event)
+        for future, _ in self.pending_replies.values():
+            if not future.done():
+                future.cancel()
+        self.pending_replies = {}
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+        XFlush(self.display)
+        super(AsyncDisplay, self).close_display()
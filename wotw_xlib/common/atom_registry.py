@@ -0,0 +1,139 @@
+"""This file provides AtomRegistry, a per-display cache of interned atoms"""
+
+from ctypes import c_void_p, cast, POINTER
+from threading import RLock
+
+from wotw_xlib.backends import XLIB_BACKEND
+from wotw_xlib.xlib import AtomNone, Display
+
+
+def encode_name(name):
+    """Xlib wants bytes"""
+    return name if isinstance(name, bytes) else name.encode('latin-1')
+
+
+def decode_name(raw_name):
+    """Hands back the native str type"""
+    return raw_name if isinstance(raw_name, str) else raw_name.decode('latin-1')
+
+
+class AtomRegistry(object):
+    """
+    This class memoizes atoms in both directions for one display. Everything
+    in KNOWN_ATOMS is interned together on first use; anything else is queued
+    and resolved with whatever else is pending in a single XInternAtoms call.
+    Requests go through the backend of whoever first asked for the display.
+    """
+
+    KNOWN_ATOMS = [
+        'UTF8_STRING',
+        'WM_CLASS',
+        'WM_NAME',
+        'WM_ICON_NAME',
+        'WM_STATE',
+        '_NET_ACTIVE_WINDOW',
+        '_NET_CLIENT_LIST',
+        '_NET_CLIENT_LIST_STACKING',
+        '_NET_FRAME_EXTENTS',
+        '_NET_SUPPORTED',
+        '_NET_SUPPORTING_WM_CHECK',
+        '_NET_WM_ICON_NAME',
+        '_NET_WM_NAME',
+        '_NET_WM_STATE',
+        '_NET_WM_STATE_HIDDEN',
+        '_NET_WM_WINDOW_TYPE'
+    ]
+
+    registries = {}
+    registries_lock = RLock()
+
+    def __init__(self, display, known_atoms=None, backend=None):
+        """Ctor queues the known atoms without touching the server"""
+        self.display = display
+        self.backend = XLIB_BACKEND if backend is None else backend
+        self.atoms = {}
+        self.names = {AtomNone: None}
+        self.pending = set()
+        self.lock = RLock()
+        self.request(
+            *(self.KNOWN_ATOMS if known_atoms is None else known_atoms)
+        )
+
+    @staticmethod
+    def display_key(display):
+        """Keys displays by address so every wrapper shares a registry"""
+        if isinstance(display, POINTER(Display)):
+            return cast(display, c_void_p).value
+        return id(display)
+
+    @classmethod
+    def for_display(cls, display, backend=None):
+        """Returns the registry attached to the display, creating it if needed"""
+        key = cls.display_key(display)
+        with cls.registries_lock:
+            if key not in cls.registries:
+                cls.registries[key] = cls(display, backend=backend)
+            return cls.registries[key]
+
+    @classmethod
+    def forget(cls, display):
+        """Detaches the registry from a display that is being closed"""
+        with cls.registries_lock:
+            cls.registries.pop(cls.display_key(display), None)
+
+    def request(self, *names):
+        """Queues names for the next batch, skipping ones already resolved"""
+        with self.lock:
+            self.pending.update([
+                decoded
+                for decoded in [decode_name(name) for name in names]
+                if decoded not in self.atoms
+            ])
+
+    def intern_pending(self):
+        """Interns everything queued with one round-trip"""
+        with self.lock:
+            names = sorted(self.pending - set(self.atoms))
+            self.pending.clear()
+            if not names:
+                return
+            atoms = self.backend.intern_atoms(self.display, names)
+            for name, atom in zip(names, atoms):
+                self.remember(name, atom)
+
+    def remember(self, name, atom):
+        """Records a pair in both directions"""
+        if atom != AtomNone:
+            self.atoms[name] = atom
+            self.names[atom] = name
+
+    def intern(self, *names):
+        """Resolves several names at once, in order"""
+        self.request(*names)
+        with self.lock:
+            if self.pending:
+                self.intern_pending()
+            return [self.atoms.get(decode_name(name), AtomNone) for name in names]
+
+    def __getitem__(self, name):
+        """Resolves a single name, flushing anything else that's pending"""
+        return self.intern(name)[0]
+
+    def __contains__(self, name):
+        """Checks if the name has already been resolved"""
+        return decode_name(name) in self.atoms
+
+    def get_names(self, *atoms):
+        """Resolves several atoms at once, fetching unknown ones together"""
+        with self.lock:
+            missing = sorted(set(atoms) - set(self.names))
+            if missing:
+                names = self.backend.get_atom_names(self.display, missing)
+                for atom, name in zip(missing, names):
+                    if name is not None:
+                        self.remember(name, atom)
+            return [self.names.get(atom) for atom in atoms]
+
+    def get_name(self, atom):
+        """Resolves a single atom"""
+        return self.get_names(atom)[0]
@@ -0,0 +1,234 @@
+"""This file provides BindingStats, opt-in instrumentation for the C bindings"""
+
+from json import dump
+from sys import _getframe, modules
+from threading import RLock
+from timeit import default_timer
+
+from wotw_xlib.common.needs_display import NeedsDisplay
+from wotw_xlib.xcb import functions as xcb_functions
+from wotw_xlib.xext import functions as xext_functions
+from wotw_xlib.xlib import functions as xlib_functions
+
+
+class BindingRecord(object):
+    """This class accumulates the timings of a single binding"""
+
+    def __init__(self, name, round_trip=False):
+        """Ctor starts from zero"""
+        self.name = name
+        self.round_trip = round_trip
+        self.clear()
+
+    def clear(self):
+        """Drops every recorded call"""
+        self.calls = 0
+        self.total = 0.0
+        # Power of two microsecond buckets, keyed by upper bound
+        self.histogram = {}
+        self.callers = {}
+
+    def record(self, elapsed, caller):
+        """Adds a single call"""
+        self.calls += 1
+        self.total += elapsed
+        bucket = 1 << int(elapsed * 1000000).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        self.callers[caller] = self.callers.get(caller, 0) + 1
+
+    def as_dict(self):
+        """Copies everything into plain containers"""
+        return {
+            'calls': self.calls,
+            'round_trip': self.round_trip,
+            'total': self.total,
+            'mean': self.total / self.calls if self.calls else 0.0,
+            'histogram_us': dict(self.histogram),
+            'callers': dict(self.callers)
+        }
+
+
+class BindingStats(object):
+    """
+    This class swaps every libX11, libxcb, and extension binding, wherever
+    a wotw_xlib module imported it, for a wrapper that times the call and
+    notes which display method made it. The binding modules themselves are
+    swapped too, so anything imported or resolved while enabled gets a
+    wrapper. Disabled, every wotw_xlib module is swept and each wrapper it
+    holds is put back to the original, however it got there.
+    """
+
+    BINDING_MODULES = [xlib_functions, xcb_functions, xext_functions]
+
+    # Calls that block on a reply from the server
+    ROUND_TRIP_BINDINGS = set([
+        'XDamageQueryExtension',
+        'XFetchName',
+        'XFixesFetchRegion',
+        'XGetAtomNames',
+        'XGetGeometry',
+        'XGetSubImage',
+        'XGetWMIconName',
+        'XGetWindowAttributes',
+        'XGetWindowProperty',
+        'XInternAtoms',
+        'XQueryPointer',
+        'XQueryTree',
+        'XRRGetMonitors',
+        'XRRQueryExtension',
+        'XShapeGetRectangles',
+        'XShapeQueryExtension',
+        'XShmGetImage',
+        'XShmQueryExtension',
+        'XSync',
+        'XTranslateCoordinates',
+        'xcb_get_geometry_reply',
+        'xcb_get_property_reply',
+        'xcb_get_window_attributes_reply',
+        'xcb_query_pointer_reply',
+        'xcb_query_tree_reply',
+        'xcb_translate_coordinates_reply'
+    ])
+
+    # How far up the stack to look for the calling method
+    CALLER_DEPTH = 8
+
+    def __init__(self):
+        """Ctor starts disabled"""
+        self.records = {}
+        # Every wrapper handed out while enabled, by id, with its original
+        self.wrappers = {}
+        self.lock = RLock()
+
+    @property
+    def enabled(self):
+        """Checks if any binding is currently wrapped"""
+        return bool(self.wrappers)
+
+    @classmethod
+    def find_bindings(cls):
+        """Binds every function the binding modules declare and collects them"""
+        bindings = {}
+        for module in cls.BINDING_MODULES:
+            for name in module.BINDINGS:
+                value = getattr(module, name)
+                bindings[id(value)] = (name, value)
+        return bindings
+
+    @classmethod
+    def find_caller(cls):
+        """Names the nearest display method on the stack"""
+        frame = _getframe(2)
+        for _ in range(cls.CALLER_DEPTH):
+            if frame is None:
+                break
+            instance = frame.f_locals.get('self')
+            if isinstance(instance, NeedsDisplay):
+                return '%s.%s' % (type(instance).__name__, frame.f_code.co_name)
+            frame = frame.f_back
+        return 'unattributed'
+
+    def wrap(self, name, binding):
+        """Builds the timing wrapper for one binding"""
+        with self.lock:
+            if name not in self.records:
+                self.records[name] = BindingRecord(
+                    name,
+                    name in self.ROUND_TRIP_BINDINGS
+                )
+            record = self.records[name]
+
+        def timed_binding(*args):
+            """Times the call and files it under its caller"""
+            start = default_timer()
+            try:
+                return binding(*args)
+            finally:
+                elapsed = default_timer() - start
+                caller = self.find_caller()
+                with self.lock:
+                    record.record(elapsed, caller)
+        timed_binding.__name__ = name
+        timed_binding.binding = binding
+        return timed_binding
+
+    @staticmethod
+    def swap_everywhere(replacements):
+        """
+        Replaces every value keyed by id in replacements, in every loaded
+        wotw_xlib module
+        """
+        for module_name, module in list(modules.items()):
+            if module is None or not module_name.startswith('wotw_xlib'):
+                continue
+            for attribute, value in list(vars(module).items()):
+                if id(value) in replacements:
+                    setattr(module, attribute, replacements[id(value)][1])
+
+    def enable(self):
+        """Wraps every binding in every loaded wotw_xlib module"""
+        with self.lock:
+            if self.enabled:
+                return
+            bindings = self.find_bindings()
+            replacements = {}
+            for key, (name, binding) in bindings.items():
+                wrapper = self.wrap(name, binding)
+                replacements[key] = (binding, wrapper)
+                self.wrappers[id(wrapper)] = (wrapper, binding)
+            self.swap_everywhere(replacements)
+
+    def disable(self):
+        """Sweeps every wrapper back to its original binding"""
+        with self.lock:
+            self.swap_everywhere(self.wrappers)
+            self.wrappers = {}
+
+    def reset(self):
+        """Forgets everything recorded so far"""
+        with self.lock:
+            for record in self.records.values():
+                record.clear()
+
+    def stats(self):
+        """Snapshots the records of every binding that was called"""
+        with self.lock:
+            return dict(
+                (name, record.as_dict())
+                for name, record in self.records.items()
+                if record.calls
+            )
+
+    def round_trips_by_caller(self):
+        """Totals the blocking calls each display method made"""
+        totals = {}
+        for record in self.stats().values():
+            if record['round_trip']:
+                for caller, calls in record['callers'].items():
+                    totals[caller] = totals.get(caller, 0) + calls
+        return totals
+
+    def export(self, path):
+        """Writes the snapshot out as JSON"""
+        with open(path, 'w') as output_file:
+            dump(
+                {
+                    'bindings': self.stats(),
+                    'round_trips_by_caller': self.round_trips_by_caller()
+                },
+                output_file,
+                indent=2,
+                sort_keys=True
+            )
+
+    def __enter__(self):
+        """Enables the instrumentation"""
+        self.enable()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Disables the instrumentation"""
+        self.disable()
+
+
+BINDING_STATS = BindingStats()
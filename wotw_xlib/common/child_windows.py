@@ -0,0 +1,84 @@
+"""This file provides ChildWindows, which owns the array XQueryTree returns"""
+
+from ctypes import cast, POINTER
+
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.xlib import Window, XFree
+
+
+class ChildWindows(object):
+    """
+    This class wraps the children XQueryTree allocates. Items are read straight
+    out of the Xlib buffer, which is released with XFree when the context exits
+    or the object is collected. Views are only valid until then.
+    """
+
+    def __init__(self, child_pointers, number_of_children, owned=True):
+        """Ctor takes ownership of the buffer unless told it belongs to Python"""
+        self.child_pointers = child_pointers
+        self.number_of_children = number_of_children if child_pointers else 0
+        self.owned = owned
+        self.array = self.build_array()
+
+    @classmethod
+    def from_sequence(cls, children):
+        """Wraps window IDs that live in Python, which are never XFree'd"""
+        array = (Window * len(children))(*children)
+        instance = cls(cast(array, POINTER(Window)), len(children), False)
+        instance.array = array
+        return instance
+
+    def build_array(self):
+        """Overlays a ctypes array on the buffer without copying it"""
+        if not self.number_of_children:
+            return (Window * 0)()
+        return cast(
+            self.child_pointers,
+            POINTER(Window * self.number_of_children)
+        ).contents
+
+    def as_memoryview(self):
+        """Exposes the buffer as a memoryview of native unsigned longs"""
+        view = memoryview(self.array)
+        # ctypes reports an explicit byte order, which Python 3 won't index
+        if hasattr(view, 'cast'):
+            view = view.cast('B').cast('L')
+        return view
+
+    def as_numpy(self):
+        """Exposes the buffer as a NumPy array, when NumPy is around"""
+        if not numpy:
+            raise ImportError('as_numpy needs NumPy')
+        return numpy.ctypeslib.as_array(self.array)
+
+    def free(self):
+        """Releases the buffer; safe to call more than once"""
+        if self.child_pointers and self.owned:
+            XFree(self.child_pointers)
+        self.child_pointers = None
+        self.number_of_children = 0
+        self.array = self.build_array()
+
+    def __getitem__(self, index):
+        """Reads a single child as a plain number"""
+        return self.array[index]
+
+    def __iter__(self):
+        """Reads every child as a plain number, bottom to top"""
+        return iter(self.array)
+
+    def __len__(self):
+        """Counts the children"""
+        return self.number_of_children
+
+    def __enter__(self):
+        """Sends itself off"""
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Explicitly frees the buffer"""
+        self.free()
+
+    def __del__(self):
+        """Frees anything that was never explicitly released"""
+        self.free()
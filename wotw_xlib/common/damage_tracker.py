@@ -0,0 +1,286 @@
+"""This file provides DamageTracker, which only re-grabs what changed"""
+
+from ctypes import cast, POINTER
+
+from wotw_xlib.utils import Region
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.xlib import (
+    ConfigureNotify,
+    DestroyNotify,
+    IsViewable,
+    MapNotify,
+    StructureNotifyMask,
+    UnmapNotify,
+    Visual
+)
+from wotw_xlib.xext import XDamageNotify
+from wotw_xlib.common import NeedsDisplay
+
+
+class DamageError(RuntimeError):
+    """This is raised when the display can't report damage"""
+
+
+class DamageTracker(NeedsDisplay):
+    """
+    This class keeps a persistent frame of a PointerWindow up to date. The
+    first refresh grabs the whole window through MIT-SHM; after that the
+    rectangles XDamage reports are coalesced into a few boxes, each pulled
+    into the same frame with one XGetSubImage. When the damage is scattered
+    over too many boxes or covers most of the window, a single full grab is
+    cheaper and is used instead. Every request goes through the window's
+    backend. Resizes and remaps start over with a full grab. While the
+    window isn't viewable, and once it's destroyed, the last frame stays but
+    refreshing raises DamageError.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    # Each box is its own round trip; past this many, grab everything
+    MAX_BOXES = 8
+
+    # Past this fraction of the window, one full grab beats the boxes
+    FULL_GRAB_RATIO = 0.5
+
+    # Boxes merge while the merged box is at most this much bigger than both
+    COALESCE_SLACK = 1.5
+
+    def __init__(self, window):
+        """
+        Ctor shares the window's display and backend; nothing is created
+        until start()
+        """
+        super(DamageTracker, self).__init__(window.display, backend=window.backend)
+        self.window = window
+        self.damage = None
+        self.damage_event = None
+        self.segment = None
+        self.destroyed = False
+        # Nothing has been grabbed, so everything is damaged
+        self.dirty = True
+        self.needs_full_grab = True
+
+    def check_window(self):
+        """Nothing can be created on, or grabbed from, a destroyed window"""
+        if self.destroyed:
+            raise DamageError('the window has been destroyed')
+
+    def check_viewable(self):
+        """
+        Grabbing an unviewable window is a BadMatch, which the default
+        handler makes fatal. The attributes are cached, and Map, Unmap and
+        ConfigureNotify on the window invalidate them.
+        """
+        if self.window.window_attributes.map_state != IsViewable:
+            raise DamageError('the window is not viewable')
+
+    def start(self):
+        """Creates the damage object"""
+        self.check_window()
+        if self.damage is not None:
+            return
+        event_base = self.backend.query_extension(self.display, 'DAMAGE')
+        if event_base is None:
+            raise DamageError('the display does not support DAMAGE')
+        self.damage_event = event_base + XDamageNotify
+        self.events.register(self.handle_event)
+        self.backend.select_input(
+            self.display,
+            self.window.window.value,
+            StructureNotifyMask
+        )
+        self.damage = self.backend.create_damage(
+            self.display,
+            self.window.window.value
+        )
+
+    def stop(self):
+        """Destroys the damage object and the frame; safe to call more than once"""
+        self.events.unregister(self.handle_event)
+        if self.damage is not None:
+            self.backend.destroy_damage(self.display, self.damage)
+            self.damage = None
+        if self.segment is not None:
+            self.segment.release()
+            self.segment = None
+        self.dirty = True
+        self.needs_full_grab = True
+
+    def get_segment(self):
+        """Sizes the frame to the window, reallocating when it's changed"""
+        window_attributes = self.window.window_attributes
+        size = (
+            window_attributes.width,
+            window_attributes.height,
+            window_attributes.depth
+        )
+        if self.segment is not None:
+            if size == (
+                    self.segment.width,
+                    self.segment.height,
+                    self.segment.depth
+            ):
+                return self.segment
+            self.segment.release()
+        self.segment = self.backend.create_image(
+            self.display,
+            window_attributes.width,
+            window_attributes.height,
+            window_attributes.depth,
+            cast(window_attributes.visual, POINTER(Visual))
+        )
+        self.needs_full_grab = True
+        return self.segment
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """
+        Routes this window's events to their handlers; everyone else's are
+        skipped. The damage event type isn't fixed.
+        """
+        if event.type == self.damage_event:
+            if event.xany.window == self.window.window.value:
+                self.dirty = True
+            return
+        handler = self.EVENT_HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def on_configure(self, event):
+        """Geometry changed, so the frame may need a new size"""
+        if event.xconfigure.window != self.window.window.value:
+            return
+        self.window.invalidate('window_attributes', 'region')
+        self.dirty = True
+
+    def on_unmap(self, event):
+        """The window can't be grabbed until it's mapped again"""
+        if event.xunmap.window != self.window.window.value:
+            return
+        self.window.invalidate('window_attributes', 'region')
+
+    def on_map(self, event):
+        """Nothing was tracked while unmapped, so start over"""
+        if event.xmap.window != self.window.window.value:
+            return
+        self.window.invalidate('window_attributes', 'region')
+        self.needs_full_grab = True
+
+    def on_destroy(self, event):
+        """The server dropped the damage with the window; nothing is left to track"""
+        if event.xdestroywindow.window != self.window.window.value:
+            return
+        self.damage = None
+        self.destroyed = True
+
+    EVENT_HANDLERS = {
+        ConfigureNotify: on_configure,
+        UnmapNotify: on_unmap,
+        MapNotify: on_map,
+        DestroyNotify: on_destroy
+    }
+
+    def collect_damage(self):
+        """
+        Drains the accumulated damage into Regions, relative to the window.
+        This is a round trip, so it's skipped when no damage has been
+        reported since the last drain.
+        """
+        if not self.dirty:
+            return []
+        regions = self.backend.collect_damage(self.display, self.damage)
+        self.dirty = False
+        return regions
+
+    @staticmethod
+    def area(region):
+        """Counts the pixels"""
+        return region.width * region.height
+
+    @classmethod
+    def coalesce(cls, regions):
+        """
+        Folds each region into the first box whose union with it wastes
+        little, top to bottom. Damage comes back in bands, so neighbours
+        land in the same box. Returns None past MAX_BOXES, since a full grab
+        is cheaper by then; each region is checked against at most that many
+        boxes.
+        """
+        boxes = []
+        ordered = sorted(
+            regions,
+            key=lambda region: (region.top_left.y, region.top_left.x)
+        )
+        for region in ordered:
+            for index, box in enumerate(boxes):
+                union = box.union(region)
+                limit = (cls.area(box) + cls.area(region)) * cls.COALESCE_SLACK
+                if cls.area(union) <= limit:
+                    boxes[index] = union
+                    break
+            else:
+                if len(boxes) == cls.MAX_BOXES:
+                    return None
+                boxes.append(region)
+        return boxes
+
+    def plan_grabs(self, damaged, bounds):
+        """
+        Clips and coalesces the damage, returning the boxes to grab, or None
+        when a full grab is cheaper
+        """
+        clipped = [
+            region
+            for region in (region.intersection(bounds) for region in damaged)
+            if region is not None
+        ]
+        boxes = self.coalesce(clipped)
+        if boxes is None:
+            return None
+        damaged_area = sum(self.area(box) for box in boxes)
+        if damaged_area > self.area(bounds) * self.FULL_GRAB_RATIO:
+            return None
+        return boxes
+
+    def refresh(self):
+        """
+        Brings the frame up to date and returns the window-relative Regions
+        that were grabbed
+        """
+        self.start()
+        self.process_events()
+        self.check_window()
+        self.check_viewable()
+        # Drain before grabbing, so damage during the grab shows up next time
+        damaged = self.collect_damage()
+        segment = self.get_segment()
+        bounds = Region.from_values(0, 0, segment.width, segment.height)
+        boxes = None if self.needs_full_grab else self.plan_grabs(damaged, bounds)
+        if boxes is None:
+            segment.capture(self.window.window.value)
+            self.needs_full_grab = False
+            return [bounds]
+        for box in boxes:
+            self.backend.get_sub_image(
+                self.display,
+                self.window.window.value,
+                box,
+                segment
+            )
+        return boxes
+
+    @property
+    def frame(self):
+        """The persistent frame, as NumPy when it's around"""
+        if self.segment is None:
+            return None
+        if numpy:
+            return self.segment.as_numpy()
+        return self.segment.as_memoryview()
+
+    def close_display(self):
+        """The damage and the frame have to go before the connection does"""
+        self.stop()
+        super(DamageTracker, self).close_display()
@@ -0,0 +1,122 @@
+# pylint: disable=too-few-public-methods
+"""This file provides DisplayPool, a shared cache of Display connections"""
+
+from atexit import register
+from ctypes import c_char_p
+from threading import RLock
+from time import time as time_now
+
+from wotw_xlib.backends import XLIB_BACKEND
+
+
+class PooledDisplay(object):
+    """This class tracks a single connection and who's using it"""
+
+    def __init__(self, display):
+        """Ctor starts with no leases"""
+        self.display = display
+        self.references = 0
+        self.released_at = None
+
+
+class DisplayPool(object):
+    """
+    This class shares one Display connection per display name. Leases are
+    reference counted; once the last one is returned the connection idles
+    until it either gets leased again or is pruned. max_idle only caps the
+    idle connections; leased ones are never closed out from under their
+    users, and since every name shares one connection, the pool never holds
+    more than one per name in use plus max_idle. Connections are opened and
+    closed through a single backend, libX11 unless told otherwise.
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 30.0
+    DEFAULT_MAX_IDLE = 4
+
+    def __init__(
+            self,
+            idle_timeout=DEFAULT_IDLE_TIMEOUT,
+            max_idle=DEFAULT_MAX_IDLE,
+            backend=XLIB_BACKEND
+    ):
+        """Ctor starts with an empty pool; max_idle counts unleased connections"""
+        self.idle_timeout = idle_timeout
+        self.max_idle = max_idle
+        self.backend = backend
+        self.connections = {}
+        self.lock = RLock()
+
+    @staticmethod
+    def parse_display_name(display_name=None):
+        """Unwraps c_char_p so every spelling of a name shares a key"""
+        if isinstance(display_name, c_char_p):
+            return display_name.value
+        return display_name
+
+    def lease(self, display_name=None):
+        """Hands out the pooled connection, opening it if necessary"""
+        display_name = self.parse_display_name(display_name)
+        with self.lock:
+            pooled = self.connections.get(display_name)
+            if pooled is None:
+                display = self.backend.open_display(display_name)
+                if not display:
+                    return display
+                pooled = PooledDisplay(display)
+                self.connections[display_name] = pooled
+            pooled.references += 1
+            pooled.released_at = None
+            self.prune()
+            return pooled.display
+
+    def release(self, display):
+        """Takes back a lease, letting the connection idle after the last one"""
+        with self.lock:
+            for pooled in self.connections.values():
+                if pooled.display is display and pooled.references > 0:
+                    pooled.references -= 1
+                    if pooled.references == 0:
+                        pooled.released_at = time_now()
+                    break
+            self.prune()
+
+    def prune(self, now=None):
+        """
+        Closes idle connections past the timeout, then the oldest idle ones
+        beyond the size limit. Leased connections are never touched.
+        """
+        now = time_now() if now is None else now
+        with self.lock:
+            idle = sorted(
+                [
+                    [pooled.released_at, display_name]
+                    for display_name, pooled in self.connections.items()
+                    if pooled.references == 0
+                ],
+                key=lambda entry: entry[0],
+                reverse=True
+            )
+            for index, (released_at, display_name) in enumerate(idle):
+                if index >= self.max_idle or now - released_at > self.idle_timeout:
+                    self.close(display_name)
+
+    def close(self, display_name):
+        """Drops a connection from the pool and closes it"""
+        with self.lock:
+            self.backend.close_display(
+                self.connections.pop(display_name).display
+            )
+
+    def close_all(self):
+        """Closes everything, leased or not"""
+        with self.lock:
+            for display_name in list(self.connections.keys()):
+                self.close(display_name)
+
+    def __len__(self):
+        """Counts the open connections"""
+        return len(self.connections)
+
+
+DISPLAY_POOL = DisplayPool()
+register(DISPLAY_POOL.close_all)
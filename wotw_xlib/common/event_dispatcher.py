@@ -0,0 +1,63 @@
+"""This file provides EventDispatcher, the one reader of a display's events"""
+
+from threading import RLock
+
+from wotw_xlib.backends import XLIB_BACKEND
+from wotw_xlib.xlib import XEvent
+from wotw_xlib.common.atom_registry import AtomRegistry
+
+
+class EventDispatcher(object):
+    """
+    This class is the only thing that takes events off a display's queue.
+    Everything watching the display registers a handler, and every event is
+    handed to all of them, so no one can drain events meant for someone
+    else. Handlers skip whatever isn't theirs. Events are read through the
+    backend of whoever first asked for the display.
+    """
+
+    dispatchers = {}
+    dispatchers_lock = RLock()
+
+    def __init__(self, display, backend=None):
+        """Ctor starts without any handlers"""
+        self.display = display
+        self.backend = XLIB_BACKEND if backend is None else backend
+        self.handlers = []
+        self.event = XEvent()
+        self.lock = RLock()
+
+    @classmethod
+    def for_display(cls, display, backend=None):
+        """Returns the dispatcher attached to the display, creating it if needed"""
+        key = AtomRegistry.display_key(display)
+        with cls.dispatchers_lock:
+            if key not in cls.dispatchers:
+                cls.dispatchers[key] = cls(display, backend)
+            return cls.dispatchers[key]
+
+    @classmethod
+    def forget(cls, display):
+        """Detaches the dispatcher from a display that is being closed"""
+        with cls.dispatchers_lock:
+            cls.dispatchers.pop(AtomRegistry.display_key(display), None)
+
+    def register(self, handler):
+        """Starts handing events to the handler; repeats are ignored"""
+        with self.lock:
+            if handler not in self.handlers:
+                self.handlers.append(handler)
+
+    def unregister(self, handler):
+        """Stops handing events to the handler"""
+        with self.lock:
+            if handler in self.handlers:
+                self.handlers.remove(handler)
+
+    def dispatch(self):
+        """Drains every queued event without blocking"""
+        with self.lock:
+            while self.backend.pending_events(self.display):
+                self.backend.next_event(self.display, self.event)
+                for handler in list(self.handlers):
+                    handler(self.event)
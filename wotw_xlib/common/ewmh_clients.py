@@ -0,0 +1,138 @@
+"""This file provides EwmhClients, a stacking-aware view of managed windows"""
+
+from wotw_xlib.xlib import Window
+from wotw_xlib.common import DISPLAY_POOL, PointerWindow
+
+
+class EwmhClients(PointerWindow):
+    """
+    This class reads the client list a compliant window manager keeps on the
+    root, which is already in stacking order and skips frames and decorations.
+    The list is only trusted while _NET_SUPPORTING_WM_CHECK names a live
+    window that names itself back, since a WM that died leaves its root
+    properties behind. When no such manager is running, it falls back to the
+    tree walk.
+    """
+
+    # Property lengths are in 32-bit units; plenty for any real session
+    LIST_LENGTH = 4096
+
+    def __init__(
+            self,
+            display=None,
+            window_id=None,
+            ttl=None,
+            pool=DISPLAY_POOL,
+            backend=None,
+            shapes=None
+    ):
+        """Ctor can take a ShapeCache so hit tests respect window shapes"""
+        super(EwmhClients, self).__init__(display, window_id, ttl, pool, backend)
+        self.shapes = shapes
+        self.wm_check = None
+
+    def get_window_property(self, property_name, length=LIST_LENGTH):
+        """
+        Reads a format 32 window list off the root with a single request.
+        Returns None if the property isn't there.
+        """
+        return self.backend.get_window_list(
+            self.display,
+            self.window.value,
+            self.atoms[property_name],
+            length
+        )
+
+    def is_wm_check(self, window):
+        """Checks that the window's own _NET_SUPPORTING_WM_CHECK is itself"""
+        # A stale check window is long gone
+        self.ignore_vanished_windows()
+        return self.backend.get_window_list(
+            self.display,
+            window,
+            self.atoms['_NET_SUPPORTING_WM_CHECK'],
+            1
+        ) == [window]
+
+    def get_wm_check(self):
+        """
+        Returns the running WM's check window, or None. A validated window is
+        remembered, so while that WM runs this costs one round-trip.
+        """
+        if self.wm_check is not None and self.is_wm_check(self.wm_check):
+            return self.wm_check
+        self.wm_check = None
+        published = self.get_window_property('_NET_SUPPORTING_WM_CHECK', 1)
+        if published and self.is_wm_check(published[0]):
+            self.wm_check = published[0]
+        return self.wm_check
+
+    def get_client_stacking(self):
+        """Gets the managed windows, bottom to top, or None without a WM"""
+        if self.get_wm_check() is None:
+            return None
+        return self.get_window_property('_NET_CLIENT_LIST_STACKING')
+
+    def get_active_window(self):
+        """Gets the focused managed window, if there is one"""
+        active = self.get_window_property('_NET_ACTIVE_WINDOW', 1)
+        return active[0] if active else None
+
+    def snapshot_clients(self, clients):
+        """
+        Pipelines the geometry, attributes, and root-relative origin of every
+        client, so the regions compare directly against root pointer positions
+        """
+        return self.backend.snapshot_relative(
+            self.display,
+            clients,
+            self.window.value
+        )
+
+    def topmost_under(self, snapshots, location):
+        """Returns the topmost viewable snapshot containing the location"""
+        if self.shapes is not None:
+            self.shapes.process_events()
+        for snapshot in reversed(snapshots):
+            if self.shapes is not None:
+                if self.shapes.might_be_under_pointer(snapshot, location):
+                    return snapshot
+            elif snapshot.might_be_under_pointer(location):
+                return snapshot
+        return None
+
+    def find_client_under(self, location, clients):
+        """Returns the topmost viewable client containing the root location"""
+        snapshot = self.topmost_under(self.snapshot_clients(clients), location)
+        return None if snapshot is None else snapshot.window
+
+    def find_override_redirect_under(self, location):
+        """
+        Returns the topmost child of the root under the root location when
+        it's override-redirect, like the menus and tooltips no WM lists
+        """
+        snapshot = self.topmost_under(self.snapshot_children(), location)
+        if snapshot is None or not snapshot.override_redirect:
+            return None
+        return snapshot.window
+
+    def find_window_under_pointer(self):
+        """
+        Hit tests the stacking list when a WM publishes one, which costs the
+        same handful of round-trips however deep the tree is, and walks the
+        tree otherwise. Override-redirect windows such as menus aren't
+        clients, so the root's own children are checked for them first.
+        """
+        clients = self.get_client_stacking()
+        if clients:
+            location = self.get_mouse_position()[0]
+            window = self.find_override_redirect_under(location)
+            if window is None:
+                window = self.find_client_under(location, clients)
+            if window is not None:
+                return PointerWindow(
+                    self.display,
+                    Window(window),
+                    backend=self.backend
+                )
+        return super(EwmhClients, self).find_window_under_pointer()
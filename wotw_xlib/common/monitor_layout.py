@@ -0,0 +1,133 @@
+"""This file provides MonitorLayout, a RandR monitor cache"""
+
+from wotw_xlib.utils import RegionIndex
+from wotw_xlib.xext import RRScreenChangeNotify
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay
+
+
+class RandrError(RuntimeError):
+    """This is raised when the display doesn't support RandR"""
+
+
+class Monitor(object):
+    """This class holds a single monitor's layout, in root coordinates"""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, name, region, primary=False):
+        """Ctor assigns everything"""
+        self.name = name
+        self.region = region
+        self.primary = primary
+
+    def __repr__(self):
+        """Constructor-style output"""
+        return "Monitor(%r, %r, %r)" % (self.name, self.region, self.primary)
+
+
+class MonitorLayout(NeedsDisplay):
+    """
+    This class caches the monitors of the default screen. They're loaded with
+    a single XRRGetMonitors and only loaded again after RRScreenChangeNotify,
+    so lookups never touch the server. Monitors are bucketed in a RegionIndex,
+    which makes a point lookup a dict hit and a short scan.
+    """
+
+    # Monitors are big; a few tiles each keeps the buckets tiny
+    TILE_SIZE = 512
+
+    def __init__(self, display=None, tile_size=TILE_SIZE, pool=DISPLAY_POOL, backend=None):
+        """Ctor doesn't touch the display yet"""
+        super(MonitorLayout, self).__init__(display, pool, backend)
+        self.current_root = None
+        self.tile_size = tile_size
+        self.screen_change_event = None
+        self.stale = True
+        self.monitors = []
+        self.index = RegionIndex(tile_size)
+
+    @property
+    def root(self):
+        """The root window of the default screen, found on first use"""
+        if self.current_root is None:
+            self.current_root = self.backend.root_window(self.display)
+        return self.current_root
+
+    def watch(self):
+        """Asks for RRScreenChangeNotify once"""
+        if self.screen_change_event is not None:
+            return
+        event_base = self.backend.query_extension(self.display, 'RANDR')
+        if event_base is None:
+            raise RandrError('the display does not support RandR')
+        self.screen_change_event = event_base + RRScreenChangeNotify
+        self.events.register(self.handle_event)
+        self.backend.select_screen_changes(self.display, self.root)
+
+    def load(self):
+        """Rebuilds the monitors and the index from one XRRGetMonitors"""
+        self.watch()
+        monitors = self.backend.get_monitors(self.display, self.root)
+        names = self.atoms.get_names(*[name for name, _, _ in monitors])
+        # Right and lower monitors stack higher, so shared edges go to them
+        self.monitors = sorted(
+            [
+                Monitor(name, region, primary)
+                for name, (_, region, primary) in zip(names, monitors)
+            ],
+            key=lambda monitor: (monitor.region.top_left.x, monitor.region.top_left.y)
+        )
+        self.index = RegionIndex(self.tile_size)
+        for stacking, monitor in enumerate(self.monitors):
+            self.index.insert(monitor, monitor.region, stacking)
+        self.stale = False
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """Marks the layout stale on a screen change; the type isn't fixed"""
+        if event.type == self.screen_change_event:
+            self.backend.update_configuration(event)
+            self.stale = True
+
+    def refresh(self):
+        """Applies pending events, reloading only if the screen changed"""
+        if self.screen_change_event is not None:
+            self.process_events()
+        if self.stale:
+            self.load()
+
+    def get_monitors(self):
+        """Every monitor, left to right"""
+        self.refresh()
+        return self.monitors
+
+    def get_primary(self):
+        """The primary monitor, or the first one when none is marked"""
+        monitors = self.get_monitors()
+        return next(
+            (monitor for monitor in monitors if monitor.primary),
+            monitors[0] if monitors else None
+        )
+
+    def monitor_at(self, location):
+        """Finds the monitor holding a Point, if any"""
+        self.refresh()
+        return self.index.find_topmost(location)
+
+    def monitors_for(self, region):
+        """Lists the monitors a Region overlaps, left to right"""
+        self.refresh()
+        return sorted(
+            self.index.query_region(region),
+            key=self.monitors.index
+        )
+
+    def close_display(self):
+        """RRScreenChangeNotify was selected on this connection, so watch again"""
+        if self.current_display is not None:
+            self.events.unregister(self.handle_event)
+        super(MonitorLayout, self).close_display()
+        self.screen_change_event = None
+        self.stale = True
@@ -4,41 +4,125 @@
 from ctypes import c_char_p, POINTER
 
 
-from wotw_xlib.xlib import Display, XCloseDisplay, XOpenDisplay
+from wotw_xlib.backends import XLIB_BACKEND
+from wotw_xlib.xlib import Display
+from wotw_xlib.common.atom_registry import AtomRegistry
+from wotw_xlib.common.display_pool import DISPLAY_POOL
+from wotw_xlib.common.event_dispatcher import EventDispatcher
+
+try:
+    TEXT_TYPES = (basestring, c_char_p)
+except NameError:
+    # Python 3 has no basestring; c_char_p wants bytes there
+    TEXT_TYPES = (bytes, c_char_p)
 
 
 class NeedsDisplay(object):
-    """This class provides the vehicle to manage a Display connection"""
+    """
+    This class provides the vehicle to manage a Display connection. Displays
+    passed in are never closed here. Otherwise nothing is opened until the
+    display is first needed: entering a with block leases one from the pool,
+    and using it outside of one opens a connection of its own.
+    """
+
+    # Every request goes through this, unless another backend is passed in
+    backend = XLIB_BACKEND
 
-    def __init__(self, unknown_display=None):
-        """Ctor initializes the display state"""
+    # Set once this asked the backend to ignore vanished windows
+    ignoring_vanished_windows = False
+
+    def __init__(self, unknown_display=None, pool=DISPLAY_POOL, backend=None):
+        """
+        Ctor initializes the display state. Leases only come from a pool that
+        opens through the same backend; pass pool=None to always open a
+        connection of its own, e.g. when threads are involved. When a Backend
+        is passed in, every request goes to it instead of libX11.
+        """
         self.opened_display = False
-        self.display = self.parse_unknown_display(unknown_display)
+        self.leased_display = False
+        self.pool = pool
+        if backend is not None:
+            self.backend = backend
+        self.display_name = None
+        self.current_display = self.parse_unknown_display(unknown_display)
 
     def parse_unknown_display(self, unknown_display=None):
         """
-        This method checks for an existing display and viable display strings
+        This method checks for an existing display and remembers viable
+        display strings for whenever a display is opened
         """
         if isinstance(unknown_display, (Display, POINTER(Display))):
             return unknown_display
-        if not isinstance(unknown_display, (basestring, c_char_p)):
-            unknown_display = None
-        return self.open_display(unknown_display)
+        if isinstance(unknown_display, TEXT_TYPES):
+            self.display_name = unknown_display
+        return None
+
+    @property
+    def display(self):
+        """The display, opened on first use if nothing's been passed in"""
+        if self.current_display is None:
+            self.current_display = self.open_display(self.display_name)
+        return self.current_display
+
+    @display.setter
+    def display(self, value):
+        self.current_display = value
+
+    def uses_pool(self):
+        """Pools only hand out displays opened through the same backend"""
+        return self.pool is not None and self.pool.backend is self.backend
 
     def open_display(self, display_to_open):
         """Sets an internal flag and returns the display"""
         self.opened_display = True
-        return XOpenDisplay(display_to_open)
+        return self.backend.open_display(display_to_open)
+
+    def lease_display(self, display_to_lease):
+        """Sets both internal flags and returns the pooled display"""
+        self.opened_display = True
+        self.leased_display = True
+        return self.pool.lease(display_to_lease)
+
+    def ignore_vanished_windows(self):
+        """Has the backend ignore vanished windows until this closes"""
+        if not self.ignoring_vanished_windows:
+            self.backend.ignore_vanished_windows()
+            self.ignoring_vanished_windows = True
 
     def close_display(self):
-        """Checks the internal flag and only closes displays it opened"""
+        """
+        Checks the internal flag and only closes displays it opened. Leased
+        displays are returned to the pool instead. Either way, the next use
+        opens a fresh one.
+        """
+        if self.ignoring_vanished_windows:
+            self.backend.stop_ignoring_vanished_windows(self.current_display)
+            self.ignoring_vanished_windows = False
         if self.opened_display:
-            XCloseDisplay(self.display)
+            if self.leased_display:
+                self.pool.release(self.current_display)
+            else:
+                self.backend.close_display(self.current_display)
+            self.opened_display = False
+            self.leased_display = False
+            self.current_display = None
+
+    @property
+    def atoms(self):
+        """The atom registry shared by everything using this display"""
+        return AtomRegistry.for_display(self.display, self.backend)
+
+    @property
+    def events(self):
+        """The dispatcher shared by everything watching this display"""
+        return EventDispatcher.for_display(self.display, self.backend)
 
     def __enter__(self):
-        """Sends itself off"""
+        """Leases a display unless one's already open or been passed in"""
+        if self.current_display is None and self.uses_pool():
+            self.current_display = self.lease_display(self.display_name)
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        """Explicitly closes the display"""
+        """Explicitly closes the display, or returns it to the pool"""
         self.close_display()
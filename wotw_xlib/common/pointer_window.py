@@ -1,35 +1,127 @@
 """This files provides a common interface for window/pointer interaction"""
 
-from ctypes import byref, c_char_p, c_uint, c_ulong, POINTER
-
-from wotw_xlib.utils import Point, Region
-from wotw_xlib.xlib import (
-    Coordinate,
-    IsViewable,
-    Window,
-    XDefaultScreen,
-    XFetchName,
-    XGetGeometry,
-    XGetWMIconName,
-    XGetWindowAttributes,
-    XQueryPointer,
-    XQueryTree,
-    XRootWindow,
-    XTextProperty,
-    XWindowAttributes
-)
-from wotw_xlib.common import NeedsDisplay
+from time import time as time_now
+
+from wotw_xlib.utils import Point, Region, RegionSet
+from wotw_xlib.xlib import IsViewable, Window
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay, WindowVisibility
 
 
 class PointerWindow(NeedsDisplay):
-    """This class collects methods to inspect pointer position on the display"""
+    """
+    This class collects methods to inspect pointer position on the display.
+    The region, attributes, names, and children are only queried when first
+    read, then cached until invalidate() or until ttl seconds pass. Every
+    request goes through the backend, libX11 unless another is passed in.
+    The root is only discovered when first read, so a with block can still
+    lease the display it's discovered on.
+    """
+    # pylint: disable=too-many-public-methods
+
+    def __init__(self, display=None, window_id=None, ttl=None, pool=DISPLAY_POOL, backend=None):
+
+        super(PointerWindow, self).__init__(display, pool, backend)
+        self.window_id = window_id
+        self.current_window = None
+        self.ttl = ttl
+        self.cache = {}
+
+    @property
+    def window(self):
+        """The window, parsed from the ID when first read"""
+        if self.current_window is None:
+            self.current_window = self.parse_window_id(self.window_id)
+        return self.current_window
+
+    @window.setter
+    def window(self, value):
+        self.current_window = value
+
+    def load_cached(self, field, loader):
+        """Returns the cached field, reloading it if missing or stale"""
+        if field in self.cache:
+            value, loaded_at = self.cache[field]
+            if self.ttl is None or time_now() - loaded_at <= self.ttl:
+                return value
+        return self.store_cached(field, loader())
+
+    def store_cached(self, field, value):
+        """Caches the field, or drops it when value is None"""
+        if value is None:
+            self.cache.pop(field, None)
+        else:
+            self.cache[field] = (value, time_now())
+        return value
+
+    def invalidate(self, *fields):
+        """Drops the named cached fields, or everything if none are named"""
+        if not fields:
+            self.cache.clear()
+        for field in fields:
+            self.cache.pop(field, None)
+
+    @property
+    def region(self):
+        """The window's region, reusing cached attributes when possible"""
+        return self.load_cached('region', self.load_region)
+
+    @region.setter
+    def region(self, value):
+        self.store_cached('region', value)
+
+    @property
+    def window_attributes(self):
+        """The window's attributes; loading them also caches the region"""
+        return self.load_cached('window_attributes', self.load_window_attributes)
 
-    def __init__(self, display=None, window_id=None):
+    @window_attributes.setter
+    def window_attributes(self, value):
+        self.store_cached('window_attributes', value)
 
-        super(PointerWindow, self).__init__(display)
-        self.window = self.parse_window_id(window_id)
-        self.region = self.get_region()
-        self.window_attributes = None
+    @property
+    def names(self):
+        """The WM Name and WM Icon Name"""
+        return self.load_cached('names', self.get_names)
+
+    @names.setter
+    def names(self, value):
+        self.store_cached('names', value)
+
+    @property
+    def children(self):
+        """The child window IDs, bottom to top, copied out of Xlib's buffer"""
+        return self.load_cached('children', self.load_children)
+
+    @children.setter
+    def children(self, value):
+        self.store_cached('children', value)
+
+    def load_region(self):
+        """Builds the region from fresh attributes or asks for the geometry"""
+        if 'window_attributes' in self.cache:
+            return self.region_from_attributes(self.window_attributes)
+        return self.get_region()
+
+    def load_window_attributes(self):
+        """Fetches the attributes and fills in the region from the same reply"""
+        window_attributes = self.get_window_attributes()
+        self.region = self.region_from_attributes(window_attributes)
+        return window_attributes
+
+    @staticmethod
+    def region_from_attributes(window_attributes):
+        """Pulls the region out of an XWindowAttributes"""
+        return Region.from_values(
+            window_attributes.x,
+            window_attributes.y,
+            window_attributes.width,
+            window_attributes.height
+        )
+
+    def load_children(self):
+        """Copies the children out so the Xlib buffer can be freed"""
+        with self.get_query_tree() as children:
+            return tuple(children)
 
     def parse_window_id(self, window_id=None):
         """Return the passed in ID or find the root window"""
@@ -39,78 +131,116 @@ class PointerWindow(NeedsDisplay):
 
     def discover_root_window(self):
         """Gets the root window for the screen"""
-        screen = XDefaultScreen(self.display)
-        return XRootWindow(self.display, screen)
+        return Window(self.backend.root_window(self.display))
 
     def get_mouse_position(self):
         """Gets the mouse position relative to the display and window"""
-        (root_x, root_y) = (Coordinate(), Coordinate())
-        (win_x, win_y) = (Coordinate(), Coordinate())
-        XQueryPointer(
+        root_x, root_y, win_x, win_y = self.query_pointer()[:4]
+        return [
+            Point.from_values(root_x, root_y),
+            Point.from_values(win_x, win_y)
+        ]
+
+    @staticmethod
+    def window_number(window):
+        """Unwraps Window so backends only ever see plain numbers"""
+        return getattr(window, 'value', window)
+
+    def query_pointer(self, window=None):
+        """Asks the backend for (root_x, root_y, win_x, win_y, child)"""
+        return self.backend.query_pointer(
+            self.display,
+            self.window_number(self.window if window is None else window)
+        )
+
+    def sample_mouse_position(self, out=None):
+        """
+        Low-allocation get_mouse_position; returns or fills
+        (root_x, root_y, win_x, win_y)
+        """
+        return self.backend.sample_pointer(
             self.display,
-            self.window,
-            Window(),
-            Window(),
-            byref(root_x),
-            byref(root_y),
-            byref(win_x),
-            byref(win_y),
-            c_ulong()
+            self.window_number(self.window),
+            out
         )
-        return [Point(root_x, root_y), Point(win_x, win_y)]
+
+    def get_pointer_child(self, window=None):
+        """Gets the child of the window that contains the pointer, if any"""
+        return self.query_pointer(window)[4]
+
+    def find_window_under_pointer(self):
+        """
+        Walks down the tree using the child XQueryPointer reports at each level,
+        which costs one round-trip per level instead of two per child
+        """
+        window = self.window
+        child = self.get_pointer_child(window)
+        while child:
+            window = Window(child)
+            child = self.get_pointer_child(window)
+        return PointerWindow(self.display, window, backend=self.backend)
 
     def get_region(self):
         """Returns the window's region"""
-        (win_x, win_y) = (Coordinate(), Coordinate())
-        (width, height) = (c_uint(), c_uint())
-        XGetGeometry(
-            self.display,
-            self.window,
-            Window(),
-            byref(win_x),
-            byref(win_y),
-            byref(width),
-            byref(height),
-            c_uint(),
-            c_uint()
+        return Region.from_values(
+            *self.backend.get_geometry(
+                self.display,
+                self.window_number(self.window)
+            )
         )
-        return Region(
-            Point(win_x, win_y),
-            width,
-            height
+
+    def sample_region(self, out=None):
+        """Low-allocation get_region; returns or fills (x, y, width, height)"""
+        return self.backend.sample_geometry(
+            self.display,
+            self.window_number(self.window),
+            out
         )
 
     def get_window_attributes(self):
         """Collects the window attributes"""
-        win_attributes = XWindowAttributes()
-        XGetWindowAttributes(
+        return self.backend.get_window_attributes(
             self.display,
-            self.window,
-            byref(win_attributes)
+            self.window_number(self.window)
         )
-        return win_attributes
 
     def get_names(self):
         """Collects the WM Name and WM Icon Name"""
-        name = c_char_p()
-        XFetchName(self.display, self.window, byref(name))
-        props = XTextProperty()
-        XGetWMIconName(self.display, self.window, byref(props))
-        return [name.value, props.value]
+        return self.backend.get_names(
+            self.display,
+            self.window_number(self.window)
+        )
 
     def get_query_tree(self):
-        """Gets the window tree from the specified root"""
-        child_pointers = POINTER(Window)()
-        number_of_children = c_uint()
-        XQueryTree(
+        """
+        Gets the window tree from the specified root. With libX11, the
+        children stay in Xlib's buffer until the returned ChildWindows is
+        freed.
+        """
+        return self.backend.child_windows(
             self.display,
-            self.window,
-            Window(),
-            Window(),
-            byref(child_pointers),
-            byref(number_of_children)
+            self.window_number(self.window)
+        )
+
+    def snapshot_children(self):
+        """
+        Collects the region, map state, and name of every child; libX11 does
+        it in one pipelined XCB batch instead of two blocking calls per child
+        """
+        with self.get_query_tree() as children:
+            return self.backend.snapshot_windows(self.display, children)
+
+    def get_children_visibility(self):
+        """
+        Works out how much of each child its siblings leave uncovered, within
+        this window's own box, in one top to bottom sweep
+        """
+        return WindowVisibility.sweep(
+            self.snapshot_children(),
+            RegionSet([
+                Region.from_values(0, 0, self.region.width, self.region.height)
+            ])
         )
-        return [child_pointers, number_of_children.value]
 
     def contains_pointer(self, pointer_location=None):
         """Checks to see if the window might contain the pointer"""
@@ -122,8 +252,6 @@ class PointerWindow(NeedsDisplay):
 
     def is_viewable(self):
         """Checks if the Window is reporting an obstruction"""
-        if not self.window_attributes:
-            self.window_attributes = self.get_window_attributes()
         return self.window_attributes.map_state == IsViewable
 
     def might_be_under_pointer(self, pointer_location=None):
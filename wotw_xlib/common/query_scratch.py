@@ -0,0 +1,84 @@
+"""This file provides QueryScratch, reusable out-parameters for hot queries"""
+
+from ctypes import byref, c_uint, c_ulong
+
+from wotw_xlib.xlib import Coordinate, Window, XGetGeometry, XQueryPointer
+
+
+class QueryScratch(object):
+    """
+    This class owns one set of XQueryPointer and XGetGeometry out-parameters
+    and the byref handles that point at them, so sampling allocates nothing
+    past the result. Instances are not thread-safe; keep one per thread.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self):
+        """Ctor allocates every out-parameter once"""
+        self.root = Window()
+        self.child = Window()
+        self.root_x = Coordinate()
+        self.root_y = Coordinate()
+        self.win_x = Coordinate()
+        self.win_y = Coordinate()
+        self.mask = c_ulong()
+        self.width = c_uint()
+        self.height = c_uint()
+        self.border_width = c_uint()
+        self.depth = c_uint()
+        self.pointer_arguments = (
+            byref(self.root),
+            byref(self.child),
+            byref(self.root_x),
+            byref(self.root_y),
+            byref(self.win_x),
+            byref(self.win_y),
+            byref(self.mask)
+        )
+        self.geometry_arguments = (
+            byref(self.root),
+            byref(self.win_x),
+            byref(self.win_y),
+            byref(self.width),
+            byref(self.height),
+            byref(self.border_width),
+            byref(self.depth)
+        )
+
+    def query_pointer(self, display, window, out=None):
+        """
+        Reads the pointer as (root_x, root_y, win_x, win_y), either as a new
+        tuple or written into the first four slots of out
+        """
+        XQueryPointer(display, window, *self.pointer_arguments)
+        if out is None:
+            return (
+                self.root_x.value,
+                self.root_y.value,
+                self.win_x.value,
+                self.win_y.value
+            )
+        out[0] = self.root_x.value
+        out[1] = self.root_y.value
+        out[2] = self.win_x.value
+        out[3] = self.win_y.value
+        return out
+
+    def query_geometry(self, display, window, out=None):
+        """
+        Reads the geometry as (x, y, width, height), either as a new tuple or
+        written into the first four slots of out
+        """
+        XGetGeometry(display, window, *self.geometry_arguments)
+        if out is None:
+            return (
+                self.win_x.value,
+                self.win_y.value,
+                self.width.value,
+                self.height.value
+            )
+        out[0] = self.win_x.value
+        out[1] = self.win_y.value
+        out[2] = self.width.value
+        out[3] = self.height.value
+        return out
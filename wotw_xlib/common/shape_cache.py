@@ -0,0 +1,134 @@
+"""This file provides ShapeCache, per-window XShape regions for hit tests"""
+
+from wotw_xlib.utils import Point, Region, RegionSet
+from wotw_xlib.xext import ShapeBounding, ShapeInput, ShapeNotify
+from wotw_xlib.xlib import DestroyNotify, StructureNotifyMask
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay
+
+
+class ShapeCache(NeedsDisplay):
+    """
+    This class caches where each window actually takes pointer input: the
+    intersection of its bounding and input shapes. Shapes are fetched the
+    first time a window's box contains a hit test and dropped on ShapeNotify
+    or DestroyNotify. Windows whose shape covers their whole box are stored
+    as unshaped, so every later hit test on them is just the box check,
+    until the box changes size and the shape has to be checked again.
+    Displays without SHAPE treat every window as unshaped.
+    """
+
+    # Stands in for windows whose shape doesn't matter
+    UNSHAPED = None
+
+    def __init__(self, display=None, pool=DISPLAY_POOL, backend=None):
+        """Ctor starts with an empty cache"""
+        super(ShapeCache, self).__init__(display, pool, backend)
+        self.shapes = {}
+        # Box sizes that windows stored as unshaped were checked against
+        self.covered = {}
+        self.available = None
+        self.shape_event = None
+
+    def is_available(self):
+        """Checks for SHAPE once"""
+        if self.available is None:
+            event_base = self.backend.query_extension(self.display, 'SHAPE')
+            self.available = event_base is not None
+            if self.available:
+                self.shape_event = event_base + ShapeNotify
+        return self.available
+
+    def get_rectangles(self, window, kind):
+        """Fetches one of the window's shapes, relative to its origin"""
+        return RegionSet(
+            self.backend.get_shape_rectangles(self.display, window, kind)
+        )
+
+    def load_shape(self, window, region, border_width=0):
+        """
+        Costs two round-trips, once per window until its shape changes. The
+        region includes the border, which shapes cover by default.
+        """
+        if not self.is_available():
+            return self.UNSHAPED
+        # Watch first, so a change mid-fetch still invalidates
+        self.events.register(self.handle_event)
+        self.backend.select_shape_input(self.display, window)
+        self.backend.select_input(self.display, window, StructureNotifyMask)
+        shape = (
+            self.get_rectangles(window, ShapeBounding)
+            &
+            self.get_rectangles(window, ShapeInput)
+        )
+        box = RegionSet([
+            Region.from_values(
+                -border_width,
+                -border_width,
+                region.width,
+                region.height
+            )
+        ])
+        if not box - shape:
+            self.covered[window] = (region.width, region.height)
+            return self.UNSHAPED
+        return shape
+
+    def get_shape(self, window, region, border_width=0):
+        """Returns the cached shape, loading it if needed"""
+        size = (region.width, region.height)
+        if self.covered.get(window, size) != size:
+            self.forget(window)
+        if window not in self.shapes:
+            self.shapes[window] = self.load_shape(window, region, border_width)
+        return self.shapes[window]
+
+    def accepts(self, window, region, location, border_width=0):
+        """
+        Checks if a location inside the window's region, in the same
+        coordinates, actually lands on the window. Shapes are relative to
+        the inside origin, past the border.
+        """
+        shape = self.get_shape(window, region, border_width)
+        if shape is self.UNSHAPED:
+            return True
+        return shape.contains(Point.from_values(
+            location.x - region.top_left.x - border_width,
+            location.y - region.top_left.y - border_width
+        ))
+
+    def might_be_under_pointer(self, snapshot, location):
+        """Runs the usual box and map state check, then the shape"""
+        return (
+            snapshot.might_be_under_pointer(location)
+            and
+            self.accepts(
+                snapshot.window,
+                snapshot.region,
+                location,
+                snapshot.border_width
+            )
+        )
+
+    def forget(self, window):
+        """Drops a window from the cache"""
+        self.shapes.pop(window, None)
+        self.covered.pop(window, None)
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """Forgets reshaped and destroyed windows"""
+        if event.type == DestroyNotify:
+            self.forget(event.xdestroywindow.window)
+        elif self.shape_event is not None and event.type == self.shape_event:
+            self.forget(event.xany.window)
+
+    def close_display(self):
+        """ShapeNotify was selected on this connection, so the shapes go too"""
+        if self.current_display is not None:
+            self.events.unregister(self.handle_event)
+        super(ShapeCache, self).close_display()
+        self.shapes = {}
+        self.covered = {}
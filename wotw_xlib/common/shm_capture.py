@@ -0,0 +1,158 @@
+"""This file provides ShmCapture, which grabs pixels through MIT-SHM"""
+
+from collections import OrderedDict
+from ctypes import cast, POINTER
+
+from wotw_xlib.utils import Region
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.xlib import IsViewable, Visual
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay, PointerWindow, ShmError
+
+
+class ShmCapture(NeedsDisplay):
+    """
+    This class captures a PointerWindow or a root-relative Region without
+    pushing the pixels through the socket. One segment is kept per frame
+    size, so a capture loop at a fixed size never allocates. Each capture
+    overwrites the last one's pixels; copy anything that has to outlive it.
+    Past max_segments sizes, the oldest segment is evicted. Views of an
+    evicted segment stay readable but stop changing, and its memory stays
+    mapped until they're dropped.
+    """
+
+    # Different sizes each get a segment; the oldest go past this many
+    MAX_SEGMENTS = 4
+
+    def __init__(
+            self,
+            display=None,
+            max_segments=MAX_SEGMENTS,
+            pool=DISPLAY_POOL,
+            backend=None
+    ):
+        """Ctor starts without any segments"""
+        super(ShmCapture, self).__init__(display, pool, backend)
+        self.max_segments = max_segments
+        self.segments = OrderedDict()
+        self.available = None
+
+    def is_available(self):
+        """Checks for MIT-SHM once"""
+        if self.available is None:
+            self.available = (
+                self.backend.query_extension(self.display, 'MIT-SHM') is not None
+            )
+        return self.available
+
+    def root_region(self):
+        """Returns the root window and its Region"""
+        root = self.backend.root_window(self.display)
+        return root, Region.from_values(
+            *self.backend.get_geometry(self.display, root)
+        )
+
+    def resolve_target(self, target):
+        """
+        Works out (drawable, x, y, width, height, depth, visual). Windows are
+        read with their own visual, sized from fresh attributes and clipped
+        to the root through their translated origin; a window manager's
+        frames already keep clients inside their parents. Regions come off
+        the root window, clipped to it. Reading past the screen is a
+        BadMatch, which the default handler makes fatal, so anything that
+        can't be read raises ShmError instead.
+        """
+        root, screen = self.root_region()
+        if isinstance(target, PointerWindow):
+            target.invalidate('window_attributes', 'region')
+            window_attributes = target.window_attributes
+            if window_attributes.map_state != IsViewable:
+                raise ShmError('the window is not viewable')
+            origin_x, origin_y = self.backend.translate_coordinates(
+                self.display,
+                target.window.value,
+                root
+            )
+            visible = screen.intersection(
+                Region.from_values(
+                    origin_x,
+                    origin_y,
+                    window_attributes.width,
+                    window_attributes.height
+                )
+            )
+            if visible is None:
+                raise ShmError('the window is off the screen')
+            return (
+                target.window.value,
+                visible.top_left.x - origin_x,
+                visible.top_left.y - origin_y,
+                visible.width,
+                visible.height,
+                window_attributes.depth,
+                cast(window_attributes.visual, POINTER(Visual))
+            )
+        target = target.intersection(screen)
+        if target is None:
+            raise ShmError('the region is off the screen')
+        depth, visual = self.backend.screen_format(self.display)
+        return (
+            root,
+            target.top_left.x,
+            target.top_left.y,
+            target.width,
+            target.height,
+            depth,
+            visual
+        )
+
+    def get_segment(self, width, height, depth, visual):
+        """
+        Reuses the segment for this size and format, creating it if needed.
+        Windows with the same depth can still differ in visual.
+        """
+        key = (width, height, depth, self.backend.visual_id(visual))
+        if key in self.segments:
+            return self.segments[key]
+        if not self.is_available():
+            raise ShmError('the display does not support MIT-SHM')
+        while self.segments and len(self.segments) >= self.max_segments:
+            self.segments.popitem(last=False)[1].release()
+        self.segments[key] = self.backend.create_image(
+            self.display,
+            width,
+            height,
+            depth,
+            visual
+        )
+        return self.segments[key]
+
+    def capture_segment(self, target):
+        """Fills and returns the segment for the target"""
+        drawable, x, y, width, height, depth, visual = self.resolve_target(
+            target
+        )
+        return self.get_segment(width, height, depth, visual).capture(
+            drawable,
+            x,
+            y
+        )
+
+    def capture(self, target):
+        """
+        Returns the target's pixels as a NumPy array mapped onto the segment,
+        or as a flat memoryview when NumPy isn't around
+        """
+        segment = self.capture_segment(target)
+        if numpy:
+            return segment.as_numpy()
+        return segment.as_memoryview()
+
+    def release(self):
+        """Releases every segment"""
+        while self.segments:
+            self.segments.popitem()[1].release()
+
+    def close_display(self):
+        """The segments have to go before the connection does"""
+        self.release()
+        super(ShmCapture, self).close_display()
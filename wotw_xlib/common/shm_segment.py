@@ -0,0 +1,198 @@
+"""This file provides ShmSegment, an XImage backed by a shared segment"""
+
+from ctypes import byref, c_ubyte
+
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.xlib import AllPlanes, XDestroyImage, XSync, ZPixmap
+from wotw_xlib.xext import (
+    IPC_CREAT,
+    IPC_PRIVATE,
+    IPC_RMID,
+    SHM_FAILED,
+    shmat,
+    shmctl,
+    shmdt,
+    shmget,
+    XShmAttach,
+    XShmCreateImage,
+    XShmDetach,
+    XShmGetImage,
+    XShmSegmentInfo
+)
+
+
+class ShmError(RuntimeError):
+    """This is raised when a shared segment can't be set up or filled"""
+
+
+class ShmMapping(object):
+    """
+    This class owns the client's attachment. Views are built on a buffer
+    that holds on to it, so the memory stays mapped until the last one goes.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, address):
+        """Ctor takes over an address shmat returned"""
+        self.address = address
+
+    def __del__(self):
+        """Nothing can read the memory any more"""
+        shmdt(self.address)
+
+
+class ShmSegment(object):
+    """
+    This class owns a single MIT-SHM image. The server writes pixels straight
+    into the segment, so every capture lands in the same memory and the views
+    handed out are overwritten by the next one. Views outlive release(): the
+    server side goes right away, but the memory stays mapped, frozen at the
+    last capture, until the last view is dropped. The segment is marked for
+    removal as soon as both sides have attached, so it can't outlive the
+    process.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    # Owner read/write
+    PERMISSIONS = 0o600
+
+    def __init__(self, display, width, height, depth, visual):
+        """Ctor creates the image and attaches the segment on both ends"""
+        self.display = display
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.info = XShmSegmentInfo(shmid=-1)
+        self.image = None
+        self.attached = False
+        self.removed = False
+        self.buffer = None
+        self.memoryview = None
+        self.array = None
+        try:
+            self.allocate(visual)
+        except ShmError:
+            self.release()
+            raise
+
+    def allocate(self, visual):
+        """Walks through XShmCreateImage, shmget, shmat, and XShmAttach"""
+        self.image = XShmCreateImage(
+            self.display,
+            visual,
+            self.depth,
+            ZPixmap,
+            None,
+            byref(self.info),
+            self.width,
+            self.height
+        )
+        if not self.image:
+            raise ShmError('XShmCreateImage failed')
+        self.info.shmid = shmget(
+            IPC_PRIVATE,
+            self.size,
+            IPC_CREAT | self.PERMISSIONS
+        )
+        if self.info.shmid < 0:
+            raise ShmError('shmget failed')
+        address = shmat(self.info.shmid, None, 0)
+        if address in (None, SHM_FAILED):
+            raise ShmError('shmat failed')
+        self.info.shmaddr = address
+        self.buffer = (c_ubyte * self.size).from_address(address)
+        # Every view keeps the buffer, and so the mapping, alive
+        self.buffer.mapping = ShmMapping(address)
+        self.image.contents.data = address
+        self.info.readOnly = 0
+        if not XShmAttach(self.display, byref(self.info)):
+            raise ShmError('XShmAttach failed')
+        self.attached = True
+        # The server attaches while handling the request, so wait for it
+        XSync(self.display, 0)
+        self.remove()
+
+    @property
+    def size(self):
+        """Counts the bytes in the image, padding included"""
+        return self.image.contents.bytes_per_line * self.image.contents.height
+
+    def remove(self):
+        """Marks the segment for removal once everyone detaches"""
+        if self.info.shmid >= 0 and not self.removed:
+            shmctl(self.info.shmid, IPC_RMID, None)
+            self.removed = True
+
+    def capture(self, drawable, x=0, y=0):
+        """Copies the drawable's pixels starting at (x, y) into the segment"""
+        if not self.image:
+            raise ShmError('the segment has been released')
+        if not XShmGetImage(
+                self.display,
+                drawable,
+                self.image,
+                x,
+                y,
+                AllPlanes
+        ):
+            raise ShmError('XShmGetImage failed')
+        return self
+
+    def get_buffer(self):
+        """The mapped bytes every view is built on"""
+        if self.buffer is None:
+            raise ShmError('the segment has been released')
+        return self.buffer
+
+    def as_memoryview(self):
+        """Exposes the whole segment as flat bytes, rows bytes_per_line apart"""
+        if self.memoryview is None:
+            self.memoryview = memoryview(self.get_buffer())
+        return self.memoryview
+
+    def as_numpy(self):
+        """Exposes the segment as a (height, width, bytes per pixel) array"""
+        if not numpy:
+            raise ImportError('as_numpy needs NumPy')
+        if self.array is None:
+            mapped = self.get_buffer()
+            image = self.image.contents
+            rows = numpy.ctypeslib.as_array(mapped).reshape(
+                image.height,
+                image.bytes_per_line
+            )
+            pixel_size = image.bits_per_pixel // 8
+            # Slicing off the row padding keeps this a view
+            self.array = rows[:, :image.width * pixel_size].reshape(
+                image.height,
+                image.width,
+                pixel_size
+            )
+        return self.array
+
+    def release(self):
+        """
+        Detaches the server and frees the image; safe to call more than once.
+        The client detaches once no views are left.
+        """
+        self.memoryview = None
+        self.array = None
+        if self.attached:
+            XShmDetach(self.display, byref(self.info))
+            XSync(self.display, 0)
+            self.attached = False
+        self.buffer = None
+        self.info.shmaddr = None
+        self.remove()
+        if self.image:
+            # XShmCreateImage installs a destroy_image that leaves data alone
+            XDestroyImage(self.image)
+            self.image = None
+
+    def __enter__(self):
+        """Sends itself off"""
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Explicitly releases the segment"""
+        self.release()
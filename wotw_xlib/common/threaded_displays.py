@@ -0,0 +1,56 @@
+"""This file provides ThreadedDisplays, a Display connection per thread"""
+
+from threading import local, Lock
+
+from wotw_xlib.backends import XLIB_BACKEND
+from wotw_xlib.common import NeedsDisplay
+
+
+class ThreadedDisplays(object):
+    """
+    This class hands every thread its own Display, opened outside the pool
+    so no two threads ever share a connection. Xlib still needs XInitThreads
+    before the first XOpenDisplay anywhere in the process, so build one of
+    these, or an XlibBackend(threaded=True), before opening any other
+    connections; the backend raises once it's too late.
+    """
+
+    def __init__(self, display_name=None, backend=None):
+        """Ctor turns on the backend's thread support but opens nothing yet"""
+        self.backend = XLIB_BACKEND if backend is None else backend
+        self.backend.init_threads()
+        self.display_name = display_name
+        self.local = local()
+        self.opened = []
+        self.lock = Lock()
+
+    @property
+    def display(self):
+        """Returns this thread's Display, opening it on first use"""
+        needs_display = getattr(self.local, 'needs_display', None)
+        if needs_display is None:
+            needs_display = NeedsDisplay(
+                self.display_name,
+                pool=None,
+                backend=self.backend
+            )
+            self.local.needs_display = needs_display
+            with self.lock:
+                self.opened.append(needs_display)
+        return needs_display.display
+
+    def close(self):
+        """Closes every thread's Display"""
+        with self.lock:
+            for needs_display in self.opened:
+                needs_display.close_display()
+            self.opened = []
+        self.local = local()
+
+    def __enter__(self):
+        """Sends itself off"""
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Explicitly closes the displays"""
+        self.close()
@@ -0,0 +1,82 @@
+"""This file provides ThreadedQuery, which fans window queries across threads"""
+
+from multiprocessing.pool import ThreadPool
+
+from wotw_xlib.xlib import Window
+from wotw_xlib.common import PointerWindow, ThreadedDisplays, WindowSnapshot
+
+
+class ThreadedQuery(ThreadedDisplays):
+    """
+    This class runs window queries on a pool of worker threads, each with its
+    own connection. ctypes drops the GIL for the duration of every Xlib call,
+    so the round-trips on different connections genuinely overlap.
+    """
+
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, display_name=None, workers=DEFAULT_WORKERS, backend=None):
+        """Ctor spins up the workers"""
+        super(ThreadedQuery, self).__init__(display_name, backend)
+        self.workers = workers
+        self.pool = ThreadPool(workers)
+
+    def map_windows(self, method, windows):
+        """Calls method(display, window) for every window on the workers"""
+        return self.pool.map(
+            lambda window: method(self.display, window),
+            windows
+        )
+
+    def snapshot_windows(self, windows):
+        """Splits one big XCB batch into a batch per worker"""
+        windows = list(windows)
+        chunks = [
+            windows[index::self.workers]
+            for index in range(0, self.workers)
+        ]
+        snapshots = []
+        for chunk in self.pool.map(
+                lambda chunk: WindowSnapshot.collect(self.display, chunk),
+                [chunk for chunk in chunks if chunk]
+        ):
+            snapshots.extend(chunk)
+        return snapshots
+
+    def walk_tree(self, root_window=None):
+        """
+        Snapshots every window under the root. Each of the root's children
+        becomes a job, and a worker walks that whole subtree on its own.
+        """
+        root = PointerWindow(
+            self.display,
+            root_window if isinstance(root_window, Window) else None
+        )
+        top_level = root.snapshot_children()
+        snapshots = list(top_level)
+        for subtree in self.map_windows(
+                self.walk_subtree,
+                [snapshot.window for snapshot in top_level]
+        ):
+            snapshots.extend(subtree)
+        return snapshots
+
+    @staticmethod
+    def walk_subtree(display, window):
+        """Snapshots everything under a window, depth first"""
+        snapshots = []
+        pending = [window]
+        while pending:
+            children = PointerWindow(
+                display,
+                Window(pending.pop())
+            ).snapshot_children()
+            snapshots.extend(children)
+            pending.extend([child.window for child in children])
+        return snapshots
+
+    def close(self):
+        """Stops the workers before closing their displays"""
+        self.pool.close()
+        self.pool.join()
+        super(ThreadedQuery, self).close()
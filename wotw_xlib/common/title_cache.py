@@ -0,0 +1,167 @@
+"""This file provides TitleCache, window titles kept fresh by PropertyNotify"""
+
+from wotw_xlib.xlib import (
+    DestroyNotify,
+    PropertyChangeMask,
+    PropertyNotify,
+    StructureNotifyMask
+)
+from wotw_xlib.common import DISPLAY_POOL, NeedsDisplay
+
+
+class WindowTitle(object):
+    """This class holds the decoded titles for a single window"""
+
+    FIELDS = ['name', 'icon_name', 'wm_class']
+
+    def __init__(self, window):
+        """Ctor starts with everything stale"""
+        self.window = window
+        self.name = None
+        self.icon_name = None
+        # (instance, class), as WM_CLASS stores them
+        self.wm_class = None
+        self.stale = set(self.FIELDS)
+
+
+class TitleCache(NeedsDisplay):
+    """
+    This class caches titles and classes by window. Each window is watched for
+    PropertyNotify the first time it's read, and only the fields whose
+    properties changed are ever fetched again.
+    """
+
+    # Each field takes the first of its properties that's set
+    FIELD_PROPERTIES = {
+        'name': ['_NET_WM_NAME', 'WM_NAME'],
+        'icon_name': ['_NET_WM_ICON_NAME', 'WM_ICON_NAME'],
+        'wm_class': ['WM_CLASS']
+    }
+
+    # Property lengths are in 32-bit units; 256 of them covers any sane title
+    TITLE_LENGTH = 256
+
+    EVENT_MASK = PropertyChangeMask | StructureNotifyMask
+
+    def __init__(self, display=None, pool=DISPLAY_POOL, backend=None):
+        """Ctor starts with an empty cache"""
+        super(TitleCache, self).__init__(display, pool, backend)
+        self.titles = {}
+        self.property_fields = None
+
+    def get_property_fields(self):
+        """Maps each watched atom back to its field, interning them in one go"""
+        if self.property_fields is None:
+            self.property_fields = {}
+            for field, names in self.FIELD_PROPERTIES.items():
+                for name, atom in zip(names, self.atoms.intern(*names)):
+                    self.property_fields[atom] = field
+        return self.property_fields
+
+    def get_title(self, window):
+        """Reads a single window"""
+        return self.get_titles([window])[0]
+
+    def get_titles(self, windows):
+        """
+        Applies pending invalidations, starts watching new windows, and then
+        refreshes every stale field with one pipelined batch
+        """
+        self.ignore_vanished_windows()
+        self.events.register(self.handle_event)
+        self.process_events()
+        entries = []
+        for window in windows:
+            entry = self.titles.get(window)
+            if entry is None:
+                # Watch first, so a change mid-fetch still invalidates
+                self.backend.select_input(self.display, window, self.EVENT_MASK)
+                entry = self.titles[window] = WindowTitle(window)
+            entries.append(entry)
+        self.refresh([entry for entry in entries if entry.stale])
+        return entries
+
+    def refresh(self, entries):
+        """Fetches every stale property before waiting on a single reply"""
+        if not entries:
+            return
+        utf8_string = self.atoms['UTF8_STRING']
+        fields = [
+            [
+                entry,
+                field,
+                self.atoms.intern(*self.FIELD_PROPERTIES[field])
+            ]
+            for entry in entries
+            for field in sorted(entry.stale)
+        ]
+        values = iter(self.backend.get_properties(
+            self.display,
+            [
+                (entry.window, atom)
+                for entry, _, atoms in fields
+                for atom in atoms
+            ],
+            self.TITLE_LENGTH
+        ))
+        for entry, field, atoms in fields:
+            decoded = [
+                self.decode_value(next(values), utf8_string)
+                for _ in atoms
+            ]
+            value = next((value for value in decoded if value), None)
+            if 'wm_class' == field and value is not None:
+                value = tuple((value.split(u'\0') + [u'', u''])[:2])
+            setattr(entry, field, value)
+            entry.stale.discard(field)
+
+    @staticmethod
+    def decode_value(value, utf8_string):
+        """Decodes UTF8_STRING as UTF-8 and anything else as Latin-1"""
+        if not value:
+            return None
+        property_type, raw_value = value
+        if not raw_value:
+            return None
+        if property_type == utf8_string:
+            return raw_value.decode('utf-8', 'replace')
+        return raw_value.decode('latin-1')
+
+    def forget(self, window):
+        """Drops a window from the cache"""
+        self.titles.pop(window, None)
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """Routes an event to its handler"""
+        handler = self.EVENT_HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def on_property(self, event):
+        """Marks only the field backed by the changed property as stale"""
+        entry = self.titles.get(event.xproperty.window)
+        if entry is None:
+            return
+        field = self.get_property_fields().get(event.xproperty.atom)
+        if field:
+            entry.stale.add(field)
+
+    def on_destroy(self, event):
+        """Forgets destroyed windows"""
+        self.forget(event.xdestroywindow.window)
+
+    EVENT_HANDLERS = {
+        PropertyNotify: on_property,
+        DestroyNotify: on_destroy
+    }
+
+    def close_display(self):
+        """The watches were on this connection, so the titles go with it"""
+        if self.current_display is not None:
+            self.events.unregister(self.handle_event)
+        super(TitleCache, self).close_display()
+        self.titles = {}
@@ -0,0 +1,246 @@
+"""This file provides WindowSnapshot and the pipelined XCB batch that fills it"""
+
+from ctypes import byref, POINTER, string_at
+
+from wotw_xlib.utils import Point, Region
+from wotw_xlib.xlib import IsViewable
+from wotw_xlib.xcb import (
+    free,
+    GenericError,
+    XCB_ATOM_WM_NAME,
+    XCB_GET_PROPERTY_TYPE_ANY,
+    XGetXCBConnection,
+    xcb_get_geometry,
+    xcb_get_geometry_reply,
+    xcb_get_property,
+    xcb_get_property_reply,
+    xcb_get_property_value,
+    xcb_get_property_value_length,
+    xcb_get_window_attributes,
+    xcb_get_window_attributes_reply,
+    xcb_translate_coordinates,
+    xcb_translate_coordinates_reply
+)
+
+
+class WindowSnapshot(object):
+    """This class holds everything a single batch learned about a window"""
+
+    # Property lengths are in 32-bit units; 256 of them covers any sane title
+    NAME_LENGTH = 256
+
+    def __init__(
+            self,
+            window,
+            region,
+            map_state,
+            override_redirect=False,
+            name=None,
+            border_width=0
+    ):
+        """
+        Ctor assigns the collected replies. Like the server's own hit tests,
+        the region includes the border, so it starts at the outer corner.
+        """
+        # pylint: disable=too-many-arguments
+        self.window = window
+        self.region = region
+        self.map_state = map_state
+        self.override_redirect = override_redirect
+        self.name = name
+        self.border_width = border_width
+
+    @staticmethod
+    def bordered(x, y, width, height, border_width):
+        """Builds the outer Region from an outer corner and an inside size"""
+        return Region.from_values(
+            x,
+            y,
+            width + 2 * border_width,
+            height + 2 * border_width
+        )
+
+    def to_inside(self, location):
+        """
+        Moves a location in the same coordinates as the region to the
+        window's inside origin, which is where its children and shapes start
+        """
+        return Point.from_values(
+            location.x - self.region.top_left.x - self.border_width,
+            location.y - self.region.top_left.y - self.border_width
+        )
+
+    @classmethod
+    def collect(cls, display, windows):
+        """
+        Sends GetGeometry, GetWindowAttributes, and GetProperty for every
+        window before waiting on a single reply, so the whole batch costs
+        about one round-trip. Windows that vanished in the meantime are skipped.
+        """
+        connection = XGetXCBConnection(display)
+        cookies = [
+            [
+                window,
+                xcb_get_geometry(connection, window),
+                xcb_get_window_attributes(connection, window),
+                xcb_get_property(
+                    connection,
+                    0,
+                    window,
+                    XCB_ATOM_WM_NAME,
+                    XCB_GET_PROPERTY_TYPE_ANY,
+                    0,
+                    cls.NAME_LENGTH
+                )
+            ]
+            for window in windows
+        ]
+        snapshots = []
+        for window, geometry_cookie, attributes_cookie, name_cookie in cookies:
+            geometry = cls.collect_reply(
+                connection,
+                xcb_get_geometry_reply,
+                geometry_cookie
+            )
+            attributes = cls.collect_reply(
+                connection,
+                xcb_get_window_attributes_reply,
+                attributes_cookie
+            )
+            name = cls.collect_reply(
+                connection,
+                xcb_get_property_reply,
+                name_cookie
+            )
+            if geometry and attributes:
+                snapshots.append(
+                    cls(
+                        window,
+                        cls.bordered(
+                            geometry.contents.x,
+                            geometry.contents.y,
+                            geometry.contents.width,
+                            geometry.contents.height,
+                            geometry.contents.border_width
+                        ),
+                        attributes.contents.map_state,
+                        bool(attributes.contents.override_redirect),
+                        cls.parse_name(name),
+                        geometry.contents.border_width
+                    )
+                )
+            for reply in [geometry, attributes, name]:
+                if reply:
+                    free(reply)
+        return snapshots
+
+    @classmethod
+    def collect_relative(cls, display, windows, destination):
+        """
+        Pipelines the geometry, attributes, and origin in the destination's
+        coordinates of every window, so the regions compare directly against
+        positions relative to it. The origin is inside the border.
+        """
+        connection = XGetXCBConnection(display)
+        cookies = [
+            [
+                window,
+                xcb_get_geometry(connection, window),
+                xcb_get_window_attributes(connection, window),
+                xcb_translate_coordinates(connection, window, destination, 0, 0)
+            ]
+            for window in windows
+        ]
+        snapshots = []
+        for window, geometry_cookie, attributes_cookie, origin_cookie in cookies:
+            replies = [
+                cls.collect_reply(connection, reply_function, cookie)
+                for reply_function, cookie in [
+                    [xcb_get_geometry_reply, geometry_cookie],
+                    [xcb_get_window_attributes_reply, attributes_cookie],
+                    [xcb_translate_coordinates_reply, origin_cookie]
+                ]
+            ]
+            geometry, attributes, origin = replies
+            if geometry and attributes and origin:
+                snapshots.append(
+                    cls(
+                        window,
+                        cls.bordered(
+                            origin.contents.dst_x - geometry.contents.border_width,
+                            origin.contents.dst_y - geometry.contents.border_width,
+                            geometry.contents.width,
+                            geometry.contents.height,
+                            geometry.contents.border_width
+                        ),
+                        attributes.contents.map_state,
+                        bool(attributes.contents.override_redirect),
+                        border_width=geometry.contents.border_width
+                    )
+                )
+            for reply in replies:
+                if reply:
+                    free(reply)
+        return snapshots
+
+    @classmethod
+    def collect_properties(cls, display, requests, length):
+        """
+        Sends a GetProperty for every (window, atom) pair before waiting on
+        a single reply. Each comes back as (type, bytes), or None when the
+        window vanished.
+        """
+        connection = XGetXCBConnection(display)
+        cookies = [
+            xcb_get_property(
+                connection,
+                0,
+                window,
+                atom,
+                XCB_GET_PROPERTY_TYPE_ANY,
+                0,
+                length
+            )
+            for window, atom in requests
+        ]
+        values = []
+        for cookie in cookies:
+            reply = cls.collect_reply(connection, xcb_get_property_reply, cookie)
+            if not reply:
+                values.append(None)
+                continue
+            try:
+                values.append((reply.contents.type, cls.parse_name(reply)))
+            finally:
+                free(reply)
+        return values
+
+    @staticmethod
+    def collect_reply(connection, reply_function, cookie):
+        """Waits on a cookie, discarding the error if there is one"""
+        error = POINTER(GenericError)()
+        reply = reply_function(connection, cookie, byref(error))
+        if error:
+            free(error)
+        return reply
+
+    @staticmethod
+    def parse_name(reply):
+        """Copies the property value out of the reply"""
+        if not reply:
+            return None
+        return string_at(
+            xcb_get_property_value(reply),
+            xcb_get_property_value_length(reply)
+        )
+
+    def is_viewable(self):
+        """Checks if the Window was reporting an obstruction"""
+        return self.map_state == IsViewable
+
+    def might_be_under_pointer(self, pointer_location):
+        """
+        Test if the window region could contain the pointer and if the window is
+        viewable
+        """
+        return self.region.contains(pointer_location) and self.is_viewable()
@@ -0,0 +1,324 @@
+"""This file provides WindowTreeCache, an event-driven copy of the window tree"""
+
+from wotw_xlib.utils import Region
+from wotw_xlib.xlib import (
+    CirculateNotify,
+    ConfigureNotify,
+    CreateNotify,
+    DestroyNotify,
+    GravityNotify,
+    IsUnmapped,
+    IsViewable,
+    MapNotify,
+    PlaceOnTop,
+    ReparentNotify,
+    SubstructureNotifyMask,
+    UnmapNotify
+)
+from wotw_xlib.common import (
+    DISPLAY_POOL,
+    NeedsDisplay,
+    PointerWindow,
+    WindowSnapshot
+)
+
+
+class CachedWindow(WindowSnapshot):
+    """This class adds the tree links a snapshot doesn't know about"""
+
+    def __init__(
+            self,
+            window,
+            region,
+            map_state,
+            override_redirect=False,
+            parent=None,
+            border_width=0
+    ):
+        """Ctor assigns the window state and starts with no children"""
+        # pylint: disable=too-many-arguments
+        super(CachedWindow, self).__init__(
+            window,
+            region,
+            map_state,
+            override_redirect,
+            border_width=border_width
+        )
+        self.parent = parent
+        # Bottom to top, just like XQueryTree
+        self.children = []
+
+    def move_to(self, left, top):
+        """Swaps in a region with the new outer corner"""
+        self.region = Region.from_values(
+            left,
+            top,
+            self.region.width,
+            self.region.height
+        )
+
+    def resize_to(self, left, top, width, height, border_width):
+        """Swaps in a region with the new geometry, which X reports inside the border"""
+        self.border_width = border_width
+        self.region = self.bordered(left, top, width, height, border_width)
+
+
+class WindowTreeCache(NeedsDisplay):
+    """
+    This class loads the window tree once, then keeps it current by listening
+    for SubstructureNotify events, so hit tests never touch the server
+    """
+
+    def __init__(self, display=None, shapes=None, pool=DISPLAY_POOL, backend=None):
+        """
+        Ctor doesn't touch the display or load anything yet. When a
+        ShapeCache on the same display is passed in, hit tests respect
+        window shapes.
+        """
+        super(WindowTreeCache, self).__init__(display, pool, backend)
+        self.current_root = None
+        self.shapes = shapes
+        self.windows = {}
+
+    @property
+    def root(self):
+        """The root, discovered on first use"""
+        if self.current_root is None:
+            self.current_root = PointerWindow(self.display, backend=self.backend)
+        return self.current_root
+
+    def load(self):
+        """Walks the whole tree once, selecting events as it goes"""
+        # Windows can vanish between an event and our request about them
+        self.ignore_vanished_windows()
+        self.events.register(self.handle_event)
+        self.windows = {}
+        root_window = self.root.window.value
+        self.windows[root_window] = CachedWindow(
+            root_window,
+            self.root.region,
+            IsViewable
+        )
+        self.load_children(root_window)
+
+    def load_children(self, window):
+        """
+        Selects events before querying the tree so nothing created in between
+        is missed; anything reported twice is handled idempotently
+        """
+        self.backend.select_input(self.display, window, SubstructureNotifyMask)
+        with self.backend.child_windows(self.display, window) as children:
+            snapshots = self.backend.snapshot_windows(self.display, children)
+        for snapshot in snapshots:
+            self.add_window(
+                snapshot.window,
+                window,
+                snapshot.region,
+                snapshot.map_state,
+                snapshot.override_redirect,
+                snapshot.border_width
+            )
+            self.load_children(snapshot.window)
+
+    def add_window(
+            self,
+            window,
+            parent,
+            region,
+            map_state=IsUnmapped,
+            override_redirect=False,
+            border_width=0
+    ):
+        """Tracks a window on top of its siblings; the region includes the border"""
+        # pylint: disable=too-many-arguments
+        self.remove_window(window)
+        self.windows[window] = CachedWindow(
+            window,
+            region,
+            map_state,
+            override_redirect,
+            parent,
+            border_width
+        )
+        if parent in self.windows:
+            self.windows[parent].children.append(window)
+
+    def remove_window(self, window):
+        """Forgets a window and everything under it"""
+        cached = self.windows.pop(window, None)
+        if cached is None:
+            return
+        if cached.parent in self.windows:
+            self.unlink(cached)
+        for child in cached.children:
+            self.remove_window(child)
+
+    def unlink(self, cached):
+        """Pulls a window out of its parent's stacking order"""
+        siblings = self.windows[cached.parent].children
+        if cached.window in siblings:
+            siblings.remove(cached.window)
+
+    def restack(self, cached, above):
+        """Places a window directly on top of its sibling, or at the bottom"""
+        self.unlink(cached)
+        siblings = self.windows[cached.parent].children
+        if above in siblings:
+            siblings.insert(siblings.index(above) + 1, cached.window)
+        else:
+            siblings.insert(0, cached.window)
+
+    def process_events(self):
+        """Hands every queued event to everything watching the display"""
+        self.events.dispatch()
+
+    def handle_event(self, event):
+        """Routes an event to its handler"""
+        handler = self.EVENT_HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def on_create(self, event):
+        """New windows start unmapped on top of their siblings"""
+        created = event.xcreatewindow
+        if created.parent not in self.windows:
+            return
+        self.add_window(
+            created.window,
+            created.parent,
+            CachedWindow.bordered(
+                created.x,
+                created.y,
+                created.width,
+                created.height,
+                created.border_width
+            ),
+            IsUnmapped,
+            bool(created.override_redirect),
+            created.border_width
+        )
+        self.backend.select_input(
+            self.display,
+            created.window,
+            SubstructureNotifyMask
+        )
+
+    def on_destroy(self, event):
+        """Drops the window and its subtree"""
+        self.remove_window(event.xdestroywindow.window)
+        if self.shapes is not None:
+            self.shapes.forget(event.xdestroywindow.window)
+
+    def on_unmap(self, event):
+        """Marks the window unmapped"""
+        cached = self.windows.get(event.xunmap.window)
+        if cached:
+            cached.map_state = IsUnmapped
+
+    def on_map(self, event):
+        """
+        Marks the window viewable. Strictly, a mapped window with an unmapped
+        ancestor is unviewable, but hit tests never descend past one anyway.
+        """
+        cached = self.windows.get(event.xmap.window)
+        if cached:
+            cached.map_state = IsViewable
+
+    def on_reparent(self, event):
+        """Moves the window to the top of its new parent"""
+        reparented = event.xreparent
+        cached = self.windows.get(reparented.window)
+        if cached is None or reparented.parent not in self.windows:
+            self.remove_window(reparented.window)
+            return
+        if cached.parent in self.windows:
+            self.unlink(cached)
+        cached.parent = reparented.parent
+        cached.move_to(reparented.x, reparented.y)
+        cached.override_redirect = bool(reparented.override_redirect)
+        self.windows[cached.parent].children.append(cached.window)
+
+    def on_configure(self, event):
+        """Updates the geometry and the stacking order"""
+        configured = event.xconfigure
+        cached = self.windows.get(configured.window)
+        if cached is None:
+            return
+        cached.resize_to(
+            configured.x,
+            configured.y,
+            configured.width,
+            configured.height,
+            configured.border_width
+        )
+        if cached.parent in self.windows:
+            self.restack(cached, configured.above)
+
+    def on_gravity(self, event):
+        """Updates the origin after the parent resized"""
+        cached = self.windows.get(event.xgravity.window)
+        if cached:
+            cached.move_to(event.xgravity.x, event.xgravity.y)
+
+    def on_circulate(self, event):
+        """Moves the window to the top or the bottom of its siblings"""
+        cached = self.windows.get(event.xcirculate.window)
+        if cached is None or cached.parent not in self.windows:
+            return
+        self.unlink(cached)
+        siblings = self.windows[cached.parent].children
+        if event.xcirculate.place == PlaceOnTop:
+            siblings.append(cached.window)
+        else:
+            siblings.insert(0, cached.window)
+
+    EVENT_HANDLERS = {
+        CreateNotify: on_create,
+        DestroyNotify: on_destroy,
+        UnmapNotify: on_unmap,
+        MapNotify: on_map,
+        ReparentNotify: on_reparent,
+        ConfigureNotify: on_configure,
+        GravityNotify: on_gravity,
+        CirculateNotify: on_circulate
+    }
+
+    def find_window_under(self, location):
+        """
+        Descends through the topmost viewable child containing the location,
+        which is relative to the root. Borders count as part of their window,
+        as they do for the server. The tree costs no round-trips; with a
+        ShapeCache, a window's first hit test still fetches its shape.
+        """
+        cached = self.windows.get(self.root.window.value)
+        while cached is not None:
+            discovered = self.find_child_under(cached, location)
+            if discovered is None:
+                return cached
+            location = discovered.to_inside(location)
+            cached = discovered
+        return None
+
+    def find_child_under(self, cached, location):
+        """Checks children from the top of the stack down"""
+        for child in reversed(cached.children):
+            candidate = self.windows[child]
+            if self.shapes is not None:
+                if self.shapes.might_be_under_pointer(candidate, location):
+                    return candidate
+            elif candidate.might_be_under_pointer(location):
+                return candidate
+        return None
+
+    def find_window_under_pointer(self):
+        """Processes pending events, then hit tests the pointer"""
+        self.process_events()
+        return self.find_window_under(self.root.get_mouse_position()[0])
+
+    def close_display(self):
+        """Events were selected on this connection, so the tree goes with it"""
+        if self.current_display is not None:
+            self.events.unregister(self.handle_event)
+        super(WindowTreeCache, self).close_display()
+        self.windows = {}
+        self.current_root = None
@@ -0,0 +1,74 @@
+"""This file provides WindowVisibility and the sweep that computes it"""
+
+from wotw_xlib.utils import RegionSet
+from wotw_xlib.xlib import IsViewable
+
+
+class WindowVisibility(object):
+    """This class holds the part of a single window nothing above it covers"""
+
+    def __init__(self, snapshot, visible):
+        """Ctor takes the WindowSnapshot and its visible RegionSet"""
+        self.snapshot = snapshot
+        self.visible = visible
+
+    @classmethod
+    def sweep(cls, snapshots, clip=None):
+        """
+        Takes sibling snapshots bottom to top, the way XQueryTree lists them,
+        and walks them top to bottom, subtracting everything already covered
+        from each window before adding it to the cover. Windows that aren't
+        viewable cover nothing. An optional RegionSet clips everything,
+        usually the parent's own box; once the cover fills it, whatever is
+        left is hidden without any more region math. Results come back in the
+        same order as the snapshots.
+        """
+        covered = RegionSet()
+        covered_area = 0
+        clip_area = None if clip is None else clip.area
+        # Windows inside a plain rectangle clip don't need intersecting
+        clip_bounds = clip.bounds if clip is not None and 1 == len(clip) else None
+        results = []
+        for snapshot in reversed(snapshots):
+            if snapshot.map_state != IsViewable or (
+                    clip_area is not None and covered_area == clip_area
+            ):
+                results.append(cls(snapshot, RegionSet()))
+                continue
+            area = RegionSet([snapshot.region])
+            if clip is not None and not (
+                    clip_bounds is not None
+                    and
+                    clip_bounds.intersection(snapshot.region) == snapshot.region
+            ):
+                area = area & clip
+            visible = area - covered
+            results.append(cls(snapshot, visible))
+            # What's visible is exactly what's newly covered
+            covered = covered | visible
+            covered_area += visible.area
+        results.reverse()
+        return results
+
+    @property
+    def window(self):
+        """The window ID"""
+        return self.snapshot.window
+
+    @property
+    def fraction(self):
+        """How much of the window can be seen, from 0.0 to 1.0"""
+        region = self.snapshot.region
+        area = region.width * region.height
+        if not area:
+            return 0.0
+        return float(self.visible.area) / area
+
+    @property
+    def is_hidden(self):
+        """Checks if no part of the window can be seen"""
+        return not self.visible
+
+    def __repr__(self):
+        """Debugging output"""
+        return "WindowVisibility(%r, %.3f)" % (self.window, self.fraction)
@@ -0,0 +1,35 @@
+"""This file provides LazyModule, a module that fills itself in on demand"""
+
+from sys import modules
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    This class stands in for a module in sys.modules and resolves missing
+    attributes the first time they're read, caching whatever comes back.
+    Swapping the module out this way works on Python 2, which has no module
+    level __getattr__.
+    """
+
+    def __init__(self, module, resolve):
+        """Ctor copies the original namespace and keeps the module alive"""
+        super(LazyModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Python 2 wipes a module's globals once the module is collected
+        self.__dict__['_original_module'] = module
+        self.__dict__['_resolve'] = resolve
+
+    @classmethod
+    def install(cls, name, resolve):
+        """Replaces the named module in sys.modules"""
+        modules[name] = cls(modules[name], resolve)
+        return modules[name]
+
+    def __getattr__(self, name):
+        """Only called for attributes that don't exist yet"""
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = self._resolve(name)
+        setattr(self, name, value)
+        return value
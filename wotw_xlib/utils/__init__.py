@@ -2,3 +2,7 @@
 
 from .point import Point
 from .region import Region
+from .region_index import RegionIndex
+from .point_array import PointArray
+from .region_array import RegionArray
+from .region_set import RegionSet
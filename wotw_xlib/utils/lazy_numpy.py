@@ -0,0 +1,38 @@
+"""This file provides a stand-in that only imports NumPy once it's used"""
+
+
+class LazyNumpy(object):
+    """
+    This class defers the NumPy import, which costs more than the rest of the
+    package put together, until the first attribute is read. It's falsy when
+    NumPy isn't installed.
+    """
+
+    UNLOADED = object()
+
+    def __init__(self):
+        """Ctor doesn't import anything"""
+        self.module = self.UNLOADED
+
+    def load(self):
+        """Imports NumPy the first time through"""
+        if self.module is self.UNLOADED:
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+            self.module = numpy
+        return self.module
+
+    def __bool__(self):
+        """Checks if NumPy is installed"""
+        return self.load() is not None
+
+    __nonzero__ = __bool__
+
+    def __getattr__(self, name):
+        """Forwards everything else to the real module"""
+        return getattr(self.load(), name)
+
+
+numpy = LazyNumpy()
@@ -3,12 +3,30 @@
 
 
 class Point(object):
-    """This class holds very simple Point class with some logic for X11 tasks"""
+    """
+    This class holds very simple Point class with some logic for X11 tasks.
+    Points are immutable, hashable, and slotted to stay small in bulk.
+    """
+
+    __slots__ = ['x', 'y']
 
     def __init__(self, x, y):
         """Simple ctor; assigns sanitized values"""
-        self.x = self.parse_coordinate(x)
-        self.y = self.parse_coordinate(y)
+        set_x(self, self.parse_coordinate(x))
+        set_y(self, self.parse_coordinate(y))
+
+    @classmethod
+    def from_values(cls, x, y):
+        """Builds a Point from plain numbers without probing them"""
+        point = object.__new__(cls)
+        set_x(point, x)
+        set_y(point, y)
+        return point
+
+    @classmethod
+    def from_ctypes(cls, x, y):
+        """Builds a Point from ctype numbers without probing them"""
+        return cls.from_values(x.value, y.value)
 
     @staticmethod
     def parse_coordinate(raw_coordinate):
@@ -29,6 +47,42 @@ class Point(object):
             self.y <= unknown_point.y
         )
 
+    def __setattr__(self, name, value):
+        """Points never change once built"""
+        raise AttributeError("Point is immutable")
+
+    def __delattr__(self, name):
+        """Points never change once built"""
+        raise AttributeError("Point is immutable")
+
+    def __reduce__(self):
+        """Pickles through the ctor since attributes can't be set"""
+        return (Point, (self.x, self.y))
+
+    def __eq__(self, other):
+        """Compares coordinates"""
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __ne__(self, other):
+        """Python 2 doesn't derive this from __eq__"""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        """Hashes the coordinates"""
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        """Constructor-style output"""
+        return "Point(%r, %r)" % (self.x, self.y)
+
     def __str__(self):
         """Prettified Cartesian output"""
         return "(%d,%d)" % (self.x, self.y)
+
+# The slot descriptors skip both the __setattr__ guard and the slower
+# object.__setattr__ lookup
+set_x = Point.x.__set__
+set_y = Point.y.__set__
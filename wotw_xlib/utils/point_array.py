@@ -0,0 +1,48 @@
+"""This file provides the PointArray util class"""
+
+from array import array
+
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.utils import Point
+
+
+class PointArray(object):
+    """
+    This class stores many Points as parallel coordinate arrays. It uses NumPy
+    when it's around and falls back to the array module when it isn't.
+    """
+
+    def __init__(self, xs, ys):
+        """Ctor copies the coordinates into columns"""
+        self.x = self.as_column(xs)
+        self.y = self.as_column(ys)
+
+    @staticmethod
+    def as_column(values):
+        """Builds a single integer column"""
+        if numpy:
+            return numpy.asarray(values, dtype=numpy.int64)
+        return array('l', values)
+
+    @classmethod
+    def from_points(cls, points):
+        """Splits a sequence of Points into columns"""
+        return cls(
+            [point.x for point in points],
+            [point.y for point in points]
+        )
+
+    @classmethod
+    def parse_points(cls, unknown_points):
+        """Passes PointArrays through and converts anything else"""
+        if isinstance(unknown_points, cls):
+            return unknown_points
+        return cls.from_points(unknown_points)
+
+    def __getitem__(self, index):
+        """Rebuilds a single Point"""
+        return Point.from_values(int(self.x[index]), int(self.y[index]))
+
+    def __len__(self):
+        """Counts the points"""
+        return len(self.x)
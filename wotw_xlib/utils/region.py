@@ -5,15 +5,43 @@ from wotw_xlib.utils import Point
 
 
 class Region(object):
-    """This class simplifies window geometry using the Point class"""
+    """
+    This class simplifies window geometry using the Point class. Like Point,
+    Regions are immutable, hashable, and slotted.
+    """
+
+    __slots__ = ['top_left', 'bottom_right']
 
     def __init__(self, top_left, width=0, height=0):
         """Ctor assigns the two bounding corners"""
-        self.top_left = top_left
-        self.bottom_right = Point(
+        set_top_left(self, top_left)
+        set_bottom_right(self, Point(
             self.top_left.x + Point.parse_coordinate(width),
             self.top_left.y + Point.parse_coordinate(height)
-        )
+        ))
+
+    @classmethod
+    def from_values(cls, x, y, width, height):
+        """Builds a Region from plain numbers without probing them"""
+        region = object.__new__(cls)
+        set_top_left(region, Point.from_values(x, y))
+        set_bottom_right(region, Point.from_values(x + width, y + height))
+        return region
+
+    @classmethod
+    def from_ctypes(cls, x, y, width, height):
+        """Builds a Region from ctype numbers without probing them"""
+        return cls.from_values(x.value, y.value, width.value, height.value)
+
+    @property
+    def width(self):
+        """Recovers the width from the corners"""
+        return self.bottom_right.x - self.top_left.x
+
+    @property
+    def height(self):
+        """Recovers the height from the corners"""
+        return self.bottom_right.y - self.top_left.y
 
     def contains(self, unknown_point):
         """Test if the region contains an unknown point"""
@@ -23,6 +51,81 @@ class Region(object):
             unknown_point.is_above_and_left_of(self.bottom_right)
         )
 
+    def overlaps(self, other):
+        """Checks if the regions share any area; touching edges don't count"""
+        return (
+            self.top_left.x < other.bottom_right.x
+            and
+            other.top_left.x < self.bottom_right.x
+            and
+            self.top_left.y < other.bottom_right.y
+            and
+            other.top_left.y < self.bottom_right.y
+        )
+
+    def intersection(self, other):
+        """Returns the shared area, or None when there isn't any"""
+        if not self.overlaps(other):
+            return None
+        left = max(self.top_left.x, other.top_left.x)
+        top = max(self.top_left.y, other.top_left.y)
+        return Region.from_values(
+            left,
+            top,
+            min(self.bottom_right.x, other.bottom_right.x) - left,
+            min(self.bottom_right.y, other.bottom_right.y) - top
+        )
+
+    def union(self, other):
+        """Returns the smallest region covering both"""
+        left = min(self.top_left.x, other.top_left.x)
+        top = min(self.top_left.y, other.top_left.y)
+        return Region.from_values(
+            left,
+            top,
+            max(self.bottom_right.x, other.bottom_right.x) - left,
+            max(self.bottom_right.y, other.bottom_right.y) - top
+        )
+
+    def __setattr__(self, name, value):
+        """Regions never change once built"""
+        raise AttributeError("Region is immutable")
+
+    def __delattr__(self, name):
+        """Regions never change once built"""
+        raise AttributeError("Region is immutable")
+
+    def __reduce__(self):
+        """Pickles through the ctor since attributes can't be set"""
+        return (Region, (self.top_left, self.width, self.height))
+
+    def __eq__(self, other):
+        """Compares corners"""
+        if not isinstance(other, Region):
+            return NotImplemented
+        return (
+            self.top_left == other.top_left
+            and
+            self.bottom_right == other.bottom_right
+        )
+
+    def __ne__(self, other):
+        """Python 2 doesn't derive this from __eq__"""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        """Hashes the corners"""
+        return hash((self.top_left, self.bottom_right))
+
+    def __repr__(self):
+        """Constructor-style output"""
+        return "Region(%r, %r, %r)" % (self.top_left, self.width, self.height)
+
     def __str__(self):
         """Prettified Cartesian (sorta) output"""
         return "%sx%s" % (self.top_left, self.bottom_right)
+
+# See point.py; these skip the __setattr__ guard
+set_top_left = Region.top_left.__set__
+set_bottom_right = Region.bottom_right.__set__
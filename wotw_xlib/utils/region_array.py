@@ -0,0 +1,103 @@
+"""This file provides the RegionArray util class"""
+
+from array import array
+
+from wotw_xlib.utils.lazy_numpy import numpy
+from wotw_xlib.utils import PointArray, Region
+
+
+class RegionArray(object):
+    """
+    This class stores many Regions as parallel edge arrays so containment can be
+    tested against whole batches of points at once. Regions are expected in
+    stacking order, bottom to top, just like XQueryTree returns children.
+    """
+
+    def __init__(self, xs, ys, rights, bottoms):
+        """Ctor copies the edges into columns"""
+        self.x = PointArray.as_column(xs)
+        self.y = PointArray.as_column(ys)
+        self.right = PointArray.as_column(rights)
+        self.bottom = PointArray.as_column(bottoms)
+
+    @classmethod
+    def from_regions(cls, regions):
+        """Splits a sequence of Regions into columns"""
+        return cls(
+            [region.top_left.x for region in regions],
+            [region.top_left.y for region in regions],
+            [region.bottom_right.x for region in regions],
+            [region.bottom_right.y for region in regions]
+        )
+
+    def contains_many(self, unknown_points):
+        """
+        Builds a points by regions matrix that's true wherever the region
+        contains the point
+        """
+        points = PointArray.parse_points(unknown_points)
+        if numpy:
+            return (
+                (points.x[:, None] >= self.x[None, :])
+                & (points.y[:, None] >= self.y[None, :])
+                & (points.x[:, None] <= self.right[None, :])
+                & (points.y[:, None] <= self.bottom[None, :])
+            )
+        return [
+            [
+                self.edges_contain(index, point_x, point_y)
+                for index in range(len(self))
+            ]
+            for point_x, point_y in zip(points.x, points.y)
+        ]
+
+    def topmost_many(self, unknown_points):
+        """
+        Finds the index of the topmost region containing each point, or -1 when
+        nothing does. NumPy sweeps every point through one region at a time, so
+        memory stays linear in the number of points.
+        """
+        points = PointArray.parse_points(unknown_points)
+        if numpy:
+            topmost = numpy.full(len(points), -1, dtype=numpy.int64)
+            for index in range(len(self)):
+                topmost[
+                    (points.x >= self.x[index])
+                    & (points.y >= self.y[index])
+                    & (points.x <= self.right[index])
+                    & (points.y <= self.bottom[index])
+                ] = index
+            return topmost
+        return array('l', [
+            self.find_topmost(point_x, point_y)
+            for point_x, point_y in zip(points.x, points.y)
+        ])
+
+    def find_topmost(self, point_x, point_y):
+        """Checks a single point from the top of the stack down"""
+        for index in range(len(self) - 1, -1, -1):
+            if self.edges_contain(index, point_x, point_y):
+                return index
+        return -1
+
+    def edges_contain(self, index, point_x, point_y):
+        """Checks a single point against a single region"""
+        return (
+            self.x[index] <= point_x <= self.right[index]
+            and
+            self.y[index] <= point_y <= self.bottom[index]
+        )
+
+    def __getitem__(self, index):
+        """Rebuilds a single Region"""
+        left, top = int(self.x[index]), int(self.y[index])
+        return Region.from_values(
+            left,
+            top,
+            int(self.right[index]) - left,
+            int(self.bottom[index]) - top
+        )
+
+    def __len__(self):
+        """Counts the regions"""
+        return len(self.x)
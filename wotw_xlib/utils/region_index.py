@@ -0,0 +1,107 @@
+"""This file provides the RegionIndex util class"""
+
+
+class RegionIndex(object):
+    """
+    This class buckets Regions into a uniform grid of screen tiles, so a point
+    query only checks the few regions sharing its tile instead of every window
+    """
+
+    DEFAULT_TILE_SIZE = 256
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE):
+        """Ctor starts with an empty grid"""
+        self.tile_size = tile_size
+        self.entries = {}
+        self.tiles = {}
+        self.next_stacking = 0
+
+    def tiles_for(self, region):
+        """Lists every tile the region touches"""
+        return [
+            (column, row)
+            for column in range(
+                region.top_left.x // self.tile_size,
+                region.bottom_right.x // self.tile_size + 1
+            )
+            for row in range(
+                region.top_left.y // self.tile_size,
+                region.bottom_right.y // self.tile_size + 1
+            )
+        ]
+
+    def insert(self, key, region, stacking=None):
+        """
+        Adds a region under the key. Without an explicit stacking position, it
+        lands on top of everything already indexed, just like a new window.
+        """
+        if key in self.entries:
+            self.remove(key)
+        if stacking is None:
+            stacking = self.next_stacking
+        self.next_stacking = max(self.next_stacking, stacking + 1)
+        self.entries[key] = (region, stacking)
+        for tile in self.tiles_for(region):
+            self.tiles.setdefault(tile, {})[key] = stacking
+
+    def remove(self, key):
+        """Drops the key from the index"""
+        region = self.entries.pop(key)[0]
+        for tile in self.tiles_for(region):
+            bucket = self.tiles[tile]
+            del bucket[key]
+            if not bucket:
+                del self.tiles[tile]
+
+    def update(self, key, region=None, stacking=None):
+        """Moves or restacks the key, keeping whatever wasn't passed in"""
+        old_region, old_stacking = self.entries[key]
+        self.insert(
+            key,
+            old_region if region is None else region,
+            old_stacking if stacking is None else stacking
+        )
+
+    def query(self, location):
+        """Lists every key whose region contains the location, topmost first"""
+        bucket = self.tiles.get(
+            (location.x // self.tile_size, location.y // self.tile_size),
+            {}
+        )
+        return [
+            key
+            for key, _ in sorted(
+                bucket.items(),
+                key=lambda entry: entry[1],
+                reverse=True
+            )
+            if self.entries[key][0].contains(location)
+        ]
+
+    def query_region(self, region):
+        """Lists every key whose region overlaps the region, topmost first"""
+        bucket = {}
+        for tile in self.tiles_for(region):
+            bucket.update(self.tiles.get(tile, {}))
+        return [
+            key
+            for key, _ in sorted(
+                bucket.items(),
+                key=lambda entry: entry[1],
+                reverse=True
+            )
+            if self.entries[key][0].overlaps(region)
+        ]
+
+    def find_topmost(self, location):
+        """Returns the topmost key containing the location, if any"""
+        matches = self.query(location)
+        return matches[0] if matches else None
+
+    def __contains__(self, key):
+        """Checks if the key is indexed"""
+        return key in self.entries
+
+    def __len__(self):
+        """Counts the indexed regions"""
+        return len(self.entries)
@@ -0,0 +1,267 @@
+"""This file provides the RegionSet util class"""
+
+from bisect import bisect_right
+
+from wotw_xlib.utils import Region
+
+# Sorts after any band starting on the same row
+INFINITY = float('inf')
+
+# Truth tables, indexed by [inside first][inside second]
+UNION = ((False, True), (True, True))
+INTERSECTION = ((False, False), (False, True))
+SUBTRACTION = ((False, False), (True, False))
+
+
+def combine_spans(first, second, keep):
+    """
+    Sweeps two sorted lists of [start, end) edges, keeping the x ranges where
+    keep[inside first][inside second] holds
+    """
+    result = []
+    first_index, second_index = 0, 0
+    in_first, in_second, inside = False, False, False
+    while first_index < len(first) or second_index < len(second):
+        if second_index == len(second) or (
+                first_index < len(first)
+                and
+                first[first_index] <= second[second_index]
+        ):
+            edge = first[first_index]
+        else:
+            edge = second[second_index]
+        while first_index < len(first) and first[first_index] == edge:
+            in_first = not in_first
+            first_index += 1
+        while second_index < len(second) and second[second_index] == edge:
+            in_second = not in_second
+            second_index += 1
+        if keep[in_first][in_second] != inside:
+            inside = not inside
+            result.append(edge)
+    return tuple(result)
+
+
+def spans_at(bands, index, row):
+    """The x ranges of the band at index, if it covers the row"""
+    if index < len(bands) and bands[index][0] <= row:
+        return bands[index][2]
+    return ()
+
+
+def append_band(bands, band):
+    """Adds a band to the bottom, coalescing it into an identical one above"""
+    if not band[2]:
+        return
+    if bands and bands[-1][1] == band[0] and bands[-1][2] == band[2]:
+        bands[-1] = (bands[-1][0], band[1], band[2])
+    else:
+        bands.append(band)
+
+
+class RegionSet(object):
+    """
+    This class holds a set of pixels as y-x banded rectangles, the way the X
+    server's region code does. Bands are sorted top to bottom and never
+    overlap; each holds sorted, disjoint [start, end) x ranges, and
+    vertically touching bands with the same ranges are coalesced. That keeps
+    the representation canonical, so equal sets compare equal, and every
+    operation a single sweep over both band lists. Like Regions, RegionSets
+    are immutable.
+
+    Unlike Region.contains, which includes the far edges, pixels here are
+    half-open: a 2x2 Region at the origin covers (0, 0) through (1, 1).
+    """
+
+    __slots__ = ['bands']
+
+    def __init__(self, regions=()):
+        """Ctor unions the regions, pairwise, so each merge stays balanced"""
+        sets = [
+            self.from_bands([(
+                region.top_left.y,
+                region.bottom_right.y,
+                (region.top_left.x, region.bottom_right.x)
+            )])
+            for region in regions
+            if region.width > 0 and region.height > 0
+        ]
+        while len(sets) > 1:
+            sets = [
+                sets[index].union(sets[index + 1])
+                if index + 1 < len(sets)
+                else sets[index]
+                for index in range(0, len(sets), 2)
+            ]
+        set_bands(self, sets[0].bands if sets else ())
+
+    @classmethod
+    def from_bands(cls, bands):
+        """Builds a RegionSet from bands already in canonical order"""
+        region_set = object.__new__(cls)
+        set_bands(region_set, tuple(bands))
+        return region_set
+
+    def combine(self, other, keep):
+        """
+        Only rows where both sets have bands need any real work; everywhere
+        else one set's bands are copied, or dropped, verbatim. In the shared
+        rows, each stretch between consecutive band edges gets its x ranges
+        from combine_spans.
+        """
+        bands = []
+        if self.bands and other.bands:
+            top = max(self.bands[0][0], other.bands[0][0])
+            bottom = min(self.bands[-1][1], other.bands[-1][1])
+        else:
+            # Everything is one set's alone
+            top, bottom = INFINITY, INFINITY
+        sources = [
+            [self, keep[True][False]],
+            [other, keep[False][True]]
+        ]
+        for source, alone in sources:
+            if alone:
+                for band in source.clip_bands(-INFINITY, min(top, bottom)):
+                    append_band(bands, band)
+        if top < bottom:
+            first = list(self.clip_bands(top, bottom))
+            second = list(other.clip_bands(top, bottom))
+            edges = sorted(set(
+                edge
+                for band_top, band_bottom, _ in first + second
+                for edge in (band_top, band_bottom)
+            ))
+            first_index, second_index = 0, 0
+            for band_top, band_bottom in zip(edges, edges[1:]):
+                while first_index < len(first) and first[first_index][1] <= band_top:
+                    first_index += 1
+                while second_index < len(second) and second[second_index][1] <= band_top:
+                    second_index += 1
+                append_band(bands, (
+                    band_top,
+                    band_bottom,
+                    combine_spans(
+                        spans_at(first, first_index, band_top),
+                        spans_at(second, second_index, band_top),
+                        keep
+                    )
+                ))
+        for source, alone in sources:
+            if alone:
+                for band in source.clip_bands(max(top, bottom), INFINITY):
+                    append_band(bands, band)
+        return self.from_bands(bands)
+
+    def clip_bands(self, top, bottom):
+        """Yields the parts of the bands within rows [top, bottom)"""
+        start = max(0, bisect_right(self.bands, (top, INFINITY)) - 1)
+        for band_top, band_bottom, spans in self.bands[start:]:
+            if band_top >= bottom:
+                break
+            if band_bottom > top:
+                yield (max(band_top, top), min(band_bottom, bottom), spans)
+
+    def union(self, other):
+        """Pixels in either"""
+        return self.combine(other, UNION)
+
+    def intersection(self, other):
+        """Pixels in both"""
+        return self.combine(other, INTERSECTION)
+
+    def subtract(self, other):
+        """Pixels in this but not the other"""
+        return self.combine(other, SUBTRACTION)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = subtract
+
+    @property
+    def area(self):
+        """Counts the pixels"""
+        return sum(
+            (bottom - top) * sum(
+                spans[index + 1] - spans[index]
+                for index in range(0, len(spans), 2)
+            )
+            for top, bottom, spans in self.bands
+        )
+
+    @property
+    def bounds(self):
+        """The smallest Region covering everything, or None when empty"""
+        if not self.bands:
+            return None
+        left = min(spans[0] for _, _, spans in self.bands)
+        right = max(spans[-1] for _, _, spans in self.bands)
+        return Region.from_values(
+            left,
+            self.bands[0][0],
+            right - left,
+            self.bands[-1][1] - self.bands[0][0]
+        )
+
+    def contains(self, unknown_point):
+        """Checks if the pixel at the point is in the set, by bisection"""
+        index = bisect_right(self.bands, (unknown_point.y, INFINITY)) - 1
+        if index < 0 or self.bands[index][1] <= unknown_point.y:
+            return False
+        # An odd count of edges at or left of x means it's inside a range
+        return 1 == bisect_right(self.bands[index][2], unknown_point.x) % 2
+
+    def __iter__(self):
+        """Lists the banded rectangles as Regions, top to bottom"""
+        for top, bottom, spans in self.bands:
+            for index in range(0, len(spans), 2):
+                yield Region.from_values(
+                    spans[index],
+                    top,
+                    spans[index + 1] - spans[index],
+                    bottom - top
+                )
+
+    def __len__(self):
+        """Counts the banded rectangles"""
+        return sum(len(spans) // 2 for _, _, spans in self.bands)
+
+    def __bool__(self):
+        """Empty sets are falsy"""
+        return bool(self.bands)
+
+    __nonzero__ = __bool__
+
+    def __setattr__(self, name, value):
+        """RegionSets never change once built"""
+        raise AttributeError("RegionSet is immutable")
+
+    def __delattr__(self, name):
+        """RegionSets never change once built"""
+        raise AttributeError("RegionSet is immutable")
+
+    def __reduce__(self):
+        """Pickles through the ctor since attributes can't be set"""
+        return (RegionSet, (list(self),))
+
+    def __eq__(self, other):
+        """Bands are canonical, so equal sets have equal bands"""
+        if not isinstance(other, RegionSet):
+            return NotImplemented
+        return self.bands == other.bands
+
+    def __ne__(self, other):
+        """Python 2 doesn't derive this from __eq__"""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        """Hashes the bands"""
+        return hash(self.bands)
+
+    def __repr__(self):
+        """Constructor-style output"""
+        return "RegionSet(%r)" % (list(self),)
+
+# See point.py; this skips the __setattr__ guard
+set_bands = RegionSet.bands.__set__
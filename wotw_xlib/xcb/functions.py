@@ -0,0 +1,183 @@
+# pylint: disable=invalid-name
+"""
+This file collects the XCB functions used to pipeline requests. Like the Xlib
+bindings, each library is only loaded the first time one of its functions is
+read off this module.
+"""
+
+from ctypes import c_int, c_int16, c_uint, c_uint8, c_uint32, c_void_p, POINTER
+
+from wotw_xlib.lazy_module import LazyModule
+from wotw_xlib.xlib.lazy_bindings import LazyBindings
+from wotw_xlib.xlib.types import Display
+from wotw_xlib.xcb.types import (
+    Connection,
+    Cookie,
+    GenericError,
+    GetGeometryReply,
+    GetPropertyReply,
+    GetWindowAttributesReply,
+    QueryPointerReply,
+    QueryTreeReply,
+    TranslateCoordinatesReply,
+    XcbAtom,
+    XcbWindow
+)
+
+LIBRARIES = {
+    'lib': 'libxcb.so.1',
+    'x11_xcb': 'libX11-xcb.so.1',
+    'libc': 'libc.so.6'
+}
+
+# name: (library, argtypes, restype)
+BINDINGS = {
+    # Every reply and error XCB returns is malloc'd and must be freed by the caller
+    'free': (
+        'libc',
+        [c_void_p],
+        None
+    ),
+    'XGetXCBConnection': (
+        'x11_xcb',
+        [POINTER(Display)],
+        POINTER(Connection)
+    ),
+    'xcb_flush': (
+        'lib',
+        [POINTER(Connection)],
+        c_int
+    ),
+    # Unlike the typed *_reply functions, this never blocks
+    'xcb_poll_for_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            c_uint,
+            POINTER(c_void_p),
+            POINTER(POINTER(GenericError))
+        ],
+        c_int
+    ),
+    'xcb_get_geometry': (
+        'lib',
+        [POINTER(Connection), XcbWindow],
+        Cookie
+    ),
+    'xcb_get_geometry_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(GetGeometryReply)
+    ),
+    'xcb_get_window_attributes': (
+        'lib',
+        [POINTER(Connection), XcbWindow],
+        Cookie
+    ),
+    'xcb_get_window_attributes_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(GetWindowAttributesReply)
+    ),
+    'xcb_get_property': (
+        'lib',
+        [
+            POINTER(Connection),
+            c_uint8,
+            XcbWindow,
+            XcbAtom,
+            XcbAtom,
+            c_uint32,
+            c_uint32
+        ],
+        Cookie
+    ),
+    'xcb_get_property_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(GetPropertyReply)
+    ),
+    'xcb_get_property_value': (
+        'lib',
+        [POINTER(GetPropertyReply)],
+        c_void_p
+    ),
+    'xcb_get_property_value_length': (
+        'lib',
+        [POINTER(GetPropertyReply)],
+        c_int
+    ),
+    'xcb_query_pointer': (
+        'lib',
+        [POINTER(Connection), XcbWindow],
+        Cookie
+    ),
+    'xcb_query_pointer_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(QueryPointerReply)
+    ),
+    'xcb_query_tree': (
+        'lib',
+        [POINTER(Connection), XcbWindow],
+        Cookie
+    ),
+    'xcb_query_tree_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(QueryTreeReply)
+    ),
+    'xcb_query_tree_children': (
+        'lib',
+        [POINTER(QueryTreeReply)],
+        POINTER(XcbWindow)
+    ),
+    'xcb_query_tree_children_length': (
+        'lib',
+        [POINTER(QueryTreeReply)],
+        c_int
+    ),
+    'xcb_translate_coordinates': (
+        'lib',
+        [
+            POINTER(Connection),
+            XcbWindow,
+            XcbWindow,
+            c_int16,
+            c_int16
+        ],
+        Cookie
+    ),
+    'xcb_translate_coordinates_reply': (
+        'lib',
+        [
+            POINTER(Connection),
+            Cookie,
+            POINTER(POINTER(GenericError))
+        ],
+        POINTER(TranslateCoordinatesReply)
+    )
+}
+
+BINDER = LazyBindings(globals(), LIBRARIES, BINDINGS)
+LazyModule.install(__name__, BINDER)
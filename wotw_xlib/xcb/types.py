@@ -0,0 +1,184 @@
+# pylint: disable=invalid-name,too-few-public-methods
+"""This file collects the XCB types used by the batch queries"""
+
+from ctypes import c_int16, c_uint, c_uint8, c_uint16, c_uint32, Structure
+
+
+class Connection(Structure):
+    """
+    Like Display, xcb_connection_t is opaque. We only ever hold pointers to it.
+
+    see: https://xcb.freedesktop.org/manual/group__XCB__Core__API.html
+    """
+    _fields_ = [
+        ('_opaque_struct', c_uint8)
+    ]
+
+XcbWindow = c_uint32
+XcbAtom = c_uint32
+
+# Predefined atoms, which never need interning
+# see: https://github.com/mirror/libxcb/blob/libxcb-1.12/src/xproto.h
+XCB_ATOM_NONE = 0
+XCB_ATOM_STRING = 31
+XCB_ATOM_WM_ICON_NAME = 37
+XCB_ATOM_WM_NAME = 39
+XCB_ATOM_WM_CLASS = 67
+
+XCB_GET_PROPERTY_TYPE_ANY = 0
+
+
+class Cookie(Structure):
+    """
+    Every xcb_*_cookie_t is the same struct; only the reply function differs
+    """
+    _fields_ = [
+        ('sequence', c_uint)
+    ]
+
+
+class GenericError(Structure):
+    """
+    The error XCB hands back instead of a reply
+
+    see: https://xcb.freedesktop.org/manual/structxcb__generic__error__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('error_code', c_uint8),
+        ('sequence', c_uint16),
+        ('resource_id', c_uint32),
+        ('minor_code', c_uint16),
+        ('major_code', c_uint8),
+        ('pad0', c_uint8),
+        ('pad', c_uint32 * 5),
+        ('full_sequence', c_uint32)
+    ]
+
+
+class GetGeometryReply(Structure):
+    """
+    The XCB half of XGetGeometry
+
+    see: https://xcb.freedesktop.org/manual/structxcb__get__geometry__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('depth', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('root', XcbWindow),
+        ('x', c_int16),
+        ('y', c_int16),
+        ('width', c_uint16),
+        ('height', c_uint16),
+        ('border_width', c_uint16),
+        ('pad0', c_uint8 * 2)
+    ]
+
+
+class GetWindowAttributesReply(Structure):
+    """
+    The XCB half of XGetWindowAttributes. Unlike XWindowAttributes, this
+    doesn't include any geometry.
+
+    see: https://xcb.freedesktop.org/manual/structxcb__get__window__attributes__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('backing_store', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('visual', c_uint32),
+        ('class', c_uint16),
+        ('bit_gravity', c_uint8),
+        ('win_gravity', c_uint8),
+        ('backing_planes', c_uint32),
+        ('backing_pixel', c_uint32),
+        ('save_under', c_uint8),
+        ('map_is_installed', c_uint8),
+        ('map_state', c_uint8),
+        ('override_redirect', c_uint8),
+        ('colormap', c_uint32),
+        ('all_event_masks', c_uint32),
+        ('your_event_mask', c_uint32),
+        ('do_not_propagate_mask', c_uint16),
+        ('pad0', c_uint8 * 2)
+    ]
+
+
+class GetPropertyReply(Structure):
+    """
+    The XCB half of XGetWindowProperty. The value trails the struct and should
+    be read with xcb_get_property_value.
+
+    see: https://xcb.freedesktop.org/manual/structxcb__get__property__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('format', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('type', XcbAtom),
+        ('bytes_after', c_uint32),
+        ('value_len', c_uint32),
+        ('pad0', c_uint8 * 12)
+    ]
+
+
+class QueryPointerReply(Structure):
+    """
+    The XCB half of XQueryPointer
+
+    see: https://xcb.freedesktop.org/manual/structxcb__query__pointer__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('same_screen', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('root', XcbWindow),
+        ('child', XcbWindow),
+        ('root_x', c_int16),
+        ('root_y', c_int16),
+        ('win_x', c_int16),
+        ('win_y', c_int16),
+        ('mask', c_uint16),
+        ('pad0', c_uint8 * 2)
+    ]
+
+
+class TranslateCoordinatesReply(Structure):
+    """
+    The XCB half of XTranslateCoordinates
+
+    see: https://xcb.freedesktop.org/manual/structxcb__translate__coordinates__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('same_screen', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('child', XcbWindow),
+        ('dst_x', c_int16),
+        ('dst_y', c_int16)
+    ]
+
+
+class QueryTreeReply(Structure):
+    """
+    The XCB half of XQueryTree. The children trail the struct and should be
+    read with xcb_query_tree_children.
+
+    see: https://xcb.freedesktop.org/manual/structxcb__query__tree__reply__t.html
+    """
+    _fields_ = [
+        ('response_type', c_uint8),
+        ('pad0', c_uint8),
+        ('sequence', c_uint16),
+        ('length', c_uint32),
+        ('root', XcbWindow),
+        ('parent', XcbWindow),
+        ('children_len', c_uint16),
+        ('pad1', c_uint8 * 14)
+    ]
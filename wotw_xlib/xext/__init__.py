@@ -0,0 +1,17 @@
+# pylint:disable=wildcard-import
+"""Placeholder"""
+
+from importlib import import_module
+
+from wotw_xlib.lazy_module import LazyModule
+from .types import *
+
+
+def resolve(name):
+    """Defers to the functions, which load libXext on first use"""
+    functions = import_module('wotw_xlib.xext.functions')
+    if 'functions' == name:
+        return functions
+    return getattr(functions, name)
+
+LazyModule.install(__name__, resolve)
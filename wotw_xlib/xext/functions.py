@@ -0,0 +1,171 @@
+# pylint: disable=invalid-name
+"""
+This file collects the X extension functions. Like the Xlib bindings, each
+library is only loaded the first time one of its functions is read off this
+module.
+"""
+
+from ctypes import c_int, c_size_t, c_uint, c_ulong, c_void_p, POINTER
+
+from wotw_xlib.lazy_module import LazyModule
+from wotw_xlib.xlib.lazy_bindings import LazyBindings
+from wotw_xlib.xlib.types import Display, Visual, Window, XEvent, XImage, XRectangle
+from wotw_xlib.xext.types import (
+    Damage,
+    XRRMonitorInfo,
+    XserverRegion,
+    XShmSegmentInfo
+)
+
+LIBRARIES = {
+    'lib': 'libXext.so.6',
+    'damage': 'libXdamage.so.1',
+    'fixes': 'libXfixes.so.3',
+    'randr': 'libXrandr.so.2',
+    'libc': 'libc.so.6'
+}
+
+# name: (library, argtypes, restype)
+BINDINGS = {
+    # MIT-SHM
+    'XShmAttach': (
+        'lib',
+        [POINTER(Display), POINTER(XShmSegmentInfo)],
+        c_int
+    ),
+    'XShmCreateImage': (
+        'lib',
+        [
+            POINTER(Display),
+            POINTER(Visual),
+            c_uint,
+            c_int,
+            c_void_p,
+            POINTER(XShmSegmentInfo),
+            c_uint,
+            c_uint
+        ],
+        POINTER(XImage)
+    ),
+    'XShmDetach': (
+        'lib',
+        [POINTER(Display), POINTER(XShmSegmentInfo)],
+        c_int
+    ),
+    'XShmGetImage': (
+        'lib',
+        [POINTER(Display), Window, POINTER(XImage), c_int, c_int, c_ulong],
+        c_int
+    ),
+    'XShmQueryExtension': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    # DAMAGE
+    'XDamageCreate': (
+        'damage',
+        [POINTER(Display), Window, c_int],
+        Damage
+    ),
+    'XDamageDestroy': (
+        'damage',
+        [POINTER(Display), Damage],
+        None
+    ),
+    'XDamageQueryExtension': (
+        'damage',
+        [POINTER(Display), POINTER(c_int), POINTER(c_int)],
+        c_int
+    ),
+    'XDamageSubtract': (
+        'damage',
+        [POINTER(Display), Damage, XserverRegion, XserverRegion],
+        None
+    ),
+    # XFIXES, which holds the regions DAMAGE reports into
+    'XFixesCreateRegion': (
+        'fixes',
+        [POINTER(Display), POINTER(XRectangle), c_int],
+        XserverRegion
+    ),
+    'XFixesDestroyRegion': (
+        'fixes',
+        [POINTER(Display), XserverRegion],
+        None
+    ),
+    # The rectangles are malloc'd and must be released with XFree
+    'XFixesFetchRegion': (
+        'fixes',
+        [POINTER(Display), XserverRegion, POINTER(c_int)],
+        POINTER(XRectangle)
+    ),
+    # RANDR
+    'XRRFreeMonitors': (
+        'randr',
+        [POINTER(XRRMonitorInfo)],
+        None
+    ),
+    # Monitors are malloc'd and must be released with XRRFreeMonitors
+    'XRRGetMonitors': (
+        'randr',
+        [POINTER(Display), Window, c_int, POINTER(c_int)],
+        POINTER(XRRMonitorInfo)
+    ),
+    'XRRQueryExtension': (
+        'randr',
+        [POINTER(Display), POINTER(c_int), POINTER(c_int)],
+        c_int
+    ),
+    'XRRSelectInput': (
+        'randr',
+        [POINTER(Display), Window, c_int],
+        None
+    ),
+    'XRRUpdateConfiguration': (
+        'randr',
+        [POINTER(XEvent)],
+        c_int
+    ),
+    # SHAPE
+    # The rectangles are malloc'd and must be released with XFree
+    'XShapeGetRectangles': (
+        'lib',
+        [POINTER(Display), Window, c_int, POINTER(c_int), POINTER(c_int)],
+        POINTER(XRectangle)
+    ),
+    'XShapeQueryExtension': (
+        'lib',
+        [POINTER(Display), POINTER(c_int), POINTER(c_int)],
+        c_int
+    ),
+    'XShapeSelectInput': (
+        'lib',
+        [POINTER(Display), Window, c_ulong],
+        None
+    ),
+    # The System V half of MIT-SHM lives in libc
+    'shmat': (
+        'libc',
+        [c_int, c_void_p, c_int],
+        c_void_p
+    ),
+    'shmctl': (
+        'libc',
+        [c_int, c_int, c_void_p],
+        c_int
+    ),
+    'shmdt': (
+        'libc',
+        [c_void_p],
+        c_int
+    ),
+    'shmget': (
+        'libc',
+        [c_int, c_size_t, c_int],
+        c_int
+    )
+}
+
+BINDER = LazyBindings(globals(), LIBRARIES, BINDINGS)
+LazyModule.install(__name__, BINDER)
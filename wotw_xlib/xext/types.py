@@ -0,0 +1,117 @@
+# pylint: disable=invalid-name,too-few-public-methods
+"""This file collects the types used by the X extensions"""
+
+from ctypes import c_int, c_uint, c_ulong, c_void_p, POINTER, Structure
+
+from wotw_xlib.xlib.types import Atom, Display, Window, XRectangle
+
+ShmSeg = c_ulong
+Damage = c_ulong
+XserverRegion = c_ulong
+Time = c_ulong
+RROutput = c_ulong
+
+# The "no region" value XDamageSubtract takes to mean everything
+XFixesRegionNone = 0
+
+# System V IPC flags, which come from sys/ipc.h
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+# shmat reports failure as (void *) -1
+SHM_FAILED = c_void_p(-1).value
+
+
+class XShmSegmentInfo(Structure):
+    """
+    This struct ties a System V shared segment to its server-side ID
+
+    see: https://www.x.org/releases/X11R7.7/doc/xextproto/shm.html
+    """
+    _fields_ = [
+        ('shmseg', ShmSeg),
+        ('shmid', c_int),
+        ('shmaddr', c_void_p),
+        ('readOnly', c_int)
+    ]
+
+# Damage report levels and events, which come from Xdamage.h
+# see: https://www.x.org/releases/X11R7.7/doc/damageproto/damageproto.txt
+XDamageReportRawRectangles = 0
+XDamageReportDeltaRectangles = 1
+XDamageReportBoundingBox = 2
+XDamageReportNonEmpty = 3
+
+# Added to the event base XDamageQueryExtension reports
+XDamageNotify = 0
+
+
+class XDamageNotifyEvent(Structure):
+    """This struct is what XNextEvent writes for a damage event"""
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('drawable', Window),
+        ('damage', Damage),
+        ('level', c_int),
+        ('more', c_int),
+        ('timestamp', Time),
+        ('area', XRectangle),
+        ('geometry', XRectangle)
+    ]
+
+# RandR event masks and events, which come from Xrandr.h and randr.h
+# see: https://www.x.org/releases/X11R7.7/doc/randrproto/randrproto.txt
+RRScreenChangeNotifyMask = 1 << 0
+
+# Added to the event base XRRQueryExtension reports
+RRScreenChangeNotify = 0
+
+
+class XRRMonitorInfo(Structure):
+    """This struct describes a single monitor from XRRGetMonitors"""
+    _fields_ = [
+        ('name', Atom),
+        ('primary', c_int),
+        ('automatic', c_int),
+        ('noutput', c_int),
+        ('x', c_int),
+        ('y', c_int),
+        ('width', c_int),
+        ('height', c_int),
+        ('mwidth', c_int),
+        ('mheight', c_int),
+        ('outputs', POINTER(RROutput))
+    ]
+
+# Shape kinds, masks, and events, which come from shape.h and shapeconst.h
+# see: https://www.x.org/releases/X11R7.7/doc/xextproto/shape.html
+ShapeBounding = 0
+ShapeClip = 1
+ShapeInput = 2
+
+ShapeNotifyMask = 1 << 0
+
+# Added to the event base XShapeQueryExtension reports
+ShapeNotify = 0
+
+
+class XShapeEvent(Structure):
+    """This struct is what XNextEvent writes for a shape event"""
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('window', Window),
+        ('kind', c_int),
+        ('x', c_int),
+        ('y', c_int),
+        ('width', c_uint),
+        ('height', c_uint),
+        ('time', Time),
+        ('shaped', c_int)
+    ]
@@ -1,83 +1,301 @@
 # pylint: disable=invalid-name
-"""This file collects several X11 functions"""
+"""
+This file collects several X11 functions. libX11 is only loaded, and each
+function only bound, the first time it's read off this module.
+"""
 
-from ctypes import CDLL, c_char_p, c_int, c_uint, c_ulong, POINTER
+from ctypes import CFUNCTYPE, c_char_p, c_int, c_long, c_uint, c_ulong, c_void_p, POINTER
 
-from wotw_xlib.xlib.types import Coordinate, Display, Window, XWindowAttributes, XTextProperty
-
-lib = CDLL('libX11.so.6')
-
-XCloseDisplay = lib.XCloseDisplay
-XCloseDisplay.argtypes = [POINTER(Display)]
-XCloseDisplay.restype = c_int
-
-XDefaultScreen = lib.XDefaultScreen
-XDefaultScreen.argtypes = [POINTER(Display)]
-XDefaultScreen.restype = c_int
-
-XGetGeometry = lib.XGetGeometry
-XGetGeometry.argtypes = [
-    POINTER(Display),
+from wotw_xlib.lazy_module import LazyModule
+from wotw_xlib.xlib.lazy_bindings import LazyBindings
+from wotw_xlib.xlib.types import (
+    Atom,
+    Coordinate,
+    Display,
+    Status,
+    Visual,
     Window,
-    POINTER(Window),
-    POINTER(Coordinate),
-    POINTER(Coordinate),
-    POINTER(c_uint),
-    POINTER(c_uint),
-    POINTER(c_uint),
-    POINTER(c_uint)
-]
-XGetGeometry.restype = c_int
+    XErrorEvent,
+    XEvent,
+    XImage,
+    XWindowAttributes,
+    XTextProperty
+)
 
-XGetWindowAttributes = lib.XGetWindowAttributes
-XGetWindowAttributes.argtypes = [
-    POINTER(Display),
-    Window,
-    POINTER(XWindowAttributes)
-]
-XGetWindowAttributes.restype = c_int
+XErrorHandler = CFUNCTYPE(c_int, POINTER(Display), POINTER(XErrorEvent))
 
-XGetWMIconName = lib.XGetWMIconName
-XGetWMIconName.argtypes = [
-    POINTER(Display),
-    Window,
-    POINTER(XTextProperty)
-]
-XGetWMIconName.restype = c_int
-
-XOpenDisplay = lib.XOpenDisplay
-XOpenDisplay.argtypes = [c_char_p]
-XOpenDisplay.restype = POINTER(Display)
-
-XQueryPointer = lib.XQueryPointer
-XQueryPointer.argtypes = [
-    POINTER(Display),
-    Window,
-    POINTER(Window),
-    POINTER(Window),
-    POINTER(Coordinate),
-    POINTER(Coordinate),
-    POINTER(Coordinate),
-    POINTER(Coordinate),
-    POINTER(c_ulong)
-]
-XQueryPointer.restype = c_int
-
-XQueryTree = lib.XQueryTree
-XQueryTree.argtypes = [
-    POINTER(Display),
-    Window,
-    POINTER(Window),
-    POINTER(Window),
-    POINTER(POINTER(Window)),
-    POINTER(c_uint)
-]
-XQueryTree.restype = c_int
+LIBRARIES = {
+    'lib': 'libX11.so.6'
+}
 
-XRootWindow = lib.XRootWindow
-XRootWindow.argtypes = [POINTER(Display), c_int]
-XRootWindow.restype = Window
+# name: (library, argtypes, restype)
+BINDINGS = {
+    'XCloseDisplay': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    'XConnectionNumber': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    'XCreateSimpleWindow': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            c_int,
+            c_int,
+            c_uint,
+            c_uint,
+            c_uint,
+            c_ulong,
+            c_ulong
+        ],
+        Window
+    ),
+    'XDefaultDepth': (
+        'lib',
+        [POINTER(Display), c_int],
+        c_int
+    ),
+    'XDefaultScreen': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    'XDefaultVisual': (
+        'lib',
+        [POINTER(Display), c_int],
+        POINTER(Visual)
+    ),
+    'XDestroyImage': (
+        'lib',
+        [POINTER(XImage)],
+        c_int
+    ),
+    'XDestroyWindow': (
+        'lib',
+        [POINTER(Display), Window],
+        c_int
+    ),
+    'XFlush': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    'XFree': (
+        'lib',
+        [c_void_p],
+        c_int
+    ),
+    'XGetAtomNames': (
+        'lib',
+        [POINTER(Display), POINTER(Atom), c_int, POINTER(c_void_p)],
+        Status
+    ),
+    'XGetSubImage': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            c_int,
+            c_int,
+            c_uint,
+            c_uint,
+            c_ulong,
+            c_int,
+            POINTER(XImage),
+            c_int,
+            c_int
+        ],
+        POINTER(XImage)
+    ),
+    'XGetGeometry': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            POINTER(Window),
+            POINTER(Coordinate),
+            POINTER(Coordinate),
+            POINTER(c_uint),
+            POINTER(c_uint),
+            POINTER(c_uint),
+            POINTER(c_uint)
+        ],
+        c_int
+    ),
+    'XGetWindowAttributes': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            POINTER(XWindowAttributes)
+        ],
+        c_int
+    ),
+    'XGetWindowProperty': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            Atom,
+            c_long,
+            c_long,
+            c_int,
+            Atom,
+            POINTER(Atom),
+            POINTER(c_int),
+            POINTER(c_ulong),
+            POINTER(c_ulong),
+            POINTER(c_void_p)
+        ],
+        c_int
+    ),
+    'XGetWMIconName': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            POINTER(XTextProperty)
+        ],
+        c_int
+    ),
+    'XOpenDisplay': (
+        'lib',
+        [c_char_p],
+        POINTER(Display)
+    ),
+    'XInitThreads': (
+        'lib',
+        [],
+        c_int
+    ),
+    'XInternAtoms': (
+        'lib',
+        [
+            POINTER(Display),
+            POINTER(c_char_p),
+            c_int,
+            c_int,
+            POINTER(Atom)
+        ],
+        Status
+    ),
+    'XMapSubwindows': (
+        'lib',
+        [POINTER(Display), Window],
+        c_int
+    ),
+    'XMapWindow': (
+        'lib',
+        [POINTER(Display), Window],
+        c_int
+    ),
+    'XNextEvent': (
+        'lib',
+        [POINTER(Display), POINTER(XEvent)],
+        c_int
+    ),
+    'XPending': (
+        'lib',
+        [POINTER(Display)],
+        c_int
+    ),
+    'XQueryPointer': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            POINTER(Window),
+            POINTER(Window),
+            POINTER(Coordinate),
+            POINTER(Coordinate),
+            POINTER(Coordinate),
+            POINTER(Coordinate),
+            POINTER(c_ulong)
+        ],
+        c_int
+    ),
+    'XQueryTree': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            POINTER(Window),
+            POINTER(Window),
+            POINTER(POINTER(Window)),
+            POINTER(c_uint)
+        ],
+        c_int
+    ),
+    'XReparentWindow': (
+        'lib',
+        [POINTER(Display), Window, Window, c_int, c_int],
+        c_int
+    ),
+    'XRootWindow': (
+        'lib',
+        [POINTER(Display), c_int],
+        Window
+    ),
+    'XSelectInput': (
+        'lib',
+        [POINTER(Display), Window, c_long],
+        c_int
+    ),
+    'XSetErrorHandler': (
+        'lib',
+        [XErrorHandler],
+        XErrorHandler
+    ),
+    'XSync': (
+        'lib',
+        [POINTER(Display), c_int],
+        c_int
+    ),
+    'XTranslateCoordinates': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            Window,
+            c_int,
+            c_int,
+            POINTER(c_int),
+            POINTER(c_int),
+            POINTER(Window)
+        ],
+        c_int
+    ),
+    'XVisualIDFromVisual': (
+        'lib',
+        [POINTER(Visual)],
+        c_ulong
+    ),
+    'XWarpPointer': (
+        'lib',
+        [
+            POINTER(Display),
+            Window,
+            Window,
+            c_int,
+            c_int,
+            c_uint,
+            c_uint,
+            c_int,
+            c_int
+        ],
+        c_int
+    ),
+    'XFetchName': (
+        'lib',
+        [POINTER(Display), Window, POINTER(c_char_p)],
+        c_int
+    )
+}
 
-XFetchName = lib.XFetchName
-XFetchName.argtypes = [POINTER(Display), Window, POINTER(c_char_p)]
-XFetchName.restype = c_int
+BINDER = LazyBindings(globals(), LIBRARIES, BINDINGS)
+LazyModule.install(__name__, BINDER)
@@ -0,0 +1,75 @@
+"""This file provides LazyBindings, which loads C functions on first use"""
+
+from ctypes import CDLL
+
+
+class MissingBinding(object):
+    """
+    This stands in for a function whose library couldn't be loaded, so
+    optional extensions can be imported anywhere and only fail when called
+    """
+
+    def __init__(self, name, error):
+        """Ctor keeps the load error to raise later"""
+        self.__name__ = name
+        self.error = error
+
+    def __call__(self, *args):
+        """Raises the original load error"""
+        raise OSError("%s is unavailable: %s" % (self.__name__, self.error))
+
+
+class LazyBindings(object):
+    """
+    This class resolves a binding module's shared libraries and functions by
+    name. Nothing is loaded until something asks for it, so hosts without X
+    can still import the package.
+    """
+
+    def __init__(self, namespace, libraries, bindings):
+        """
+        Ctor takes the module globals to cache into, library attribute names
+        mapped to sonames, and function names mapped to
+        (library attribute, argtypes, restype)
+        """
+        self.namespace = namespace
+        self.libraries = libraries
+        self.bindings = bindings
+
+    def load_library(self, name):
+        """Opens a library once"""
+        if name not in self.namespace:
+            self.namespace[name] = CDLL(self.libraries[name])
+        return self.namespace[name]
+
+    def bind(self, name):
+        """
+        Looks up a function and declares its signature. If the library is
+        missing, the function is bound to a stand-in that raises when called.
+        """
+        library_name, argtypes, restype = self.bindings[name]
+        try:
+            library = self.load_library(library_name)
+        except OSError as error:
+            self.namespace[name] = MissingBinding(name, error)
+            return self.namespace[name]
+        function = getattr(library, name)
+        function.argtypes = argtypes
+        function.restype = restype
+        self.namespace[name] = function
+        return function
+
+    def __call__(self, name):
+        """Resolves a library or a function; anything else doesn't exist"""
+        if name in self.libraries:
+            return self.load_library(name)
+        if name in self.bindings:
+            return self.bind(name)
+        raise AttributeError(name)
+
+    def bind_all(self):
+        """Resolves everything at once"""
+        return dict(
+            (name, self(name))
+            for name in list(self.libraries) + list(self.bindings)
+        )
@@ -1,7 +1,20 @@
 # pylint: disable=invalid-name,too-few-public-methods
 """This file collects several X11 types"""
 
-from ctypes import c_char_p, c_int, c_long, c_uint, c_ulong, POINTER, Structure
+from ctypes import (
+    c_char_p,
+    c_int,
+    c_long,
+    c_short,
+    c_ubyte,
+    c_uint,
+    c_ulong,
+    c_ushort,
+    c_void_p,
+    POINTER,
+    Structure,
+    Union
+)
 
 
 class Display(Structure):
@@ -16,8 +29,27 @@ class Display(Structure):
         ('_opaque_struct', c_int)
     ]
 
+
+class Visual(Structure):
+    """Another opaque placeholder; only ever passed around as a pointer"""
+    _fields_ = [
+        ('_opaque_struct', c_int)
+    ]
+
 Window = c_ulong
 Coordinate = c_int
+Atom = c_ulong
+Status = c_int
+
+# The reserved "no atom" value
+AtomNone = 0
+
+# Predefined atoms and property types, which come from Xatom.h and X.h
+# see: https://github.com/mirror/libX11/blob/libX11-1.6.5/include/X11/Xatom.h
+AnyPropertyType = 0
+XA_CARDINAL = 6
+XA_WINDOW = 33
+Success = 0
 
 # Window map state, which comes from the docs below:
 # https://tronche.com/gui/x/xlib/window-information/XGetWindowAttributes.html
@@ -27,6 +59,11 @@ IsViewable = 2
 
 IGNORED_FOR_NOW = POINTER(c_int)
 
+# Image formats and plane masks, which come from X.h and Xlib.h
+XYPixmap = 1
+ZPixmap = 2
+AllPlanes = 0xffffffff
+
 
 class XTextProperty(Structure):
     """
@@ -74,3 +111,291 @@ class XWindowAttributes(Structure):
         ('override_redirect', c_int),
         ('screen', IGNORED_FOR_NOW),
     ]
+
+
+class XRectangle(Structure):
+    """
+    A plain rectangle, as the extensions hand them back
+
+    see: https://tronche.com/gui/x/xlib/graphics/drawing/XDrawRectangle.html
+    """
+    _fields_ = [
+        ('x', c_short),
+        ('y', c_short),
+        ('width', c_ushort),
+        ('height', c_ushort)
+    ]
+
+
+class XImageFunctions(Structure):
+    """
+    The function table inside XImage. Only destroy_image ever matters here,
+    through XDestroyImage.
+    """
+    _fields_ = [
+        ('create_image', c_void_p),
+        ('destroy_image', c_void_p),
+        ('get_pixel', c_void_p),
+        ('put_pixel', c_void_p),
+        ('sub_image', c_void_p),
+        ('add_pixel', c_void_p)
+    ]
+
+
+class XImage(Structure):
+    """
+    This struct describes an image in client memory. data is left as a plain
+    address so it can point into a shared segment.
+
+    see: https://tronche.com/gui/x/xlib/graphics/images.html
+    """
+    _fields_ = [
+        ('width', c_int),
+        ('height', c_int),
+        ('xoffset', c_int),
+        ('format', c_int),
+        ('data', c_void_p),
+        ('byte_order', c_int),
+        ('bitmap_unit', c_int),
+        ('bitmap_bit_order', c_int),
+        ('bitmap_pad', c_int),
+        ('depth', c_int),
+        ('bytes_per_line', c_int),
+        ('bits_per_pixel', c_int),
+        ('red_mask', c_ulong),
+        ('green_mask', c_ulong),
+        ('blue_mask', c_ulong),
+        ('obdata', c_char_p),
+        ('f', XImageFunctions)
+    ]
+
+# Event masks and types, which come from X.h
+# see: https://github.com/mirror/libX11/blob/libX11-1.6.5/include/X11/X.h
+NoEventMask = 0
+StructureNotifyMask = 1 << 17
+SubstructureNotifyMask = 1 << 19
+PropertyChangeMask = 1 << 22
+
+CreateNotify = 16
+DestroyNotify = 17
+UnmapNotify = 18
+MapNotify = 19
+ReparentNotify = 21
+ConfigureNotify = 22
+GravityNotify = 24
+CirculateNotify = 26
+PropertyNotify = 28
+
+PropertyNewValue = 0
+PropertyDelete = 1
+
+PlaceOnTop = 0
+PlaceOnBottom = 1
+
+BadValue = 2
+BadWindow = 3
+BadDrawable = 9
+
+
+class XAnyEvent(Structure):
+    """
+    The header every event shares
+
+    see: https://tronche.com/gui/x/xlib/events/structures.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('window', Window)
+    ]
+
+
+class XCreateWindowEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/create.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('parent', Window),
+        ('window', Window),
+        ('x', Coordinate),
+        ('y', Coordinate),
+        ('width', c_int),
+        ('height', c_int),
+        ('border_width', c_int),
+        ('override_redirect', c_int)
+    ]
+
+
+class XDestroyWindowEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/destroy.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window)
+    ]
+
+
+class XUnmapEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/unmap.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('from_configure', c_int)
+    ]
+
+
+class XMapEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/map.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('override_redirect', c_int)
+    ]
+
+
+class XReparentEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/reparent.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('parent', Window),
+        ('x', Coordinate),
+        ('y', Coordinate),
+        ('override_redirect', c_int)
+    ]
+
+
+class XConfigureEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/configure.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('x', Coordinate),
+        ('y', Coordinate),
+        ('width', c_int),
+        ('height', c_int),
+        ('border_width', c_int),
+        ('above', Window),
+        ('override_redirect', c_int)
+    ]
+
+
+class XGravityEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/gravity.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('x', Coordinate),
+        ('y', Coordinate)
+    ]
+
+
+class XCirculateEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/window-state-change/circulate.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('event', Window),
+        ('window', Window),
+        ('place', c_int)
+    ]
+
+
+class XPropertyEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/events/client-communication/property.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('serial', c_ulong),
+        ('send_event', c_int),
+        ('display', POINTER(Display)),
+        ('window', Window),
+        ('atom', Atom),
+        ('time', c_ulong),
+        ('state', c_int)
+    ]
+
+
+class XErrorEvent(Structure):
+    """
+    see: https://tronche.com/gui/x/xlib/event-handling/protocol-errors/XErrorEvent.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('display', POINTER(Display)),
+        ('resourceid', c_ulong),
+        ('serial', c_ulong),
+        ('error_code', c_ubyte),
+        ('request_code', c_ubyte),
+        ('minor_code', c_ubyte)
+    ]
+
+
+class XEvent(Union):
+    """
+    This union only lists the members that are actually used. The padding keeps
+    it as large as the real thing, since XNextEvent writes the full size.
+
+    see: https://tronche.com/gui/x/xlib/events/structures.html
+    """
+    _fields_ = [
+        ('type', c_int),
+        ('xany', XAnyEvent),
+        ('xcreatewindow', XCreateWindowEvent),
+        ('xdestroywindow', XDestroyWindowEvent),
+        ('xunmap', XUnmapEvent),
+        ('xmap', XMapEvent),
+        ('xreparent', XReparentEvent),
+        ('xconfigure', XConfigureEvent),
+        ('xgravity', XGravityEvent),
+        ('xcirculate', XCirculateEvent),
+        ('xproperty', XPropertyEvent),
+        ('xerror', XErrorEvent),
+        ('pad', c_long * 24)
+    ]